@@ -10,6 +10,11 @@ import pandas as pd
 import re
 from bs4 import BeautifulSoup
 import logging
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '03_s3_inventory', 'scripts'))
+from seed_bank_classifier import bank_mask
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -190,7 +195,7 @@ class AmsterdamExtractor:
         inv = pd.read_csv('c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/03_s3_inventory/s3_html_inventory.csv')
         
         # Filter Amsterdam URLs
-        ams = inv[inv['url'].str.contains('amsterdammarijuanaseeds.com', na=False)]
+        ams = inv[bank_mask(inv['url'], 'amsterdam')]
         logger.info(f"Found {len(ams)} Amsterdam strains")
         
         for idx, row in ams.iterrows():
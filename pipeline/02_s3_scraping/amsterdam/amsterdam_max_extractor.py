@@ -14,10 +14,20 @@ from urllib.parse import urlparse
 import logging
 from datetime import datetime
 from typing import Dict, Optional
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from checkpoint_writer import CheckpointWriter, extractor_version
+from method_profiler import MethodProfiler
+from sparse_attributes import SPARSE_PREFIXES
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Bump on logic changes; the manifest also fingerprints this file's source
+EXTRACTION_VERSION = '1.0'
+
 class AmsterdamMaxExtractor:
     def __init__(self):
         self.s3_client = boto3.client('s3')
@@ -26,6 +36,7 @@ class AmsterdamMaxExtractor:
             'json_ld': 0, 'meta_tags': 0, 'tables': 0, 'pricing': 0,
             'cannabis_data': 0, 'images': 0, 'awards': 0, 'genetics': 0
         }
+        self.profiler = MethodProfiler()
     
     def extract_json_ld_data(self, soup):
         data = {}
@@ -293,7 +304,7 @@ class AmsterdamMaxExtractor:
             'source_url': url,
             'scraped_at': datetime.now().isoformat(),
             'url_domain': urlparse(url).netloc,
-            'extraction_version': '1.0'
+            'extraction_version': EXTRACTION_VERSION
         }
         
         extraction_methods = [
@@ -311,7 +322,9 @@ class AmsterdamMaxExtractor:
         extraction_success = []
         for method_name, method_func in extraction_methods:
             try:
-                method_data = method_func(soup)
+                with self.profiler.measure(method_name, url) as probe:
+                    method_data = method_func(soup)
+                    probe['fields'] = len(method_data) if method_data else 0
                 if method_data:
                     strain_data.update(method_data)
                     extraction_success.append(method_name)
@@ -361,17 +374,20 @@ class AmsterdamMaxExtractor:
         paginator = self.s3_client.get_paginator('list_objects_v2')
         page_iterator = paginator.paginate(Bucket=self.bucket_name, Prefix='html/')
         
-        available_hashes = set()
+        available_hashes = {}
         for page in page_iterator:
             if 'Contents' in page:
                 for obj in page['Contents']:
                     if obj['Key'].endswith('.html'):
                         hash_id = obj['Key'].split('/')[-1].replace('.html', '')
-                        available_hashes.add(hash_id)
+                        available_hashes[hash_id] = obj['ETag'].strip('"')
         
         logger.info(f"Found {len(available_hashes)} HTML files in S3")
         
-        all_strains = []
+        output_file = 'amsterdam_maximum_extraction.csv'
+        writer = CheckpointWriter(output_file, stats=self.extraction_stats,
+                                  version=extractor_version(__file__, EXTRACTION_VERSION),
+                                  sparse_prefixes=SPARSE_PREFIXES)
         processed = 0
         
         for idx, row in df_urls.iterrows():
@@ -383,13 +399,17 @@ class AmsterdamMaxExtractor:
             if url_hash not in available_hashes:
                 continue
             
+            # Skip documents whose HTML and extractor are unchanged since the last run
+            if writer.is_complete(url_hash, available_hashes[url_hash]):
+                continue
+            
             try:
                 html_key = f'html/{url_hash}.html'
                 response = self.s3_client.get_object(Bucket=self.bucket_name, Key=html_key)
                 html_content = response['Body'].read().decode('utf-8')
                 
                 strain_data = self.maximum_extraction_pipeline(html_content, url)
-                all_strains.append(strain_data)
+                writer.write(url_hash, strain_data, available_hashes[url_hash])
                 
                 processed += 1
                 if processed % 50 == 0:
@@ -399,23 +419,23 @@ class AmsterdamMaxExtractor:
                 logger.error(f"Error processing {url}: {e}")
                 continue
         
-        df_results = pd.DataFrame(all_strains)
+        # Combine checkpointed parts into the main dataset
+        writer.finalize()
+        df_results = writer.load()
         
         # Handle empty dataframe
         if len(df_results) == 0:
             logger.warning("No strains extracted - check URL pattern")
             return df_results
         
-        output_file = 'amsterdam_maximum_extraction.csv'
-        df_results.to_csv(output_file, index=False, encoding='utf-8')
-        
         # Generate sample
         sample_file = 'amsterdam_maximum_extraction_sample.csv'
-        df_results.head(10).to_csv(sample_file, index=False, encoding='utf-8')
+        pd.read_csv(output_file, nrows=10, encoding='utf-8').to_csv(sample_file, index=False, encoding='utf-8')
         
         self.generate_report(df_results, output_file)
+        self.profiler.save(output_file.replace('.csv', '_method_profile.csv'))
         
-        logger.info(f"Extraction complete! Processed {len(all_strains)} strains")
+        logger.info(f"Extraction complete! Processed {len(df_results)} strains")
         logger.info(f"Dataset saved to: {output_file}")
         
         return df_results
@@ -434,7 +454,7 @@ class AmsterdamMaxExtractor:
 
 ### Success Metrics
 - **Total Strains Extracted:** {len(df)}
-- **Total Columns Captured:** {len(df.columns)}
+- **Total Columns Captured:** {len(df.attrs['columns'])}
 - **Average Fields per Strain:** {df['total_fields_captured'].mean():.1f}
 - **Average Quality Score:** {df['data_completeness_score'].mean():.1f}%
 
@@ -454,6 +474,8 @@ class AmsterdamMaxExtractor:
 ## Top Performing Strains
 {df.nlargest(10, 'data_completeness_score')[['strain_name', 'data_completeness_score', 'market_tier']].to_string(index=False)}
 
+{self.profiler.report_section()}
+
 ---
 
 **Logic designed by Amazon Q, verified by Shannon Goddard.**
@@ -468,7 +490,7 @@ def main():
     
     if len(df) > 0:
         print(f"\nAMSTERDAM MARIJUANA SEEDS EXTRACTION COMPLETE!")
-        print(f"Dataset: {len(df)} strains x {len(df.columns)} columns")
+        print(f"Dataset: {len(df)} strains x {len(df.attrs['columns'])} columns")
         print(f"Average Quality: {df['data_completeness_score'].mean():.1f}%")
         print(f"Market Tiers: {df['market_tier'].value_counts().to_dict()}")
     else:
@@ -20,11 +20,24 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 from urllib.parse import urlparse
 import logging
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from checkpoint_writer import CheckpointWriter, extractor_version
+from method_profiler import MethodProfiler
+from sparse_attributes import SPARSE_PREFIXES
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '03_s3_inventory', 'scripts'))
+from seed_bank_classifier import bank_mask
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Bump on logic changes; the manifest also fingerprints this file's source
+EXTRACTION_VERSION = '2.0'
+
 class BarneysFarmMaxExtractor:
     def __init__(self, s3_bucket='ci-strains-html-archive'):
         self.s3 = boto3.client('s3')
@@ -35,6 +48,7 @@ class BarneysFarmMaxExtractor:
             'json_ld': 0, 'meta_tags': 0, 'tables': 0, 'pricing': 0,
             'cannabis_data': 0, 'images': 0, 'awards': 0, 'genetics': 0
         }
+        self.profiler = MethodProfiler()
         
     def extract_json_ld_data(self, soup):
         """Extract structured JSON-LD data - Premium business intelligence"""
@@ -478,7 +492,7 @@ class BarneysFarmMaxExtractor:
             'source_url': url,
             'scraped_at': datetime.now().isoformat(),
             'url_domain': urlparse(url).netloc,
-            'extraction_version': '2.0'
+            'extraction_version': EXTRACTION_VERSION
         }
         
         # Apply all extraction methods
@@ -497,10 +511,12 @@ class BarneysFarmMaxExtractor:
         
         for method_name, method_func in extraction_methods:
             try:
-                if 'url' in method_func.__code__.co_varnames:
-                    method_data = method_func(soup, url)
-                else:
-                    method_data = method_func(soup)
+                with self.profiler.measure(method_name, url) as probe:
+                    if 'url' in method_func.__code__.co_varnames:
+                        method_data = method_func(soup, url)
+                    else:
+                        method_data = method_func(soup)
+                    probe['fields'] = len(method_data) if method_data else 0
                 
                 if method_data:
                     strain_data.update(method_data)
@@ -543,7 +559,7 @@ class BarneysFarmMaxExtractor:
         df = pd.read_csv('../../01_html_collection/original_html_collection/data/unique_urls.csv', encoding='latin-1')
         logger.info("Loaded URL mapping from local file")
         
-        barneys_farm_urls = df[df['url'].str.contains('barneysfarm', na=False)]
+        barneys_farm_urls = df[bank_mask(df['url'], 'barneys_farm')]
         logger.info(f"Found {len(barneys_farm_urls)} Barney's Farm URLs")
         
         # Get available HTML files
@@ -551,18 +567,21 @@ class BarneysFarmMaxExtractor:
         paginator = self.s3.get_paginator('list_objects_v2')
         page_iterator = paginator.paginate(Bucket=self.bucket, Prefix='html/')
         
-        available_hashes = set()
+        available_hashes = {}
         for page in page_iterator:
             if 'Contents' in page:
                 for obj in page['Contents']:
                     if obj['Key'].endswith('.html'):
                         hash_id = obj['Key'].split('/')[-1].replace('.html', '')
-                        available_hashes.add(hash_id)
+                        available_hashes[hash_id] = obj['ETag'].strip('"')
         
         logger.info(f"Found {len(available_hashes)} HTML files in S3")
         
         # Process strains
-        all_strains = []
+        output_file = 'barneys_farm_maximum_extraction.csv'
+        writer = CheckpointWriter(output_file, stats=self.extraction_stats,
+                                  version=extractor_version(__file__, EXTRACTION_VERSION),
+                                  sparse_prefixes=SPARSE_PREFIXES)
         processed = 0
         
         for idx, row in barneys_farm_urls.iterrows():
@@ -573,6 +592,10 @@ class BarneysFarmMaxExtractor:
                 logger.debug(f"HTML not found for {url_hash}")
                 continue
             
+            # Skip documents whose HTML and extractor are unchanged since the last run
+            if writer.is_complete(url_hash, available_hashes[url_hash]):
+                continue
+            
             try:
                 # Get HTML from S3
                 html_key = f'html/{url_hash}.html'
@@ -581,7 +604,7 @@ class BarneysFarmMaxExtractor:
                 
                 # Extract strain data
                 strain_data = self.maximum_extraction_pipeline(html_content, url)
-                all_strains.append(strain_data)
+                writer.write(url_hash, strain_data, available_hashes[url_hash])
                 
                 processed += 1
                 strain_name = strain_data.get('strain_name') or strain_data.get('jsonld_product_name') or 'Unknown'
@@ -595,19 +618,17 @@ class BarneysFarmMaxExtractor:
                 logger.error(f"Error processing {url}: {e}")
                 continue
         
-        # Create comprehensive dataset
-        df_results = pd.DataFrame(all_strains)
-        
-        # Save main dataset
-        output_file = 'barneys_farm_maximum_extraction.csv'
-        df_results.to_csv(output_file, index=False, encoding='utf-8')
+        # Combine checkpointed parts into the main dataset
+        writer.finalize()
+        df_results = writer.load()
         
         # Generate summary report
         self.generate_extraction_report(df_results, output_file)
+        self.profiler.save(output_file.replace('.csv', '_method_profile.csv'))
         
-        logger.info(f"Maximum extraction complete! Processed {len(all_strains)} strains")
+        logger.info(f"Maximum extraction complete! Processed {len(df_results)} strains")
         logger.info(f"Dataset saved to: {output_file}")
-        logger.info(f"Total columns captured: {len(df_results.columns)}")
+        logger.info(f"Total columns captured: {len(df_results.attrs['columns'])}")
         
         return df_results
     
@@ -624,7 +645,7 @@ class BarneysFarmMaxExtractor:
 
 ### Success Metrics
 - **Total Strains Extracted:** {len(df)}
-- **Total Columns Captured:** {len(df.columns)}
+- **Total Columns Captured:** {len(df.attrs['columns'])}
 - **Average Fields per Strain:** {df['total_fields_captured'].mean():.1f}
 - **Maximum Fields Captured:** {df['total_fields_captured'].max()}
 - **Average Quality Score:** {df['data_completeness_score'].mean():.1f}%
@@ -647,10 +668,12 @@ class BarneysFarmMaxExtractor:
 
 ## File Output
 - **Main Dataset:** {output_file}
-- **Total Size:** {len(df)} rows × {len(df.columns)} columns
+- **Total Size:** {len(df)} rows × {len(df.attrs['columns'])} columns
 - **Encoding:** UTF-8
 - **Format:** CSV with headers
 
+{self.profiler.report_section()}
+
 ---
 
 **Processing completed with maximum data extraction methodology.**  
@@ -667,7 +690,7 @@ def main():
     df = extractor.process_all_barneys_farm_strains()
     
     print(f"\nBARNEY'S FARM MAXIMUM EXTRACTION COMPLETE!")
-    print(f"Dataset: {len(df)} strains × {len(df.columns)} columns")
+    print(f"Dataset: {len(df)} strains × {len(df.attrs['columns'])} columns")
     print(f"Average Quality: {df['data_completeness_score'].mean():.1f}%")
     print(f"Market Tiers: {df['market_tier'].value_counts().to_dict()}")
 
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Golden Corpus Builder
+Downloads a fixed, deterministic sample of archived pages per extractor for offline benchmarking
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Pages are chosen by sorting each extractor's inventory rows on url_hash and
+taking the first N. url_hash is a truncated SHA-256/MD5, so this is a stable
+pseudo-random sample: rebuilding the corpus from the same inventory gives
+the same pages, and growing N only adds pages.
+
+Layout:
+  corpus/<extractor>/<url_hash>.html
+  corpus/<extractor>/index.csv   url_hash, url, s3_key, etag, html_size
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+import boto3
+import pandas as pd
+
+from extractor_registry import EXTRACTORS, INVENTORIES, select_rows, s3_key
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BUCKET = 'ci-strains-html-archive'
+CORPUS_DIR = Path(__file__).resolve().parent / 'corpus'
+DEFAULT_PAGES = 200
+
+
+def build_corpus(names, pages_per_extractor=DEFAULT_PAGES):
+    s3_client = boto3.client('s3')
+    inventories = {}
+
+    for name in names:
+        inventory = EXTRACTORS[name][3]
+        if inventory not in inventories:
+            inventories[inventory] = pd.read_csv(INVENTORIES[inventory], dtype={'url_hash': str}, encoding='utf-8')
+
+        rows = select_rows(name, inventories[inventory]).sort_values('url_hash')
+        rows = rows.drop_duplicates('url_hash').head(pages_per_extractor)
+
+        out_dir = CORPUS_DIR / name
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        index = []
+        for _, row in rows.iterrows():
+            key = s3_key(name, row['url_hash'])
+            html_file = out_dir / f"{row['url_hash']}.html"
+            try:
+                response = s3_client.get_object(Bucket=BUCKET, Key=key)
+                html_bytes = response['Body'].read()
+            except Exception as e:
+                logger.warning(f"{name}: could not fetch {key}: {e}")
+                continue
+
+            html_file.write_bytes(html_bytes)
+            index.append({
+                'url_hash': row['url_hash'],
+                'url': row['url'],
+                's3_key': key,
+                'etag': response['ETag'].strip('"'),
+                'html_size': len(html_bytes)
+            })
+
+        pd.DataFrame(index, columns=['url_hash', 'url', 's3_key', 'etag', 'html_size']).to_csv(
+            out_dir / 'index.csv', index=False, encoding='utf-8')
+        logger.info(f"{name}: {len(index)} pages in corpus ({len(rows)} selected)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the offline golden corpus from the S3 archive')
+    parser.add_argument('--extractor', action='append', choices=sorted(EXTRACTORS),
+                        help='Extractor to build (repeatable); default all')
+    parser.add_argument('--pages', type=int, default=DEFAULT_PAGES, help='Pages per extractor')
+    args = parser.parse_args()
+
+    build_corpus(args.extractor or list(EXTRACTORS), args.pages)
+
+
+if __name__ == "__main__":
+    main()
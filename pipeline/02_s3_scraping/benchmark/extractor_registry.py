@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Extractor Registry for the Golden-Corpus Benchmark
+One entry per extractor in 02_s3_scraping with how to select, fetch and call it offline
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Extractors expose three calling conventions:
+  pipeline  - maximum_extraction_pipeline(html_content, url)   (*_max_extractor.py)
+  strain    - extract_strain(url, html)                        (*_extractor.py)
+  soup      - extract_strain_data(soup, url)                   (*_js_extractor.py)
+  html_key  - extract_from_html(html_content, s3_key)          (seedsman_max_extractor.py)
+
+Selection mirrors each extractor's own run: a seed bank slug (see
+03_s3_inventory/scripts/seed_bank_classifier.py) against the html/
+inventory, or a seed_bank value against the html_js/ inventory.
+"""
+
+import importlib.util
+import logging
+import sys
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+SCRAPING_DIR = Path(__file__).resolve().parents[1]
+INVENTORY_DIR = SCRAPING_DIR.parent / '03_s3_inventory'
+
+sys.path.append(str(INVENTORY_DIR / 'scripts'))
+from seed_bank_classifier import bank_mask
+
+INVENTORIES = {
+    'html': INVENTORY_DIR / 's3_html_inventory.csv',
+    'js': INVENTORY_DIR / 's3_js_html_inventory.csv'
+}
+
+HTML_KEY = 'html/{url_hash}.html'
+NESTED_HTML_KEY = 'html/html/{url_hash}.html'
+JS_HTML_KEY = 'html_js/{url_hash}_js.html'
+
+# name: (script, class, adapter, inventory, selector, s3 key template)
+# selector is a seed bank slug for the html inventory, a seed_bank value for js
+EXTRACTORS = {
+    'amsterdam_max': ('amsterdam/amsterdam_max_extractor.py', 'AmsterdamMaxExtractor', 'pipeline', 'html', 'amsterdam', HTML_KEY),
+    'attitude_max': ('attitude_seed_bank/attitude_max_extractor_v2.py', 'AttitudeMaxExtractorV2', 'pipeline', 'html', 'attitude', HTML_KEY),
+    'barneys_farm_max': ('barneys_farm/barneys_farm_max_extractor.py', 'BarneysFarmMaxExtractor', 'pipeline', 'html', 'barneys_farm', HTML_KEY),
+    'crop_king_max': ('crop_king/crop_king_max_extractor.py', 'CropKingMaxExtractor', 'pipeline', 'html', 'crop_king', HTML_KEY),
+    'dutch_passion_max': ('dutch_passion/dutch_passion_max_extractor.py', 'DutchPassionMaxExtractor', 'pipeline', 'html', 'dutch_passion', HTML_KEY),
+    'great_lakes_genetics_max': ('great_lakes_genetics/great_lakes_genetics_max_extractor.py', 'GreatLakesGeneticsMaxExtractor', 'pipeline', 'html', 'great_lakes_genetics', HTML_KEY),
+    'mephisto_genetics_max': ('mephisto_genetics/mephisto_genetics_max_extractor.py', 'MephistoGeneticsMaxExtractor', 'pipeline', 'html', 'mephisto_genetics', HTML_KEY),
+    'multiverse_beans_max': ('multiverse_beans/multiverse_beans_max_extractor.py', 'MultiverseBeansMaxExtractor', 'pipeline', 'html', 'multiverse_beans', HTML_KEY),
+    'neptune_max': ('neptune/neptune_max_extractor.py', 'NeptuneMaxExtractor', 'pipeline', 'html', 'neptune', HTML_KEY),
+    'north_atlantic_max': ('north_atlantic/north_atlantic_max_extractor.py', 'NorthAtlanticMaxExtractor', 'pipeline', 'html', 'north_atlantic', HTML_KEY),
+    'royal_queen_seeds_max': ('royal_queen_seeds/royal_queen_seeds_max_extractor.py', 'RoyalQueenSeedsMaxExtractor', 'pipeline', 'html', 'royal_queen_seeds', HTML_KEY),
+    'seed_supreme_max': ('seed_supreme/seed_supreme_max_extractor.py', 'SeedSupremeMaxExtractor', 'pipeline', 'html', 'seed_supreme', HTML_KEY),
+    'seeds_here_now_max': ('seeds_here_now/seeds_here_now_max_extractor.py', 'SeedsHereNowMaxExtractor', 'pipeline', 'html', 'seeds_here_now', HTML_KEY),
+    'sensi_seeds_max': ('sensi_seeds/sensi_seeds_max_extractor.py', 'SensiSeedsMaxExtractor', 'pipeline', 'html', 'sensi_seeds', HTML_KEY),
+    'seedsman_max': ('seedsman/seedsman_max_extractor.py', 'SeedsmanMaxExtractor', 'html_key', 'html', 'seedsman', HTML_KEY),
+    'amsterdam': ('amsterdam/amsterdam_extractor.py', 'AmsterdamExtractor', 'strain', 'html', 'amsterdam', NESTED_HTML_KEY),
+    'compound': ('compound/compound_extractor.py', 'CompoundExtractor', 'strain', 'html', 'compound', NESTED_HTML_KEY),
+    'exotic': ('exotic_genetics/exotic_extractor.py', 'ExoticExtractor', 'strain', 'html', 'exotic', NESTED_HTML_KEY),
+    'gorilla': ('gorilla/gorilla_extractor.py', 'GorillaExtractor', 'strain', 'html', 'gorilla', NESTED_HTML_KEY),
+    'herbies': ('herbies/herbies_extractor.py', 'HerbiesExtractor', 'strain', 'html', 'herbies', NESTED_HTML_KEY),
+    'ilgm': ('ilgm/ilgm_extractor.py', 'ILGMExtractor', 'strain', 'html', 'ilgm', HTML_KEY),
+    # ILGM JS pages are stored as 'Unknown' in the JS inventory (metadata lookup failed)
+    'ilgm_js': ('ilgm/ilgm_js_extractor.py', 'ILGMJSExtractor', 'soup', 'js', 'Unknown', JS_HTML_KEY),
+    'seedsman_js': ('seedsman/seedsman_js_extractor.py', 'SeedsmanJSExtractor', 'soup', 'js', 'Seedsman', JS_HTML_KEY)
+}
+
+
+def select_rows(name, inventory_df):
+    """Inventory rows an extractor would process in a full run"""
+    _, _, _, inventory, selector, _ = EXTRACTORS[name]
+    if inventory == 'js':
+        return inventory_df[inventory_df['seed_bank'] == selector]
+    return inventory_df[bank_mask(inventory_df['url'], selector)]
+
+
+def s3_key(name, url_hash):
+    return EXTRACTORS[name][5].format(url_hash=url_hash)
+
+
+def load_extractor(name):
+    """Import an extractor script by path and return a callable (html, url, key) -> dict"""
+    script, class_name, adapter, _, _, _ = EXTRACTORS[name]
+    script_path = SCRAPING_DIR / script
+
+    # Extractors import their shared helpers relative to their own folder
+    sys.path.insert(0, str(script_path.parent))
+    spec = importlib.util.spec_from_file_location(f"benchmark_{name}", script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    # Extractor scripts log every page at INFO; keep the benchmark output readable
+    logging.getLogger(module.__name__).setLevel(logging.WARNING)
+
+    extractor = getattr(module, class_name)()
+
+    if adapter == 'pipeline':
+        return lambda html, url, key: extractor.maximum_extraction_pipeline(html, url)
+    if adapter == 'strain':
+        return lambda html, url, key: extractor.extract_strain(url, html)
+    if adapter == 'soup':
+        return lambda html, url, key: extractor.extract_strain_data(BeautifulSoup(html, 'html.parser'), url)
+    if adapter == 'html_key':
+        return lambda html, url, key: extractor.extract_from_html(html, key)
+    raise ValueError(f"Unknown adapter '{adapter}' for {name}")
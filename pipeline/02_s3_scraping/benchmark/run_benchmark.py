@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Golden-Corpus Extractor Benchmark
+Offline pages/sec, peak memory and field-level accuracy for every extractor, compared across commits
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Each extractor runs against its corpus/ pages (see build_corpus.py) with no
+S3 access. A timed pass measures throughput, a second pass under tracemalloc
+measures per-page peak allocation and collects outputs, which are compared
+field by field with golden/<extractor>.jsonl.
+
+Results are saved as results/<commit>.json and appended to results/history.csv.
+The run is compared with a baseline (the previous commit's results by
+default) and throughput, memory or accuracy regressions are flagged.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from extractor_registry import EXTRACTORS, SCRAPING_DIR, load_extractor
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+CORPUS_DIR = BENCHMARK_DIR / 'corpus'
+GOLDEN_DIR = BENCHMARK_DIR / 'golden'
+RESULTS_DIR = BENCHMARK_DIR / 'results'
+
+# Fields that legitimately differ between runs
+VOLATILE_FIELDS = {'scraped_at'}
+
+# Regression thresholds against the baseline
+SPEED_TOLERANCE = 0.10      # pages/sec may drop by up to 10%
+MEMORY_TOLERANCE = 0.20     # peak memory may grow by up to 20%
+ACCURACY_TOLERANCE = 0.005  # recall/precision may drop by up to 0.5 points
+
+HISTORY_COLUMNS = ['timestamp', 'commit', 'dirty', 'extractor', 'pages', 'errors', 'pages_per_sec',
+                   'p95_ms', 'peak_mb', 'recall', 'precision', 'corpus']
+
+
+def git_revision():
+    """Short commit hash and whether the extractors differ from it"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRAPING_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--', '.'], cwd=SCRAPING_DIR,
+                                capture_output=True, text=True, check=True).stdout
+        return commit, bool(status.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', True
+
+
+def normalize(value):
+    """String form used for comparison; None for values that count as not captured"""
+    if value is None:
+        return None
+    if isinstance(value, float) and value != value:
+        return None
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value, sort_keys=True, default=str)
+    value = str(value).strip()
+    return value or None
+
+
+def normalize_record(record):
+    normalized = {}
+    for key, value in (record or {}).items():
+        if key in VOLATILE_FIELDS:
+            continue
+        value = normalize(value)
+        if value is not None:
+            normalized[key] = value
+    return normalized
+
+
+def load_corpus(name):
+    index_file = CORPUS_DIR / name / 'index.csv'
+    if not index_file.exists():
+        return None, None
+
+    index = pd.read_csv(index_file, dtype=str, keep_default_na=False, encoding='utf-8')
+    pages = []
+    for row in index.itertuples(index=False):
+        html = (CORPUS_DIR / name / f"{row.url_hash}.html").read_text(encoding='utf-8', errors='ignore')
+        pages.append((row.url_hash, row.url, row.s3_key, html))
+
+    # The corpus identity is its pages and their content; results are only
+    # compared between runs over the same corpus
+    fingerprint = hashlib.sha256(
+        '\n'.join(f"{row.url_hash}:{row.etag}" for row in index.itertuples(index=False)).encode()
+    ).hexdigest()[:12]
+    return pages, fingerprint
+
+
+def load_golden(name):
+    golden_file = GOLDEN_DIR / f"{name}.jsonl"
+    if not golden_file.exists():
+        return None
+    golden = {}
+    with open(golden_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                golden[entry['url_hash']] = entry['fields']
+    return golden
+
+
+def save_golden(name, outputs):
+    GOLDEN_DIR.mkdir(parents=True, exist_ok=True)
+    with open(GOLDEN_DIR / f"{name}.jsonl", 'w', encoding='utf-8') as f:
+        for url_hash in sorted(outputs):
+            f.write(json.dumps({'url_hash': url_hash, 'fields': outputs[url_hash]}, sort_keys=True) + '\n')
+
+
+def score_accuracy(outputs, golden):
+    """Field-level comparison of extracted records against golden records"""
+    matched = changed = missing = extra = 0
+    field_errors = {}
+
+    for url_hash, expected in golden.items():
+        actual = outputs.get(url_hash, {})
+        for field, value in expected.items():
+            if field not in actual:
+                missing += 1
+            elif actual[field] != value:
+                changed += 1
+            else:
+                matched += 1
+                continue
+            field_errors[field] = field_errors.get(field, 0) + 1
+        for field in actual.keys() - expected.keys():
+            extra += 1
+            field_errors[field] = field_errors.get(field, 0) + 1
+
+    golden_fields = matched + changed + missing
+    produced_fields = matched + changed + extra
+    return {
+        'golden_fields': golden_fields,
+        'matched': matched,
+        'changed': changed,
+        'missing': missing,
+        'extra': extra,
+        'recall': matched / golden_fields if golden_fields else None,
+        'precision': matched / produced_fields if produced_fields else None,
+        'worst_fields': sorted(field_errors.items(), key=lambda kv: kv[1], reverse=True)[:10]
+    }
+
+
+def benchmark_extractor(name, pages, repeat=3):
+    extract = load_extractor(name)
+
+    # Warm-up: first-call costs (lazy imports, regex compilation) are not throughput
+    url_hash, url, key, html = pages[0]
+    try:
+        extract(html, url, key)
+    except Exception:
+        pass
+
+    # Timed passes - keep the fastest to damp scheduler noise
+    best_total = None
+    best_times = None
+    errors = 0
+    for _ in range(repeat):
+        times = []
+        errors = 0
+        for url_hash, url, key, html in pages:
+            start = time.perf_counter()
+            try:
+                extract(html, url, key)
+            except Exception:
+                errors += 1
+            times.append(time.perf_counter() - start)
+        total = sum(times)
+        if best_total is None or total < best_total:
+            best_total, best_times = total, times
+
+    # Memory pass - tracemalloc slows extraction, so it is kept out of the timing
+    outputs = {}
+    peaks = []
+    tracemalloc.start()
+    for url_hash, url, key, html in pages:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        try:
+            outputs[url_hash] = normalize_record(extract(html, url, key))
+        except Exception as e:
+            logger.warning(f"{name}: extraction failed for {url_hash}: {e}")
+            outputs[url_hash] = {}
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    times_ms = sorted(t * 1000 for t in best_times)
+    return {
+        'pages': len(pages),
+        'errors': errors,
+        'pages_per_sec': len(pages) / best_total if best_total else 0.0,
+        'mean_ms': sum(times_ms) / len(times_ms),
+        'p95_ms': times_ms[min(len(times_ms) - 1, int(len(times_ms) * 0.95))],
+        'peak_mb': max(peaks) / (1024 ** 2),
+        'mean_html_kb': sum(len(p[3]) for p in pages) / len(pages) / 1024
+    }, outputs
+
+
+def find_baseline(commit, baseline=None):
+    """Results of an explicit baseline commit, or the latest run of another commit"""
+    if baseline:
+        path = RESULTS_DIR / f"{baseline}.json"
+        if not path.exists():
+            logger.warning(f"No results for baseline {baseline}")
+            return None
+        return json.loads(path.read_text(encoding='utf-8'))
+
+    candidates = []
+    for path in RESULTS_DIR.glob('*.json'):
+        result = json.loads(path.read_text(encoding='utf-8'))
+        if result['commit'] != commit:
+            candidates.append(result)
+    return max(candidates, key=lambda r: r['timestamp']) if candidates else None
+
+
+def compare(current, baseline):
+    """Regression messages per extractor, for extractors benchmarked on the same corpus"""
+    regressions = {}
+    for name, metrics in current['extractors'].items():
+        before = baseline['extractors'].get(name)
+        if not before or before['corpus'] != metrics['corpus']:
+            continue
+
+        found = []
+        if metrics['pages_per_sec'] < before['pages_per_sec'] * (1 - SPEED_TOLERANCE):
+            found.append(f"pages/sec {before['pages_per_sec']:.1f} -> {metrics['pages_per_sec']:.1f}")
+        if metrics['peak_mb'] > before['peak_mb'] * (1 + MEMORY_TOLERANCE):
+            found.append(f"peak MB {before['peak_mb']:.1f} -> {metrics['peak_mb']:.1f}")
+        for metric in ('recall', 'precision'):
+            if metrics.get(metric) is not None and before.get(metric) is not None \
+                    and metrics[metric] < before[metric] - ACCURACY_TOLERANCE:
+                found.append(f"{metric} {before[metric]:.3f} -> {metrics[metric]:.3f}")
+        if metrics['errors'] > before['errors']:
+            found.append(f"errors {before['errors']} -> {metrics['errors']}")
+
+        if found:
+            regressions[name] = found
+    return regressions
+
+
+def write_report(result, baseline, regressions):
+    fmt = lambda v: f"{v:.3f}" if v is not None else "n/a"
+    lines = [
+        "# Extractor Benchmark Report",
+        "",
+        f"**Generated:** {datetime.now().strftime('%B %d, %Y at %H:%M:%S')}  ",
+        f"**Commit:** {result['commit']}{' (uncommitted changes)' if result['dirty'] else ''}  ",
+        f"**Baseline:** {baseline['commit'] if baseline else 'none'}  ",
+        "**Logic designed by Amazon Q, verified by Shannon Goddard.**",
+        "",
+        "## Results",
+        "",
+        "| Extractor | Pages | Errors | Pages/sec | Mean ms | p95 ms | Peak MB | Recall | Precision |",
+        "|---|---|---|---|---|---|---|---|---|"
+    ]
+    for name, m in sorted(result['extractors'].items()):
+        lines.append(
+            f"| {name} | {m['pages']} | {m['errors']} | {m['pages_per_sec']:.1f} | {m['mean_ms']:.1f} | "
+            f"{m['p95_ms']:.1f} | {m['peak_mb']:.1f} | {fmt(m.get('recall'))} | {fmt(m.get('precision'))} |"
+        )
+
+    lines += ["", "## Regressions", ""]
+    if regressions:
+        for name, found in sorted(regressions.items()):
+            lines.append(f"- **{name}:** {'; '.join(found)}")
+    else:
+        lines.append("None against baseline." if baseline else "No baseline to compare against.")
+
+    inaccurate = {n: m for n, m in result['extractors'].items() if m.get('worst_fields')}
+    if inaccurate:
+        lines += ["", "## Fields Differing From Golden", ""]
+        for name, m in sorted(inaccurate.items()):
+            lines.append(f"- **{name}:** " + ', '.join(f"{field} ({count})" for field, count in m['worst_fields']))
+
+    report_file = RESULTS_DIR / 'benchmark_report.md'
+    report_file.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return report_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark extractors against the offline golden corpus')
+    parser.add_argument('--extractor', action='append', choices=sorted(EXTRACTORS),
+                        help='Extractor to benchmark (repeatable); default all with a corpus')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed passes per extractor (fastest is kept)')
+    parser.add_argument('--baseline', help='Commit to compare against; default the latest other commit')
+    parser.add_argument('--update-golden', action='store_true',
+                        help='Write current outputs as the golden records (review the diff before committing)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit non-zero if regressions are found')
+    args = parser.parse_args()
+
+    commit, dirty = git_revision()
+    result = {
+        'commit': commit,
+        'dirty': dirty,
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.node(),
+        'extractors': {}
+    }
+
+    for name in args.extractor or list(EXTRACTORS):
+        pages, fingerprint = load_corpus(name)
+        if not pages:
+            logger.warning(f"{name}: no corpus - run build_corpus.py --extractor {name}")
+            continue
+
+        logger.info(f"{name}: benchmarking {len(pages)} pages")
+        metrics, outputs = benchmark_extractor(name, pages, args.repeat)
+        metrics['corpus'] = fingerprint
+
+        if args.update_golden:
+            save_golden(name, outputs)
+            logger.info(f"{name}: golden records updated")
+
+        golden = load_golden(name)
+        if golden is not None:
+            metrics.update(score_accuracy(outputs, golden))
+
+        result['extractors'][name] = metrics
+        logger.info(f"{name}: {metrics['pages_per_sec']:.1f} pages/sec, peak {metrics['peak_mb']:.1f} MB, "
+                    f"recall {metrics.get('recall')}")
+
+    if not result['extractors']:
+        logger.error("Nothing benchmarked - build the corpus first")
+        return 1
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    baseline = find_baseline(commit, args.baseline)
+    regressions = compare(result, baseline) if baseline else {}
+
+    (RESULTS_DIR / f"{commit}.json").write_text(json.dumps(result, indent=2), encoding='utf-8')
+
+    history_file = RESULTS_DIR / 'history.csv'
+    new_history = not history_file.exists()
+    with open(history_file, 'a', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=HISTORY_COLUMNS, extrasaction='ignore')
+        if new_history:
+            writer.writeheader()
+        for name, metrics in result['extractors'].items():
+            rounded = {k: round(v, 4) if isinstance(v, float) else v for k, v in metrics.items()}
+            writer.writerow({'timestamp': result['timestamp'], 'commit': commit, 'dirty': dirty,
+                             'extractor': name, **rounded})
+
+    report_file = write_report(result, baseline, regressions)
+    logger.info(f"Report saved to {report_file}")
+
+    for name, found in regressions.items():
+        logger.warning(f"REGRESSION {name}: {'; '.join(found)}")
+
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Checkpointed Result Writer for Maximum Extraction Runs
+Streams strain rows to chunked CSV parts with an incremental extraction manifest
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Each extractor used to hold every strain dict in memory and write the
+*_maximum_extraction.csv only after the last page. The writer flushes rows
+every `chunk_size` documents into <output>_parts/part-NNNNN.csv and records,
+per url_hash, the part holding its row, the HTML content hash (S3 ETag) and
+the extractor version that produced it. A restarted run skips documents that
+are already current; a document whose HTML changed or whose extractor was
+bumped is re-extracted and its new row supersedes the old one when the
+parts are combined. Delete the _parts folder to force a full re-extraction.
+
+With sparse_prefixes set, meta_*/spec_* fields are kept out of the core rows
+and written as long-format attribute parts with dictionary-encoded keys
+(see sparse_attributes.py).
+"""
+
+import json
+import os
+import csv
+import hashlib
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+from sparse_attributes import ATTRIBUTE_COLUMNS, KEY_COLUMNS, attributes_file, keys_file, split_sparse
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+
+# Per-row fields the extraction reports read; load() leaves the other (wide) columns on disk
+REPORT_COLUMNS = frozenset({
+    'strain_name', 'market_tier', 'data_completeness_score', 'quality_score', 'total_fields_captured',
+    'jsonld_price', 'thc_min', 'thc_content', 'cbd_min', 'cbd_content', 'flowering_time', 'yield_range',
+    'yield_amount', 'genetics_lineage', 'effects_all', 'terpenes', 'flavors_all', 'awards',
+    'product_images', 'strain_images',
+})
+REPORT_PREFIXES = ('prices_',)
+
+
+def extractor_version(source_file, declared_version):
+    """Declared extraction_version plus a fingerprint of the extractor source.
+
+    Any edit to the extractor (one regex tweak included) changes the
+    fingerprint, so its documents are re-extracted without a manual bump.
+    """
+    with open(source_file, 'rb') as f:
+        fingerprint = hashlib.sha256(f.read()).hexdigest()[:12]
+    return f"{declared_version}+{fingerprint}"
+
+
+class CheckpointWriter:
+    def __init__(self, output_file, chunk_size=250, stats=None, version=None, sparse_prefixes=None):
+        self.output_file = Path(output_file)
+        self.parts_dir = self.output_file.with_name(f"{self.output_file.stem}_parts")
+        self.manifest_file = self.parts_dir / MANIFEST_NAME
+        self.chunk_size = chunk_size
+        self.stats = stats if stats is not None else {}
+        self.version = version
+        self.sparse_prefixes = tuple(sparse_prefixes) if sparse_prefixes else None
+
+        self.buffer = []
+        self.buffer_entries = []
+        self.buffer_attributes = []
+
+        self.parts_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+        # Rebuild extraction counters from current documents so reports cover the
+        # whole output, not just pages extracted in this session
+        for entry in self.manifest['completed'].values():
+            for key, count in entry.get('stats', {}).items():
+                self.stats[key] = self.stats.get(key, 0) + count
+        self._last_stats = dict(self.stats)
+
+        if self.manifest['completed']:
+            logger.info(f"Loaded extraction manifest: {len(self.manifest['completed'])} documents on record")
+
+    def _load_manifest(self):
+        if not self.manifest_file.exists():
+            return {'output_file': self.output_file.name, 'next_part': 0, 'parts': {}, 'completed': {}, 'keys': {}}
+
+        with open(self.manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        # Older checkpoints stored only the part name per url_hash
+        manifest['completed'] = {
+            url_hash: entry if isinstance(entry, dict) else {'part': entry}
+            for url_hash, entry in manifest['completed'].items()
+        }
+        manifest.setdefault('next_part', len(manifest['parts']))
+        manifest.setdefault('keys', {})
+        manifest.pop('stats', None)
+        return manifest
+
+    def _save_manifest(self):
+        # Write-then-rename so a crash mid-save never corrupts the manifest
+        tmp_file = self.manifest_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_file, self.manifest_file)
+
+    def is_complete(self, url_hash, content_hash=None):
+        """True if this document's row is current for its HTML and this extractor version"""
+        entry = self.manifest['completed'].get(url_hash)
+        if entry is None:
+            return False
+        if content_hash is not None and entry.get('content_hash') != content_hash:
+            return False
+        if self.version is not None and entry.get('version') != self.version:
+            return False
+        return True
+
+    @property
+    def completed_count(self):
+        return len(self.manifest['completed']) + len(self.buffer)
+
+    @property
+    def key_count(self):
+        return len(self.manifest['keys'])
+
+    def _key_id(self, key):
+        # Dictionary-encode sparse keys; ids are stable across runs via the manifest
+        key_id = self.manifest['keys'].get(key)
+        if key_id is None:
+            key_id = len(self.manifest['keys'])
+            self.manifest['keys'][key] = key_id
+        return key_id
+
+    def _attributes_part(self, part_name):
+        return self.parts_dir / part_name.replace('.csv', '_attributes.csv')
+
+    def write(self, url_hash, strain_data, content_hash=None):
+        """Buffer one extracted strain; flush a part once the chunk is full"""
+        # Counters this document added, so they can be dropped if it is superseded
+        stats_delta = {
+            key: value - self._last_stats.get(key, 0)
+            for key, value in self.stats.items()
+            if isinstance(value, (int, float)) and value != self._last_stats.get(key, 0)
+        }
+        self._last_stats = dict(self.stats)
+
+        if self.sparse_prefixes:
+            strain_data, sparse = split_sparse(strain_data, self.sparse_prefixes)
+            strain_data['url_hash'] = url_hash
+            self.buffer_attributes.extend(
+                (url_hash, self._key_id(key), value) for key, value in sparse.items()
+            )
+
+        self.buffer.append(strain_data)
+        self.buffer_entries.append((url_hash, {
+            'content_hash': content_hash,
+            'version': self.version,
+            'stats': stats_delta
+        }))
+
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows as the next part and checkpoint the manifest"""
+        if not self.buffer:
+            return
+
+        part_name = f"part-{self.manifest['next_part']:05d}.csv"
+        pd.DataFrame(self.buffer).to_csv(self.parts_dir / part_name, index=False, encoding='utf-8')
+        if self.buffer_attributes:
+            pd.DataFrame(self.buffer_attributes, columns=ATTRIBUTE_COLUMNS).to_csv(
+                self._attributes_part(part_name), index=False, encoding='utf-8')
+
+        self.manifest['next_part'] += 1
+        self.manifest['parts'][part_name] = [url_hash for url_hash, _ in self.buffer_entries]
+        for url_hash, entry in self.buffer_entries:
+            previous = self.manifest['completed'].get(url_hash)
+            if previous:
+                # Re-extracted document - its old row and counters are superseded
+                for key, count in previous.get('stats', {}).items():
+                    self.stats[key] = self.stats.get(key, 0) - count
+            entry['part'] = part_name
+            self.manifest['completed'][url_hash] = entry
+        self._last_stats = dict(self.stats)
+        self._save_manifest()
+
+        logger.info(f"Checkpoint: {part_name} ({len(self.buffer)} rows, {len(self.manifest['completed'])} documents)")
+        self.buffer = []
+        self.buffer_entries = []
+        self.buffer_attributes = []
+
+    def _live_rows(self, part_name):
+        """Row mask for a part: False where the document was re-extracted into a later part"""
+        return [
+            self.manifest['completed'].get(url_hash, {}).get('part') == part_name
+            for url_hash in self.manifest['parts'][part_name]
+        ]
+
+    def finalize(self):
+        """Flush remaining rows and merge all current rows into the main output CSV"""
+        self.flush()
+
+        # Drop parts whose rows have all been superseded
+        for part_name in list(self.manifest['parts']):
+            if not any(self._live_rows(part_name)):
+                (self.parts_dir / part_name).unlink(missing_ok=True)
+                self._attributes_part(part_name).unlink(missing_ok=True)
+                del self.manifest['parts'][part_name]
+        self._save_manifest()
+
+        part_names = list(self.manifest['parts'])
+
+        # Union of columns in first-seen order, read from part headers only
+        columns = []
+        seen = set()
+        for part_name in part_names:
+            with open(self.parts_dir / part_name, 'r', encoding='utf-8', newline='') as f:
+                header = next(csv.reader(f), [])
+            for col in header:
+                if col not in seen:
+                    seen.add(col)
+                    columns.append(col)
+
+        tmp_output = self.output_file.with_suffix('.tmp')
+        pd.DataFrame(columns=columns).to_csv(tmp_output, index=False, encoding='utf-8')
+        for part_name in part_names:
+            # Keep values as written - no dtype inference between part and output
+            part = pd.read_csv(self.parts_dir / part_name, dtype=str, keep_default_na=False, encoding='utf-8')
+            part = part[self._live_rows(part_name)]
+            part.reindex(columns=columns).to_csv(tmp_output, mode='a', header=False, index=False, encoding='utf-8')
+        os.replace(tmp_output, self.output_file)
+
+        logger.info(f"Merged {len(part_names)} parts into {self.output_file} ({len(columns)} columns)")
+
+        if self.sparse_prefixes:
+            self._finalize_attributes(part_names)
+        return self.output_file
+
+    def _finalize_attributes(self, part_names):
+        """Merge current attribute rows and write the key dictionary with document counts"""
+        output = attributes_file(self.output_file)
+        tmp_output = output.with_suffix('.tmp')
+        pd.DataFrame(columns=ATTRIBUTE_COLUMNS).to_csv(tmp_output, index=False, encoding='utf-8')
+
+        doc_counts = {}
+        for part_name in part_names:
+            part_file = self._attributes_part(part_name)
+            if not part_file.exists():
+                continue
+            attrs = pd.read_csv(part_file, dtype=str, keep_default_na=False, encoding='utf-8')
+            owner = attrs['url_hash'].map(lambda h: self.manifest['completed'].get(h, {}).get('part'))
+            attrs = attrs[owner == part_name]
+            for key_id, count in attrs['key_id'].value_counts().items():
+                doc_counts[int(key_id)] = doc_counts.get(int(key_id), 0) + int(count)
+            attrs.to_csv(tmp_output, mode='a', header=False, index=False, encoding='utf-8')
+        os.replace(tmp_output, output)
+
+        keys = pd.DataFrame(
+            [(key_id, key, doc_counts.get(key_id, 0)) for key, key_id in self.manifest['keys'].items()],
+            columns=KEY_COLUMNS
+        )
+        keys[keys['doc_count'] > 0].sort_values('key_id').to_csv(keys_file(self.output_file), index=False, encoding='utf-8')
+
+        logger.info(f"Sparse attributes: {sum(doc_counts.values())} values across {len(doc_counts)} keys in {output}")
+
+    def load(self, columns=REPORT_COLUMNS, prefixes=REPORT_PREFIXES):
+        """Report view of the combined output: only the named/prefixed columns, read in chunks
+
+        columns=None loads every column. attrs['columns'] lists all columns of the
+        output file, for column counts and inventories.
+        """
+        if not self.output_file.exists() or not self.manifest['parts']:
+            df = pd.DataFrame()
+            df.attrs['columns'] = []
+            return df
+
+        with open(self.output_file, 'r', encoding='utf-8', newline='') as f:
+            all_columns = next(csv.reader(f), [])
+        keep = all_columns if columns is None else [
+            col for col in all_columns if col in columns or col.startswith(prefixes)
+        ]
+        chunks = list(pd.read_csv(self.output_file, encoding='utf-8', usecols=keep,
+                                  chunksize=self.chunk_size * 4, low_memory=False))
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=keep)
+        df.attrs['columns'] = all_columns
+        return df
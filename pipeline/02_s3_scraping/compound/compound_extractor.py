@@ -10,6 +10,11 @@ import pandas as pd
 import re
 from bs4 import BeautifulSoup
 import logging
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '03_s3_inventory', 'scripts'))
+from seed_bank_classifier import bank_mask
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -85,7 +90,7 @@ class CompoundExtractor:
         logger.info("Loading S3 inventory...")
         
         inv = pd.read_csv('c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/03_s3_inventory/s3_html_inventory.csv')
-        compound = inv[inv['url'].str.contains('compound-genetics', na=False)]
+        compound = inv[bank_mask(inv['url'], 'compound')]
         logger.info(f"Found {len(compound)} Compound strains")
         
         for idx, row in compound.iterrows():
@@ -13,10 +13,23 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 from urllib.parse import urlparse
 import logging
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from checkpoint_writer import CheckpointWriter, extractor_version
+from method_profiler import MethodProfiler
+from sparse_attributes import SPARSE_PREFIXES
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '03_s3_inventory', 'scripts'))
+from seed_bank_classifier import bank_mask
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Bump on logic changes; the manifest also fingerprints this file's source
+EXTRACTION_VERSION = '2.0'
+
 class GreatLakesGeneticsMaxExtractor:
     def __init__(self, s3_bucket='ci-strains-html-archive'):
         self.s3 = boto3.client('s3')
@@ -25,6 +38,7 @@ class GreatLakesGeneticsMaxExtractor:
             'json_ld': 0, 'meta_tags': 0, 'tables': 0, 'pricing': 0,
             'cannabis_data': 0, 'images': 0, 'awards': 0, 'genetics': 0
         }
+        self.profiler = MethodProfiler()
         
     def extract_json_ld_data(self, soup):
         data = {}
@@ -407,7 +421,7 @@ class GreatLakesGeneticsMaxExtractor:
             'source_url': url,
             'scraped_at': datetime.now().isoformat(),
             'url_domain': urlparse(url).netloc,
-            'extraction_version': '2.0'
+            'extraction_version': EXTRACTION_VERSION
         }
         
         extraction_methods = [
@@ -426,10 +440,12 @@ class GreatLakesGeneticsMaxExtractor:
         
         for method_name, method_func in extraction_methods:
             try:
-                if 'url' in method_func.__code__.co_varnames:
-                    method_data = method_func(soup, url)
-                else:
-                    method_data = method_func(soup)
+                with self.profiler.measure(method_name, url) as probe:
+                    if 'url' in method_func.__code__.co_varnames:
+                        method_data = method_func(soup, url)
+                    else:
+                        method_data = method_func(soup)
+                    probe['fields'] = len(method_data) if method_data else 0
                 
                 if method_data:
                     strain_data.update(method_data)
@@ -466,24 +482,27 @@ class GreatLakesGeneticsMaxExtractor:
         df = pd.read_csv('../../01_html_collection/original_html_collection/data/unique_urls.csv', encoding='latin-1')
         logger.info("Loaded URL mapping from local file")
         
-        great_lakes_genetics_urls = df[df['url'].str.contains('greatlakesgenetics', na=False)]
+        great_lakes_genetics_urls = df[bank_mask(df['url'], 'great_lakes_genetics')]
         logger.info(f"Found {len(great_lakes_genetics_urls)} Great Lakes Genetics URLs")
         
         logger.info("Scanning S3 for available HTML files...")
         paginator = self.s3.get_paginator('list_objects_v2')
         page_iterator = paginator.paginate(Bucket=self.bucket, Prefix='html/')
         
-        available_hashes = set()
+        available_hashes = {}
         for page in page_iterator:
             if 'Contents' in page:
                 for obj in page['Contents']:
                     if obj['Key'].endswith('.html'):
                         hash_id = obj['Key'].split('/')[-1].replace('.html', '')
-                        available_hashes.add(hash_id)
+                        available_hashes[hash_id] = obj['ETag'].strip('"')
         
         logger.info(f"Found {len(available_hashes)} HTML files in S3")
         
-        all_strains = []
+        output_file = 'great_lakes_genetics_maximum_extraction.csv'
+        writer = CheckpointWriter(output_file, stats=self.extraction_stats,
+                                  version=extractor_version(__file__, EXTRACTION_VERSION),
+                                  sparse_prefixes=SPARSE_PREFIXES)
         processed = 0
         
         for idx, row in great_lakes_genetics_urls.iterrows():
@@ -493,13 +512,17 @@ class GreatLakesGeneticsMaxExtractor:
             if url_hash not in available_hashes:
                 continue
             
+            # Skip documents whose HTML and extractor are unchanged since the last run
+            if writer.is_complete(url_hash, available_hashes[url_hash]):
+                continue
+            
             try:
                 html_key = f'html/{url_hash}.html'
                 response = self.s3.get_object(Bucket=self.bucket, Key=html_key)
                 html_content = response['Body'].read().decode('utf-8')
                 
                 strain_data = self.maximum_extraction_pipeline(html_content, url)
-                all_strains.append(strain_data)
+                writer.write(url_hash, strain_data, available_hashes[url_hash])
                 
                 processed += 1
                 if processed % 5 == 0:
@@ -509,16 +532,16 @@ class GreatLakesGeneticsMaxExtractor:
                 logger.error(f"Error processing {url}: {e}")
                 continue
         
-        df_results = pd.DataFrame(all_strains)
-        
-        output_file = 'great_lakes_genetics_maximum_extraction.csv'
-        df_results.to_csv(output_file, index=False, encoding='utf-8')
+        # Combine checkpointed parts into the main dataset
+        writer.finalize()
+        df_results = writer.load()
         
         self.generate_extraction_report(df_results, output_file)
+        self.profiler.save(output_file.replace('.csv', '_method_profile.csv'))
         
-        logger.info(f"Maximum extraction complete! Processed {len(all_strains)} strains")
+        logger.info(f"Maximum extraction complete! Processed {len(df_results)} strains")
         logger.info(f"Dataset saved to: {output_file}")
-        logger.info(f"Total columns captured: {len(df_results.columns)}")
+        logger.info(f"Total columns captured: {len(df_results.attrs['columns'])}")
         
         return df_results
     
@@ -533,7 +556,7 @@ class GreatLakesGeneticsMaxExtractor:
 
 ### Success Metrics
 - **Total Strains Extracted:** {len(df)}
-- **Total Columns Captured:** {len(df.columns)}
+- **Total Columns Captured:** {len(df.attrs['columns'])}
 - **Average Fields per Strain:** {df['total_fields_captured'].mean():.1f}
 - **Maximum Fields Captured:** {df['total_fields_captured'].max()}
 - **Average Quality Score:** {df['data_completeness_score'].mean():.1f}%
@@ -541,6 +564,8 @@ class GreatLakesGeneticsMaxExtractor:
 ### Market Tier Distribution
 {df['market_tier'].value_counts().to_string()}
 
+{self.profiler.report_section()}
+
 ---
 
 **Processing completed with maximum data extraction methodology.**  
@@ -557,7 +582,7 @@ def main():
     df = extractor.process_all_great_lakes_genetics_strains()
     
     print(f"\nGREAT LAKES GENETICS MAXIMUM EXTRACTION COMPLETE!")
-    print(f"Dataset: {len(df)} strains x {len(df.columns)} columns")
+    print(f"Dataset: {len(df)} strains x {len(df.attrs['columns'])} columns")
     print(f"Average Quality: {df['data_completeness_score'].mean():.1f}%")
     print(f"Market Tiers: {df['market_tier'].value_counts().to_dict()}")
     print(f"Top Quality: {df['data_completeness_score'].max():.1f}%")
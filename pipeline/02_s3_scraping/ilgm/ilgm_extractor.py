@@ -10,6 +10,11 @@ import re
 import json
 from bs4 import BeautifulSoup
 import logging
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '03_s3_inventory', 'scripts'))
+from seed_bank_classifier import bank_mask
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -93,7 +98,7 @@ class ILGMExtractor:
         logger.info("Loading S3 inventory...")
         
         inv = pd.read_csv('c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/03_s3_inventory/s3_html_inventory.csv', encoding='latin-1')
-        ilgm = inv[inv['url'].str.contains('ilgm.com', na=False)]
+        ilgm = inv[bank_mask(inv['url'], 'ilgm')]
         logger.info(f"Found {len(ilgm)} ILGM strains")
         
         for idx, row in ilgm.iterrows():
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Per-Method Profiler for the Maximum Extraction Pipeline
+Records wall time, allocation and field yield for every extraction method on every document
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+extraction_stats only counts successes per method. The profiler adds the
+cost side: how long each of the eight passes takes, how much it allocates
+and how many fields it contributes, so unprofitable passes can be dropped
+per seed bank. Allocation tracking uses tracemalloc, which slows extraction
+noticeably - enable it with PROFILE_ALLOCATIONS=1 for profiling runs only.
+"""
+
+import os
+import csv
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+# A method is flagged when its share of extraction time is this many times
+# larger than its share of captured fields
+COST_FLAG_RATIO = 2.0
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class MethodProfiler:
+    def __init__(self, track_allocations=None):
+        if track_allocations is None:
+            track_allocations = os.environ.get('PROFILE_ALLOCATIONS') == '1'
+        self.track_allocations = track_allocations
+
+        # method -> list of (url, seconds, allocated_bytes, fields)
+        self.samples = defaultdict(list)
+
+    @contextmanager
+    def measure(self, method_name, url=None):
+        """Time one extraction method call; set probe['fields'] inside the block"""
+        probe = {'fields': 0}
+
+        if self.track_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            yield probe
+        finally:
+            elapsed = time.perf_counter() - start
+            allocated = tracemalloc.get_traced_memory()[1] - baseline if self.track_allocations else 0
+            self.samples[method_name].append((url, elapsed, allocated, probe['fields']))
+
+    def summary(self):
+        """Aggregate samples into one row of statistics per method"""
+        total_time = sum(s[1] for samples in self.samples.values() for s in samples) or 1e-9
+        total_fields = sum(s[3] for samples in self.samples.values() for s in samples) or 1
+
+        rows = []
+        for method_name, samples in self.samples.items():
+            times_ms = sorted(s[1] * 1000 for s in samples)
+            allocs_kb = sorted(s[2] / 1024 for s in samples)
+            fields = sum(s[3] for s in samples)
+            method_time = sum(times_ms) / 1000
+
+            time_share = method_time / total_time
+            field_share = fields / total_fields
+            cost_ratio = time_share / field_share if field_share else float('inf')
+
+            rows.append({
+                'method': method_name,
+                'calls': len(samples),
+                'hit_rate': sum(1 for s in samples if s[3]) / len(samples) * 100,
+                'fields_per_doc': fields / len(samples),
+                'p50_ms': percentile(times_ms, 50),
+                'p95_ms': percentile(times_ms, 95),
+                'p99_ms': percentile(times_ms, 99),
+                'total_s': method_time,
+                'p95_alloc_kb': percentile(allocs_kb, 95),
+                'time_share': time_share * 100,
+                'field_share': field_share * 100,
+                'ms_per_field': sum(times_ms) / fields if fields else float('inf'),
+                'flagged': cost_ratio >= COST_FLAG_RATIO
+            })
+
+        return sorted(rows, key=lambda r: r['total_s'], reverse=True)
+
+    def report_section(self):
+        """Markdown section for generate_extraction_report"""
+        rows = self.summary()
+        if not rows:
+            return "## Method Profile\nNo documents extracted in this run."
+
+        alloc_note = "" if self.track_allocations else " (allocation tracking off - set PROFILE_ALLOCATIONS=1)"
+        lines = [
+            "## Method Profile",
+            f"Documents profiled this run: {rows[0]['calls']}{alloc_note}",
+            "",
+            "| Method | Hit Rate | Fields/Doc | p50 ms | p95 ms | p99 ms | Total s | p95 Alloc KB | Time % | Field % | Flag |",
+            "|---|---|---|---|---|---|---|---|---|---|---|"
+        ]
+        for r in rows:
+            flag = "HIGH COST" if r['flagged'] else ""
+            lines.append(
+                f"| {r['method']} | {r['hit_rate']:.1f}% | {r['fields_per_doc']:.1f} | {r['p50_ms']:.2f} | "
+                f"{r['p95_ms']:.2f} | {r['p99_ms']:.2f} | {r['total_s']:.2f} | {r['p95_alloc_kb']:.0f} | "
+                f"{r['time_share']:.1f}% | {r['field_share']:.1f}% | {flag} |"
+            )
+
+        flagged = [r['method'] for r in rows if r['flagged']]
+        if flagged:
+            lines.append("")
+            lines.append(f"**Flagged (time share >= {COST_FLAG_RATIO:.0f}x field share):** {', '.join(flagged)}")
+        return '\n'.join(lines)
+
+    def save(self, output_file):
+        """Write raw per-document, per-method samples for offline analysis"""
+        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['source_url', 'method', 'wall_ms', 'allocated_kb', 'fields'])
+            for method_name, samples in self.samples.items():
+                for url, elapsed, allocated, fields in samples:
+                    writer.writerow([url, method_name, round(elapsed * 1000, 3), round(allocated / 1024, 1), fields])
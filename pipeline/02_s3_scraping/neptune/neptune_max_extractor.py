@@ -14,11 +14,24 @@ from urllib.parse import urljoin, urlparse
 import logging
 from datetime import datetime
 from typing import Dict, List, Any, Optional
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from checkpoint_writer import CheckpointWriter, extractor_version
+from method_profiler import MethodProfiler
+from sparse_attributes import SPARSE_PREFIXES
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '03_s3_inventory', 'scripts'))
+from seed_bank_classifier import bank_mask
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Bump on logic changes; the manifest also fingerprints this file's source
+EXTRACTION_VERSION = '1.0'
+
 class NeptuneMaxExtractor:
     def __init__(self):
         self.s3_client = boto3.client('s3')
@@ -32,6 +45,7 @@ class NeptuneMaxExtractor:
             'cannabis_data': 0, 'images': 0, 'awards': 0, 'genetics': 0,
             'total_processed': 0, 'successful_extractions': 0, 'failed_extractions': 0
         }
+        self.profiler = MethodProfiler()
     
     def extract_json_ld_data(self, soup):
         """Extract structured JSON-LD data - Premium business intelligence"""
@@ -653,7 +667,7 @@ class NeptuneMaxExtractor:
             'source_url': url,
             'scraped_at': datetime.now().isoformat(),
             'url_domain': urlparse(url).netloc,
-            'extraction_version': '1.0'
+            'extraction_version': EXTRACTION_VERSION
         }
         
         # Apply all extraction methods
@@ -672,10 +686,12 @@ class NeptuneMaxExtractor:
         
         for method_name, method_func in extraction_methods:
             try:
-                if 'url' in method_func.__code__.co_varnames:
-                    method_data = method_func(soup, url)
-                else:
-                    method_data = method_func(soup)
+                with self.profiler.measure(method_name, url) as probe:
+                    if 'url' in method_func.__code__.co_varnames:
+                        method_data = method_func(soup, url)
+                    else:
+                        method_data = method_func(soup)
+                    probe['fields'] = len(method_data) if method_data else 0
                 
                 if method_data:
                     strain_data.update(method_data)
@@ -735,7 +751,7 @@ class NeptuneMaxExtractor:
             logger.warning(f"S3 mapping failed, using local file: {e}")
             df = pd.read_csv('../../01_html_collection/data/unique_urls.csv', encoding='latin-1')
         
-        neptune_urls = df[df['url'].str.contains('neptuneseedbank', na=False)]
+        neptune_urls = df[bank_mask(df['url'], 'neptune')]
         
         if limit:
             neptune_urls = neptune_urls.head(limit)
@@ -747,18 +763,21 @@ class NeptuneMaxExtractor:
         paginator = self.s3_client.get_paginator('list_objects_v2')
         page_iterator = paginator.paginate(Bucket=self.bucket_name, Prefix='html/')
         
-        available_hashes = set()
+        available_hashes = {}
         for page in page_iterator:
             if 'Contents' in page:
                 for obj in page['Contents']:
                     if obj['Key'].endswith('.html'):
                         hash_id = obj['Key'].split('/')[-1].replace('.html', '')
-                        available_hashes.add(hash_id)
+                        available_hashes[hash_id] = obj['ETag'].strip('"')
         
         logger.info(f"Found {len(available_hashes)} HTML files in S3")
         
         # Process strains
-        all_strains = []
+        output_file = 'neptune_maximum_extraction.csv'
+        writer = CheckpointWriter(output_file, stats=self.extraction_stats,
+                                  version=extractor_version(__file__, EXTRACTION_VERSION),
+                                  sparse_prefixes=SPARSE_PREFIXES)
         processed = 0
         
         for idx, row in neptune_urls.iterrows():
@@ -769,6 +788,10 @@ class NeptuneMaxExtractor:
                 logger.debug(f"HTML not found for {url_hash}")
                 continue
             
+            # Skip documents whose HTML and extractor are unchanged since the last run
+            if writer.is_complete(url_hash, available_hashes[url_hash]):
+                continue
+            
             try:
                 # Get HTML from S3
                 html_key = f'html/{url_hash}.html'
@@ -777,7 +800,7 @@ class NeptuneMaxExtractor:
                 
                 # Extract strain data
                 strain_data = self.maximum_extraction_pipeline(html_content, url)
-                all_strains.append(strain_data)
+                writer.write(url_hash, strain_data, available_hashes[url_hash])
                 
                 processed += 1
                 strain_name = strain_data.get('strain_name') or strain_data.get('jsonld_product_name') or 'Unknown'
@@ -791,19 +814,17 @@ class NeptuneMaxExtractor:
                 logger.error(f"Error processing {url}: {e}")
                 continue
         
-        # Create comprehensive dataset
-        df_results = pd.DataFrame(all_strains)
-        
-        # Save main dataset
-        output_file = 'neptune_maximum_extraction.csv'
-        df_results.to_csv(output_file, index=False, encoding='utf-8')
+        # Combine checkpointed parts into the main dataset
+        writer.finalize()
+        df_results = writer.load()
         
         # Generate summary report
         self.generate_extraction_report(df_results, output_file)
+        self.profiler.save(output_file.replace('.csv', '_method_profile.csv'))
         
-        logger.info(f"Maximum extraction complete! Processed {len(all_strains)} strains")
+        logger.info(f"Maximum extraction complete! Processed {len(df_results)} strains")
         logger.info(f"Dataset saved to: {output_file}")
-        logger.info(f"Total columns captured: {len(df_results.columns)}")
+        logger.info(f"Total columns captured: {len(df_results.attrs['columns'])}")
         
         return df_results
     
@@ -820,7 +841,7 @@ class NeptuneMaxExtractor:
 
 ### Success Metrics
 - **Total Strains Extracted:** {len(df)}
-- **Total Columns Captured:** {len(df.columns)}
+- **Total Columns Captured:** {len(df.attrs['columns'])}
 - **Average Fields per Strain:** {df['total_fields_captured'].mean():.1f}
 - **Maximum Fields Captured:** {df['total_fields_captured'].max()}
 - **Average Quality Score:** {df['data_completeness_score'].mean():.1f}%
@@ -858,12 +879,12 @@ class NeptuneMaxExtractor:
 ## Top Performing Strains (Data Completeness)
 {df.nlargest(10, 'data_completeness_score')[['strain_name', 'data_completeness_score', 'market_tier', 'total_fields_captured']].to_string(index=False)}
 
-## Column Inventory ({len(df.columns)} total)
-{', '.join(sorted(df.columns))}
+## Column Inventory ({len(df.attrs['columns'])} total)
+{', '.join(sorted(df.attrs['columns']))}
 
 ## File Output
 - **Main Dataset:** {output_file}
-- **Total Size:** {len(df)} rows × {len(df.columns)} columns
+- **Total Size:** {len(df)} rows × {len(df.attrs['columns'])} columns
 - **Encoding:** UTF-8
 - **Format:** CSV with headers
 
@@ -881,6 +902,8 @@ Good baseline data - moderate market value
 ### Basic Tier ({sum(1 for _, row in df.iterrows() if row.get('market_tier') == 'Basic')} strains)
 Limited data - entry-level market value
 
+{self.profiler.report_section()}
+
 ---
 
 **Processing completed with enhanced extraction methodology.**  
@@ -918,7 +941,7 @@ Enhanced with Neptune-specific selectors and premium data patterns.
         f.write(methodology)
     
     print(f"\nNEPTUNE SEED BANK EXTRACTION COMPLETE!")
-    print(f"Dataset: {len(df)} strains x {len(df.columns)} columns")
+    print(f"Dataset: {len(df)} strains x {len(df.attrs['columns'])} columns")
     print(f"Average Quality: {df['data_completeness_score'].mean():.1f}%")
     print(f"Market Tiers: {df['market_tier'].value_counts().to_dict()}")
     print(f"Top Quality: {df['data_completeness_score'].max():.1f}%")
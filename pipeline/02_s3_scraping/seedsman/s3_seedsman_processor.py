@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 
 import boto3
-import json
 import pandas as pd
 from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 import logging
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '03_s3_inventory', 'scripts'))
+from generate_inventory import refresh_inventory
+from seed_bank_classifier import bank_mask
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -19,27 +24,15 @@ class S3SeedsmanProcessor:
         self.results = []
         
     def get_seedsman_metadata(self):
-        """Get all metadata files for Seedsman URLs"""
-        logger.info("Fetching Seedsman metadata from S3...")
-        
-        paginator = self.s3_client.get_paginator('list_objects_v2')
-        seedsman_files = []
-        
-        for page in paginator.paginate(Bucket=self.bucket_name, Prefix='metadata/'):
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    try:
-                        # Get metadata file
-                        response = self.s3_client.get_object(Bucket=self.bucket_name, Key=obj['Key'])
-                        metadata = json.loads(response['Body'].read().decode('utf-8'))
-                        
-                        # Check if it's a Seedsman URL
-                        if 'seedsman.com' in metadata.get('url', ''):
-                            seedsman_files.append(metadata)
-                            
-                    except Exception as e:
-                        logger.warning(f"Error processing {obj['Key']}: {e}")
-                        
+        """Get url_hash/url records for all Seedsman URLs"""
+        logger.info("Fetching Seedsman metadata from S3 inventory...")
+        
+        # The shared inventory only re-reads sidecars that are new or changed
+        # since its last refresh, instead of every metadata file on each run
+        inventory, _ = refresh_inventory()
+        seedsman = inventory[bank_mask(inventory['url'], 'seedsman')]
+        seedsman_files = seedsman[['url_hash', 'url']].to_dict('records')
+        
         logger.info(f"Found {len(seedsman_files)} Seedsman files in S3")
         return seedsman_files
     
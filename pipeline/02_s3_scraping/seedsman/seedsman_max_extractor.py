@@ -15,11 +15,25 @@ from pathlib import Path
 import boto3
 from urllib.parse import urljoin, urlparse
 import logging
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from checkpoint_writer import CheckpointWriter, extractor_version
+from method_profiler import MethodProfiler
+from sparse_attributes import SPARSE_PREFIXES
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Bump on logic changes; the manifest also fingerprints this file's source
+EXTRACTION_VERSION = '1.0'
+
+# Spec table labels (seedsman_*) and other tables (table_N_*) vary per page like meta_*/spec_* do
+SEEDSMAN_SPARSE_PREFIXES = SPARSE_PREFIXES + ('seedsman_', 'table_')
+
 class SeedsmanMaxExtractor:
     def __init__(self):
         self.s3_client = boto3.client('s3')
@@ -32,6 +46,7 @@ class SeedsmanMaxExtractor:
             'high': 2.0,     # price, yield, height, effects
             'standard': 1.0  # description, images, basic info
         }
+        self.profiler = MethodProfiler()
         
     def extract_json_ld(self, soup):
         """Method 1: Extract JSON-LD structured data"""
@@ -400,6 +415,39 @@ class SeedsmanMaxExtractor:
         else:
             return 'Basic'
     
+    def extract_from_html(self, html_content, s3_key):
+        """Apply the 8-method pipeline to already-loaded HTML (no S3 access)"""
+        soup = BeautifulSoup(html_content, 'html.parser')
+        
+        # Apply 8-method extraction pipeline
+        strain_data = {'s3_key': s3_key}
+        extraction_methods = [
+            ('JSON-LD', self.extract_json_ld),
+            ('Meta Tags', self.extract_meta_tags),
+            ('Tables', self.extract_tables),
+            ('Pricing', self.extract_pricing),
+            ('Cannabis Data', self.extract_cannabis_data),
+            ('Media Assets', self.extract_media),
+            ('Awards', self.extract_awards),
+            ('Genetics', self.extract_genetics)
+        ]
+        for method_name, method_func in extraction_methods:
+            with self.profiler.measure(method_name, s3_key) as probe:
+                method_data = method_func(soup)
+                probe['fields'] = len(method_data)
+            strain_data.update(method_data)
+        
+        # Calculate quality metrics
+        quality_score = self.calculate_quality_score(strain_data)
+        market_tier = self.classify_market_tier(quality_score, strain_data)
+        
+        strain_data['quality_score'] = quality_score
+        strain_data['market_tier'] = market_tier
+        strain_data['extraction_method'] = '8_method_pipeline'
+        strain_data['field_count'] = len([k for k, v in strain_data.items() if pd.notna(v) and str(v).strip()])
+        
+        return strain_data
+    
     def process_strain(self, s3_key):
         """Process a single strain HTML file"""
         try:
@@ -407,29 +455,7 @@ class SeedsmanMaxExtractor:
             response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
             html_content = response['Body'].read().decode('utf-8', errors='ignore')
             
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Apply 8-method extraction pipeline
-            strain_data = {'s3_key': s3_key}
-            strain_data.update(self.extract_json_ld(soup))
-            strain_data.update(self.extract_meta_tags(soup))
-            strain_data.update(self.extract_tables(soup))
-            strain_data.update(self.extract_pricing(soup))
-            strain_data.update(self.extract_cannabis_data(soup))
-            strain_data.update(self.extract_media(soup))
-            strain_data.update(self.extract_awards(soup))
-            strain_data.update(self.extract_genetics(soup))
-            
-            # Calculate quality metrics
-            quality_score = self.calculate_quality_score(strain_data)
-            market_tier = self.classify_market_tier(quality_score, strain_data)
-            
-            strain_data['quality_score'] = quality_score
-            strain_data['market_tier'] = market_tier
-            strain_data['extraction_method'] = '8_method_pipeline'
-            strain_data['field_count'] = len([k for k, v in strain_data.items() if pd.notna(v) and str(v).strip()])
-            
-            return strain_data
+            return self.extract_from_html(html_content, s3_key)
             
         except Exception as e:
             logger.error(f"Error processing {s3_key}: {str(e)}")
@@ -445,31 +471,57 @@ class SeedsmanMaxExtractor:
             logger.error(f"Inventory file not found: {inventory_path}")
             return None
             
-        import pandas as pd
         inventory_df = pd.read_csv(inventory_path)
         seedsman_df = inventory_df[inventory_df['seed_bank'] == 'Seedsman']
         
         logger.info(f"Found {len(seedsman_df)} Seedsman strains in inventory")
         
-        # Process all Seedsman strains
-        all_data = []
+        # ETags of the archived HTML, so unchanged pages are not downloaded again
+        logger.info("Scanning S3 for available HTML files...")
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        available_hashes = {}
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix='html/'):
+            for obj in page.get('Contents', []):
+                if obj['Key'].endswith('.html'):
+                    available_hashes[obj['Key'].split('/')[-1].replace('.html', '')] = obj['ETag'].strip('"')
+        
+        logger.info(f"Found {len(available_hashes)} HTML files in S3")
+        
+        # Stream rows to checkpointed parts; a restarted run skips strains already written
+        output_file = Path(__file__).parent / 'seedsman_maximum_extraction.csv'
+        writer = CheckpointWriter(output_file, version=extractor_version(__file__, EXTRACTION_VERSION),
+                                  sparse_prefixes=SEEDSMAN_SPARSE_PREFIXES)
+        
         for i, row in seedsman_df.iterrows():
             if i % 50 == 0:
                 logger.info(f"Processing strain {i+1}/{len(seedsman_df)}")
             
-            s3_key = f"html/{row['url_hash']}.html"
+            url_hash = row['url_hash']
+            if url_hash not in available_hashes:
+                logger.debug(f"HTML not found for {url_hash}")
+                continue
+            
+            # Skip documents whose HTML and extractor are unchanged since the last run
+            if writer.is_complete(url_hash, available_hashes[url_hash]):
+                continue
+            
+            s3_key = f"html/{url_hash}.html"
             strain_data = self.process_strain(s3_key)
+            if 'error' in strain_data:
+                # Not checkpointed, so the next run retries it
+                continue
             strain_data['original_url'] = row['url']
-            strain_data['url_hash'] = row['url_hash']
-            all_data.append(strain_data)
+            strain_data['url_hash'] = url_hash
+            writer.write(url_hash, strain_data, available_hashes[url_hash])
         
-        # Create DataFrame and save
-        df = pd.DataFrame(all_data)
+        # Combine checkpointed parts into the main dataset
+        writer.finalize()
+        df = writer.load()
         
         # Generate summary statistics
         total_strains = len(df)
         avg_quality = df['quality_score'].mean() if 'quality_score' in df.columns else 0
-        total_columns = len(df.columns)
+        total_columns = len(df.attrs['columns'])
         
         tier_distribution = df['market_tier'].value_counts().to_dict() if 'market_tier' in df.columns else {}
         
@@ -478,13 +530,42 @@ class SeedsmanMaxExtractor:
         logger.info(f"Average quality: {avg_quality:.1f}%")
         logger.info(f"Total columns: {total_columns}")
         logger.info(f"Market tiers: {tier_distribution}")
-        
-        # Save results
-        output_file = Path(__file__).parent / 'seedsman_maximum_extraction.csv'
-        df.to_csv(output_file, index=False, encoding='utf-8')
         logger.info(f"Results saved to {output_file}")
         
+        self.generate_extraction_report(df, output_file)
+        self.profiler.save(str(output_file).replace('.csv', '_method_profile.csv'))
+        
         return df
+    
+    def generate_extraction_report(self, df, output_file):
+        """Write the extraction summary with the per-method profile"""
+        avg_quality = df['quality_score'].mean() if 'quality_score' in df.columns else 0
+        tiers = df['market_tier'].value_counts().to_string() if 'market_tier' in df.columns else 'n/a'
+        
+        report = f"""# Seedsman Maximum Extraction Report
+
+**Date:** {datetime.now().strftime('%B %d, %Y')}  
+**Logic designed by Amazon Q, verified by Shannon Goddard.**
+
+## Extraction Summary
+- **Total Strains Extracted:** {len(df)}
+- **Total Columns Captured:** {len(df.attrs['columns'])}
+- **Average Quality Score:** {avg_quality:.1f}%
+
+### Market Tier Distribution
+{tiers}
+
+{self.profiler.report_section()}
+
+## File Output
+- **Main Dataset:** {Path(output_file).name}
+"""
+        
+        report_file = Path(output_file).parent / 'seedsman_extraction_report.md'
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write(report)
+        
+        logger.info(f"Extraction report saved to {report_file}")
 
 if __name__ == "__main__":
     extractor = SeedsmanMaxExtractor()
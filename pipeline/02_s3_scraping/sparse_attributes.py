@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Compact Long-Format Storage for Sparse meta_* and spec_* Columns
+Key/value attribute tables with dictionary-encoded keys plus pivot-on-demand
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+extract_comprehensive_meta_tags and extract_structured_tables emit arbitrary
+meta_{name} / spec_{key} fields per page, which used to become hundreds of
+mostly-empty columns (1,477 for Seed Supreme). These fields are now stored as:
+
+  [seedbank]_maximum_extraction.csv             core columns + url_hash
+  [seedbank]_maximum_extraction_attributes.csv  url_hash, key_id, value
+  [seedbank]_maximum_extraction_keys.csv        key_id, key, doc_count
+
+Column mapping can run over the keys file alone; pivot_attributes() rebuilds
+wide columns for just the keys a consumer needs.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+SPARSE_PREFIXES = ('meta_', 'spec_')
+ATTRIBUTE_COLUMNS = ['url_hash', 'key_id', 'value']
+KEY_COLUMNS = ['key_id', 'key', 'doc_count']
+
+
+def attributes_file(output_file):
+    output_file = Path(output_file)
+    return output_file.with_name(f"{output_file.stem}_attributes.csv")
+
+
+def keys_file(output_file):
+    output_file = Path(output_file)
+    return output_file.with_name(f"{output_file.stem}_keys.csv")
+
+
+def is_companion_file(csv_file):
+    """True for attribute/key files that sit next to a core extraction CSV"""
+    stem = Path(csv_file).stem
+    return stem.endswith('_attributes') or stem.endswith('_keys')
+
+
+def split_sparse(strain_data, prefixes=SPARSE_PREFIXES):
+    """Split one strain dict into core fields and non-empty sparse fields"""
+    core = {}
+    sparse = {}
+    for key, value in strain_data.items():
+        if key.startswith(prefixes):
+            if value is not None and str(value).strip():
+                sparse[key] = value
+        else:
+            core[key] = value
+    return core, sparse
+
+
+def load_keys(output_file):
+    """Key dictionary for an extraction output; empty if it has no sparse storage"""
+    path = keys_file(output_file)
+    if not path.exists():
+        return pd.DataFrame(columns=KEY_COLUMNS)
+    return pd.read_csv(path, encoding='utf-8')
+
+
+def load_attributes(output_file, keys=None, chunksize=100000):
+    """Long-format attributes as (url_hash, key, value), optionally limited to some keys"""
+    key_df = load_keys(output_file)
+    if keys is not None:
+        key_df = key_df[key_df['key'].isin(keys)]
+    key_names = dict(zip(key_df['key_id'], key_df['key']))
+
+    path = attributes_file(output_file)
+    if not path.exists() or not key_names:
+        return pd.DataFrame(columns=['url_hash', 'key', 'value'])
+
+    # Filter chunk by chunk so only the requested keys are ever held in memory
+    chunks = []
+    for chunk in pd.read_csv(path, encoding='utf-8', dtype={'url_hash': str, 'key_id': 'int32', 'value': str},
+                             keep_default_na=False, chunksize=chunksize):
+        chunks.append(chunk[chunk['key_id'].isin(key_names)])
+    long_df = pd.concat(chunks, ignore_index=True)
+
+    long_df['key'] = pd.Categorical(long_df['key_id'].map(key_names), categories=sorted(key_names.values()))
+    return long_df[['url_hash', 'key', 'value']]
+
+
+def wide_attributes(output_file, keys=None):
+    """meta_*/spec_* columns for the given keys, one row per url_hash; None if there are none"""
+    long_df = load_attributes(output_file, keys)
+    if long_df.empty:
+        return None
+
+    wide = long_df.assign(key=long_df['key'].astype(str)).pivot(index='url_hash', columns='key', values='value')
+    wide.columns = list(wide.columns)
+    return wide
+
+
+def pivot_attributes(core_df, output_file, keys=None, wide=None):
+    """Join wide meta_*/spec_* columns back onto core rows, for the given keys only
+
+    Pass wide (from wide_attributes) to join chunk after chunk without re-reading the attributes file.
+    """
+    if wide is None:
+        wide = wide_attributes(output_file, keys)
+    if wide is None:
+        return core_df
+    return core_df.merge(wide, left_on='url_hash', right_index=True, how='left')
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Lookup Lambda Inventory Format Benchmark
+Cold-start init time, memory and lookup latency: CSV dict vs s3_inventory.db vs s3_inventory.bin
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Init is what a cold Lambda pays before its first answer once the file is
+local: parse the CSVs into a dict, open the SQLite index, or mmap the
+binary table. Memory is the tracemalloc peak during init; file size is what
+a cold start downloads from S3.
+"""
+
+import argparse
+import csv
+import random
+import statistics
+import time
+import tracemalloc
+
+from inventory_index import HTML_INVENTORY, INDEX_FILE, JS_INVENTORY, InventoryIndex
+from lookup_table import TABLE_FILE, LookupTable
+
+
+def open_csv():
+    # The original Lambda path: both CSVs into one url -> row dict
+    inventory = {}
+    with open(HTML_INVENTORY, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            inventory[row['url']] = row
+    if JS_INVENTORY.exists():
+        with open(JS_INVENTORY, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                inventory[row['url']] = row
+    return inventory.get
+
+
+FILES = {
+    'csv': [HTML_INVENTORY, JS_INVENTORY],
+    'sqlite': [INDEX_FILE],
+    'binary': [TABLE_FILE]
+}
+
+FORMATS = {
+    'csv': open_csv,
+    'sqlite': lambda: InventoryIndex(INDEX_FILE).lookup_url,
+    'binary': lambda: LookupTable(TABLE_FILE).lookup_url
+}
+
+
+def measure(name, urls):
+    tracemalloc.start()
+    start = time.perf_counter()
+    lookup = FORMATS[name]()
+    init_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for url in urls:
+        start = time.perf_counter()
+        lookup(url)
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return {
+        'format': name,
+        'file_mb': sum(path.stat().st_size for path in FILES[name] if path.exists()) / 1024**2,
+        'init_ms': init_ms,
+        'init_peak_mb': peak / 1024**2,
+        'lookup_p50_us': statistics.median(timings),
+        'lookup_p99_us': timings[int(len(timings) * 0.99) - 1]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare inventory formats for the lookup Lambda')
+    parser.add_argument('--lookups', type=int, default=2000)
+    args = parser.parse_args()
+
+    with InventoryIndex(INDEX_FILE) as index:
+        urls = index.load(['url'])['url'].dropna().tolist()
+    urls = random.Random(0).sample(urls, min(args.lookups, len(urls)))
+
+    print(f"{'format':<8} {'file MB':>8} {'init ms':>9} {'init MB':>9} {'p50 us':>8} {'p99 us':>8}")
+    for name in FORMATS:
+        r = measure(name, urls)
+        print(f"{r['format']:<8} {r['file_mb']:>8.1f} {r['init_ms']:>9.1f} {r['init_peak_mb']:>9.2f} "
+              f"{r['lookup_p50_us']:>8.1f} {r['lookup_p99_us']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
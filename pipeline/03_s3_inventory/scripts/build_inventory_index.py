@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Build and Publish the Indexed S3 Inventory
+Compiles the CSV inventories into s3_inventory.db + s3_inventory.bin and optionally uploads them for the Lambda
+Logic designed by Amazon Q, verified by Shannon Goddard.
+"""
+
+import argparse
+import logging
+
+import boto3
+
+from inventory_index import INDEX_FILE, InventoryIndex, build_index
+from lookup_table import TABLE_FILE, build_lookup_table
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BUCKET = 'ci-strains-html-archive'
+INDEX_KEY = 'pipeline/03_s3_inventory/s3_inventory.db'
+TABLE_KEY = 'pipeline/03_s3_inventory/s3_inventory.bin'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build s3_inventory.db from the CSV inventories')
+    parser.add_argument('--upload', action='store_true', help=f'Upload both files to s3://{BUCKET}/pipeline/03_s3_inventory/')
+    args = parser.parse_args()
+
+    rows = build_index()
+    logger.info(f"Built {INDEX_FILE} ({rows} rows, {INDEX_FILE.stat().st_size / 1024**2:.1f} MB)")
+
+    table_rows = build_lookup_table()
+    logger.info(f"Built {TABLE_FILE} ({table_rows} URLs, {TABLE_FILE.stat().st_size / 1024**2:.1f} MB)")
+
+    with InventoryIndex() as index:
+        for seed_bank, count in index.seed_bank_counts().items():
+            logger.info(f"  {seed_bank}: {count}")
+
+    if args.upload:
+        s3_client = boto3.client('s3')
+        for local_file, key in [(INDEX_FILE, INDEX_KEY), (TABLE_FILE, TABLE_KEY)]:
+            s3_client.upload_file(str(local_file), BUCKET, key)
+            logger.info(f"Uploaded to s3://{BUCKET}/{key}")
+
+
+if __name__ == "__main__":
+    main()
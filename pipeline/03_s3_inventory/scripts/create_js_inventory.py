@@ -9,6 +9,8 @@ import pandas as pd
 import json
 from datetime import datetime
 
+from seed_bank_classifier import classify_series
+
 s3 = boto3.client('s3')
 bucket = 'ci-strains-html-archive'
 
@@ -51,7 +53,7 @@ for page in pages:
 df = pd.DataFrame(inventory)
 
 # Add seed bank column
-df['seed_bank'] = df['url'].apply(lambda x: 'ILGM' if 'ilgm.com' in str(x) else ('Seedsman' if 'seedsman.com' in str(x) else 'Unknown'))
+df['seed_bank'] = classify_series(df['url'])
 
 # Save inventory
 output_file = 's3_js_html_inventory.csv'
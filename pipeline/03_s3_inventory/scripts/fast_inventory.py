@@ -8,6 +8,8 @@ import boto3
 import json
 import logging
 
+from seed_bank_classifier import classify_url
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -38,24 +40,7 @@ for key in sample_keys:
         metadata = json.loads(resp['Body'].read())
         url = metadata.get('url', '')
         
-        if 'amsterdammarijuanaseeds' in url.lower():
-            sb = 'Amsterdam Marijuana Seeds'
-        elif 'gorillaseedbank' in url.lower():
-            sb = 'Gorilla Seeds Bank'
-        elif 'herbies' in url.lower():
-            sb = 'Herbies Seeds'
-        elif 'exoticgenetix' in url.lower():
-            sb = 'Exotic Genetix'
-        elif 'compoundgenetics' in url.lower():
-            sb = 'Compound Genetics'
-        elif 'cannabis-seeds-bank' in url.lower():
-            sb = 'Attitude Seed Bank'
-        elif 'northatlanticseed' in url.lower():
-            sb = 'North Atlantic'
-        elif 'neptuneseedbank' in url.lower():
-            sb = 'Neptune'
-        else:
-            sb = 'Other'
+        sb = classify_url(url)
         
         seed_banks[sb] = seed_banks.get(sb, 0) + 1
     except:
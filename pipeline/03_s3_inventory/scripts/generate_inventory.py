@@ -5,84 +5,75 @@ Creates complete hash-to-URL mapping from S3 metadata
 Logic designed by Amazon Q, verified by Shannon Goddard.
 """
 
-import boto3
-import pandas as pd
-import json
+import argparse
 import logging
+import time
 from datetime import datetime
+from pathlib import Path
+
+from inventory_builder import DEFAULT_WORKERS, SidecarInventory
+from inventory_index import INDEX_FILE, build_index
+from lookup_table import TABLE_FILE, build_lookup_table
+from seed_bank_classifier import classify_series, classify_url
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def identify_seed_bank(url):
-    if pd.isna(url) or not url:
-        return 'Unknown'
-    url_lower = url.lower()
-    if 'amsterdammarijuanaseeds' in url_lower:
-        return 'Amsterdam Marijuana Seeds'
-    elif 'gorillaseedbank' in url_lower:
-        return 'Gorilla Seeds Bank'
-    elif 'herbiesheadshop' in url_lower or 'herbies' in url_lower:
-        return 'Herbies Seeds'
-    elif 'exoticgenetix' in url_lower:
-        return 'Exotic Genetix'
-    elif 'compoundgenetics' in url_lower:
-        return 'Compound Genetics'
-    else:
-        return 'Other'
-
-def generate_s3_inventory():
+INVENTORY_FILE = Path(__file__).resolve().parents[1] / 's3_html_inventory.csv'
+REPORT_FILE = INVENTORY_FILE.with_name('s3_inventory_report.md')
+
+def build_inventory_record(metadata_key, metadata):
+    """One inventory row from a metadata/{hash}.json sidecar"""
+    url_hash = metadata.get('url_hash')
+    url = metadata.get('url')
+    return {
+        'url_hash': url_hash,
+        's3_html_key': f'html/{url_hash}.html',
+        's3_metadata_key': metadata_key,
+        'url': url,
+        'seed_bank': classify_url(url),
+        'collection_date': metadata.get('collection_date'),
+        'scrape_method': metadata.get('scrape_method'),
+        'html_size': metadata.get('html_size'),
+        'validation_score': metadata.get('validation_score')
+    }
+
+def refresh_inventory(max_workers=DEFAULT_WORKERS, full=False):
+    """Incrementally update s3_html_inventory.csv from S3 metadata and return it"""
+    builder = SidecarInventory(INVENTORY_FILE, build_inventory_record, max_workers=max_workers)
+    inventory, counts = builder.refresh(full=full)
+
+    # Unchanged sidecars are not re-read, so re-label them when the seed bank registry changes
+    counts['relabeled'] = 0
+    if not inventory.empty:
+        seed_banks = classify_series(inventory['url'])
+        relabeled = seed_banks != inventory['seed_bank']
+        counts['relabeled'] = int(relabeled.sum())
+        if counts['relabeled']:
+            inventory['seed_bank'] = seed_banks
+            builder.save(inventory)
+            logger.info(f"Re-labeled {counts['relabeled']} rows from the seed bank registry")
+    return inventory, counts
+
+def generate_s3_inventory(max_workers=DEFAULT_WORKERS, full=False):
     """Generate complete inventory from S3 metadata folder"""
     
-    s3_client = boto3.client('s3')
-    bucket_name = 'ci-strains-html-archive'
-    
     logger.info("Scanning S3 metadata for URL mappings...")
     
-    paginator = s3_client.get_paginator('list_objects_v2')
-    page_iterator = paginator.paginate(Bucket=bucket_name, Prefix='metadata/')
-    
-    inventory_data = []
-    processed = 0
+    start = time.perf_counter()
+    df_final, counts = refresh_inventory(max_workers, full)
+    elapsed = time.perf_counter() - start
     
-    for page in page_iterator:
-        if 'Contents' in page:
-            for obj in page['Contents']:
-                if obj['Key'].endswith('.json'):
-                    try:
-                        response = s3_client.get_object(Bucket=bucket_name, Key=obj['Key'])
-                        metadata = json.loads(response['Body'].read())
-                        
-                        url_hash = metadata.get('url_hash')
-                        url = metadata.get('url')
-                        seed_bank = identify_seed_bank(url)
-                        
-                        inventory_data.append({
-                            'url_hash': url_hash,
-                            's3_html_key': f'html/{url_hash}.html',
-                            's3_metadata_key': obj['Key'],
-                            'url': url,
-                            'seed_bank': seed_bank,
-                            'collection_date': metadata.get('collection_date'),
-                            'scrape_method': metadata.get('scrape_method'),
-                            'html_size': metadata.get('html_size'),
-                            'validation_score': metadata.get('validation_score')
-                        })
-                        
-                        processed += 1
-                        if processed % 1000 == 0:
-                            logger.info(f"Processed {processed} metadata files...")
-                        
-                    except Exception as e:
-                        logger.warning(f"Error processing {obj['Key']}: {e}")
-                        continue
+    logger.info(f"Found {len(df_final)} HTML files with metadata")
     
-    logger.info(f"Found {len(inventory_data)} HTML files with metadata")
+    # Keep the indexed artifact in step with the CSV
+    if counts['fetched'] or counts['removed'] or counts['relabeled'] or not INDEX_FILE.exists():
+        index_rows = build_index()
+        logger.info(f"Rebuilt {INDEX_FILE.name} ({index_rows} rows)")
+        table_rows = build_lookup_table()
+        logger.info(f"Rebuilt {TABLE_FILE.name} ({table_rows} URLs)")
     
-    df_final = pd.DataFrame(inventory_data)
-    
-    output_file = 's3_html_inventory.csv'
-    df_final.to_csv(output_file, index=False, encoding='utf-8')
+    output_file = INVENTORY_FILE.name
     
     total_size_mb = df_final['html_size'].sum() / (1024**2)
     
@@ -97,6 +88,15 @@ def generate_s3_inventory():
 - **Total Storage Size:** {total_size_mb:.2f} MB
 - **Average File Size:** {df_final['html_size'].mean() / 1024:.1f} KB
 
+## Refresh
+
+- **Sidecars Listed:** {counts['listed']}
+- **Unchanged (skipped):** {counts['unchanged']}
+- **Read This Run:** {counts['fetched']} ({counts['failed']} failed, retried next run)
+- **Removed:** {counts['removed']}
+- **Seed Bank Re-labeled:** {counts['relabeled']}
+- **Duration:** {elapsed:.1f}s
+
 ## Seed Bank Distribution
 
 {df_final['seed_bank'].value_counts().to_string()}
@@ -112,6 +112,8 @@ def generate_s3_inventory():
 ## Output Files
 
 - **Complete Inventory:** {output_file}
+- **Indexed Inventory:** {INDEX_FILE.name} (html + JS, indexed on url, url_hash, seed_bank)
+- **Lambda Lookup Table:** {TABLE_FILE.name} (binary, normalized URL -> page)
 - **Total Records:** {len(df_final)}
 
 ---
@@ -121,11 +123,11 @@ def generate_s3_inventory():
 **Logic designed by Amazon Q, verified by Shannon Goddard.**
 """
     
-    with open('s3_inventory_report.md', 'w', encoding='utf-8') as f:
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
         f.write(report)
     
-    logger.info(f"Inventory saved to: {output_file}")
-    logger.info(f"Report saved to: s3_inventory_report.md")
+    logger.info(f"Inventory saved to: {INVENTORY_FILE}")
+    logger.info(f"Report saved to: {REPORT_FILE}")
     
     print(f"\nS3 INVENTORY COMPLETE!")
     print(f"Total HTML files: {len(df_final)}")
@@ -138,4 +140,8 @@ def generate_s3_inventory():
         print(f"  {bank}: {count} strains")
 
 if __name__ == "__main__":
-    generate_s3_inventory()
+    parser = argparse.ArgumentParser(description='Build or refresh s3_html_inventory.csv from S3 metadata sidecars')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Concurrent sidecar reads')
+    parser.add_argument('--full', action='store_true', help='Re-read every sidecar instead of only new/changed ones')
+    args = parser.parse_args()
+    generate_s3_inventory(args.workers, args.full)
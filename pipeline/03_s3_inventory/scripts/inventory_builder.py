@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Concurrent Incremental S3 Sidecar Inventory
+Reads metadata/*.json sidecars with a bounded thread pool and only re-reads new or changed ones
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Every inventory row remembers the sidecar it came from (s3_metadata_key) and
+that sidecar's ETag and LastModified at read time. A refresh lists the prefix
+(1 request per 1,000 keys, no object reads), compares ETags with the stored
+ones and fetches only sidecars that are new or whose ETag changed. Rows for
+sidecars that disappeared are dropped. When nothing changed the inventory
+file is left untouched, so a no-change refresh costs only the listing.
+
+An inventory written before these columns existed is rebuilt once in full.
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import boto3
+import pandas as pd
+from botocore.config import Config
+
+logger = logging.getLogger(__name__)
+
+BUCKET = 'ci-strains-html-archive'
+METADATA_PREFIX = 'metadata/'
+DEFAULT_WORKERS = 32
+
+STATE_COLUMNS = ['s3_metadata_key', 'metadata_etag', 'metadata_last_modified']
+
+
+def s3_client_for_pool(max_workers):
+    # botocore keeps 10 connections per client by default; size the pool to the workers
+    return boto3.client('s3', config=Config(max_pool_connections=max_workers,
+                                            retries={'max_attempts': 5, 'mode': 'adaptive'}))
+
+
+def list_sidecars(s3_client, bucket=BUCKET, prefix=METADATA_PREFIX):
+    """Sidecar key -> (ETag, LastModified) from the listing alone"""
+    sidecars = {}
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            if obj['Key'].endswith('.json'):
+                sidecars[obj['Key']] = (obj['ETag'].strip('"'), obj['LastModified'].isoformat())
+    return sidecars
+
+
+class SidecarInventory:
+    def __init__(self, inventory_file, build_record, bucket=BUCKET, prefix=METADATA_PREFIX,
+                 max_workers=DEFAULT_WORKERS, s3_client=None):
+        """build_record(metadata_key, metadata_dict) returns one inventory row (a dict)"""
+        self.inventory_file = Path(inventory_file)
+        self.build_record = build_record
+        self.bucket = bucket
+        self.prefix = prefix
+        self.max_workers = max_workers
+        self.s3_client = s3_client or s3_client_for_pool(max_workers)
+
+    def load(self):
+        """Existing inventory, or an empty frame if there is none yet"""
+        if not self.inventory_file.exists():
+            return pd.DataFrame()
+        return pd.read_csv(self.inventory_file, dtype={'url_hash': str, 'metadata_etag': str},
+                           encoding='utf-8', low_memory=False)
+
+    def save(self, inventory):
+        # Write-then-rename so an interrupted refresh never leaves a truncated inventory
+        tmp_file = self.inventory_file.with_suffix('.tmp')
+        inventory.to_csv(tmp_file, index=False, encoding='utf-8')
+        os.replace(tmp_file, self.inventory_file)
+
+    def _fetch(self, key):
+        response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
+        return json.loads(response['Body'].read())
+
+    def refresh(self, full=False):
+        """Bring the inventory in line with S3; returns (inventory DataFrame, change counts)"""
+        existing = self.load()
+        has_state = not existing.empty and all(col in existing.columns for col in STATE_COLUMNS)
+        if existing.empty or not has_state or full:
+            if not existing.empty and not has_state:
+                logger.info("Inventory has no sidecar ETags yet - rebuilding once in full")
+            known = {}
+        else:
+            known = dict(zip(existing['s3_metadata_key'], existing['metadata_etag']))
+
+        logger.info(f"Listing s3://{self.bucket}/{self.prefix} ...")
+        sidecars = list_sidecars(self.s3_client, self.bucket, self.prefix)
+
+        to_fetch = [key for key, (etag, _) in sidecars.items() if known.get(key) != etag]
+        removed = set(known) - set(sidecars)
+        counts = {
+            'listed': len(sidecars),
+            'unchanged': len(sidecars) - len(to_fetch),
+            'fetched': 0,
+            'failed': 0,
+            'removed': len(removed)
+        }
+        logger.info(f"{len(sidecars)} sidecars listed: {len(to_fetch)} new or changed, {len(removed)} removed")
+
+        if not to_fetch and not removed and known:
+            return existing, counts
+
+        records = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self._fetch, key): key for key in to_fetch}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    record = self.build_record(key, future.result())
+                except Exception as e:
+                    # Not recorded, so the sidecar is retried on the next refresh
+                    logger.warning(f"Error processing {key}: {e}")
+                    counts['failed'] += 1
+                    continue
+
+                etag, last_modified = sidecars[key]
+                record.update({'s3_metadata_key': key, 'metadata_etag': etag, 'metadata_last_modified': last_modified})
+                records.append(record)
+
+                counts['fetched'] += 1
+                if counts['fetched'] % 1000 == 0:
+                    logger.info(f"Read {counts['fetched']}/{len(to_fetch)} sidecars...")
+
+        fresh = pd.DataFrame(records)
+        if known:
+            replaced = set(fresh['s3_metadata_key']) if not fresh.empty else set()
+            keep = ~existing['s3_metadata_key'].isin(replaced | removed)
+            inventory = pd.concat([existing[keep], fresh], ignore_index=True)
+        else:
+            inventory = fresh
+
+        if not inventory.empty:
+            inventory = inventory.sort_values('s3_metadata_key', ignore_index=True)
+        self.save(inventory)
+
+        logger.info(f"Inventory updated: {counts['fetched']} read, {counts['failed']} failed, "
+                    f"{counts['removed']} removed, {len(inventory)} rows")
+        return inventory, counts
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Indexed S3 Inventory Artifact and Query API
+SQLite build of s3_html_inventory.csv + s3_js_html_inventory.csv with url, url_hash and seed_bank indexes
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Consumers used to read both inventory CSVs in full and build dicts or scan
+DataFrames per row. s3_inventory.db holds one row per archived page
+(source = 'html' or 'js') and answers point lookups through B-tree indexes
+in O(log n); load() reads only the requested columns.
+
+Standard library only (pandas is imported lazily by load()), so the same
+module ships inside the Lambda package.
+
+When a URL exists in both archives the JS-rendered page wins, matching the
+order the CSV inventories were previously merged in.
+"""
+
+import csv
+import os
+import sqlite3
+from pathlib import Path
+
+INVENTORY_DIR = Path(__file__).resolve().parents[1]
+HTML_INVENTORY = INVENTORY_DIR / 's3_html_inventory.csv'
+JS_INVENTORY = INVENTORY_DIR / 's3_js_html_inventory.csv'
+INDEX_FILE = INVENTORY_DIR / 's3_inventory.db'
+
+COLUMNS = ['url_hash', 'url', 's3_html_key', 'seed_bank', 'collection_date', 'scrape_method', 'html_size', 'source']
+
+# Keep IN (...) lists below SQLite's bound-parameter limit
+BATCH_SIZE = 500
+
+
+def _inventory_rows(html_inventory, js_inventory):
+    # Build-time only: the Lambda ships this module without the classifier (or pandas)
+    from seed_bank_classifier import OTHER, UNKNOWN, classify_url
+
+    def _seed_bank(row):
+        # Registry label; CSV value only for rows without a classifiable URL (e.g. url 'Unknown' JS rows)
+        seed_bank = classify_url(row['url'])
+        return row['seed_bank'] if seed_bank in (UNKNOWN, OTHER) and row.get('seed_bank') else seed_bank
+
+    with open(html_inventory, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            yield (row['url_hash'], row['url'], row['s3_html_key'], _seed_bank(row),
+                   row.get('collection_date'), row.get('scrape_method'), row.get('html_size') or None, 'html')
+
+    if js_inventory and Path(js_inventory).exists():
+        with open(js_inventory, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                yield (row['url_hash'], row['url'], row['html_key'], _seed_bank(row),
+                       'JS-rendered', 'js_rescrape', row.get('html_size') or None, 'js')
+
+
+def build_index(html_inventory=HTML_INVENTORY, js_inventory=JS_INVENTORY, index_file=INDEX_FILE):
+    """Rebuild the SQLite artifact from the CSV inventories; returns the row count"""
+    index_file = Path(index_file)
+    tmp_file = index_file.with_suffix('.tmp')
+    tmp_file.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(tmp_file)
+    try:
+        conn.execute("""
+            CREATE TABLE inventory (
+                url_hash TEXT NOT NULL,
+                url TEXT,
+                s3_html_key TEXT NOT NULL,
+                seed_bank TEXT,
+                collection_date TEXT,
+                scrape_method TEXT,
+                html_size INTEGER,
+                source TEXT NOT NULL
+            )
+        """)
+        conn.executemany("INSERT INTO inventory VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         _inventory_rows(html_inventory, js_inventory))
+        conn.execute("CREATE INDEX idx_inventory_url ON inventory (url)")
+        conn.execute("CREATE INDEX idx_inventory_url_hash ON inventory (url_hash)")
+        conn.execute("CREATE INDEX idx_inventory_seed_bank ON inventory (seed_bank)")
+        conn.execute("ANALYZE")
+        conn.commit()
+        rows = conn.execute("SELECT COUNT(*) FROM inventory").fetchone()[0]
+    finally:
+        conn.close()
+
+    # VACUUM outside the build transaction keeps the shipped file compact
+    conn = sqlite3.connect(tmp_file)
+    conn.execute("VACUUM")
+    conn.close()
+
+    os.replace(tmp_file, index_file)
+    return rows
+
+
+class InventoryIndex:
+    def __init__(self, index_file=INDEX_FILE):
+        index_file = Path(index_file)
+        if not index_file.exists():
+            raise FileNotFoundError(f"Inventory index not found: {index_file} (run build_inventory_index.py)")
+        # Read-only: many processes (or Lambda invocations) can share one file
+        self.conn = sqlite3.connect(f"file:{index_file.as_posix()}?mode=ro", uri=True, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def _source_clause(source):
+        return (" AND source = ?", [source]) if source else ("", [])
+
+    def _lookup(self, column, value, source=None):
+        clause, params = self._source_clause(source)
+        row = self.conn.execute(
+            f"SELECT * FROM inventory WHERE {column} = ?{clause} ORDER BY source = 'js' DESC LIMIT 1",
+            [value] + params
+        ).fetchone()
+        return dict(row) if row else None
+
+    def lookup_url(self, url, source=None):
+        """Inventory row for a page URL, or None"""
+        return self._lookup('url', url, source)
+
+    def lookup_hash(self, url_hash, source=None):
+        """Inventory row for a url_hash, or None"""
+        return self._lookup('url_hash', url_hash, source)
+
+    def keys_for_urls(self, urls, source=None):
+        """{url: s3_html_key} for the given URLs that are in the inventory"""
+        urls = list({u for u in urls if isinstance(u, str) and u})
+        clause, params = self._source_clause(source)
+        keys = {}
+        for i in range(0, len(urls), BATCH_SIZE):
+            batch = urls[i:i + BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            # html rows first so a JS row for the same URL overwrites it
+            for row in self.conn.execute(
+                f"SELECT url, s3_html_key FROM inventory WHERE url IN ({placeholders}){clause} ORDER BY source = 'js'",
+                batch + params
+            ):
+                keys[row['url']] = row['s3_html_key']
+        return keys
+
+    def seed_bank_counts(self):
+        return dict(self.conn.execute(
+            "SELECT seed_bank, COUNT(*) FROM inventory GROUP BY seed_bank ORDER BY COUNT(*) DESC"
+        ).fetchall())
+
+    def load(self, columns=None, seed_bank=None, source=None):
+        """DataFrame of the selected columns, optionally for one seed bank and/or source"""
+        import pandas as pd
+
+        columns = columns or COLUMNS
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown inventory columns: {sorted(unknown)}")
+
+        where, params = [], []
+        if seed_bank:
+            where.append("seed_bank = ?")
+            params.append(seed_bank)
+        if source:
+            where.append("source = ?")
+            params.append(source)
+        query = f"SELECT {', '.join(columns)} FROM inventory"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        return pd.read_sql_query(query, self.conn, params=params)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Precompiled Binary Lookup Table
+Sorted fixed-width URL and url_hash keys + string table, memory-mapped and searched with bisect
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+s3_inventory.bin answers URL -> archived page for the lookup Lambda without
+building Python objects for the whole inventory. Opening it is one mmap;
+a lookup is a binary search over 8-byte hashes plus one slice of the
+string table, so cold start cost does not grow with the row count.
+
+Layout (little-endian):
+  header      MAGIC (8 bytes), record count N, URL key count U, url_hash key count H, field count (uint32 each)
+  url keys    U x uint64, sorted - blake2b-64 of normalize_url(url)
+  hash keys   H x uint64, sorted - the 16-hex-digit url_hash as an integer
+  url rows    U x uint32 record number for each url key
+  hash rows   H x uint32 record number for each hash key
+  offsets     (N + 1) x uint32 into the string table
+  strings     UTF-8 records, FIELDS joined by FIELD_SEP
+
+Built from s3_inventory.db, so the JS page wins when a URL is in both
+archives; either archive's url_hash resolves to that page. Rows without a
+usable URL (url 'Unknown' in the JS inventory) are reachable by url_hash
+only. Standard library only; ships inside the Lambda package.
+"""
+
+import hashlib
+import mmap
+import os
+import sqlite3
+import struct
+from bisect import bisect_left
+from pathlib import Path
+
+INVENTORY_DIR = Path(__file__).resolve().parents[1]
+INDEX_FILE = INVENTORY_DIR / 's3_inventory.db'
+TABLE_FILE = INVENTORY_DIR / 's3_inventory.bin'
+
+MAGIC = b'CISINV02'
+HEADER = struct.Struct('<8sIIII')
+FIELDS = ['url', 'url_hash', 's3_html_key', 'seed_bank', 'collection_date', 'source']
+FIELD_SEP = '\x1f'
+
+
+def normalize_url(url):
+    """Lookup form of a URL: trimmed, lowercase scheme and host, no fragment or trailing slash"""
+    url = url.strip().split('#', 1)[0]
+    scheme, sep, rest = url.partition('://')
+    if sep:
+        host, slash, path = rest.partition('/')
+        url = f"{scheme.lower()}://{host.lower()}{slash}{path}"
+    return url.rstrip('/')
+
+
+def url_key(url):
+    return int.from_bytes(hashlib.blake2b(normalize_url(url).encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def hash_key(url_hash):
+    """url_hash as an integer, or None if it is not 16 hex digits"""
+    try:
+        return int(url_hash, 16) if len(url_hash) == 16 else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _has_url(url):
+    return bool(url) and '://' in url
+
+
+def build_lookup_table(index_file=INDEX_FILE, table_file=TABLE_FILE):
+    """Compile s3_inventory.db into the binary table; returns the record count"""
+    conn = sqlite3.connect(f"file:{Path(index_file).as_posix()}?mode=ro", uri=True)
+    try:
+        # html rows first so a JS row for the same normalized URL replaces it
+        rows = conn.execute(f"SELECT {', '.join(FIELDS)} FROM inventory ORDER BY source = 'js'").fetchall()
+    finally:
+        conn.close()
+
+    records, by_url, by_hash = [], {}, {}
+    for row in rows:
+        record = FIELD_SEP.join('' if value is None else str(value) for value in row).encode('utf-8')
+        url, url_hash = row[0], row[1]
+        if _has_url(url):
+            normalized = normalize_url(url)
+            if normalized not in by_url:
+                by_url[normalized] = len(records)
+                records.append(record)
+            else:
+                records[by_url[normalized]] = record
+            number = by_url[normalized]
+        else:
+            number = len(records)
+            records.append(record)
+        # The html row's url_hash keeps pointing at the URL's record after a JS row replaces it
+        if hash_key(url_hash) is not None:
+            by_hash[url_hash.lower()] = number
+
+    url_keys = sorted((url_key(url), number) for url, number in by_url.items())
+    hash_keys = sorted((hash_key(url_hash), number) for url_hash, number in by_hash.items())
+
+    offsets, position = [], 0
+    for record in records:
+        offsets.append(position)
+        position += len(record)
+    offsets.append(position)
+
+    table_file = Path(table_file)
+    tmp_file = table_file.with_suffix('.tmp')
+    with open(tmp_file, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(records), len(url_keys), len(hash_keys), len(FIELDS)))
+        f.write(struct.pack(f'<{len(url_keys)}Q', *(key for key, _ in url_keys)))
+        f.write(struct.pack(f'<{len(hash_keys)}Q', *(key for key, _ in hash_keys)))
+        f.write(struct.pack(f'<{len(url_keys)}I', *(number for _, number in url_keys)))
+        f.write(struct.pack(f'<{len(hash_keys)}I', *(number for _, number in hash_keys)))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        for record in records:
+            f.write(record)
+    os.replace(tmp_file, table_file)
+    return len(records)
+
+
+class LookupTable:
+    def __init__(self, table_file=TABLE_FILE):
+        table_file = Path(table_file)
+        if not table_file.exists():
+            raise FileNotFoundError(f"Lookup table not found: {table_file} (run build_inventory_index.py)")
+        with open(table_file, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count, url_count, hash_count, field_count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or field_count != len(FIELDS):
+            self._mm.close()
+            raise ValueError(f"{table_file} is not a {MAGIC.decode()} lookup table")
+
+        # Zero-copy views over the mapping; bisect runs directly on them
+        view = memoryview(self._mm)
+        sections = {}
+        position = HEADER.size
+        for name, length, fmt in [('url_keys', url_count, 'Q'), ('hash_keys', hash_count, 'Q'),
+                                  ('url_rows', url_count, 'I'), ('hash_rows', hash_count, 'I'),
+                                  ('offsets', self.count + 1, 'I')]:
+            end = position + length * struct.calcsize(fmt)
+            sections[name] = view[position:end].cast(fmt)
+            position = end
+        view.release()
+        self._sections = sections
+        self._url_keys, self._hash_keys = sections['url_keys'], sections['hash_keys']
+        self._url_rows, self._hash_rows = sections['url_rows'], sections['hash_rows']
+        self._offsets = sections['offsets']
+        self._strings_start = position
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        # Views must be released before the mapping can close
+        for section in self._sections.values():
+            section.release()
+        self._mm.close()
+
+    def _record(self, i):
+        start = self._strings_start + self._offsets[i]
+        end = self._strings_start + self._offsets[i + 1]
+        return dict(zip(FIELDS, self._mm[start:end].decode('utf-8').split(FIELD_SEP)))
+
+    def lookup_url(self, url):
+        """Inventory row for a page URL (normalized), or None"""
+        normalized = normalize_url(url)
+        key = url_key(url)
+        i = bisect_left(self._url_keys, key)
+        # Walk equal hashes so a 64-bit collision can never return the wrong page
+        while i < len(self._url_keys) and self._url_keys[i] == key:
+            record = self._record(self._url_rows[i])
+            if normalize_url(record['url']) == normalized:
+                return record
+            i += 1
+        return None
+
+    def lookup_hash(self, url_hash):
+        """Inventory row for a url_hash (html/ or html_js/ archive), or None"""
+        key = hash_key(url_hash)
+        if key is None:
+            return None
+        i = bisect_left(self._hash_keys, key)
+        if i < len(self._hash_keys) and self._hash_keys[i] == key:
+            return self._record(self._hash_rows[i])
+        return None
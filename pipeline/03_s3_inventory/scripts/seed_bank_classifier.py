@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+URL to Seed Bank Classifier
+One registry of seed bank domains compiled into a hash lookup, shared by every pipeline stage
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Seed bank attribution used to be re-implemented per script as chains of
+`'x' in url.lower()` checks and `str.contains` filters that disagreed with
+each other. Every stage now classifies through SEED_BANKS below.
+
+A URL is classified by its registrable domain label - the label in front of
+the public suffix, so www.cannabis-seeds-bank.co.uk and
+seeds.compound-genetics.com resolve to 'cannabis-seeds-bank' and
+'compound-genetics' - via one dict lookup, independent of TLD and
+subdomain. A registry entry may add a path prefix ('label/path/') to split
+one domain between banks; the longest matching prefix wins.
+
+The host part of a URL is sliced with str.partition and each distinct host
+is resolved once and cached, so classifying 100k URLs is one pass of dict
+hits (~50 ms) - no per-row lowercasing or substring scans.
+"""
+
+import re
+
+import pandas as pd
+
+# slug (used in Phase 05+ file names and seed_bank columns), display name, domain labels
+SEED_BANKS = [
+    ('amsterdam', 'Amsterdam Marijuana Seeds', ['amsterdammarijuanaseeds']),
+    ('attitude', 'Attitude Seed Bank', ['cannabis-seeds-bank']),
+    ('barneys_farm', "Barney's Farm", ['barneysfarm']),
+    ('compound', 'Compound Genetics', ['compound-genetics', 'compoundgenetics']),
+    ('crop_king', 'Crop King', ['cropkingseeds']),
+    ('dutch_passion', 'Dutch Passion', ['dutch-passion']),
+    ('exotic', 'Exotic Genetix', ['exoticgenetix']),
+    ('gorilla', 'Gorilla Seeds Bank', ['gorilla-cannabis-seeds', 'gorillaseedsbank', 'gorillaseedbank']),
+    ('great_lakes_genetics', 'Great Lakes Genetics', ['greatlakesgenetics']),
+    ('herbies', 'Herbies Seeds', ['herbiesheadshop']),
+    ('ilgm', 'ILGM', ['ilgm']),
+    ('mephisto_genetics', 'Mephisto Genetics', ['mephistogenetics']),
+    ('multiverse_beans', 'Multiverse Beans', ['multiversebeans']),
+    ('neptune', 'Neptune', ['neptuneseedbank']),
+    ('north_atlantic', 'North Atlantic', ['northatlanticseed']),
+    ('royal_queen_seeds', 'Royal Queen Seeds', ['royalqueenseeds']),
+    ('seed_supreme', 'Seed Supreme', ['seedsupreme']),
+    ('seeds_here_now', 'Seeds Here Now', ['seedsherenow']),
+    ('seedsman', 'Seedsman', ['seedsman']),
+    ('sensi_seeds', 'Sensi Seeds', ['sensiseeds'])
+]
+
+# Missing or non-URL values (e.g. 'Unknown' in the JS inventory) vs. a URL from an unregistered site
+UNKNOWN = 'Unknown'
+OTHER = 'Other'
+
+# Two-label public suffixes seen in the archive; everything else is treated as a single-label TLD
+MULTI_LABEL_SUFFIXES = {'co.uk', 'org.uk', 'com.au', 'co.nz', 'co.za', 'com.br', 'com.mx'}
+
+HOST_DELIMITERS = re.compile(r'[:?#]')
+MAX_CACHED_HOSTS = 10000
+
+
+def _compile(registry):
+    """label -> [(path_prefix, slug), ...] with the longest prefixes first"""
+    rules = {}
+    for slug, _, entries in registry:
+        for entry in entries:
+            label, _, path = entry.lower().partition('/')
+            rules.setdefault(label, []).append(('/' + path if path else '', slug))
+    for label in rules:
+        rules[label].sort(key=lambda rule: len(rule[0]), reverse=True)
+    return rules
+
+
+_RULES = _compile(SEED_BANKS)
+_PATH_LABELS = {label for label, rules in _RULES.items() if any(prefix for prefix, _ in rules)}
+_NAMES = {slug: name for slug, name, _ in SEED_BANKS}
+_CACHE = {'name': {}, 'slug': {}}
+SLUGS = [slug for slug, _, _ in SEED_BANKS]
+
+
+def domain_label(host):
+    """Registrable label of a hostname: 'www.cannabis-seeds-bank.co.uk' -> 'cannabis-seeds-bank'"""
+    labels = host.lower().rstrip('.').split('.')
+    if len(labels) < 2:
+        return None
+    if len(labels) >= 3 and '.'.join(labels[-2:]) in MULTI_LABEL_SUFFIXES:
+        return labels[-3]
+    return labels[-2]
+
+
+def _match(label, path=''):
+    for prefix, slug in _RULES.get(label, ()):
+        if path.lower().startswith(prefix):
+            return slug
+    return None
+
+
+def _label_for(slug, label):
+    if slug is None:
+        return OTHER
+    return _NAMES[slug] if label == 'name' else slug
+
+
+def _resolve_netloc(netloc, label):
+    """(result, None) when the host alone decides, (None, domain_label) when path rules apply"""
+    host = HOST_DELIMITERS.split(netloc.rpartition('@')[2], 1)[0]
+    if '.' not in host:
+        return UNKNOWN, None
+    host_label = domain_label(host)
+    if host_label in _PATH_LABELS:
+        return None, host_label
+    return _label_for(_match(host_label), label), None
+
+
+def classify_url(url, label='name'):
+    """Seed bank of one URL: display name (label='name') or pipeline slug (label='slug')"""
+    if not isinstance(url, str):
+        return UNKNOWN
+    url = url.strip()
+    _, sep, rest = url.partition('://')
+    netloc, _, path = (rest if sep else url).partition('/')
+
+    # Archives hold a few dozen distinct hosts, so almost every call is one dict hit
+    cache = _CACHE[label]
+    hit = cache.get(netloc)
+    if hit is None:
+        if len(cache) >= MAX_CACHED_HOSTS:
+            cache.clear()
+        hit = cache[netloc] = _resolve_netloc(netloc, label)
+
+    result, path_label = hit
+    if path_label is not None:
+        return _label_for(_match(path_label, '/' + path), label)
+    return result
+
+
+def classify_series(urls, label='name'):
+    """Vectorized classify_url for a Series of URLs (index preserved)"""
+    urls = pd.Series(urls)
+    return pd.Series([classify_url(url, label) for url in urls.to_numpy(dtype=object)],
+                     index=urls.index, dtype=object)
+
+
+def bank_mask(urls, slug):
+    """Boolean Series selecting one seed bank's URLs (replaces per-script str.contains filters)"""
+    if slug not in _NAMES:
+        raise ValueError(f"Unknown seed bank slug '{slug}' - add it to SEED_BANKS")
+    return classify_series(urls, label='slug') == slug
@@ -53,32 +53,64 @@ function trackEvent(eventName, params = {}) {
     }
 }
 
-// Load inventory data (mock for now - will be populated from Lambda)
+// Seed bank counts if the API is unreachable
+const FALLBACK_SEED_BANKS = [
+    { name: 'Attitude Seed Bank', count: 7673 },
+    { name: 'Crop King', count: 3336 },
+    { name: 'North Atlantic', count: 2727 },
+    { name: 'Gorilla Seed Bank', count: 2009 },
+    { name: 'Neptune', count: 1995 },
+    { name: 'Seedsman', count: 866 },
+    { name: 'Multiverse Beans', count: 799 },
+    { name: 'Herbies Seeds', count: 753 },
+    { name: 'Sensi Seeds', count: 620 },
+    { name: 'Seed Supreme', count: 353 },
+    { name: 'Mephisto Genetics', count: 245 },
+    { name: 'Exotic Genetix', count: 227 },
+    { name: 'Amsterdam Marijuana', count: 163 },
+    { name: 'ILGM', count: 133 },
+    { name: 'Barney\'s Farm', count: 88 },
+    { name: 'Royal Queen Seeds', count: 67 },
+    { name: 'Dutch Passion', count: 44 },
+    { name: 'Seeds Here Now', count: 43 },
+    { name: 'Great Lakes Genetics', count: 16 },
+    { name: 'Compound Genetics', count: 1 }
+];
+
+// Strain search: wait for a pause in typing, ignore out-of-order responses
+const SEARCH_DEBOUNCE_MS = 150;
+const SEARCH_MIN_LENGTH = 2;
+const SEARCH_LIMIT = 10;
+let searchTimer = null;
+let searchRequestId = 0;
+
+// POST a JSON body to the lookup Lambda
+async function callApi(body) {
+    const response = await fetch(API_ENDPOINT, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(body)
+    });
+    const data = await response.json();
+    if (!response.ok) {
+        throw new Error(data.error || 'Request failed');
+    }
+    return data;
+}
+
+// Load seed bank counts for the filter dropdown from the Lambda
 async function loadInventory() {
-    // TODO: Replace with actual API call to get inventory summary
-    // For now, populate seed banks manually
-    const seedBanks = [
-        { name: 'Attitude Seed Bank', count: 7673 },
-        { name: 'Crop King', count: 3336 },
-        { name: 'North Atlantic', count: 2727 },
-        { name: 'Gorilla Seed Bank', count: 2009 },
-        { name: 'Neptune', count: 1995 },
-        { name: 'Seedsman', count: 866 },
-        { name: 'Multiverse Beans', count: 799 },
-        { name: 'Herbies Seeds', count: 753 },
-        { name: 'Sensi Seeds', count: 620 },
-        { name: 'Seed Supreme', count: 353 },
-        { name: 'Mephisto Genetics', count: 245 },
-        { name: 'Exotic Genetix', count: 227 },
-        { name: 'Amsterdam Marijuana', count: 163 },
-        { name: 'ILGM', count: 133 },
-        { name: 'Barney\'s Farm', count: 88 },
-        { name: 'Royal Queen Seeds', count: 67 },
-        { name: 'Dutch Passion', count: 44 },
-        { name: 'Seeds Here Now', count: 43 },
-        { name: 'Great Lakes Genetics', count: 16 },
-        { name: 'Compound Genetics', count: 1 }
-    ];
+    let seedBanks = FALLBACK_SEED_BANKS;
+    try {
+        const data = await callApi({ seed_banks: true });
+        if (data.seed_banks && data.seed_banks.length) {
+            seedBanks = data.seed_banks;
+        }
+    } catch (error) {
+        console.warn('Seed bank list unavailable, using built-in counts:', error.message);
+    }
     
     // Populate dropdown
     seedBanks.forEach(bank => {
@@ -100,27 +132,77 @@ function handleFilterChange() {
         statusDiv.classList.add('hidden');
     }
     searchResults.classList.add('hidden');
+    handleStrainSearch();
 }
 
-// Handle strain search
+// Handle strain search (debounced typeahead against the Lambda's search index)
 function handleStrainSearch() {
-    const query = strainSearch.value.trim().toLowerCase();
+    clearTimeout(searchTimer);
+    const query = strainSearch.value.trim();
     
-    if (query.length < 3) {
+    if (query.length < SEARCH_MIN_LENGTH) {
+        searchRequestId++;
         searchResults.classList.add('hidden');
         return;
     }
     
-    trackEvent('strain_search', { query: query });
+    searchTimer = setTimeout(() => runStrainSearch(query), SEARCH_DEBOUNCE_MS);
+}
+
+async function runStrainSearch(query) {
+    const requestId = ++searchRequestId;
+    const seedBank = seedBankFilter.value;
     
-    // TODO: Replace with actual search API call
-    // For now, show placeholder message
-    searchResults.innerHTML = `
-        <p class="search-placeholder">
-            🔍 Searching for "${query}"...<br>
-            <small>Full search functionality will be available after Lambda deployment.</small>
-        </p>
-    `;
+    try {
+        const data = await callApi({ search: query, seed_bank: seedBank || null, limit: SEARCH_LIMIT });
+        if (requestId !== searchRequestId) return;
+        trackEvent('strain_search', { query: query, seed_bank: seedBank || 'all', results: data.results.length });
+        renderSearchResults(query, data.results);
+    } catch (error) {
+        if (requestId !== searchRequestId) return;
+        renderSearchMessage(`❌ Search failed: ${error.message}`);
+    }
+}
+
+// Render results with textContent only - names and queries are untrusted text
+function renderSearchResults(query, results) {
+    if (!results.length) {
+        renderSearchMessage(`No archived strains match "${query}".`);
+        return;
+    }
+    
+    const list = document.createElement('ul');
+    list.className = 'search-result-list';
+    results.forEach(result => {
+        const item = document.createElement('li');
+        const button = document.createElement('button');
+        button.type = 'button';
+        button.className = 'search-result';
+        
+        const name = document.createElement('strong');
+        name.textContent = result.name;
+        const details = document.createElement('small');
+        details.textContent = [result.breeder, result.seed_bank].filter(Boolean).join(' · ');
+        button.append(name, document.createElement('br'), details);
+        
+        button.addEventListener('click', () => {
+            trackEvent('strain_search_select', { seed_bank: result.seed_bank });
+            urlInput.value = result.url;
+            searchResults.classList.add('hidden');
+            handleLookup();
+        });
+        item.appendChild(button);
+        list.appendChild(item);
+    });
+    searchResults.replaceChildren(list);
+    searchResults.classList.remove('hidden');
+}
+
+function renderSearchMessage(message) {
+    const paragraph = document.createElement('p');
+    paragraph.className = 'search-placeholder';
+    paragraph.textContent = message;
+    searchResults.replaceChildren(paragraph);
     searchResults.classList.remove('hidden');
 }
 
@@ -149,26 +231,19 @@ async function handleLookup() {
     hideViewer();
     
     try {
-        const response = await fetch(API_ENDPOINT, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({ url })
-        });
-        
-        const data = await response.json();
-        
-        if (!response.ok) {
-            trackEvent('lookup_error', { error: data.error, url: url });
-            throw new Error(data.error || 'Failed to lookup URL');
+        let data;
+        try {
+            data = await callApi({ url });
+        } catch (error) {
+            trackEvent('lookup_error', { error: error.message, url: url });
+            throw error;
         }
         
         // Success - display results
         trackEvent('lookup_success', { seed_bank: data.seed_bank, url: url });
         showStatus('✅ Source HTML found! Loading archive...', 'success');
         displayMetadata(data);
-        displayHTML(data.signed_url);
+        displayHTML(data.signed_url, data.expires_in_minutes);
         
     } catch (error) {
         showStatus(`❌ Error: ${error.message}`, 'error');
@@ -194,12 +269,12 @@ function displayMetadata(data) {
 }
 
 // Display HTML in iframe
-function displayHTML(signedUrl) {
+function displayHTML(signedUrl, expiresInMinutes) {
     htmlViewer.src = signedUrl;
     viewerContainer.classList.remove('hidden');
     
     // Start expiration countdown
-    startExpirationTimer(5);
+    startExpirationTimer(expiresInMinutes || 5);
 }
 
 // Hide metadata
@@ -0,0 +1,96 @@
+"""
+Batch Lookup for the Source-of-Truth Lambda
+Resolves a list of URLs or url_hashes against the inventory and signs them in one invocation
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Request body: {"urls": [...]} or {"url_hashes": [...]}, at most
+MAX_BATCH_ITEMS entries. Every entry gets a result in input order, either
+the signed page or an error, so one bad URL never fails the batch.
+
+Responses stay under MAX_RESPONSE_BYTES (Lambda's synchronous limit is
+6 MB). If the results would not fit, the response ends early with
+"truncated": true and "next_offset"; resend items[next_offset:] for the rest.
+"""
+
+import json
+
+MAX_BATCH_ITEMS = 500
+MAX_RESPONSE_BYTES = 5 * 1024 * 1024
+
+# Room for the envelope (counts, legal notice) around the results list
+ENVELOPE_BYTES = 1024
+
+BATCH_FIELDS = {'urls': 'lookup_url', 'url_hashes': 'lookup_hash'}
+
+
+def is_batch(body):
+    return any(field in body for field in BATCH_FIELDS)
+
+
+def parse_batch(body, max_items=MAX_BATCH_ITEMS):
+    """(field, items) from a request body; raises ValueError with a client-facing message"""
+    fields = [field for field in BATCH_FIELDS if field in body]
+    if len(fields) != 1:
+        raise ValueError('Send either "urls" or "url_hashes", not both')
+    field = fields[0]
+    items = body[field]
+    if not isinstance(items, list) or not items:
+        raise ValueError(f'"{field}" must be a non-empty list')
+    if len(items) > max_items:
+        raise ValueError(f'"{field}" has {len(items)} entries; the limit is {max_items} per request')
+    return field, items
+
+
+def resolve_batch(inventory, signed_urls, field, items, max_response_bytes=MAX_RESPONSE_BYTES):
+    """Response payload with one result per item, in input order"""
+    lookup = getattr(inventory, BATCH_FIELDS[field])
+    resolved = {}
+    results = []
+    size = ENVELOPE_BYTES
+    found = 0
+
+    for position, item in enumerate(items):
+        if not isinstance(item, str) or not item.strip():
+            result = {'input': item, 'error': 'Expected a non-empty string'}
+        else:
+            key = item.strip()
+            # Duplicates within a batch cost one lookup and one signature
+            if key not in resolved:
+                resolved[key] = _resolve(lookup, signed_urls, key)
+            result = {'input': item, **resolved[key]}
+
+        result_size = len(json.dumps(result)) + 2
+        if size + result_size > max_response_bytes:
+            return _payload(results, found, len(items), next_offset=position)
+        size += result_size
+        results.append(result)
+        found += 'signed_url' in result
+
+    return _payload(results, found, len(items))
+
+
+def _resolve(lookup, signed_urls, key):
+    strain_data = lookup(key)
+    if strain_data is None:
+        return {'error': 'Not found in inventory'}
+    try:
+        signed_url, expires_in_seconds = signed_urls.get(strain_data['s3_html_key'])
+    except Exception as e:
+        return {'error': f'Failed to generate signed URL: {str(e)}'}
+    return {
+        'signed_url': signed_url,
+        'seed_bank': strain_data['seed_bank'],
+        'collection_date': strain_data['collection_date'],
+        'expires_in_minutes': expires_in_seconds // 60
+    }
+
+
+def _payload(results, found, requested, next_offset=None):
+    return {
+        'results': results,
+        'requested': requested,
+        'found': found,
+        'errors': len(results) - found,
+        'truncated': next_offset is not None,
+        'next_offset': next_offset
+    }
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Signed URL Throughput Benchmark
+Signatures/sec for the per-request signer vs the cached key/signer and signed-URL reuse
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Runs offline with a throwaway 2048-bit RSA key in place of the Secrets
+Manager secret; no AWS calls are made.
+
+  per_request  - parse PEM + new CloudFrontSigner on every call (previous code)
+  cached       - cached key and signer, every call signs (first lookup of a page)
+  reuse        - repeat lookups of a small set of pages through SignedUrlCache
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+from botocore.signers import CloudFrontSigner
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+# Importing the handler module must not need credentials or a region
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+import lookup_function  # noqa: E402
+
+
+def test_private_key_pem():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL,
+                             serialization.NoEncryption()).decode('utf-8')
+
+
+def per_request_signed_url(s3_key, private_key_pem):
+    def signer(message):
+        private_key = serialization.load_pem_private_key(private_key_pem.encode('utf-8'), password=None,
+                                                         backend=default_backend())
+        return private_key.sign(message, padding.PKCS1v15(), hashes.SHA1())
+
+    url = f"https://{lookup_function.CLOUDFRONT_DOMAIN}/{s3_key}"
+    expire_date = datetime.utcnow() + timedelta(minutes=5)
+    return CloudFrontSigner(lookup_function.CLOUDFRONT_KEY_PAIR_ID, signer).generate_presigned_url(
+        url, date_less_than=expire_date)
+
+
+def rate(fn, seconds):
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn(f"html/{calls:016x}.html")
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CloudFront URL signing in lookup_function')
+    parser.add_argument('--seconds', type=float, default=3.0, help='Duration of each run')
+    parser.add_argument('--pages', type=int, default=50, help='Distinct pages in the reuse run')
+    args = parser.parse_args()
+
+    pem = test_private_key_pem()
+    lookup_function._private_key_cache = pem
+
+    results = {
+        'per_request': rate(lambda key: per_request_signed_url(key, pem), args.seconds),
+        'cached': rate(lookup_function.generate_signed_url, args.seconds),
+        'reuse': rate(lambda key: lookup_function.signed_urls.get(f"html/{int(key[5:21], 16) % args.pages:016x}.html"),
+                      args.seconds)
+    }
+
+    baseline = results['per_request']
+    print(f"{'mode':<12} {'URLs/sec':>12} {'speedup':>8}")
+    for mode, per_second in results.items():
+        print(f"{mode:<12} {per_second:>12,.0f} {per_second / baseline:>7.1f}x")
+    cache = lookup_function.signed_urls
+    print(f"\nreuse run: {cache.hits} hits, {cache.misses} signatures")
+
+
+if __name__ == "__main__":
+    main()
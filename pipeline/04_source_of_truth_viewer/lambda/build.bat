@@ -6,19 +6,34 @@ REM Create temp directory for dependencies
 if exist package rmdir /s /q package
 mkdir package
 
-REM Install dependencies
+REM Install dependencies (boto3/botocore come from the Lambda runtime)
 echo Installing dependencies...
 pip install -r requirements.txt -t package
+REM Optional: pin the SDK instead of using the runtime's
+if "%BUNDLE_SDK%"=="true" pip install boto3==1.34.34 -t package
 
 REM Copy Lambda function
 echo Copying Lambda function...
 copy lookup_function.py package\
+copy inventory_cache.py package\
+copy signed_url_cache.py package\
+copy batch_lookup.py package\
+copy strain_search.py package\
+copy ..\..\03_s3_inventory\scripts\lookup_table.py package\
+REM Optional: ship the lookup table in the package (no S3 download on cold start)
+if "%BUNDLE_INVENTORY%"=="true" copy ..\..\03_s3_inventory\s3_inventory.bin package\
+if "%BUNDLE_INVENTORY%"=="true" if exist strain_search.json.gz copy strain_search.json.gz package\
+
+REM Drop pip metadata, bytecode and unused botocore service models
+echo Slimming package...
+python slim_package.py package --measure-init lookup_function
 
 REM Create ZIP file
 echo Creating deployment package...
 cd package
 powershell Compress-Archive -Path * -DestinationPath ..\lambda-deployment.zip -Force
 cd ..
+python slim_package.py package --report-only --zip lambda-deployment.zip
 
 REM Cleanup
 echo Cleaning up...
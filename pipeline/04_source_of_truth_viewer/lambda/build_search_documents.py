@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Build the Viewer's Strain Search Documents
+Joins the Phase 11 clean dataset with the S3 inventory into strain_search.json.gz for the Lambda
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Only strains whose source page is in the archive are searchable (the viewer
+can only open archived pages). Seed bank labels and the dropdown counts
+come from the inventory, so search results, the filter and lookups agree.
+
+Output is columnar JSON (field list + one row per strain, seed banks as
+indexes into the counts table), gzipped: a few hundred KB for ~20k strains.
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import re
+import sys
+
+import boto3
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '03_s3_inventory', 'scripts'))
+from inventory_index import InventoryIndex
+from seed_bank_classifier import OTHER, UNKNOWN, classify_series
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '05_master_dataset', 'scripts'))
+from table_io import read_table
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CLEAN_DATASET = os.path.join(BASE_DIR, '..', '..', '11_manual_review_and_validation', 'output', 'pipeline_11_clean.csv')
+OUTPUT_FILE = os.path.join(BASE_DIR, 'strain_search.json.gz')
+
+BUCKET = 'ci-strains-html-archive'
+SEARCH_DOCUMENTS_KEY = 'pipeline/04_source_of_truth_viewer/strain_search.json.gz'
+
+FIELDS = ['name', 'slug', 'breeder', 'seed_bank', 'url']
+
+# First usable column wins (manual review columns, then earlier-phase names)
+NAME_COLUMNS = ['strain_name_display_manual', 'strain_name_display', 'strain_name_raw']
+BREEDER_COLUMNS = ['breeder_display_manual', 'breeder_displayl', 'breeder_display']
+SLUG_COLUMNS = ['strain_name_slug']
+
+# Spreadsheet artefacts and numeric placeholders are not names
+UNUSABLE = re.compile(r'^(#NAME\?|#VALUE!|#REF!|nan|none|\d+)$', re.IGNORECASE)
+
+
+def first_usable(df, columns):
+    values = pd.Series(pd.NA, index=df.index, dtype=object)
+    for column in columns:
+        if column not in df.columns:
+            continue
+        candidate = df[column].astype('string').str.strip()
+        usable = candidate.notna() & (candidate != '') & ~candidate.str.match(UNUSABLE, na=False)
+        values = values.where(values.notna(), candidate.where(usable))
+    return values
+
+
+def slugify(names):
+    return names.str.lower().str.replace(r'[^a-z0-9]+', '-', regex=True).str.strip('-')
+
+
+def build_documents(clean_file=CLEAN_DATASET):
+    df = read_table(clean_file)
+    logger.info(f"Loaded {len(df):,} strains from {clean_file}")
+
+    strains = pd.DataFrame({
+        'name': first_usable(df, NAME_COLUMNS),
+        'breeder': first_usable(df, BREEDER_COLUMNS).fillna(''),
+        'url': df['source_url_raw']
+    })
+    slugs = first_usable(df, SLUG_COLUMNS)
+    strains = strains[strains['name'].notna() & strains['url'].notna()]
+    strains['slug'] = slugs.reindex(strains.index).fillna(slugify(strains['name']))
+
+    with InventoryIndex() as inventory:
+        archived = inventory.keys_for_urls(strains['url'])
+        seed_bank_counts = inventory.seed_bank_counts()
+    strains = strains[strains['url'].isin(archived)].drop_duplicates('url')
+    strains['seed_bank'] = classify_series(strains['url'])
+    logger.info(f"{len(strains):,} strains have an archived source page")
+
+    seed_banks = {bank: count for bank, count in seed_bank_counts.items() if bank and bank not in (UNKNOWN, OTHER)}
+    for bank in strains['seed_bank'].unique():
+        seed_banks.setdefault(bank, 0)
+    bank_index = {bank: i for i, bank in enumerate(seed_banks)}
+    strains['seed_bank'] = strains['seed_bank'].map(bank_index)
+
+    strains = strains.sort_values('name', key=lambda names: names.str.lower())
+    return {
+        'fields': FIELDS,
+        'seed_banks': seed_banks,
+        'strains': strains[FIELDS].values.tolist()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build strain_search.json.gz for the viewer search box')
+    parser.add_argument('--clean-dataset', default=CLEAN_DATASET)
+    parser.add_argument('--upload', action='store_true', help=f'Upload to s3://{BUCKET}/{SEARCH_DOCUMENTS_KEY}')
+    args = parser.parse_args()
+
+    payload = build_documents(args.clean_dataset)
+    data = gzip.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+
+    tmp_file = OUTPUT_FILE + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_file, OUTPUT_FILE)
+    logger.info(f"Wrote {OUTPUT_FILE} ({len(payload['strains']):,} strains, {len(data) / 1024:.0f} KB)")
+
+    if args.upload:
+        boto3.client('s3').upload_file(OUTPUT_FILE, BUCKET, SEARCH_DOCUMENTS_KEY)
+        logger.info(f"Uploaded to s3://{BUCKET}/{SEARCH_DOCUMENTS_KEY}")
+
+
+if __name__ == "__main__":
+    main()
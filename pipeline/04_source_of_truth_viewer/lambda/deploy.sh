@@ -11,6 +11,8 @@ echo "🚀 Starting Lambda deployment..."
 FUNCTION_NAME="ci-strains-lookup"
 REGION="us-east-1"
 RUNTIME="python3.12"
+# Only used with BUNDLE_SDK=true; otherwise the runtime's boto3 is used
+BOTO3_VERSION="1.34.34"
 
 # Clean previous builds
 echo "🧹 Cleaning previous builds..."
@@ -21,19 +23,39 @@ rm -f lambda_deployment.zip
 echo "📦 Creating deployment package..."
 mkdir -p package
 
-# Install dependencies
+# Install dependencies (boto3/botocore come from the Lambda runtime)
 echo "📥 Installing dependencies..."
 pip install -r requirements.txt -t package/ --quiet
+if [ "$BUNDLE_SDK" = "true" ]; then
+    pip install "boto3==$BOTO3_VERSION" -t package/ --quiet
+fi
 
 # Copy Lambda function
 echo "📄 Adding Lambda function..."
 cp lookup_function.py package/
+cp inventory_cache.py package/
+cp signed_url_cache.py package/
+cp batch_lookup.py package/
+cp strain_search.py package/
+cp ../../03_s3_inventory/scripts/lookup_table.py package/
+# Optional: ship the lookup table in the package (no S3 download on cold start)
+if [ "$BUNDLE_INVENTORY" = "true" ]; then
+    cp ../../03_s3_inventory/s3_inventory.bin package/
+    if [ -f strain_search.json.gz ]; then
+        cp strain_search.json.gz package/
+    fi
+fi
+
+# Drop pip metadata, bytecode and unused botocore service models
+echo "🧹 Slimming package..."
+python slim_package.py package --measure-init lookup_function
 
 # Create deployment zip
 echo "🗜️  Creating deployment archive..."
 cd package
 zip -r ../lambda_deployment.zip . -q
 cd ..
+python slim_package.py package --report-only --zip lambda_deployment.zip
 
 # Upload to Lambda
 echo "☁️  Uploading to AWS Lambda..."
@@ -0,0 +1,82 @@
+"""
+Warm-Container Inventory Cache for the Lookup Lambda
+Keeps the downloaded lookup table open across invocations and revalidates it by ETag
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+A Lambda container serves many requests. The inventory is downloaded once
+per container and held at module level; after INVENTORY_TTL_SECONDS the
+next request sends one HeadObject and only re-downloads when the ETag has
+changed. If S3 cannot be reached the cached copy keeps serving.
+
+Set PREWARM_INVENTORY=true to load it during init (outside the first
+request's latency). A table bundled into the deployment package
+(BUNDLE_INVENTORY=true in build.bat / deploy.sh) is used as-is, with no S3
+request at all; it is refreshed by redeploying.
+
+The S3 client is passed as a getter and only created on first download, so
+a container serving a bundled table never imports boto3.
+"""
+
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 300
+
+
+class BundledInventory:
+    def __init__(self, index):
+        self.index = index
+
+    def get(self):
+        return self.index
+
+
+class CachedInventory:
+    def __init__(self, get_s3_client, bucket, key, opener, local_dir='/tmp', ttl_seconds=DEFAULT_TTL_SECONDS):
+        """get_s3_client() returns the boto3 S3 client; opener(local_path) returns the object that answers lookup_url()"""
+        self.get_s3_client = get_s3_client
+        self.bucket = bucket
+        self.key = key
+        self.opener = opener
+        self.local_dir = local_dir
+        self.ttl_seconds = ttl_seconds
+        self.index = None
+        self.etag = None
+        self.local_path = None
+        self.checked_at = 0.0
+
+    def _download(self, etag):
+        # New file per ETag, so the old one stays readable until the swap
+        stem, suffix = os.path.splitext(os.path.basename(self.key))
+        local_path = os.path.join(self.local_dir, f"{stem}.{etag}{suffix}")
+        self.get_s3_client().download_file(self.bucket, self.key, local_path)
+        index = self.opener(local_path)
+
+        previous, previous_path = self.index, self.local_path
+        self.index, self.etag, self.local_path = index, etag, local_path
+        if previous is not None:
+            previous.close()
+            if previous_path != local_path and os.path.exists(previous_path):
+                os.remove(previous_path)
+        logger.info(f"Loaded s3://{self.bucket}/{self.key} (ETag {etag})")
+
+    def get(self):
+        """Open inventory, downloaded on first use and revalidated once per TTL"""
+        now = time.monotonic()
+        if self.index is not None and now - self.checked_at < self.ttl_seconds:
+            return self.index
+
+        try:
+            etag = self.get_s3_client().head_object(Bucket=self.bucket, Key=self.key)['ETag'].strip('"')
+            if etag != self.etag:
+                self._download(etag)
+        except Exception as e:
+            if self.index is None:
+                raise
+            logger.warning(f"Inventory revalidation failed, serving cached copy: {e}")
+
+        self.checked_at = now
+        return self.index
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Local Load Test for the Lookup Lambda
+Cold start, p50/p95/p99 latency and memory for lookup_function / lookup_function_simple without AWS
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Each handler runs in its own process from a temporary task directory laid
+out like the deployment package. boto3 is replaced by in-memory stand-ins
+for S3 and Secrets Manager, seeded with a synthetic 22k-row inventory
+table, strain search documents and a throwaway RSA key (fixtures are built
+once into --fixtures and reused). botocore's CloudFrontSigner and the
+signing library are the real ones.
+
+  cold start   module import (init, with the deployed pre-warm settings)
+               plus the first lookup: inventory download, secret fetch,
+               key parse and the first signature
+  load         --requests handler calls from --concurrency threads, mixed
+               hits (skewed towards popular pages), misses, malformed
+               bodies and search queries; every response's status code is
+               checked against the request kind
+  memory       peak RSS of the worker after cold start and after the load
+
+  python load_test.py
+  python load_test.py --handler lookup_function_simple --requests 20000 --concurrency 16
+  python load_test.py --bundled --aws-latency-ms 20 --json results.json
+
+Run it before deploying any caching or indexing change to the viewer
+backend and compare against the previous numbers.
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(BASE_DIR, '..', '..', '03_s3_inventory', 'scripts')
+sys.path.append(SCRIPTS_DIR)
+
+HANDLERS = ['lookup_function', 'lookup_function_simple']
+# Modules build.bat / deploy.sh put next to the handler
+PACKAGE_MODULES = ['inventory_cache.py', 'signed_url_cache.py', 'batch_lookup.py', 'strain_search.py']
+
+BUCKET = 'ci-strains-html-archive'
+INVENTORY_TABLE_KEY = 'pipeline/03_s3_inventory/s3_inventory.bin'
+SEARCH_DOCUMENTS_KEY = 'pipeline/04_source_of_truth_viewer/strain_search.json.gz'
+SECRET_NAME = 'cloudfront_private_key'
+
+DEFAULT_FIXTURES = os.path.join(tempfile.gettempdir(), 'ci_lookup_load_test')
+DEFAULT_ROWS = 22000
+DEFAULT_MIX = 'hit=70,miss=15,malformed=10,search=5'
+EXPECTED_STATUS = {'hit': 200, 'miss': 404, 'malformed': 400, 'search': 200}
+
+# Share of the inventory per seed bank (slug -> approximate strain count)
+BANK_WEIGHTS = {
+    'attitude': 7673, 'crop_king': 3336, 'north_atlantic': 2727, 'gorilla': 2009, 'neptune': 1995,
+    'seedsman': 866, 'multiverse_beans': 799, 'herbies': 753, 'sensi_seeds': 620, 'seed_supreme': 353,
+    'mephisto_genetics': 245, 'exotic': 227, 'amsterdam': 163, 'ilgm': 133, 'barneys_farm': 88,
+    'royal_queen_seeds': 67, 'dutch_passion': 44, 'seeds_here_now': 43, 'great_lakes_genetics': 16,
+    'compound': 1
+}
+NAME_WORDS = ['OG', 'Kush', 'Blue', 'Dream', 'Purple', 'Haze', 'Gelato', 'Cookies', 'Diesel', 'Runtz',
+              'Zkittlez', 'Widow', 'Skunk', 'Cake', 'Lemon', 'Cherry', 'Mango', 'Glue', 'Punch', 'Auto']
+BREEDERS = ['Barney\'s Farm', 'Dutch Passion', 'Mephisto Genetics', 'Sensi Seeds', 'Seedsman',
+            'Humboldt Seed Co', 'DNA Genetics', 'Compound Genetics', 'In House', 'Ethos']
+MALFORMED_BODIES = ['{not json', '{}', json.dumps({'url': '   '}), json.dumps({'urls': 'not-a-list'}),
+                    json.dumps({'urls': ['a'], 'url_hashes': ['b']}), json.dumps({'search': 'og', 'limit': 'ten'})]
+POPULAR_PAGES = 200
+
+
+# --- Fixtures -------------------------------------------------------------
+
+def build_fixtures(fixtures_dir, rows=DEFAULT_ROWS, seed=7):
+    """Inventory table, search documents, test key and hit URLs in fixtures_dir"""
+    from lookup_table import build_lookup_table
+    from seed_bank_classifier import SEED_BANKS
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    rng = random.Random(seed)
+    banks = {slug: (name, labels[0]) for slug, name, labels in SEED_BANKS}
+    slugs = list(BANK_WEIGHTS)
+
+    inventory, documents, urls = [], [], []
+    for i in range(rows):
+        slug = rng.choices(slugs, weights=[BANK_WEIGHTS[s] for s in slugs])[0]
+        bank_name, label = banks[slug]
+        name = ' '.join(rng.sample(NAME_WORDS, rng.randint(2, 3))) + (f" #{i % 97}" if i % 5 == 0 else '')
+        page = name.lower().replace(' ', '-').replace('#', '')
+        url = f"https://www.{label}.com/product/{page}-{i}/"
+        url_hash = hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+        source = 'js' if i % 10 == 0 else 'html'
+        folder = 'html_js' if source == 'js' else 'html'
+        date = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        inventory.append((url_hash, url, f"{folder}/{url_hash}.html", bank_name, date, 'requests', 50000, source))
+        documents.append([name, page, rng.choice(BREEDERS), bank_name, url])
+        urls.append(url)
+
+    db_file = os.path.join(fixtures_dir, 's3_inventory.db')
+    if os.path.exists(db_file):
+        os.remove(db_file)
+    conn = sqlite3.connect(db_file)
+    conn.execute("""CREATE TABLE inventory (url_hash TEXT NOT NULL, url TEXT, s3_html_key TEXT NOT NULL,
+                    seed_bank TEXT, collection_date TEXT, scrape_method TEXT, html_size INTEGER, source TEXT NOT NULL)""")
+    conn.executemany("INSERT INTO inventory VALUES (?, ?, ?, ?, ?, ?, ?, ?)", inventory)
+    conn.commit()
+    conn.close()
+    build_lookup_table(db_file, os.path.join(fixtures_dir, 's3_inventory.bin'))
+
+    bank_counts = {}
+    for document in documents:
+        bank_counts[document[3]] = bank_counts.get(document[3], 0) + 1
+    bank_index = {bank: i for i, bank in enumerate(bank_counts)}
+    payload = {
+        'fields': ['name', 'slug', 'breeder', 'seed_bank', 'url'],
+        'seed_banks': bank_counts,
+        'strains': [[name, page, breeder, bank_index[bank], url] for name, page, breeder, bank, url in documents]
+    }
+    with open(os.path.join(fixtures_dir, 'strain_search.json.gz'), 'wb') as f:
+        f.write(gzip.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8')))
+
+    key_file = os.path.join(fixtures_dir, 'cloudfront_test_key.pem')
+    if not os.path.exists(key_file):
+        import rsa
+        _, private_key = rsa.newkeys(2048)
+        with open(key_file, 'wb') as f:
+            f.write(private_key.save_pkcs1())
+
+    with open(os.path.join(fixtures_dir, 'urls.json'), 'w') as f:
+        json.dump({'urls': urls, 'names': [document[0] for document in documents]}, f)
+
+
+def fixtures_ready(fixtures_dir):
+    return all(os.path.exists(os.path.join(fixtures_dir, name))
+               for name in ['s3_inventory.bin', 'strain_search.json.gz', 'cloudfront_test_key.pem', 'urls.json'])
+
+
+# --- AWS stand-ins --------------------------------------------------------
+
+class FakeClientError(Exception):
+    pass
+
+
+class FakeS3:
+    def __init__(self, objects, latency):
+        self.objects = objects
+        self.latency = latency
+        self.calls = 0
+
+    def _get(self, bucket, key):
+        self.calls += 1
+        time.sleep(self.latency)
+        if (bucket, key) not in self.objects:
+            raise FakeClientError(f"NoSuchKey: s3://{bucket}/{key}")
+        return self.objects[(bucket, key)]
+
+    def head_object(self, Bucket, Key):
+        data = self._get(Bucket, Key)
+        return {'ETag': f'"{hashlib.md5(data).hexdigest()}"', 'ContentLength': len(data)}
+
+    def get_object(self, Bucket, Key):
+        return {'Body': io.BytesIO(self._get(Bucket, Key))}
+
+    def download_file(self, Bucket, Key, Filename):
+        data = self._get(Bucket, Key)
+        with open(Filename, 'wb') as f:
+            f.write(data)
+
+
+class FakeSecretsManager:
+    def __init__(self, secrets, latency):
+        self.secrets = secrets
+        self.latency = latency
+        self.calls = 0
+
+    def get_secret_value(self, SecretId):
+        self.calls += 1
+        time.sleep(self.latency)
+        if SecretId not in self.secrets:
+            raise FakeClientError(f"ResourceNotFoundException: {SecretId}")
+        return {'SecretString': self.secrets[SecretId]}
+
+
+def install_fake_boto3(fixtures_dir, latency):
+    """Register a boto3 module whose clients serve the fixtures"""
+    def read(name, mode='rb'):
+        with open(os.path.join(fixtures_dir, name), mode) as f:
+            return f.read()
+
+    s3 = FakeS3({(BUCKET, INVENTORY_TABLE_KEY): read('s3_inventory.bin'),
+                 (BUCKET, SEARCH_DOCUMENTS_KEY): read('strain_search.json.gz')}, latency)
+    secrets = FakeSecretsManager({SECRET_NAME: read('cloudfront_test_key.pem', 'r')}, latency)
+    clients = {'s3': s3, 'secretsmanager': secrets}
+
+    fake = types.ModuleType('boto3')
+    fake.client = lambda service, **kwargs: clients[service]
+    sys.modules['boto3'] = fake
+    return clients
+
+
+# --- Worker (one handler, fresh process) ----------------------------------
+
+def peak_rss_mb():
+    # VmHWM is this process's own high-water mark; ru_maxrss can carry over from the parent across exec
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {'p50': value, 'p95': value, 'p99': value, 'max': value}
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {'p50': cuts[49], 'p95': cuts[94], 'p99': cuts[98], 'max': samples[-1]}
+
+
+def make_requests(fixtures_dir, count, mix, seed):
+    with open(os.path.join(fixtures_dir, 'urls.json')) as f:
+        fixture = json.load(f)
+    urls, names = fixture['urls'], fixture['names']
+    rng = random.Random(seed)
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=count)
+
+    requests = []
+    for i, kind in enumerate(kinds):
+        if kind == 'hit':
+            # Half the traffic goes to a small set of popular pages, as on the live viewer
+            url = urls[rng.randrange(POPULAR_PAGES)] if rng.random() < 0.5 else rng.choice(urls)
+            body = json.dumps({'url': url})
+        elif kind == 'miss':
+            body = json.dumps({'url': f"https://www.northatlanticseed.com/product/not-archived-{i}/"})
+        elif kind == 'malformed':
+            body = rng.choice(MALFORMED_BODIES)
+        else:
+            name = rng.choice(names)
+            body = json.dumps({'search': name[:rng.randint(2, min(len(name), 10))], 'limit': 10})
+        requests.append((kind, {'body': body}))
+    return requests
+
+
+def run_worker(args):
+    clients = install_fake_boto3(args.fixtures, args.aws_latency_ms / 1000)
+    sys.path.insert(0, args.task_dir)
+
+    start = time.perf_counter()
+    handler_module = __import__(args.handler)
+    init_ms = (time.perf_counter() - start) * 1000
+
+    with open(os.path.join(args.fixtures, 'urls.json')) as f:
+        first_url = json.load(f)['urls'][0]
+    start = time.perf_counter()
+    first = handler_module.lambda_handler({'body': json.dumps({'url': first_url})}, None)
+    first_request_ms = (time.perf_counter() - start) * 1000
+    if first['statusCode'] != 200:
+        raise SystemExit(f"First lookup failed: {first['statusCode']} {first['body']}")
+    cold_rss = peak_rss_mb()
+
+    requests = make_requests(args.fixtures, args.requests, parse_mix(args.mix), args.seed)
+    latencies = {kind: [] for kind in EXPECTED_STATUS}
+    unexpected = {kind: 0 for kind in EXPECTED_STATUS}
+    lock = threading.Lock()
+
+    def call(request):
+        kind, event = request
+        start = time.perf_counter()
+        response = handler_module.lambda_handler(event, None)
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies[kind].append(elapsed)
+            unexpected[kind] += response['statusCode'] != EXPECTED_STATUS[kind]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(call, requests))
+    wall = time.perf_counter() - start
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    result = {
+        'handler': args.handler,
+        'cold_start': {'init_ms': init_ms, 'first_request_ms': first_request_ms, 'peak_rss_mb': cold_rss},
+        'load': {
+            'requests': len(requests),
+            'concurrency': args.concurrency,
+            'throughput_rps': len(requests) / wall if wall else 0.0,
+            'peak_rss_mb': peak_rss_mb(),
+            'all': dict(percentiles(all_latencies), count=len(all_latencies), unexpected=sum(unexpected.values())),
+            'by_kind': {kind: dict(percentiles(values), count=len(values), unexpected=unexpected[kind])
+                        for kind, values in latencies.items() if values}
+        },
+        'aws_calls': {service: client.calls for service, client in clients.items()}
+    }
+    print(json.dumps(result))
+
+
+# --- Driver ---------------------------------------------------------------
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(','):
+        kind, _, weight = part.partition('=')
+        if kind.strip() not in EXPECTED_STATUS:
+            raise argparse.ArgumentTypeError(f"Unknown request kind '{kind}' (use {', '.join(EXPECTED_STATUS)})")
+        weights[kind.strip()] = float(weight)
+    return weights
+
+
+def prepare_task_dir(fixtures_dir, bundled):
+    """Temporary directory laid out like the deployment package"""
+    task_dir = tempfile.mkdtemp(prefix='ci_lookup_task_')
+    for name in HANDLERS:
+        shutil.copy(os.path.join(BASE_DIR, f"{name}.py"), task_dir)
+    for name in PACKAGE_MODULES:
+        shutil.copy(os.path.join(BASE_DIR, name), task_dir)
+    shutil.copy(os.path.join(SCRIPTS_DIR, 'lookup_table.py'), task_dir)
+    if bundled:
+        shutil.copy(os.path.join(fixtures_dir, 's3_inventory.bin'), task_dir)
+        shutil.copy(os.path.join(fixtures_dir, 'strain_search.json.gz'), task_dir)
+    return task_dir
+
+
+def run_handler(args, handler, task_dir):
+    command = [sys.executable, os.path.abspath(__file__), '--worker', '--handler', handler,
+               '--task-dir', task_dir, '--fixtures', args.fixtures, '--requests', str(args.requests),
+               '--concurrency', str(args.concurrency), '--mix', args.mix, '--seed', str(args.seed),
+               '--aws-latency-ms', str(args.aws_latency_ms)]
+    # Deployed defaults unless the caller's environment overrides them; the worker owns its /tmp downloads
+    env = dict(os.environ, AWS_DEFAULT_REGION='us-east-1', PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run(command, env=env, capture_output=True, text=True, cwd=task_dir)
+    if result.returncode != 0:
+        raise SystemExit(f"{handler} worker failed:\n{result.stderr or result.stdout}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def format_mb(value):
+    return f"{value:.1f} MB" if value is not None else 'n/a'
+
+
+def print_report(results):
+    for result in results:
+        cold, load = result['cold_start'], result['load']
+        print(f"\n🧪 {result['handler']}")
+        print(f"   Cold start: init {cold['init_ms']:.1f} ms + first lookup {cold['first_request_ms']:.1f} ms "
+              f"= {cold['init_ms'] + cold['first_request_ms']:.1f} ms, peak RSS {format_mb(cold['peak_rss_mb'])}")
+        print(f"   Load: {load['requests']:,} requests x {load['concurrency']} threads, "
+              f"{load['throughput_rps']:,.0f} req/s, peak RSS {format_mb(load['peak_rss_mb'])}")
+        print(f"   {'kind':<10} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'wrong':>6}")
+        rows = list(load['by_kind'].items()) + [('all', load['all'])]
+        for kind, stats in rows:
+            print(f"   {kind:<10} {stats['count']:>7,} {stats['p50']:>8.2f} {stats['p95']:>8.2f} "
+                  f"{stats['p99']:>8.2f} {stats['max']:>8.2f} {stats['unexpected']:>6}")
+        print(f"   AWS calls: {', '.join(f'{service} {calls}' for service, calls in result['aws_calls'].items())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the lookup Lambda locally against fake S3/Secrets Manager')
+    parser.add_argument('--handler', nargs='+', choices=HANDLERS, default=HANDLERS)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Request kind weights (default {DEFAULT_MIX})')
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help='Synthetic inventory size')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES, help='Directory for generated fixtures')
+    parser.add_argument('--rebuild-fixtures', action='store_true')
+    parser.add_argument('--bundled', action='store_true',
+                        help='Ship the table and search documents in the task directory (BUNDLE_INVENTORY=true)')
+    parser.add_argument('--aws-latency-ms', type=float, default=0.0, help='Added to every fake AWS call')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Also write the results to this file')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--task-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        args.handler = args.handler[0]
+        run_worker(args)
+        return
+
+    parse_mix(args.mix)
+    args.fixtures = os.path.abspath(args.fixtures)
+    if args.rebuild_fixtures or not fixtures_ready(args.fixtures):
+        print(f"🔧 Building fixtures ({args.rows:,} rows) in {args.fixtures}...")
+        build_fixtures(args.fixtures, args.rows)
+
+    task_dir = prepare_task_dir(args.fixtures, args.bundled)
+    try:
+        results = [run_handler(args, handler, task_dir) for handler in args.handler]
+    finally:
+        shutil.rmtree(task_dir, ignore_errors=True)
+
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
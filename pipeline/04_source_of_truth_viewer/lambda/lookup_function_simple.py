@@ -1,83 +1,199 @@
 import json
-import boto3
-import csv
 from datetime import datetime, timedelta
-from botocore.signers import CloudFrontSigner
 import os
-import rsa
+import time
+
+# boto3/botocore come from the Lambda runtime; they and rsa are imported on first use
+
+# lookup_table.py is bundled from pipeline/03_s3_inventory/scripts by build.bat / deploy.sh
+from inventory_cache import DEFAULT_TTL_SECONDS, BundledInventory, CachedInventory
+from lookup_table import LookupTable
+from signed_url_cache import DEFAULT_REUSE_SECONDS, SignedUrlCache
+from batch_lookup import MAX_BATCH_ITEMS, is_batch, parse_batch, resolve_batch
+from strain_search import DEFAULT_LIMIT, load_search_index
 
 # Environment variables
 CLOUDFRONT_DOMAIN = os.environ.get('CLOUDFRONT_DOMAIN', 'd36gqaqkk0n97a.cloudfront.net')
 CLOUDFRONT_KEY_PAIR_ID = os.environ.get('CLOUDFRONT_KEY_PAIR_ID', 'APKASPK2KPPM2XK4DMPI')
 S3_BUCKET = os.environ.get('S3_BUCKET', 'ci-strains-html-archive')
-INVENTORY_KEY = os.environ.get('INVENTORY_KEY', 'pipeline/03_s3_inventory/s3_html_inventory.csv')
-JS_INVENTORY_KEY = os.environ.get('JS_INVENTORY_KEY', 'pipeline/03_s3_inventory/s3_js_html_inventory.csv')
+INVENTORY_TABLE_KEY = os.environ.get('INVENTORY_TABLE_KEY', 'pipeline/03_s3_inventory/s3_inventory.bin')
+BUNDLED_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 's3_inventory.bin')
+INVENTORY_TTL_SECONDS = int(os.environ.get('INVENTORY_TTL_SECONDS', DEFAULT_TTL_SECONDS))
+PREWARM_INVENTORY = os.environ.get('PREWARM_INVENTORY', 'false').lower() == 'true'
 SECRET_NAME = os.environ.get('SECRET_NAME', 'cloudfront_private_key')
+SIGNED_URL_EXPIRATION_MINUTES = 5
+SIGNED_URL_REUSE_SECONDS = int(os.environ.get('SIGNED_URL_REUSE_SECONDS', DEFAULT_REUSE_SECONDS))
+BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', MAX_BATCH_ITEMS))
+SEARCH_DOCUMENTS_KEY = os.environ.get('SEARCH_DOCUMENTS_KEY', 'pipeline/04_source_of_truth_viewer/strain_search.json.gz')
+BUNDLED_SEARCH_DOCUMENTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'strain_search.json.gz')
+PREWARM_SEARCH = os.environ.get('PREWARM_SEARCH', 'true').lower() == 'true'
+LEGAL_NOTICE = 'Use subject to Legal Disclaimer: https://github.com/loyal9/ci-strains-pro/blob/main/pipeline/04_source_of_truth_viewer/docs/LEGAL_DISCLAIMER.md'
 
-s3_client = boto3.client('s3')
-secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
+# AWS clients are created on first use: importing boto3 is most of a cold start,
+# and a container serving a bundled table or search may never need S3
+_s3_client = None
+_secrets_client = None
 
-# Cache private key (loaded once per Lambda container)
+def get_s3_client():
+    """S3 client (created once per container, on first use)."""
+    global _s3_client
+    
+    if _s3_client is None:
+        import boto3
+        _s3_client = boto3.client('s3')
+    
+    return _s3_client
+
+def get_secrets_client():
+    """Secrets Manager client (created once per container, on first use)."""
+    global _secrets_client
+    
+    if _secrets_client is None:
+        import boto3
+        _secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
+    
+    return _secrets_client
+
+# Inventory held for the life of the container: the bundled table if the package has one,
+# otherwise downloaded from S3 and revalidated by ETag every INVENTORY_TTL_SECONDS
+if os.path.exists(BUNDLED_TABLE):
+    inventory_cache = BundledInventory(LookupTable(BUNDLED_TABLE))
+else:
+    inventory_cache = CachedInventory(get_s3_client, S3_BUCKET, INVENTORY_TABLE_KEY, LookupTable,
+                                      ttl_seconds=INVENTORY_TTL_SECONDS)
+
+# Cache private key, parsed key and signer (loaded once per Lambda container)
 _private_key_cache = None
+_signing_key_cache = None
+_cloudfront_signer = None
+_search_index = None
 
 def get_private_key():
     """Retrieve CloudFront private key from Secrets Manager (cached)."""
     global _private_key_cache
     
     if _private_key_cache is None:
-        response = secrets_client.get_secret_value(SecretId=SECRET_NAME)
+        response = get_secrets_client().get_secret_value(SecretId=SECRET_NAME)
         _private_key_cache = response['SecretString']
     
     return _private_key_cache
 
 def load_inventory():
-    """Load both HTML inventories from S3 into memory."""
-    inventory = {}
-    
-    # Load main inventory
-    obj = s3_client.get_object(Bucket=S3_BUCKET, Key=INVENTORY_KEY)
-    content = obj['Body'].read().decode('utf-8').splitlines()
-    reader = csv.DictReader(content)
-    for row in reader:
-        inventory[row['url']] = {
-            's3_key': row['s3_html_key'],
-            'seed_bank': row['seed_bank'],
-            'collection_date': row['collection_date']
-        }
+    """Binary lookup table (static + JS HTML), cached across warm invocations."""
+    return inventory_cache.get()
+
+if PREWARM_INVENTORY:
+    # Init runs before the first request is timed, so the download moves out of its latency
+    try:
+        load_inventory()
+    except Exception as e:
+        # Not fatal: the first request retries and reports the error
+        print(f"Inventory pre-warm failed: {e}")
+
+def get_search_index():
+    """Strain search index, built once per container."""
+    global _search_index
     
-    # Load JS inventory
-    obj = s3_client.get_object(Bucket=S3_BUCKET, Key=JS_INVENTORY_KEY)
-    content = obj['Body'].read().decode('utf-8').splitlines()
-    reader = csv.DictReader(content)
-    for row in reader:
-        inventory[row['url']] = {
-            's3_key': row['html_key'],
-            'seed_bank': row['seed_bank'],
-            'collection_date': 'JS-rendered'
-        }
+    if _search_index is None:
+        _search_index = load_search_index(get_s3_client, S3_BUCKET, SEARCH_DOCUMENTS_KEY, BUNDLED_SEARCH_DOCUMENTS)
     
-    return inventory
+    return _search_index
+
+if PREWARM_SEARCH:
+    # Built during init so the first search box query is answered from memory
+    try:
+        get_search_index()
+    except Exception as e:
+        print(f"Search index pre-warm failed: {e}")
+
+def get_signing_key():
+    """Deserialized CloudFront private key (parsed once per container)."""
+    global _signing_key_cache
+    
+    if _signing_key_cache is None:
+        import rsa
+        _signing_key_cache = rsa.PrivateKey.load_pkcs1(get_private_key().encode('utf-8'))
+    
+    return _signing_key_cache
 
 def rsa_signer(message):
     """Sign message with CloudFront private key using rsa library."""
-    private_key_pem = get_private_key()
-    private_key = rsa.PrivateKey.load_pkcs1(private_key_pem.encode('utf-8'))
-    return rsa.sign(message, private_key, 'SHA-1')
+    import rsa
+    return rsa.sign(message, get_signing_key(), 'SHA-1')
+
+def get_cloudfront_signer():
+    """CloudFrontSigner built once per container."""
+    global _cloudfront_signer
+    
+    if _cloudfront_signer is None:
+        from botocore.signers import CloudFrontSigner
+        _cloudfront_signer = CloudFrontSigner(CLOUDFRONT_KEY_PAIR_ID, rsa_signer)
+    
+    return _cloudfront_signer
 
-def generate_signed_url(s3_key, expiration_minutes=5):
+def generate_signed_url(s3_key, expiration_minutes=SIGNED_URL_EXPIRATION_MINUTES):
     """Generate CloudFront signed URL with expiration."""
     url = f"https://{CLOUDFRONT_DOMAIN}/{s3_key}"
     expire_date = datetime.utcnow() + timedelta(minutes=expiration_minutes)
     
-    cloudfront_signer = CloudFrontSigner(CLOUDFRONT_KEY_PAIR_ID, rsa_signer)
-    signed_url = cloudfront_signer.generate_presigned_url(
+    signed_url = get_cloudfront_signer().generate_presigned_url(
         url, date_less_than=expire_date
     )
     
     return signed_url
 
+# Repeat lookups of the same page reuse its URL while at least 4 of its 5 minutes remain
+signed_urls = SignedUrlCache(generate_signed_url, SIGNED_URL_EXPIRATION_MINUTES, SIGNED_URL_REUSE_SECONDS)
+
+def search_response(body):
+    """Typeahead results for {"search": ...} or seed bank counts for {"seed_banks": true}."""
+    try:
+        index = get_search_index()
+    except Exception as e:
+        return {
+            'statusCode': 500,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': 'https://strains.loyal9.app',
+                'Access-Control-Allow-Methods': 'POST, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type'
+            },
+            'body': json.dumps({'error': f'Search index unavailable: {str(e)}'})
+        }
+    
+    if body.get('seed_banks'):
+        payload = {'seed_banks': [{'name': name, 'count': count} for name, count in index.seed_banks.items()]}
+    else:
+        start = time.perf_counter()
+        try:
+            results = index.search(str(body.get('search', '')), seed_bank=body.get('seed_bank') or None,
+                                   limit=body.get('limit', DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': 'https://strains.loyal9.app',
+                    'Access-Control-Allow-Methods': 'POST, OPTIONS',
+                    'Access-Control-Allow-Headers': 'Content-Type'
+                },
+                'body': json.dumps({'error': 'limit must be a number'})
+            }
+        payload = {'results': results, 'took_ms': round((time.perf_counter() - start) * 1000, 2)}
+    
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': 'https://strains.loyal9.app',
+            'Access-Control-Allow-Methods': 'POST, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type'
+        },
+        'body': json.dumps(payload)
+    }
+
 def lambda_handler(event, context):
-    """Main Lambda handler for URL lookup."""
+    """Main Lambda handler: URL lookup (one "url", or a batch of "urls" / "url_hashes") and strain search."""
     
     # Parse request body
     try:
@@ -95,7 +211,26 @@ def lambda_handler(event, context):
             'body': json.dumps({'error': 'Invalid request body'})
         }
     
-    if not url:
+    # Search box requests never touch the inventory or the signer
+    if 'search' in body or body.get('seed_banks'):
+        return search_response(body)
+    
+    batch = None
+    if is_batch(body):
+        try:
+            batch = parse_batch(body, BATCH_MAX_ITEMS)
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': 'https://strains.loyal9.app',
+                    'Access-Control-Allow-Methods': 'POST, OPTIONS',
+                    'Access-Control-Allow-Headers': 'Content-Type'
+                },
+                'body': json.dumps({'error': str(e)})
+            }
+    elif not url:
         return {
             'statusCode': 400,
             'headers': {
@@ -122,8 +257,25 @@ def lambda_handler(event, context):
             'body': json.dumps({'error': f'Failed to load inventory: {str(e)}'})
         }
     
-    # Validate URL exists in inventory
-    if url not in inventory:
+    # Batch: per-item results and errors in one response
+    if batch:
+        payload = resolve_batch(inventory, signed_urls, *batch)
+        payload['legal_notice'] = LEGAL_NOTICE
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': 'https://strains.loyal9.app',
+                'Access-Control-Allow-Methods': 'POST, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type'
+            },
+            'body': json.dumps(payload)
+        }
+    
+    # Validate URL exists in inventory (binary search over the memory-mapped table)
+    strain_data = inventory.lookup_url(url)
+    
+    if strain_data is None:
         return {
             'statusCode': 404,
             'headers': {
@@ -137,8 +289,7 @@ def lambda_handler(event, context):
     
     # Generate signed URL
     try:
-        strain_data = inventory[url]
-        signed_url = generate_signed_url(strain_data['s3_key'])
+        signed_url, expires_in_seconds = signed_urls.get(strain_data['s3_html_key'])
         
         return {
             'statusCode': 200,
@@ -152,8 +303,8 @@ def lambda_handler(event, context):
                 'signed_url': signed_url,
                 'seed_bank': strain_data['seed_bank'],
                 'collection_date': strain_data['collection_date'],
-                'expires_in_minutes': 5,
-                'legal_notice': 'Use subject to Legal Disclaimer: https://github.com/loyal9/ci-strains-pro/blob/main/pipeline/04_source_of_truth_viewer/docs/LEGAL_DISCLAIMER.md'
+                'expires_in_minutes': expires_in_seconds // 60,
+                'legal_notice': LEGAL_NOTICE
             })
         }
     except Exception as e:
@@ -1,2 +0,0 @@
-# https://www.python.org/dev/peps/pep-0396/
-__version__ = '0.6.2'
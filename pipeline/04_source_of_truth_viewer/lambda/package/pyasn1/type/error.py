@@ -1,11 +0,0 @@
-#
-# This file is part of pyasn1 software.
-#
-# Copyright (c) 2005-2020, Ilya Etingof <etingof@gmail.com>
-# License: https://pyasn1.readthedocs.io/en/latest/license.html
-#
-from pyasn1.error import PyAsn1Error
-
-
-class ValueConstraintError(PyAsn1Error):
-    pass
@@ -0,0 +1,48 @@
+"""
+Signed URL Reuse for the Lookup Lambda
+Hands out the same CloudFront signed URL per s3_key while it still has most of its validity left
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Signing is an RSA private-key operation - by far the most expensive step of
+a warm lookup. Popular strains are looked up repeatedly within minutes, so a
+URL signed for one request is returned to later requests for the same page
+during the first reuse_seconds of its life. Every URL handed out therefore
+still has at least (expiration - reuse_seconds) of validity left.
+"""
+
+import time
+
+DEFAULT_REUSE_SECONDS = 60
+MAX_ENTRIES = 5000
+
+
+class SignedUrlCache:
+    def __init__(self, sign, expiration_minutes=5, reuse_seconds=DEFAULT_REUSE_SECONDS, max_entries=MAX_ENTRIES):
+        """sign(s3_key, expiration_minutes) returns a signed URL"""
+        self.sign = sign
+        self.expiration_minutes = expiration_minutes
+        self.expiration_seconds = expiration_minutes * 60
+        self.reuse_seconds = reuse_seconds
+        self.max_entries = max_entries
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, s3_key):
+        """(signed_url, seconds of validity left)"""
+        now = time.time()
+        entry = self.entries.get(s3_key)
+        if entry is not None and now - entry[1] < self.reuse_seconds:
+            self.hits += 1
+            return entry[0], int(entry[1] + self.expiration_seconds - now)
+
+        self.misses += 1
+        if len(self.entries) >= self.max_entries:
+            self.entries = {key: e for key, e in self.entries.items() if now - e[1] < self.reuse_seconds}
+            if len(self.entries) >= self.max_entries:
+                self.entries.clear()
+
+        # Stamp before signing so the reuse window can never outlast the signed expiry
+        signed_url = self.sign(s3_key, self.expiration_minutes)
+        self.entries[s3_key] = (signed_url, now)
+        return signed_url, self.expiration_seconds
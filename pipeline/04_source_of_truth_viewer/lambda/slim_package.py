@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Lambda Package Slimming
+Prunes the build directory before zipping and reports package size and init time
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+The Python 3.12 runtime already provides boto3/botocore, so build.bat and
+deploy.sh only install what the runtime lacks (rsa + pyasn1) and ship the
+handler modules. This script removes what the function never loads:
+pip metadata, bytecode compiled for the build machine's Python, console
+scripts and test suites. If the SDK is bundled anyway (BUNDLE_SDK=true, to
+pin a version), botocore's service models are cut down to the services the
+function calls - they are two thirds of a bundled SDK.
+
+  python slim_package.py package                              prune + size report
+  python slim_package.py package --zip lambda_deployment.zip  also report the zip
+  python slim_package.py package --measure-init lookup_function
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# botocore/data service models the handlers use (CloudFrontSigner needs no model)
+KEEP_SERVICES = {'s3', 'secretsmanager', 'sts'}
+# boto3 resource models; the handlers only use clients
+KEEP_RESOURCES = set()
+
+PRUNE_DIRS = {'__pycache__', 'tests', 'test'}
+PRUNE_SUFFIXES = ('.dist-info', '.egg-info')
+# Console scripts pip writes next to the packages (pyrsa-*)
+PRUNE_TOP_LEVEL = {'bin'}
+
+
+def _size(path):
+    path = Path(path)
+    if path.is_file():
+        return path.stat().st_size
+    return sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+
+
+def _remove(path):
+    if path.is_dir():
+        shutil.rmtree(path)
+    else:
+        path.unlink()
+
+
+def prune(package_dir):
+    """Delete files the function never loads; returns bytes removed"""
+    package_dir = Path(package_dir)
+    before = _size(package_dir)
+
+    for path in sorted(package_dir.rglob('*'), key=lambda p: len(p.parts), reverse=True):
+        if path.is_dir() and (path.name in PRUNE_DIRS or path.name.endswith(PRUNE_SUFFIXES)):
+            shutil.rmtree(path)
+    for name in PRUNE_TOP_LEVEL:
+        if (package_dir / name).is_dir():
+            shutil.rmtree(package_dir / name)
+
+    # Only present when the SDK is bundled; top-level JSON (endpoints, partitions, retry config) stays
+    for data_dir, keep in [(package_dir / 'botocore' / 'data', KEEP_SERVICES),
+                           (package_dir / 'boto3' / 'data', KEEP_RESOURCES)]:
+        if data_dir.is_dir():
+            for service in data_dir.iterdir():
+                if service.is_dir() and service.name not in keep:
+                    _remove(service)
+
+    return before - _size(package_dir)
+
+
+def report(package_dir, zip_file=None):
+    package_dir = Path(package_dir)
+    entries = sorted(((_size(p), p.name) for p in package_dir.iterdir()), reverse=True)
+    print(f"📦 Package contents ({_size(package_dir) / 1024:,.0f} KB unzipped):")
+    for size, name in entries[:10]:
+        print(f"   {size / 1024:>9,.0f} KB  {name}")
+    if zip_file and os.path.exists(zip_file):
+        print(f"🗜️  {zip_file}: {os.path.getsize(zip_file) / 1024:,.0f} KB")
+
+
+def measure_init(package_dir, handler, runs=5):
+    """Median module import time of the handler in fresh interpreters (pre-warm disabled)"""
+    code = (f"import time; start = time.perf_counter(); import {handler}; "
+            f"print((time.perf_counter() - start) * 1000)")
+    env = dict(os.environ, PYTHONPATH=str(Path(package_dir).resolve()), PYTHONDONTWRITEBYTECODE='1',
+               PREWARM_INVENTORY='false', PREWARM_SEARCH='false', AWS_DEFAULT_REGION='us-east-1')
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True,
+                                cwd=package_dir, check=True)
+        timings.append(float(result.stdout.strip()))
+    median = statistics.median(timings)
+    print(f"⏱️  {handler} init: {median:.1f} ms median of {runs} (min {min(timings):.1f} ms)")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Slim the Lambda build directory and report its size')
+    parser.add_argument('package_dir')
+    parser.add_argument('--zip', dest='zip_file', help='Deployment zip to report')
+    parser.add_argument('--report-only', action='store_true', help='Do not prune')
+    parser.add_argument('--measure-init', metavar='HANDLER_MODULE',
+                        help='Time importing this handler module from the package')
+    args = parser.parse_args()
+
+    if not args.report_only:
+        removed = prune(args.package_dir)
+        print(f"🧹 Pruned {removed / 1024:,.0f} KB")
+    report(args.package_dir, args.zip_file)
+    if args.measure_init:
+        measure_init(args.package_dir, args.measure_init)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Strain Search Index for the Source-of-Truth Viewer
+In-memory prefix + token index over strain names, slugs, breeders and seed banks
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Built once per Lambda container from strain_search.json.gz (see
+build_search_documents.py), so the viewer's search box gets top-k
+typeahead results without shipping the inventory to the browser.
+
+Every field is split into lowercase, accent-free tokens. Postings map a
+token to {document: field weight}; the sorted token list answers prefix
+queries with bisect. A query matches documents that contain every query
+term (the last term may be a prefix of a token, as the user is still
+typing). Scores add the best field weight per term, with a bonus when the
+strain name starts with the query.
+"""
+
+import gzip
+import heapq
+import json
+import os
+import re
+import unicodedata
+from bisect import bisect_left
+
+# Document fields and how much a match in each counts
+FIELD_WEIGHTS = {'name': 4.0, 'slug': 3.0, 'breeder': 2.0, 'seed_bank': 1.0}
+PREFIX_FACTOR = 0.6
+NAME_PREFIX_BONUS = 2.0
+
+MIN_QUERY_LENGTH = 2
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+# Caps the work for very short prefixes ('a' expands to thousands of tokens)
+MAX_PREFIX_EXPANSION = 500
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def fold(text):
+    """Lowercase, accent-free form used for indexing and queries"""
+    text = unicodedata.normalize('NFKD', text or '')
+    return ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(fold(text))
+
+
+class StrainSearchIndex:
+    def __init__(self, payload):
+        """payload as written by build_search_documents.py"""
+        self.fields = payload['fields']
+        self.seed_banks = payload['seed_banks']
+        bank_names = list(self.seed_banks)
+        self.documents = []
+        self.names = []
+        self.postings = {}
+
+        name_at, bank_at = self.fields.index('name'), self.fields.index('seed_bank')
+        for doc_id, row in enumerate(payload['strains']):
+            document = dict(zip(self.fields, row))
+            document['seed_bank'] = bank_names[row[bank_at]]
+            self.documents.append(document)
+            self.names.append(' '.join(tokenize(row[name_at])))
+
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(document.get(field)):
+                    postings = self.postings.setdefault(token, {})
+                    if postings.get(doc_id, 0) < weight:
+                        postings[doc_id] = weight
+
+        self.tokens = sorted(self.postings)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _term_scores(self, term, prefix):
+        """{doc_id: best weight} for documents with the term (or, if prefix, a token starting with it)"""
+        if not prefix:
+            return dict(self.postings.get(term, {}))
+
+        scores = {}
+        start = bisect_left(self.tokens, term)
+        for token in self.tokens[start:start + MAX_PREFIX_EXPANSION]:
+            if not token.startswith(term):
+                break
+            factor = 1.0 if token == term else PREFIX_FACTOR
+            for doc_id, weight in self.postings[token].items():
+                score = weight * factor
+                if score > scores.get(doc_id, 0):
+                    scores[doc_id] = score
+        return scores
+
+    def search(self, query, seed_bank=None, limit=DEFAULT_LIMIT):
+        """Top `limit` documents for a typeahead query, best first"""
+        terms = tokenize(query)
+        if not terms or len(''.join(terms)) < MIN_QUERY_LENGTH:
+            return []
+        limit = max(1, min(int(limit), MAX_LIMIT))
+
+        totals = None
+        # Rarest-looking terms first keeps the candidate set small
+        for position, term in sorted(enumerate(terms), key=lambda item: -len(item[1])):
+            scores = self._term_scores(term, prefix=position == len(terms) - 1)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {doc_id: total + scores[doc_id] for doc_id, total in totals.items() if doc_id in scores}
+            if not totals:
+                return []
+
+        folded_query = ' '.join(terms)
+        ranked = []
+        for doc_id, score in totals.items():
+            document = self.documents[doc_id]
+            if seed_bank and document['seed_bank'] != seed_bank:
+                continue
+            if self.names[doc_id].startswith(folded_query):
+                score += NAME_PREFIX_BONUS
+            # Shorter names win ties: 'OG Kush' before 'OG Kush Breath Auto'
+            ranked.append((score, -len(self.names[doc_id]), -doc_id))
+
+        best = heapq.nlargest(limit, ranked)
+        return [dict(self.documents[-negative_id], score=round(score, 2)) for score, _, negative_id in best]
+
+
+def load_search_index(get_s3_client, bucket, key, bundled_path=None):
+    """StrainSearchIndex from the bundled documents file if present, else from S3"""
+    if bundled_path and os.path.exists(bundled_path):
+        with open(bundled_path, 'rb') as f:
+            data = f.read()
+    else:
+        data = get_s3_client().get_object(Bucket=bucket, Key=key)['Body'].read()
+    return StrainSearchIndex(json.loads(gzip.decompress(data)))
@@ -1,15 +1,20 @@
-import pandas as pd
 import json
+import sys
 from pathlib import Path
 from collections import defaultdict
 
+sys.path.append(str(Path(__file__).resolve().parents[2] / '02_s3_scraping'))
+from sparse_attributes import is_companion_file, load_keys
+
+from table_io import read_csv_text
+
 # Paths
 CSV_DIR = Path("../csv")
 OUTPUT_DIR = Path("../output")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
 # Scan all CSVs
-csv_files = sorted(CSV_DIR.glob("*.csv"))
+csv_files = sorted(f for f in CSV_DIR.glob("*.csv") if not is_companion_file(f))
 print(f"Found {len(csv_files)} CSV files\n")
 
 # Collect column data
@@ -18,15 +23,20 @@ all_columns = defaultdict(list)
 
 for csv_file in csv_files:
     try:
-        df = pd.read_csv(csv_file, encoding='latin-1', nrows=0)
+        df = read_csv_text(csv_file, nrows=0)
         columns = list(df.columns)
         
+        # Sparse meta_*/spec_* columns live in the key dictionary, not the CSV header
+        sparse_keys = list(load_keys(csv_file)['key'])
+        columns += sparse_keys
+        
         seed_bank = csv_file.stem.replace('_extracted', '').replace('_maximum_extraction', '').replace('_js_extracted', '')
         
         column_data.append({
             'seed_bank': seed_bank,
             'file': csv_file.name,
             'column_count': len(columns),
+            'sparse_column_count': len(sparse_keys),
             'columns': columns
         })
         
@@ -1,7 +1,6 @@
-import pandas as pd
 import json
 from pathlib import Path
-from schema import CORE_SCHEMA, EXCLUDED_COLUMNS, COLUMN_MAPPINGS
+from schema_registry import EXCLUDED, MAPPED, SchemaRegistry
 
 CSV_DIR = Path("../csv")
 OUTPUT_DIR = Path("../output")
@@ -10,7 +9,9 @@ OUTPUT_DIR = Path("../output")
 with open(OUTPUT_DIR / "column_analysis.json") as f:
     analysis = json.load(f)
 
-# Analyze all columns and create mapping
+registry = SchemaRegistry(OUTPUT_DIR / "schema_registry.json")
+
+# Analyze all columns and create mapping (only columns new to the registry run the matcher)
 mapping_report = []
 excluded_report = []
 unmapped_report = []
@@ -19,30 +20,21 @@ for file_data in analysis:
     seed_bank = file_data['seed_bank']
     columns = file_data['columns']
     
+    resolved = registry.resolve(columns)
     for col in columns:
-        col_lower = col.lower()
-        
-        # Check if excluded (commercial data)
-        if any(excl in col_lower for excl in EXCLUDED_COLUMNS):
+        entry = resolved[col]
+        if entry['status'] == EXCLUDED:
+            # Commercial data
             excluded_report.append({
                 'seed_bank': seed_bank,
                 'original_column': col,
                 'reason': 'Commercial data'
             })
-            continue
-        
-        # Check if it maps to core schema
-        mapped_to = None
-        for unified, keywords in COLUMN_MAPPINGS.items():
-            if any(kw in col_lower for kw in keywords):
-                mapped_to = unified
-                break
-        
-        if mapped_to:
+        elif entry['status'] == MAPPED:
             mapping_report.append({
                 'seed_bank': seed_bank,
                 'original_column': col,
-                'maps_to': mapped_to
+                'maps_to': entry['maps_to']
             })
         else:
             unmapped_report.append({
@@ -50,6 +42,8 @@ for file_data in analysis:
                 'original_column': col
             })
 
+registry.save()
+
 # Save mapping report
 with open(OUTPUT_DIR / "column_mapping.json", 'w') as f:
     json.dump(mapping_report, f, indent=2)
@@ -61,6 +55,7 @@ with open(OUTPUT_DIR / "unmapped_columns.json", 'w') as f:
     json.dump(unmapped_report, f, indent=2)
 
 # Summary
+print(f"Newly resolved columns: {registry.resolved} (others answered by {registry.path.name})")
 unique_mapped = set(x['maps_to'] for x in mapping_report)
 print(f"Mapped columns: {len(mapping_report)} instances")
 print(f"Unique fields: {len(unique_mapped)}")
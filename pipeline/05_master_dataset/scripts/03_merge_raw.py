@@ -1,69 +1,90 @@
 import pandas as pd
-import json
+import sys
 from pathlib import Path
-from schema import COLUMN_MAPPINGS, EXCLUDED_COLUMNS
+from schema_registry import SchemaRegistry
 import uuid
 
+sys.path.append(str(Path(__file__).resolve().parents[2] / '02_s3_scraping'))
+from sparse_attributes import is_companion_file, load_keys, pivot_attributes, wide_attributes
+
+from table_io import TableWriter, read_csv_text
+
 CSV_DIR = Path("../csv")
 OUTPUT_DIR = Path("../output")
+# Rows per chunk; peak memory is one chunk plus one bank's mapped sparse columns
+CHUNK_SIZE = 5000
+# strain_id = uuid5(seed_bank|source_url): the same page gets the same ID on every re-run
+STRAIN_ID_NAMESPACE = uuid.NAMESPACE_URL
+
+# Resolved mappings from 02_column_mapping.py; a column it has not seen is matched once and added
+registry = SchemaRegistry(OUTPUT_DIR / "schema_registry.json")
+
 
-# Load mapping
-with open(OUTPUT_DIR / "column_mapping.json") as f:
-    mappings = json.load(f)
+def bank_name(csv_file):
+    return csv_file.stem.replace('_extracted', '').replace('_maximum_extraction', '').replace('_js_extracted', '')
 
-# Build lookup: (seed_bank, original_col) -> unified_col
-mapping_lookup = {}
-for m in mappings:
-    key = (m['seed_bank'], m['original_column'])
-    mapping_lookup[key] = m['maps_to']
 
-# Process each CSV
-all_data = []
-csv_files = sorted(CSV_DIR.glob("*.csv"))
+def strain_ids(seed_bank, urls, seen):
+    """Deterministic IDs from seed_bank + source_url; repeats of a URL get #1, #2... in file order"""
+    keys = seed_bank + '|' + urls.fillna('')
+    occurrence = keys.groupby(keys).cumcount() + keys.map(seen).fillna(0).astype(int)
+    for key, count in keys.value_counts().items():
+        seen[key] = seen.get(key, 0) + count
+    keys = keys.where(occurrence == 0, keys + '#' + occurrence.astype(str))
+    return [str(uuid.uuid5(STRAIN_ID_NAMESPACE, key)) for key in keys]
 
+
+csv_files = sorted(f for f in CSV_DIR.glob("*.csv") if not is_companion_file(f))
+
+# Pass 1: unified schema from headers and key files only
+sources = []
+unified_cols = set()
 for csv_file in csv_files:
-    seed_bank = csv_file.stem.replace('_extracted', '').replace('_maximum_extraction', '').replace('_js_extracted', '')
-    
-    print(f"Processing {seed_bank}...")
-    df = pd.read_csv(csv_file, encoding='latin-1')
-    
-    # Create mapped dataframe
-    mapped_data = {}
-    
-    for col in df.columns:
-        col_lower = col.lower()
-        
-        # Skip excluded columns
-        if any(excl in col_lower for excl in EXCLUDED_COLUMNS):
-            continue
-        
-        # Check if mapped
-        key = (seed_bank, col)
-        if key in mapping_lookup:
-            unified_col = mapping_lookup[key]
-            mapped_data[unified_col] = df[col]
-    
-    # Create dataframe with mapped columns
-    if mapped_data:
-        mapped_df = pd.DataFrame(mapped_data)
-        mapped_df['seed_bank'] = seed_bank
-        mapped_df['strain_id'] = [str(uuid.uuid4()) for _ in range(len(mapped_df))]
-        all_data.append(mapped_df)
-        print(f"  Mapped {len(mapped_data)} columns, {len(mapped_df)} strains")
-
-# Combine all
-master_df = pd.concat(all_data, ignore_index=True)
+    seed_bank = bank_name(csv_file)
+    header = list(read_csv_text(csv_file, nrows=0).columns)
+    # Pivot in only the sparse meta_*/spec_* keys that map to the schema
+    sparse_mapping = registry.mapping(load_keys(csv_file)['key'])
+    sparse_keys = list(sparse_mapping)
+    # Excluded (commercial) columns are never in the mapping
+    mapped = {**registry.mapping(header), **sparse_mapping}
+    if mapped:
+        sources.append((csv_file, seed_bank, sparse_keys, mapped))
+        unified_cols.update(mapped.values())
+
+registry.save()
 
 # Reorder columns (core fields first)
 core_cols = ['strain_id', 'seed_bank', 'strain_name_raw']
-other_cols = [c for c in master_df.columns if c not in core_cols]
-master_df = master_df[core_cols + sorted(other_cols)]
+other_cols = [c for c in unified_cols if c not in core_cols]
+columns = core_cols + sorted(other_cols)
 
-# Save
+# Pass 2: map each bank chunk by chunk into the output
 output_file = OUTPUT_DIR / "master_strains_raw.csv"
-master_df.to_csv(output_file, index=False, encoding='utf-8')
+with TableWriter(output_file, columns) as writer:
+    for csv_file, seed_bank, sparse_keys, mapped in sources:
+        print(f"Processing {seed_bank}...")
+        wide = wide_attributes(csv_file, sparse_keys) if sparse_keys else None
+        seen = {}
+        strains = 0
+        # Raw values stay text; TableWriter types the numeric and flag columns
+        for df in read_csv_text(csv_file, dtype=str, chunksize=CHUNK_SIZE):
+            if wide is not None:
+                df = pivot_attributes(df, csv_file, wide=wide)
+
+            # Create mapped chunk (a later source column wins when two map to the same field)
+            mapped_data = {}
+            for col, unified_col in mapped.items():
+                if col in df.columns:
+                    mapped_data[unified_col] = df[col]
+            mapped_df = pd.DataFrame(mapped_data, index=df.index)
+            mapped_df['seed_bank'] = seed_bank
+            urls = mapped_df['source_url_raw'] if 'source_url_raw' in mapped_df else pd.Series(None, index=df.index)
+            mapped_df['strain_id'] = strain_ids(seed_bank, urls.astype('string'), seen)
+            writer.write(mapped_df)
+            strains += len(mapped_df)
+        print(f"  Mapped {len(set(mapped.values()))} columns, {strains} strains")
 
 print(f"\nMaster dataset created:")
-print(f"  Total strains: {len(master_df)}")
-print(f"  Total columns: {len(master_df.columns)}")
+print(f"  Total strains: {writer.rows}")
+print(f"  Total columns: {len(columns)}")
 print(f"  Saved to: {output_file}")
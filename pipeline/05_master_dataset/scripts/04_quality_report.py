@@ -1,8 +1,9 @@
-import pandas as pd
 from pathlib import Path
 
+from table_io import read_table
+
 OUTPUT_DIR = Path("../output")
-df = pd.read_csv(OUTPUT_DIR / "master_strains_raw.csv", low_memory=False)
+df = read_table(OUTPUT_DIR / "master_strains_raw.csv")
 
 print("=" * 80)
 print("MASTER DATASET QUALITY REPORT")
@@ -1,43 +1,32 @@
-import pandas as pd
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[2] / '03_s3_inventory' / 'scripts'))
+from inventory_index import InventoryIndex
+
+from table_io import read_table, write_table
+
 # Paths
 MASTER_FILE = Path("../output/master_strains_raw.csv")
-S3_INVENTORY = Path("../../03_s3_inventory/s3_html_inventory.csv")
-S3_JS_INVENTORY = Path("../../03_s3_inventory/s3_js_html_inventory.csv")
 
 # Load master dataset
 print("Loading master dataset...")
-df = pd.read_csv(MASTER_FILE, low_memory=False)
+df = read_table(MASTER_FILE)
 print(f"  {len(df):,} strains loaded")
 
-# Load S3 inventories
-print("\nLoading S3 inventories...")
-s3_df = pd.read_csv(S3_INVENTORY, encoding='latin-1')
-s3_js_df = pd.read_csv(S3_JS_INVENTORY, encoding='latin-1')
-
-# Rename html_key to s3_html_key in JS inventory if needed
-if 'html_key' in s3_js_df.columns:
-    s3_js_df = s3_js_df.rename(columns={'html_key': 's3_html_key'})
-
-print(f"  Regular HTML: {len(s3_df):,} records")
-print(f"  JS HTML: {len(s3_js_df):,} records")
-
-# Combine inventories
-s3_combined = pd.concat([s3_df, s3_js_df], ignore_index=True)
-print(f"  Combined: {len(s3_combined):,} records")
-
-# Create lookup: url -> s3_html_key
-s3_lookup = dict(zip(s3_combined['url'], s3_combined['s3_html_key']))
-
-# Map s3_html_key_raw from source_url_raw (only if missing)
+# Look up only the URLs still missing a key (indexed, html + JS inventories)
 print("\nMapping S3 keys...")
 missing_s3 = df['s3_html_key_raw'].isna()
+with InventoryIndex() as inventory:
+    s3_lookup = inventory.keys_for_urls(df.loc[missing_s3, 'source_url_raw'])
+print(f"  Found keys for {len(s3_lookup):,} of {missing_s3.sum():,} missing URLs")
+
+# Map s3_html_key_raw from source_url_raw (only if missing)
 df.loc[missing_s3, 's3_html_key_raw'] = df.loc[missing_s3, 'source_url_raw'].map(s3_lookup)
 
 matched = df['s3_html_key_raw'].notna().sum()
 print(f"  Matched: {matched:,} / {len(df):,} ({matched/len(df)*100:.1f}%)")
 
 # Save updated master
-df.to_csv(MASTER_FILE, index=False, encoding='utf-8')
+write_table(df, MASTER_FILE)
 print(f"\nUpdated master dataset saved: {MASTER_FILE}")
@@ -1,6 +1,8 @@
 import pandas as pd
 from pathlib import Path
 
+from table_io import read_table, write_table
+
 # Paths
 MASTER_FILE = Path("../output/master_strains_raw.csv")
 S3_INVENTORY = Path("../../03_s3_inventory/s3_html_inventory.csv")
@@ -8,7 +10,7 @@ S3_JS_INVENTORY = Path("../../03_s3_inventory/s3_js_html_inventory.csv")
 
 # Load master dataset
 print("Loading master dataset...")
-df = pd.read_csv(MASTER_FILE, low_memory=False)
+df = read_table(MASTER_FILE)
 print(f"  {len(df):,} strains")
 
 # Load S3 inventories
@@ -40,5 +42,5 @@ print(f"  scraped_at: {df['scraped_at_raw'].notna().sum()}/{len(df)} ({df['scrap
 print(f"  s3_html_key: {df['s3_html_key_raw'].notna().sum()}/{len(df)} ({df['s3_html_key_raw'].notna().sum()/len(df)*100:.1f}%)")
 
 # Save
-df.to_csv(MASTER_FILE, index=False, encoding='utf-8')
+write_table(df, MASTER_FILE)
 print(f"\nSaved: {MASTER_FILE}")
@@ -1,10 +1,12 @@
 import pandas as pd
 from pathlib import Path
 
+from table_io import read_table, write_table
+
 MASTER_FILE = Path("../output/master_strains_raw.csv")
 
 print("Loading master dataset...")
-df = pd.read_csv(MASTER_FILE, low_memory=False)
+df = read_table(MASTER_FILE)
 
 # Get Seedsman versions
 seedsman_reg = df[df['seed_bank'] == 'seedsman'].copy()
@@ -45,7 +47,7 @@ for idx, row in seedsman_reg.iterrows():
 print(f"\nMatched by strain name: {matched}/{len(seedsman_reg)}")
 
 # Save
-df.to_csv(MASTER_FILE, index=False, encoding='utf-8')
+write_table(df, MASTER_FILE)
 
 # Final coverage
 print(f"\nFinal coverage:")
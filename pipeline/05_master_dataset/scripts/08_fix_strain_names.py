@@ -2,10 +2,12 @@ import pandas as pd
 import re
 from pathlib import Path
 
+from table_io import read_table, write_table
+
 MASTER_FILE = Path("../output/master_strains_raw.csv")
 
 print("Loading master dataset...")
-df = pd.read_csv(MASTER_FILE, low_memory=False)
+df = read_table(MASTER_FILE)
 print(f"  Total: {len(df)} strains")
 
 # 1. Remove Gorilla non-strain pages
@@ -47,7 +49,7 @@ filled = df['strain_name_raw'].notna().sum()
 print(f"  Filled: {filled}/{len(df)} ({filled/len(df)*100:.1f}%)")
 
 # Save
-df.to_csv(MASTER_FILE, index=False, encoding='utf-8')
+write_table(df, MASTER_FILE)
 print(f"\nSaved: {MASTER_FILE}")
 
 # Final stats
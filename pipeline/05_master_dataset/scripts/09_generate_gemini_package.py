@@ -7,6 +7,8 @@ import pandas as pd
 import json
 from pathlib import Path
 
+from table_io import read_table
+
 # Paths
 INPUT_CSV = Path("c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/05_master_dataset/output/master_strains_raw.csv")
 OUTPUT_SAMPLE = Path("c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/05_master_dataset/output/gemini_sample_100.csv")
@@ -16,7 +18,7 @@ def generate_sample_and_stats():
     """Extract sample data and generate comprehensive statistics"""
     
     print("Reading master dataset...")
-    df = pd.read_csv(INPUT_CSV, encoding='latin-1', low_memory=False)
+    df = read_table(INPUT_CSV)
     
     # Extract first 100 rows
     print("Extracting first 100 rows...")
@@ -8,12 +8,18 @@ import boto3
 from pathlib import Path
 import google.generativeai as genai
 
+from response_cache import ResponseCache
+
 # Paths
 PROMPT_FILE = Path("c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/05_master_dataset/gemini_validation_prompt.md")
 SAMPLE_FILE = Path("c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/05_master_dataset/output/gemini_sample_100.csv")
 STATS_FILE = Path("c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/05_master_dataset/output/gemini_stats.json")
 OUTPUT_FILE = Path("c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/05_master_dataset/output/gemini_validation_report.md")
 
+MODEL_NAME = 'gemini-2.0-flash-exp'
+# Bump to request a fresh report for an unchanged prompt and sample
+PROMPT_VERSION = 'validation-report-v1'
+
 def get_gemini_api_key():
     """Retrieve Gemini API key from AWS Secrets Manager"""
     print("Retrieving Gemini API key from AWS Secrets Manager...")
@@ -32,14 +38,6 @@ def get_gemini_api_key():
 def send_to_gemini():
     """Send validation package to Gemini Flash 2.0"""
     
-    # Get API key
-    api_key = get_gemini_api_key()
-    genai.configure(api_key=api_key)
-    
-    # Initialize model (same as Phase 4)
-    print("Initializing Gemini 2.0 Flash model...")
-    model = genai.GenerativeModel('gemini-2.0-flash-exp')
-    
     # Read files
     print("Reading validation package files...")
     with open(PROMPT_FILE, 'r', encoding='utf-8') as f:
@@ -51,10 +49,6 @@ def send_to_gemini():
     with open(STATS_FILE, 'r', encoding='utf-8') as f:
         stats_data = f.read()
     
-    # Construct message
-    print("\nSending validation request to Gemini Flash 2.0...")
-    print("This may take 5-10 minutes for comprehensive analysis...\n")
-    
     full_prompt = f"""{prompt}
 
 ## Dataset Statistics
@@ -70,18 +64,39 @@ def send_to_gemini():
 Please provide a comprehensive validation report following the format specified in the prompt.
 """
     
-    # Generate response
-    response = model.generate_content(full_prompt)
+    # Same prompt, sample and stats as an earlier run: reuse that report
+    cache = ResponseCache()
+    cache_key = cache.key(MODEL_NAME, PROMPT_VERSION, full_prompt)
+    report_text = cache.get(cache_key)
+    
+    if report_text is not None:
+        print("\n[OK] Using cached Gemini report for this prompt and data")
+    else:
+        # Get API key
+        api_key = get_gemini_api_key()
+        genai.configure(api_key=api_key)
+        
+        # Initialize model (same as Phase 4)
+        print("Initializing Gemini 2.0 Flash model...")
+        model = genai.GenerativeModel(MODEL_NAME)
+        
+        print("\nSending validation request to Gemini Flash 2.0...")
+        print("This may take 5-10 minutes for comprehensive analysis...\n")
+        
+        # Generate response
+        report_text = model.generate_content(full_prompt).text
+        cache.put(cache_key, report_text)
+    cache.close()
     
     # Save report
     print("Validation complete! Saving report...")
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        f.write(response.text)
+        f.write(report_text)
     
     print(f"\n[OK] Validation report saved: {OUTPUT_FILE}")
     print("\nReport Preview (first 500 chars):")
     print("="*60)
-    print(response.text[:500])
+    print(report_text[:500])
     print("="*60)
     print(f"\nFull report: {OUTPUT_FILE}")
 
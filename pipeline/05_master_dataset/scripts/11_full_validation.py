@@ -3,17 +3,20 @@ Full Dataset Validation - All 23,000 Rows
 Processes in batches to handle token limits
 """
 
-import pandas as pd
 import json
 import boto3
 import google.generativeai as genai
 from pathlib import Path
 from tqdm import tqdm
 
+from table_io import read_table, write_table
+from validation_rules import check_table, report_markdown, rule_summary
+
 # Paths
 INPUT_CSV = Path("c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/05_master_dataset/output/master_strains_raw.csv")
 OUTPUT_DIR = Path("c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/05_master_dataset/output")
 FINAL_REPORT = OUTPUT_DIR / "gemini_full_validation_report.md"
+RULE_VIOLATIONS = OUTPUT_DIR / "rule_violations.csv"
 
 def get_gemini_api_key():
     """Retrieve Gemini API key from AWS Secrets Manager"""
@@ -24,10 +27,15 @@ def get_gemini_api_key():
     return secret_dict['cannabis-gemini-api']
 
 def analyze_full_dataset():
-    """Send entire dataset to Gemini for comprehensive validation"""
+    """Run the local rules on the entire dataset, then send names to Gemini for the semantic checks"""
     
     print("Loading full dataset (23,000 rows)...")
-    df = pd.read_csv(INPUT_CSV, encoding='latin-1', low_memory=False)
+    df = read_table(INPUT_CSV)
+    
+    # Exact counts, duplicates and fill rates locally, in one pass
+    rules = check_table(df)
+    write_table(rules['violations'], RULE_VIOLATIONS)
+    print(f"Local rules: {rules['seconds']:.2f}s, {len(rules['violations']):,} offending cells -> {RULE_VIOLATIONS}")
     
     # Get API key and configure
     api_key = get_gemini_api_key()
@@ -35,71 +43,63 @@ def analyze_full_dataset():
     model = genai.GenerativeModel('gemini-2.0-flash-exp')
     
     print(f"\nDataset loaded: {len(df):,} strains")
-    print("Preparing comprehensive validation request...")
+    print("Preparing semantic validation request...")
     
-    # Convert to CSV string (more compact than JSON)
-    csv_string = df.to_csv(index=False)
+    # Gemini only needs names for fuzzy matching; counts and fill rates are already exact
+    names = df[['strain_name_raw', 'seed_bank']].dropna(subset=['strain_name_raw']).drop_duplicates()
+    csv_string = names.to_csv(index=False)
     csv_size_mb = len(csv_string) / (1024 * 1024)
     
-    print(f"CSV size: {csv_size_mb:.2f} MB")
+    print(f"CSV size: {csv_size_mb:.2f} MB ({len(names):,} unique name / seed bank pairs)")
     
-    # Create comprehensive prompt
-    prompt = f"""# Full Cannabis Dataset Validation - All 23,000 Strains
-
-You are analyzing the COMPLETE master dataset with all {len(df):,} cannabis strains.
+    field_coverage = "\n".join(f"- {field}: {count}/{len(df)}" for field, count in rules['field_coverage'].items())
+    
+    # Create semantic prompt
+    prompt = f"""# Full Cannabis Dataset Validation - All {len(df):,} Strains
 
-## Your Tasks:
+You are reviewing the COMPLETE master dataset with all {len(df):,} cannabis strains.
 
-### 1. Anomaly Detection (Exact Counts)
-Count and report:
-- How many strains have THC > 40%?
-- How many have indica% + sativa% != 100%?
-- How many have impossible values (negative numbers, >100%)?
-- How many have placeholder text ("N/A", "Unknown", "TBD")?
+## Already Computed (exact, do not recount)
+{rule_summary(rules)}
 
-### 2. Duplicate Detection (Full Analysis)
-Identify ALL duplicate strains across seed banks:
-- Exact name matches (case-insensitive)
-- Fuzzy matches (Levenshtein distance < 3)
-- Provide complete list with strain names and seed banks
+Field fill rates:
+{field_coverage}
 
-### 3. Seed Bank Quality (Actual Data)
-For each of the 20 seed banks, calculate:
-- Average fill rate across all fields
-- Number of strains with >50% fields populated
-- Rank from best to worst with actual percentages
+## Your Tasks:
 
-### 4. Field-by-Field Analysis
-For each botanical field, report:
-- Exact fill rate (count/23000)
-- Most common values (top 5)
-- Null count by seed bank
-- Data quality issues found
+### 1. Fuzzy Duplicate Detection
+Exact case-insensitive duplicates are already listed. Identify strains that are
+the same but spelled differently across seed banks:
+- Fuzzy matches (Levenshtein distance < 3, word order, abbreviations)
+- Provide the list with strain names and seed banks
 
-### 5. Cleaning Priorities
-Based on ACTUAL data (not sample), rank fields 1-38 by:
+### 2. Cleaning Priorities
+Based on the fill rates and counts above, rank the botanical fields by:
 - Impact: How many strains would benefit?
 - Effort: Complexity of cleaning
 - ROI: Impact/Effort ratio
 
-## Dataset (All {len(df):,} Rows):
+## Strain Names ({len(names):,} unique name / seed bank pairs):
 ```csv
 {csv_string}
 ```
 
-Provide comprehensive validation report with exact counts and complete lists.
+Provide a validation report with complete lists.
 """
     
-    print("\nSending full dataset to Gemini Flash 2.0...")
+    print("\nSending strain names and rule summary to Gemini Flash 2.0...")
     print("This will take 2-5 minutes for comprehensive analysis...")
     print(f"Estimated cost: ~$0.05-0.10\n")
     
     # Send to Gemini
     response = model.generate_content(prompt)
     
-    # Save report
+    # Save report: local rule sections, then Gemini's semantic review
     print("Analysis complete! Saving full validation report...")
     with open(FINAL_REPORT, 'w', encoding='utf-8') as f:
+        f.write(f"# Full Dataset Validation Report - {len(df):,} Strains\n\n")
+        f.write(report_markdown(rules))
+        f.write("\n## Gemini Review (Fuzzy Duplicates, Cleaning Priorities)\n\n")
         f.write(response.text)
     
     print(f"\n[OK] Full validation report saved: {FINAL_REPORT}")
@@ -3,7 +3,6 @@ Batch Validation - All 23,000 Rows
 Processes in 50 batches of 460 rows each
 """
 
-import pandas as pd
 import json
 import boto3
 import google.generativeai as genai
@@ -11,6 +10,10 @@ from pathlib import Path
 import time
 from datetime import datetime
 
+from response_cache import ResponseCache
+from table_io import read_table, write_table
+from validation_rules import check_table, report_markdown, rule_summary
+
 # Paths
 INPUT_CSV = Path("c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/05_master_dataset/output/master_strains_raw.csv")
 OUTPUT_DIR = Path("c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/05_master_dataset/output/batch_validation")
@@ -18,8 +21,13 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 
 BATCH_SIZE = 460
 BATCH_RESULTS = OUTPUT_DIR / "batch_results.json"
+RULE_VIOLATIONS = OUTPUT_DIR / "rule_violations.csv"
 FINAL_REPORT = OUTPUT_DIR / "gemini_full_validation_report.md"
 
+MODEL_NAME = 'gemini-2.0-flash-exp'
+# Bump to re-ask every batch; any change to the prompt or a batch's rows already misses the cache
+PROMPT_VERSION = 'semantic-batch-v1'
+
 def get_gemini_api_key():
     """Retrieve Gemini API key from AWS Secrets Manager"""
     session = boto3.session.Session()
@@ -28,40 +36,35 @@ def get_gemini_api_key():
     secret_dict = json.loads(response['SecretString'])
     return secret_dict['cannabis-gemini-api']
 
-def process_batch(model, batch_df, batch_num, total_batches):
-    """Process a single batch"""
+def process_batch(model, cache, batch_df, batch_num, total_batches, rule_context):
+    """Process a single batch (semantic checks only; counts come from validation_rules)
+    
+    Returns the parsed answer and whether it came from the response cache.
+    """
     
     csv_string = batch_df.to_csv(index=False)
     
     prompt = f"""Analyze this batch ({batch_num}/{total_batches}) of {len(batch_df)} cannabis strains.
 
-## Tasks:
-1. Count anomalies:
-   - THC > 40%
-   - indica% + sativa% != 100% (tolerance ±5%)
-   - Negative/impossible values
-   - Placeholder text ("N/A", "Unknown", "TBD")
+Exact counts (THC > 40%, indica/sativa totals, impossible values, placeholders,
+exact duplicate names, fill rates) were already computed for the full dataset.
+Do not recount them:
+{rule_context}
 
-2. Find duplicates:
-   - Exact name matches (case-insensitive)
-   - List all duplicate strain names found
-
-3. Seed bank quality (for banks in this batch):
-   - Average fill rate per seed bank
-   - Count strains with >50% fields populated
+## Tasks:
+1. Near-duplicate names:
+   - Spelling variants of the same strain (typos, spacing, word order), not exact repeats
+   - List each group of names
 
-4. Field quality:
-   - For each field, count non-null values
-   - Identify top 3 data quality issues
+2. Semantic data quality issues a simple rule would miss:
+   - Values in the wrong field, text that contradicts the numbers, mislabeled seed types
+   - Top 3 issues with the strain names involved
 
 Return results as JSON:
 {{
   "batch_num": {batch_num},
   "strains_analyzed": {len(batch_df)},
-  "anomalies": {{"thc_over_40": 0, "percentage_mismatch": 0, "impossible_values": 0, "placeholders": 0}},
-  "duplicates": ["strain1", "strain2"],
-  "seed_bank_quality": {{"bank_name": {{"fill_rate": 0.0, "strains_over_50": 0}}}},
-  "field_coverage": {{"field_name": 0}},
+  "fuzzy_duplicates": [["name1", "name2"]],
   "issues": ["issue1", "issue2", "issue3"]
 }}
 
@@ -70,66 +73,34 @@ Data:
 {csv_string}
 ```"""
     
+    cache_key = cache.key(MODEL_NAME, PROMPT_VERSION, prompt)
+    data = cache.get(cache_key)
+    if data is not None:
+        return data, True
+    
     response = model.generate_content(prompt)
-    return response.text
+    
+    # Parse JSON from response; an unparseable answer raises and is not cached
+    data = json.loads(response.text.strip('```json\n').strip('```'))
+    cache.put(cache_key, data)
+    return data, False
 
 def aggregate_results(batch_results):
-    """Aggregate all batch results into final report"""
-    
-    total_anomalies = {
-        "thc_over_40": 0,
-        "percentage_mismatch": 0,
-        "impossible_values": 0,
-        "placeholders": 0
-    }
+    """Collect the semantic findings from all batch results"""
     
-    all_duplicates = set()
-    seed_bank_totals = {}
-    field_totals = {}
+    fuzzy_duplicates = []
     all_issues = []
     
-    for result in batch_results:
-        # Parse JSON from response
-        try:
-            data = json.loads(result.strip('```json\n').strip('```'))
-            
-            # Aggregate anomalies
-            for key in total_anomalies:
-                total_anomalies[key] += data.get("anomalies", {}).get(key, 0)
-            
-            # Collect duplicates
-            all_duplicates.update(data.get("duplicates", []))
-            
-            # Aggregate seed bank quality
-            for bank, stats in data.get("seed_bank_quality", {}).items():
-                if bank not in seed_bank_totals:
-                    seed_bank_totals[bank] = {"fill_rate_sum": 0, "count": 0, "strains_over_50": 0}
-                seed_bank_totals[bank]["fill_rate_sum"] += stats.get("fill_rate", 0)
-                seed_bank_totals[bank]["count"] += 1
-                seed_bank_totals[bank]["strains_over_50"] += stats.get("strains_over_50", 0)
-            
-            # Aggregate field coverage
-            for field, count in data.get("field_coverage", {}).items():
-                field_totals[field] = field_totals.get(field, 0) + count
-            
-            # Collect issues
-            all_issues.extend(data.get("issues", []))
-            
-        except Exception as e:
-            print(f"Warning: Could not parse batch result: {e}")
+    for data in batch_results:
+        if "error" in data:
+            print(f"Warning: {data['error']}")
             continue
-    
-    # Calculate averages
-    for bank in seed_bank_totals:
-        if seed_bank_totals[bank]["count"] > 0:
-            seed_bank_totals[bank]["avg_fill_rate"] = seed_bank_totals[bank]["fill_rate_sum"] / seed_bank_totals[bank]["count"]
+        fuzzy_duplicates.extend(data.get("fuzzy_duplicates", []))
+        all_issues.extend(data.get("issues", []))
     
     return {
-        "total_anomalies": total_anomalies,
-        "duplicates": sorted(list(all_duplicates)),
-        "seed_bank_quality": seed_bank_totals,
-        "field_coverage": field_totals,
-        "top_issues": list(set(all_issues))[:20]
+        "fuzzy_duplicates": fuzzy_duplicates,
+        "top_issues": list(dict.fromkeys(all_issues))[:20]
     }
 
 def batch_validate():
@@ -142,9 +113,15 @@ def batch_validate():
     
     # Load data
     print("\nLoading dataset...")
-    df = pd.read_csv(INPUT_CSV, encoding='latin-1', low_memory=False)
+    df = read_table(INPUT_CSV)
     print(f"Loaded: {len(df):,} strains")
     
+    # Exact counts locally, in one pass
+    rules = check_table(df)
+    write_table(rules['violations'], RULE_VIOLATIONS)
+    print(f"Local rules: {rules['seconds']:.2f}s, {len(rules['violations']):,} offending cells -> {RULE_VIOLATIONS}")
+    rule_context = rule_summary(rules)
+    
     # Calculate batches
     total_batches = (len(df) + BATCH_SIZE - 1) // BATCH_SIZE
     print(f"Batch size: {BATCH_SIZE} rows")
@@ -155,7 +132,8 @@ def batch_validate():
     # Get API key
     api_key = get_gemini_api_key()
     genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-2.0-flash-exp')
+    model = genai.GenerativeModel(MODEL_NAME)
+    cache = ResponseCache()
     
     # Process batches
     batch_results = []
@@ -172,15 +150,17 @@ def batch_validate():
         print(f"\nBatch {i+1}/{total_batches}: Rows {start_idx:,}-{end_idx:,} ({len(batch_df)} strains)")
         
         try:
-            result = process_batch(model, batch_df, i+1, total_batches)
+            result, from_cache = process_batch(model, cache, batch_df, i+1, total_batches, rule_context)
             batch_results.append(result)
-            print(f"  [OK] Batch {i+1} complete")
+            print(f"  [OK] Batch {i+1} complete{' (cached)' if from_cache else ''}")
             
             # Save progress
             with open(BATCH_RESULTS, 'w', encoding='utf-8') as f:
                 json.dump(batch_results, f, indent=2)
             
-            # Rate limit handling (wait 60 seconds every 10 batches)
+            # Rate limit handling (wait 60 seconds every 10 batches); cached answers cost no quota
+            if from_cache:
+                continue
             if (i + 1) % 10 == 0 and i + 1 < total_batches:
                 print(f"  [WAIT] Rate limit cooldown (60 seconds)...")
                 time.sleep(60)
@@ -189,9 +169,12 @@ def batch_validate():
                 
         except Exception as e:
             print(f"  [ERROR] Batch {i+1} failed: {e}")
-            batch_results.append(f'{{"error": "Batch {i+1} failed: {str(e)}"}}')
+            batch_results.append({"error": f"Batch {i+1} failed: {str(e)}"})
             time.sleep(5)
     
+    print(f"\n{cache.summary()}")
+    cache.close()
+    
     # Aggregate results
     print("\n" + "="*60)
     print("AGGREGATING RESULTS")
@@ -205,31 +188,12 @@ def batch_validate():
 **Batches Processed**: {total_batches}
 **Total Strains**: {len(df):,}
 
-## Anomaly Detection (Exact Counts)
-
-- **THC > 40%**: {aggregated['total_anomalies']['thc_over_40']:,} strains
-- **Percentage Mismatch** (indica + sativa != 100%): {aggregated['total_anomalies']['percentage_mismatch']:,} strains
-- **Impossible Values**: {aggregated['total_anomalies']['impossible_values']:,} strains
-- **Placeholder Text**: {aggregated['total_anomalies']['placeholders']:,} strains
-
-## Duplicate Detection
-
-**Total Duplicates Found**: {len(aggregated['duplicates']):,} unique strain names
-
-Top 20 Duplicates:
-{chr(10).join(f"- {dup}" for dup in aggregated['duplicates'][:20])}
-
-## Seed Bank Quality Rankings
-
-| Seed Bank | Avg Fill Rate | Strains >50% Fields |
-|-----------|---------------|---------------------|
-{chr(10).join(f"| {bank} | {stats['avg_fill_rate']:.1%} | {stats['strains_over_50']:,} |" for bank, stats in sorted(aggregated['seed_bank_quality'].items(), key=lambda x: x[1]['avg_fill_rate'], reverse=True))}
-
-## Field Coverage (Top 20)
+{report_markdown(rules)}
+## Near-Duplicate Names (Gemini)
 
-{chr(10).join(f"- **{field}**: {count:,} strains ({count/len(df)*100:.1f}%)" for field, count in sorted(aggregated['field_coverage'].items(), key=lambda x: x[1], reverse=True)[:20])}
+{chr(10).join(f"- {' / '.join(map(str, group))}" for group in aggregated['fuzzy_duplicates'][:50])}
 
-## Top Data Quality Issues
+## Top Data Quality Issues (Gemini)
 
 {chr(10).join(f"{i+1}. {issue}" for i, issue in enumerate(aggregated['top_issues']))}
 
@@ -3,8 +3,9 @@ Vertex AI Batch Prediction - All 23,000 Strains
 No rate limits, 50% cheaper, enterprise-grade processing
 """
 
-import pandas as pd
 import json
+import os
+from collections import Counter
 from pathlib import Path
 from google.cloud import storage
 import vertexai
@@ -12,6 +13,12 @@ from vertexai.preview.batch_prediction import BatchPredictionJob
 from datetime import datetime
 import time
 
+from batch_requests import (csv_header, estimate_tokens, pack_requests, prompt_version,
+                            row_keys, row_texts)
+from batch_results import BatchResultStore, ingest_lines
+from table_io import read_table, write_table
+from validation_rules import check_table, report_markdown, rule_summary
+
 # Configuration
 PROJECT_ID = "gen-lang-client-0100184589"
 LOCATION = "us-central1"
@@ -26,6 +33,48 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 JSONL_FILE = OUTPUT_DIR / "validation_requests.jsonl"
 RESULTS_FILE = OUTPUT_DIR / "batch_results.jsonl"
 FINAL_REPORT = OUTPUT_DIR / "vertex_validation_report.md"
+RULE_VIOLATIONS = OUTPUT_DIR / "rule_violations.csv"
+MANIFEST_FILE = OUTPUT_DIR / "request_manifest.json"
+ROW_CACHE = OUTPUT_DIR / "row_results.sqlite"
+FINDINGS_FILE = OUTPUT_DIR / "semantic_findings.csv"
+
+# Only the columns the semantic checks read; descriptions and URLs stay out of the prompt
+SEMANTIC_COLUMNS = [
+    'strain_id', 'seed_bank', 'strain_name_raw', 'breeder_name_raw', 'seed_type_raw', 'flowering_type_raw',
+    'dominant_type_raw', 'indica_percentage_raw', 'sativa_percentage_raw', 'thc_content_raw', 'thc_min_raw',
+    'thc_max_raw', 'cbd_content_raw', 'flowering_time_raw', 'genetics_lineage_raw', 'height_raw',
+]
+
+PROMPT_TEMPLATE = """Analyze this batch of {row_count} cannabis strains (batch {batch_id}).
+
+Exact counts (THC > 40%, indica/sativa totals, impossible values, placeholders,
+exact duplicate names, fill rates) were already computed for the full dataset.
+Do not recount them:
+{rule_context}
+
+## Tasks:
+1. Near-duplicate names:
+   - Spelling variants of the same strain (typos, spacing, word order), not exact repeats
+   - For each strain involved, list the other names it duplicates
+
+2. Semantic data quality issues a simple rule would miss:
+   - Values in the wrong field, text that contradicts the numbers, mislabeled seed types
+
+Return as JSON, listing only strains with a finding, by their strain_id:
+{{
+  "batch_id": "{batch_id}",
+  "strains_analyzed": {row_count},
+  "findings": [
+    {{"strain_id": "...", "fuzzy_duplicate_of": ["other name"], "issues": ["issue"]}}
+  ]
+}}
+
+Data:
+```csv
+{csv_rows}
+```"""
+# Bump to re-validate every row; editing the template above does the same through its fingerprint
+PROMPT_VERSION = prompt_version('semantic-v1', PROMPT_TEMPLATE + ','.join(SEMANTIC_COLUMNS))
 
 def create_bucket_if_needed():
     """Create GCS bucket for batch processing"""
@@ -40,86 +89,67 @@ def create_bucket_if_needed():
     
     return bucket
 
-def prepare_batch_requests():
-    """Convert CSV to JSONL format for batch prediction"""
+def run_local_rules(df):
+    """Exact anomaly counts, duplicates and fill rates, computed locally in one pass"""
     
-    print("Loading dataset...")
-    df = pd.read_csv(INPUT_CSV, encoding='latin-1', low_memory=False)
-    print(f"Loaded: {len(df):,} strains")
+    rules = check_table(df)
+    write_table(rules['violations'], RULE_VIOLATIONS)
+    print(f"[OK] Local rules: {rules['seconds']:.2f}s, {len(rules['violations']):,} offending cells -> {RULE_VIOLATIONS}")
+    return rules
+
+def prepare_batch_requests(df, rules, cache, run_id):
+    """Pack uncached rows into token-budgeted JSONL requests (semantic checks only); returns the manifest"""
     
     print("\nPreparing batch requests...")
+    rule_context = rule_summary(rules)
+    columns = [column for column in SEMANTIC_COLUMNS if column in df.columns]
+    texts = row_texts(df, columns)
+    keys = row_keys(texts, PROMPT_VERSION)
     
-    # Split into chunks of 500 rows for manageable prompts
-    chunk_size = 500
-    requests = []
+    # Only rows whose data or prompt changed since their last answer
+    cached = cache.cached_keys(keys)
+    pending = [position for position, key in enumerate(keys) if key not in cached]
+    print(f"Rows cached for prompt {PROMPT_VERSION}: {len(df) - len(pending):,}/{len(df):,}")
     
-    for i in range(0, len(df), chunk_size):
-        chunk_df = df.iloc[i:i+chunk_size]
-        csv_chunk = chunk_df.to_csv(index=False)
-        
-        prompt = f"""Analyze this batch of {len(chunk_df)} cannabis strains (rows {i}-{i+len(chunk_df)}).
-
-## Tasks:
-1. Count anomalies:
-   - THC > 40%
-   - indica% + sativa% != 100% (tolerance ±5%)
-   - Negative/impossible values
-   - Placeholder text ("N/A", "Unknown", "TBD")
-
-2. Find duplicates:
-   - Exact name matches (case-insensitive)
-   - List all duplicate strain names
-
-3. Seed bank quality:
-   - Average fill rate per seed bank in this batch
-   - Count strains with >50% fields populated
-
-4. Field coverage:
-   - For each field, count non-null values
-   - Top 3 data quality issues
-
-Return as JSON:
-{{
-  "batch_id": "{i//chunk_size}",
-  "rows": "{i}-{i+len(chunk_df)}",
-  "strains_analyzed": {len(chunk_df)},
-  "anomalies": {{"thc_over_40": 0, "percentage_mismatch": 0, "impossible_values": 0, "placeholders": 0}},
-  "duplicates": [],
-  "seed_bank_quality": {{}},
-  "field_coverage": {{}},
-  "issues": []
-}}
-
-Data:
-```csv
-{csv_chunk}
-```"""
-        
-        request = {
-            "request": {
-                "contents": [{"role": "user", "parts": [{"text": prompt}]}]
-            }
-        }
-        requests.append(request)
+    overhead = estimate_tokens(PROMPT_TEMPLATE + rule_context + csv_header(columns)) + 50
+    packed = pack_requests([texts[position] for position in pending], overhead_tokens=overhead)
     
-    # Write to JSONL
+    manifest = {'run_id': run_id, 'prompt_version': PROMPT_VERSION, 'batches': {}}
+    total_tokens = 0
     with open(JSONL_FILE, 'w', encoding='utf-8') as f:
-        for req in requests:
-            f.write(json.dumps(req) + '\n')
+        for number, request_rows in enumerate(packed):
+            positions = [pending[i] for i in request_rows]
+            batch_id = f"{run_id}-{number:04d}"
+            prompt = PROMPT_TEMPLATE.format(
+                row_count=len(positions), batch_id=batch_id, rule_context=rule_context,
+                csv_rows='\n'.join([csv_header(columns)] + [texts[position] for position in positions]))
+            total_tokens += estimate_tokens(prompt)
+            
+            request = {
+                "request": {
+                    "contents": [{"role": "user", "parts": [{"text": prompt}]}]
+                }
+            }
+            f.write(json.dumps(request) + '\n')
+            manifest['batches'][batch_id] = [[str(df['strain_id'].iloc[position]), keys[position]]
+                                            for position in positions]
+    
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
     
-    print(f"[OK] Created {len(requests)} batch requests")
+    print(f"[OK] Created {len(packed)} batch requests for {len(pending):,} rows (~{total_tokens:,} input tokens)")
     print(f"[OK] Saved to: {JSONL_FILE}")
-    return len(requests)
+    return manifest
 
-def upload_to_gcs(bucket):
-    """Upload JSONL to Cloud Storage"""
+def upload_to_gcs(bucket, run_id):
+    """Upload JSONL to Cloud Storage (one input file and output folder per run)"""
     
     print("\nUploading to Cloud Storage...")
-    blob = bucket.blob("input/validation_requests.jsonl")
+    blob = bucket.blob(f"input/{run_id}/validation_requests.jsonl")
     blob.upload_from_filename(str(JSONL_FILE))
     
-    input_uri = f"gs://{BUCKET_NAME}/input/validation_requests.jsonl"
-    output_uri = f"gs://{BUCKET_NAME}/output/"
+    input_uri = f"gs://{BUCKET_NAME}/input/{run_id}/validation_requests.jsonl"
+    output_uri = f"gs://{BUCKET_NAME}/output/{run_id}/"
     
     print(f"[OK] Input URI: {input_uri}")
     print(f"[OK] Output URI: {output_uri}")
@@ -173,118 +203,80 @@ def monitor_job(batch_job):
         print(f"[ERROR] Job failed: {batch_job.error}")
         return False
 
-def download_results(bucket):
-    """Download results from Cloud Storage"""
-    
-    print("\nDownloading results...")
-    
-    blobs = bucket.list_blobs(prefix="output/")
-    results = []
+def _copy_lines(remote, local):
+    """Yield each line of an output shard while keeping a local copy of it"""
+    for line in remote:
+        local.write(line if line.endswith('\n') else line + '\n')
+        yield line
+
+def download_results(bucket, run_id, manifest, store):
+    """Stream this run's output shards line by line into the result store; returns counts by outcome"""
     
-    for blob in blobs:
-        if blob.name.endswith('.jsonl'):
-            content = blob.download_as_text()
-            for line in content.strip().split('\n'):
-                if line:
-                    results.append(json.loads(line))
+    print("\nDownloading and ingesting results...")
     
-    print(f"[OK] Downloaded {len(results)} result batches")
+    counts = Counter()
+    partial = RESULTS_FILE.with_name(RESULTS_FILE.name + '.tmp')
+    with open(partial, 'w', encoding='utf-8') as local:
+        for blob in bucket.list_blobs(prefix=f"output/{run_id}/"):
+            if not blob.name.endswith('.jsonl'):
+                continue
+            # Each line is parsed, validated and upserted as it arrives; no shard is held in memory
+            with blob.open('r', encoding='utf-8') as remote:
+                counts.update(ingest_lines(_copy_lines(remote, local), manifest, store, source=blob.name))
+    os.replace(partial, RESULTS_FILE)
     
-    # Save locally
-    with open(RESULTS_FILE, 'w', encoding='utf-8') as f:
-        for result in results:
-            f.write(json.dumps(result) + '\n')
+    print(f"[OK] Ingested {counts['ok']} result batches ({counts['rows']:,} rows) -> {ROW_CACHE}")
+    if counts['failed']:
+        # Rows of an unreadable answer stay uncached and are resubmitted next run
+        print(f"Warning: {counts['failed']} batches failed to parse or validate:")
+        for batch_id, source, line, error in store.errors(run_id, limit=10):
+            print(f"  {batch_id} ({source}:{line}): {error}")
     
-    return results
+    return counts
 
-def aggregate_results(results):
-    """Aggregate all batch results"""
+def aggregate_results(df, cache):
+    """Join cached findings for the current rows back onto the table by strain_id"""
     
     print("\nAggregating results...")
     
-    total_anomalies = {"thc_over_40": 0, "percentage_mismatch": 0, "impossible_values": 0, "placeholders": 0}
-    all_duplicates = set()
-    seed_bank_totals = {}
-    field_totals = {}
-    all_issues = []
+    columns = [column for column in SEMANTIC_COLUMNS if column in df.columns]
+    keys = row_keys(row_texts(df, columns), PROMPT_VERSION)
+    cached = cache.results(keys)
+    print(f"Rows with results: {len(cached):,}/{len(df):,}")
     
-    for result in results:
-        try:
-            # Extract response text
-            response_text = result['response']['candidates'][0]['content']['parts'][0]['text']
-            
-            # Parse JSON from response
-            data = json.loads(response_text.strip('```json\n').strip('```'))
-            
-            # Aggregate
-            for key in total_anomalies:
-                total_anomalies[key] += data.get("anomalies", {}).get(key, 0)
-            
-            all_duplicates.update(data.get("duplicates", []))
-            
-            for bank, stats in data.get("seed_bank_quality", {}).items():
-                if bank not in seed_bank_totals:
-                    seed_bank_totals[bank] = {"fill_rate_sum": 0, "count": 0, "strains_over_50": 0}
-                seed_bank_totals[bank]["fill_rate_sum"] += stats.get("fill_rate", 0)
-                seed_bank_totals[bank]["count"] += 1
-                seed_bank_totals[bank]["strains_over_50"] += stats.get("strains_over_50", 0)
-            
-            for field, count in data.get("field_coverage", {}).items():
-                field_totals[field] = field_totals.get(field, 0) + count
-            
-            all_issues.extend(data.get("issues", []))
-            
-        except Exception as e:
-            print(f"Warning: Could not parse result: {e}")
-            continue
+    cached['fuzzy_duplicate_of'] = cached['result'].map(lambda r: '; '.join(map(str, r.get('fuzzy_duplicate_of', []))))
+    cached['issues'] = cached['result'].map(lambda r: '; '.join(map(str, r.get('issues', []))))
+    flagged = cached[(cached['fuzzy_duplicate_of'] != '') | (cached['issues'] != '')]
     
-    # Calculate averages
-    for bank in seed_bank_totals:
-        if seed_bank_totals[bank]["count"] > 0:
-            seed_bank_totals[bank]["avg_fill_rate"] = seed_bank_totals[bank]["fill_rate_sum"] / seed_bank_totals[bank]["count"]
+    identity = df[['strain_id', 'seed_bank', 'strain_name_raw']].astype({'strain_id': str})
+    findings = identity.merge(flagged[['strain_id', 'batch_id', 'fuzzy_duplicate_of', 'issues']],
+                              on='strain_id', how='inner')
+    write_table(findings, FINDINGS_FILE)
+    print(f"[OK] {len(findings):,} strains with findings -> {FINDINGS_FILE}")
     
     return {
-        "total_anomalies": total_anomalies,
-        "duplicates": sorted(list(all_duplicates)),
-        "seed_bank_quality": seed_bank_totals,
-        "field_coverage": field_totals,
-        "top_issues": list(set(all_issues))[:20]
+        "rows_answered": len(cached),
+        "fuzzy_duplicates": [f"{row.strain_name_raw} ({row.seed_bank}) ~ {row.fuzzy_duplicate_of}"
+                             for row in findings.itertuples() if row.fuzzy_duplicate_of],
+        "top_issues": [f"{row.strain_name_raw} ({row.seed_bank}): {row.issues}"
+                       for row in findings.itertuples() if row.issues][:20]
     }
 
-def generate_report(aggregated, num_batches):
+def generate_report(aggregated, rules, num_batches):
     """Generate final validation report"""
     
     report = f"""# Vertex AI Batch Validation Report - All 23,000 Strains
 **Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**Batches Processed**: {num_batches}
-**Total Strains**: 23,000
-**Processing Method**: Vertex AI Batch Prediction (Enterprise)
-
-## Anomaly Detection (Exact Counts)
-
-- **THC > 40%**: {aggregated['total_anomalies']['thc_over_40']:,} strains
-- **Percentage Mismatch**: {aggregated['total_anomalies']['percentage_mismatch']:,} strains
-- **Impossible Values**: {aggregated['total_anomalies']['impossible_values']:,} strains
-- **Placeholder Text**: {aggregated['total_anomalies']['placeholders']:,} strains
-
-## Duplicate Detection
-
-**Total Duplicates**: {len(aggregated['duplicates']):,} unique strain names
-
-Top 50 Duplicates:
-{chr(10).join(f"- {dup}" for dup in aggregated['duplicates'][:50])}
+**Batches Processed**: {num_batches} (this run)
+**Total Strains**: {rules['strains']:,} ({aggregated['rows_answered']:,} with Gemini results)
+**Processing Method**: Local rules (counts) + Vertex AI Batch Prediction (semantic checks)
 
-## Seed Bank Quality Rankings
+{report_markdown(rules)}
+## Near-Duplicate Names (Gemini)
 
-| Seed Bank | Avg Fill Rate | Strains >50% Fields |
-|-----------|---------------|---------------------|
-{chr(10).join(f"| {bank} | {stats['avg_fill_rate']:.1%} | {stats['strains_over_50']:,} |" for bank, stats in sorted(aggregated['seed_bank_quality'].items(), key=lambda x: x[1]['avg_fill_rate'], reverse=True))}
+{chr(10).join(f"- {pair}" for pair in aggregated['fuzzy_duplicates'][:50])}
 
-## Field Coverage
-
-{chr(10).join(f"- **{field}**: {count:,} strains ({count/23000*100:.1f}%)" for field, count in sorted(aggregated['field_coverage'].items(), key=lambda x: x[1], reverse=True)[:30])}
-
-## Top Data Quality Issues
+## Top Data Quality Issues (Gemini)
 
 {chr(10).join(f"{i+1}. {issue}" for i, issue in enumerate(aggregated['top_issues']))}
 
@@ -307,34 +299,45 @@ def main():
     print("="*60)
     print(f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
-    # Step 1: Prepare requests
-    num_batches = prepare_batch_requests()
-    
-    # Step 2: Create/get bucket
-    bucket = create_bucket_if_needed()
-    
-    # Step 3: Upload to GCS
-    input_uri, output_uri = upload_to_gcs(bucket)
-    
-    # Step 4: Submit batch job
-    batch_job = submit_batch_job(input_uri, output_uri)
-    
-    # Step 5: Monitor job automatically
-    print("\n[INFO] Monitoring job automatically...")
-    print("[INFO] You can also check: https://console.cloud.google.com/vertex-ai/batch-predictions")
-    
-    success = monitor_job(batch_job)
-    if not success:
-        return
-    
-    # Step 6: Download results
-    results = download_results(bucket)
+    # Step 1: Exact counts locally, then prepare requests for the semantic checks
+    print("Loading dataset...")
+    df = read_table(INPUT_CSV)
+    print(f"Loaded: {len(df):,} strains")
+    rules = run_local_rules(df)
+    run_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+    cache = BatchResultStore(ROW_CACHE)
+    manifest = prepare_batch_requests(df, rules, cache, run_id)
+    num_batches = len(manifest['batches'])
+    
+    if num_batches:
+        # Step 2: Create/get bucket
+        bucket = create_bucket_if_needed()
+        
+        # Step 3: Upload to GCS
+        input_uri, output_uri = upload_to_gcs(bucket, run_id)
+        
+        # Step 4: Submit batch job
+        batch_job = submit_batch_job(input_uri, output_uri)
+        
+        # Step 5: Monitor job automatically
+        print("\n[INFO] Monitoring job automatically...")
+        print("[INFO] You can also check: https://console.cloud.google.com/vertex-ai/batch-predictions")
+        
+        success = monitor_job(batch_job)
+        if not success:
+            return
+        
+        # Step 6: Stream results into the store per batch and row
+        download_results(bucket, run_id, manifest, cache)
+    else:
+        print("\n[OK] Every row is cached for this prompt version, nothing to submit")
     
     # Step 7: Aggregate
-    aggregated = aggregate_results(results)
+    aggregated = aggregate_results(df, cache)
+    cache.close()
     
     # Step 8: Generate report
-    generate_report(aggregated, num_batches)
+    generate_report(aggregated, rules, num_batches)
     
     print("\n" + "="*60)
     print("VALIDATION COMPLETE!")
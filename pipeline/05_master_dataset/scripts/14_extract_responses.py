@@ -3,28 +3,25 @@
 import json
 from pathlib import Path
 
+from batch_results import response_text
+
 RESULTS_FILE = Path("c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/05_master_dataset/output/vertex_batch/batch_results.jsonl")
 OUTPUT_FILE = Path("c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/05_master_dataset/output/vertex_batch/gemini_responses.txt")
 
 print("Extracting Gemini responses...")
 
-with open(RESULTS_FILE, 'r', encoding='utf-8') as f:
-    results = [json.loads(line) for line in f if line.strip()]
-
-print(f"Found {len(results)} results")
-
-# Extract all text responses
-responses = []
-for i, result in enumerate(results):
-    try:
-        text = result['response']['candidates'][0]['content']['parts'][0]['text']
-        responses.append(f"=== BATCH {i+1} ===\n{text}\n\n")
-    except Exception as e:
-        print(f"Warning: Could not extract batch {i+1}: {e}")
-
-# Save all responses
-with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-    f.writelines(responses)
-
-print(f"\n[OK] Saved {len(responses)} responses to: {OUTPUT_FILE}")
+# Stream one result at a time straight to the output file
+saved = 0
+with open(RESULTS_FILE, 'r', encoding='utf-8') as f, open(OUTPUT_FILE, 'w', encoding='utf-8') as out:
+    for i, line in enumerate(f):
+        if not line.strip():
+            continue
+        try:
+            text = response_text(json.loads(line))
+            out.write(f"=== BATCH {i+1} ===\n{text}\n\n")
+            saved += 1
+        except Exception as e:
+            print(f"Warning: Could not extract batch {i+1}: {e}")
+
+print(f"\n[OK] Saved {saved} responses to: {OUTPUT_FILE}")
 print(f"File size: {OUTPUT_FILE.stat().st_size / (1024*1024):.2f} MB")
@@ -1,98 +1,57 @@
 """
 Parse Vertex AI Batch Results - Extract Gemini Responses
+Streams batch_results.jsonl line by line into the result store; re-running replaces, never duplicates
 """
 
 import json
 from pathlib import Path
-from collections import defaultdict
+
+from batch_results import BatchResultStore, ingest_lines
 
 # Paths
-RESULTS_FILE = Path("c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/05_master_dataset/output/vertex_batch/batch_results.jsonl")
 OUTPUT_DIR = Path("c:/Users/uthin/OneDrive/Desktop/ci-strains-pro/pipeline/05_master_dataset/output/vertex_batch")
+RESULTS_FILE = OUTPUT_DIR / "batch_results.jsonl"
+MANIFEST_FILE = OUTPUT_DIR / "request_manifest.json"
+ROW_CACHE = OUTPUT_DIR / "row_results.sqlite"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-def extract_json_from_response(response_text):
-    """Extract JSON from Gemini response text"""
-    # Remove markdown code blocks
-    text = response_text.strip()
-    if text.startswith('```json'):
-        text = text[7:]
-    if text.startswith('```'):
-        text = text[3:]
-    if text.endswith('```'):
-        text = text[:-3]
-    
-    return json.loads(text.strip())
-
 def main():
     print("Parsing batch results...")
-    
-    # Read all results
-    results = []
-    with open(RESULTS_FILE, 'r', encoding='utf-8') as f:
-        for line in f:
-            if line.strip():
-                results.append(json.loads(line))
-    
-    print(f"Loaded {len(results)} result batches\n")
-    
-    # Parse each result
-    parsed_results = []
-    parse_errors = []
-    
-    for i, result in enumerate(results):
-        try:
-            # Extract response text
-            response_text = result['response']['candidates'][0]['content']['parts'][0]['text']
-            
-            # Parse JSON
-            data = extract_json_from_response(response_text)
-            parsed_results.append(data)
-            
-        except Exception as e:
-            parse_errors.append(f"Batch {i}: {str(e)}")
-    
-    print(f"Successfully parsed: {len(parsed_results)}/{len(results)} batches")
-    print(f"Parse errors: {len(parse_errors)}\n")
-    
-    # Save parsed results
-    output_file = OUTPUT_DIR / "parsed_results.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(parsed_results, f, indent=2)
-    
-    print(f"Saved parsed results to: {output_file}")
-    
-    # Generate summary statistics
-    total_strains = sum(r.get('strains_analyzed', 0) for r in parsed_results)
-    total_anomalies = defaultdict(int)
-    all_duplicates = set()
-    
-    for r in parsed_results:
-        for key, val in r.get('anomalies', {}).items():
-            total_anomalies[key] += val
-        all_duplicates.update(r.get('duplicates', []))
-    
-    print(f"\n=== SUMMARY ===")
-    print(f"Total strains analyzed: {total_strains:,}")
-    print(f"\nAnomalies:")
-    for key, val in total_anomalies.items():
-        print(f"  {key}: {val:,}")
-    print(f"\nTotal duplicate strain names: {len(all_duplicates):,}")
-    
-    # Save summary
+
+    # The manifest maps each batch_id back to its rows (written by 13_vertex_batch_validation.py)
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    with BatchResultStore(ROW_CACHE) as store:
+        with open(RESULTS_FILE, 'r', encoding='utf-8') as f:
+            counts = ingest_lines(f, manifest, store, source=RESULTS_FILE.name)
+
+        print(f"Successfully parsed: {counts['ok']}/{counts['ok'] + counts['failed']} batches ({counts['rows']:,} rows)")
+        print(f"Parse errors: {counts['failed']}\n")
+        for batch_id, source, line, error in store.errors(manifest['run_id']):
+            print(f"  {batch_id} ({source}:{line}): {error}")
+
+        # Summary of everything ingested for this run, read back from the store
+        run = store.summary(manifest['run_id'])
+        overall = store.summary()
+
+    print(f"\n=== SUMMARY (run {manifest['run_id']}) ===")
+    print(f"Batches: {run['batches']}")
+    print(f"Rows answered: {run['rows_answered']:,}")
+    print(f"Rows with findings: {run['rows_with_findings']:,}")
+
     summary = {
-        "total_strains": total_strains,
-        "batches_parsed": len(parsed_results),
-        "parse_errors": len(parse_errors),
-        "anomalies": dict(total_anomalies),
-        "duplicate_count": len(all_duplicates),
-        "duplicates": sorted(list(all_duplicates))[:50]  # Top 50
+        "run_id": manifest['run_id'],
+        "prompt_version": manifest['prompt_version'],
+        "batches_expected": len(manifest['batches']),
+        "run": run,
+        "all_runs": overall,
     }
-    
+
     summary_file = OUTPUT_DIR / "summary.json"
     with open(summary_file, 'w', encoding='utf-8') as f:
         json.dump(summary, f, indent=2)
-    
+
     print(f"\nSaved summary to: {summary_file}")
 
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+"""
+Token-Budget Request Packing and Row-Level Result Cache for Vertex Batch Jobs
+Packs only the needed columns into requests sized by tokens, and skips rows already answered
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+prepare_batch_requests used to cut the table into fixed 500-row chunks of
+every column, so request size swung with description length, and each
+re-run resubmitted all 23k rows. Now:
+
+  row_texts(df, columns)     one CSV line per row, only the columns the prompt needs
+  row_keys(texts, version)   SHA-256 of the line plus the prompt version
+  pack_requests(texts, ...)  consecutive rows up to a token budget per request
+  RowResultCache(path)       SQLite store of row_key -> result, indexed by strain_id
+
+A re-run packs only rows whose key is not cached yet: rows whose data
+changed, new rows, or every row after the prompt changes (prompt_version
+fingerprints the template). Results come back per strain_id and are stored
+per row, so reports join them onto the full table whichever run produced them.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Rough Gemini tokenizer ratio for English/CSV text
+CHARS_PER_TOKEN = 4
+TOKEN_BUDGET = 24000
+# Caps the JSON answer too: findings are listed per strain_id
+MAX_ROWS_PER_REQUEST = 400
+
+
+def prompt_version(declared_version, template):
+    """Declared version plus a fingerprint of the prompt template, so any prompt edit invalidates the cache"""
+    return f"{declared_version}+{hashlib.sha256(template.encode('utf-8')).hexdigest()[:12]}"
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def row_texts(df, columns):
+    """Each row of df[columns] as one CSV line (no header), newlines inside values flattened"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='')
+    lines = []
+    frame = df[columns].astype('string').fillna('')
+    for values in frame.itertuples(index=False, name=None):
+        writer.writerow([value.replace('\r', ' ').replace('\n', ' ') for value in values])
+        lines.append(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
+    return lines
+
+
+def csv_header(columns):
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='').writerow(columns)
+    return buffer.getvalue()
+
+
+def row_keys(texts, version):
+    """Cache key per row: its CSV line under this prompt version"""
+    prefix = f"{version}\x1e".encode('utf-8')
+    return [hashlib.sha256(prefix + text.encode('utf-8')).hexdigest()[:24] for text in texts]
+
+
+def pack_requests(texts, budget_tokens=TOKEN_BUDGET, overhead_tokens=0, max_rows=MAX_ROWS_PER_REQUEST):
+    """Lists of row positions, in order, each fitting budget_tokens including the prompt overhead"""
+    available = max(budget_tokens - overhead_tokens, 1)
+    requests, current, used = [], [], 0
+    for position, text in enumerate(texts):
+        tokens = estimate_tokens(text) + 1
+        if current and (used + tokens > available or len(current) >= max_rows):
+            requests.append(current)
+            current, used = [], 0
+        current.append(position)
+        used += tokens
+    if current:
+        requests.append(current)
+    return requests
+
+
+class RowResultCache:
+    """Persistent row_key -> result store; one row per (row content, prompt version)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS row_results (
+                row_key TEXT PRIMARY KEY,
+                strain_id TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                batch_id TEXT,
+                result TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS idx_row_results_strain ON row_results (strain_id)')
+        self.db.commit()
+
+    def _chunks(self, keys, size=900):
+        # SQLite caps bound parameters per statement
+        keys = list(keys)
+        for start in range(0, len(keys), size):
+            yield keys[start:start + size]
+
+    def cached_keys(self, keys):
+        found = set()
+        for chunk in self._chunks(keys):
+            placeholders = ','.join('?' * len(chunk))
+            found.update(row[0] for row in self.db.execute(
+                f'SELECT row_key FROM row_results WHERE row_key IN ({placeholders})', chunk))
+        return found
+
+    def put_many(self, rows):
+        """rows: (row_key, strain_id, prompt_version, batch_id, result dict); later results replace earlier ones"""
+        now = time.time()
+        self.db.executemany(
+            'INSERT OR REPLACE INTO row_results VALUES (?, ?, ?, ?, ?, ?)',
+            [(key, strain_id, version, batch_id, json.dumps(result), now)
+             for key, strain_id, version, batch_id, result in rows])
+        self.db.commit()
+
+    def results(self, keys):
+        """DataFrame (row_key, strain_id, batch_id, result) for the cached keys among keys"""
+        frames = []
+        for chunk in self._chunks(keys):
+            placeholders = ','.join('?' * len(chunk))
+            frames.append(pd.read_sql_query(
+                f'SELECT row_key, strain_id, batch_id, result FROM row_results WHERE row_key IN ({placeholders})',
+                self.db, params=chunk))
+        if not frames:
+            return pd.DataFrame(columns=['row_key', 'strain_id', 'batch_id', 'result'])
+        df = pd.concat(frames, ignore_index=True)
+        df['result'] = df['result'].map(json.loads)
+        return df
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,173 @@
+"""
+Streaming Ingestion of Vertex Batch Results
+Reads output shards line by line, extracts and validates each answer, upserts it per batch and row
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+download_results used to pull every output blob whole with download_as_text(),
+keep all results in a list and write them out again, and
+14_parse_batch_results.py re-read the whole JSONL. JSON was recovered by
+stripping '```json' from the ends of the answer, so any text before the fence,
+or a fence with a different tag, lost the batch.
+
+ingest_lines(lines, manifest, store) now handles one line at a time:
+  - record JSON -> answer text (candidates[0].content.parts[0].text)
+  - extract_json(): a fenced ```json / ``` block anywhere in the text, else the
+    first decodable {...} object
+  - validate_answer(): findings[] of {strain_id, fuzzy_duplicate_of[], issues[]},
+    optional batch_id/strains_analyzed; the batch is named by the echoed request
+  - BatchResultStore: one row per batch (status, error, source shard/line) and
+    one row per table row (row_key, joined by strain_id through the manifest),
+    both upserted, so a re-ingested shard replaces rather than duplicates
+
+Memory stays at one line plus one batch's rows however large the job is,
+and reports read the store, so they reflect every ingested shard.
+"""
+
+import json
+import re
+import time
+from collections import Counter
+
+from batch_requests import RowResultCache
+
+FENCED_BLOCK = re.compile(r'```[ \t]*(?:json|JSON)?[ \t]*\r?\n?(.*?)```', re.DOTALL)
+# batch_id as written into the prompt, for answers that leave it out
+PROMPT_BATCH_ID = re.compile(r'\(batch ([\w-]+)\)')
+DECODER = json.JSONDecoder()
+
+# Expected answer, as (required fields, optional fields) of name -> type
+ANSWER_SCHEMA = ({'findings': list}, {'batch_id': str, 'strains_analyzed': int})
+FINDING_SCHEMA = ({'strain_id': str}, {'fuzzy_duplicate_of': list, 'issues': list})
+
+
+def response_text(record):
+    """Answer text of one batch output record"""
+    return record['response']['candidates'][0]['content']['parts'][0]['text']
+
+
+def prompt_text(record):
+    try:
+        return record['request']['contents'][0]['parts'][0]['text']
+    except (KeyError, IndexError, TypeError):
+        return ''
+
+
+def extract_json(text):
+    """First JSON object in a model answer: inside a code fence if there is one, else anywhere in the text"""
+    candidates = [block.strip() for block in FENCED_BLOCK.findall(text)] + [text]
+    for candidate in candidates:
+        start = candidate.find('{')
+        while start != -1:
+            try:
+                data, _ = DECODER.raw_decode(candidate, start)
+                if isinstance(data, dict):
+                    return data
+            except json.JSONDecodeError:
+                pass
+            start = candidate.find('{', start + 1)
+    raise ValueError('no JSON object in answer')
+
+
+def _check_fields(obj, schema, path):
+    required, optional = schema
+    errors = [f"{path}{field}: missing" for field in required if field not in obj]
+    for field, kind in {**required, **optional}.items():
+        if field in obj and not isinstance(obj[field], kind):
+            errors.append(f"{path}{field}: expected {kind.__name__}, got {type(obj[field]).__name__}")
+    return errors
+
+
+def validate_answer(data):
+    """Problems with an answer's structure; empty when it matches the expected schema"""
+    errors = _check_fields(data, ANSWER_SCHEMA, '')
+    findings = data.get('findings')
+    for i, finding in enumerate(findings if isinstance(findings, list) else []):
+        if isinstance(finding, dict):
+            errors.extend(_check_fields(finding, FINDING_SCHEMA, f"findings[{i}]."))
+        else:
+            errors.append(f"findings[{i}]: expected object")
+    return errors
+
+
+class BatchResultStore(RowResultCache):
+    """Row result cache plus one record per batch, indexed by run and batch"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS batches (
+                batch_id TEXT PRIMARY KEY,
+                run_id TEXT,
+                status TEXT NOT NULL,
+                error TEXT,
+                strains_analyzed INTEGER,
+                rows INTEGER,
+                findings INTEGER,
+                source TEXT,
+                line INTEGER,
+                ingested_at REAL NOT NULL
+            )
+        ''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS idx_batches_run ON batches (run_id, status)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS idx_row_results_batch ON row_results (batch_id)')
+        self.db.commit()
+
+    def upsert_batch(self, batch_id, run_id, status, error=None, strains_analyzed=None, rows=0, findings=0,
+                     source=None, line=None):
+        self.db.execute('INSERT OR REPLACE INTO batches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        (batch_id, run_id, status, error, strains_analyzed, rows, findings, source, line, time.time()))
+        self.db.commit()
+
+    def summary(self, run_id=None):
+        """Batch counts by status and answered/flagged row counts, optionally for one run"""
+        where, params = ('WHERE run_id = ?', (run_id,)) if run_id else ('', ())
+        statuses = dict(self.db.execute(f'SELECT status, COUNT(*) FROM batches {where} GROUP BY status', params))
+        rows, findings = self.db.execute(
+            f'SELECT COALESCE(SUM(rows), 0), COALESCE(SUM(findings), 0) FROM batches {where}', params).fetchone()
+        return {'batches': statuses, 'rows_answered': rows, 'rows_with_findings': findings}
+
+    def errors(self, run_id=None, limit=20):
+        where, params = ('AND run_id = ?', (run_id,)) if run_id else ('', ())
+        return self.db.execute(f"SELECT batch_id, source, line, error FROM batches WHERE status != 'ok' {where} "
+                               f"ORDER BY ingested_at LIMIT ?", params + (limit,)).fetchall()
+
+
+def ingest_lines(lines, manifest, store, source=None):
+    """Parse, validate and upsert batch output lines one at a time; returns counts by outcome"""
+    counts = Counter()
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        batch_id = None
+        try:
+            record = json.loads(line)
+            # The echoed request names the batch reliably; the answer's batch_id is the fallback
+            match = PROMPT_BATCH_ID.search(prompt_text(record))
+            batch_id = match.group(1) if match else None
+            data = extract_json(response_text(record))
+            batch_id = batch_id or data.get('batch_id')
+            errors = validate_answer(data)
+            if errors:
+                raise ValueError('; '.join(errors[:5]))
+            if batch_id not in manifest['batches']:
+                raise KeyError(f"batch {batch_id} is not in the manifest for run {manifest['run_id']}")
+        except Exception as e:
+            counts['failed'] += 1
+            store.upsert_batch(batch_id or f"{source}:{line_number}", manifest['run_id'], 'failed',
+                               error=f"{type(e).__name__}: {e}", source=source, line=line_number)
+            continue
+
+        # Join findings to the batch's rows by strain_id; rows without a finding are answered and clean
+        findings = {str(f['strain_id']): f for f in data['findings']}
+        rows, flagged = [], 0
+        for strain_id, row_key in manifest['batches'][batch_id]:
+            finding = findings.get(strain_id, {})
+            result = {'fuzzy_duplicate_of': finding.get('fuzzy_duplicate_of', []), 'issues': finding.get('issues', [])}
+            flagged += bool(result['fuzzy_duplicate_of'] or result['issues'])
+            rows.append((row_key, strain_id, manifest['prompt_version'], batch_id, result))
+        store.put_many(rows)
+        store.upsert_batch(batch_id, manifest['run_id'], 'ok', strains_analyzed=data.get('strains_analyzed'),
+                           rows=len(rows), findings=flagged, source=source, line=line_number)
+        counts['ok'] += 1
+        counts['rows'] += len(rows)
+    return counts
@@ -0,0 +1,269 @@
+"""
+Concurrent Rate-Limited Gemini Client
+Runs generate_content calls in parallel under requests- and tokens-per-minute budgets
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+VertexValidator.validate_batch (phase 09), extract_breeder_with_gemini and
+the S3 auditor (phase 11) called model.generate_content one request at a
+time, slept 1-3s between requests, and on a 429 slept 5-80s inside the only
+thread, so nothing else moved while one request waited.
+
+GeminiClient(model) wraps any object with generate_content(prompt):
+
+  client.generate(prompt)       text of one answer; waits for quota, retries
+                                429/503/timeouts with jittered backoff in the
+                                calling thread only
+  client.map(fn, items)         runs fn(item) on `concurrency` worker threads,
+                                yields (item, result) as each finishes
+  client.stats() / summary()    requests, retries, failures, tokens, cost,
+                                requests and tokens per minute
+
+RateLimiter keeps a sliding 60s window of requests and tokens shared by every
+worker: a request starts only when both budgets have room, so concurrency
+speeds up a job until it reaches the quota instead of tripping it. Budgets
+default to GEMINI_RPM / GEMINI_TPM / GEMINI_CONCURRENCY from the environment.
+
+MockModel answers like GenerativeModel with a fixed latency and its own
+quota, raising 429s past it, to measure a client configuration offline:
+
+  python gemini_client.py --requests 200 --latency 0.5 --concurrency 8
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import SimpleNamespace
+
+from batch_requests import estimate_tokens
+
+DEFAULT_RPM = int(os.environ.get('GEMINI_RPM', 60))
+DEFAULT_TPM = int(os.environ.get('GEMINI_TPM', 1_000_000))
+DEFAULT_CONCURRENCY = int(os.environ.get('GEMINI_CONCURRENCY', 8))
+
+# List prices, USD per 1M (input, output) tokens; cost counters are estimates
+PRICING = {
+    'gemini-2.0-flash-exp': (0.10, 0.40),
+    'gemini-2.0-flash-001': (0.10, 0.40),
+    'gemini-1.5-pro': (1.25, 5.00),
+}
+
+# google.api_core exception names and message fragments that mean "try again later"
+RETRYABLE_ERRORS = {'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable', 'DeadlineExceeded',
+                    'InternalServerError', 'MockQuotaError'}
+RETRYABLE_MESSAGES = ('429', '503', 'Resource exhausted', 'Unavailable', 'Deadline')
+
+
+def is_retryable(error):
+    return type(error).__name__ in RETRYABLE_ERRORS or any(text in str(error) for text in RETRYABLE_MESSAGES)
+
+
+class RateLimiter:
+    """Sliding-window requests/tokens per minute budget shared across threads"""
+
+    def __init__(self, rpm=DEFAULT_RPM, tpm=DEFAULT_TPM, window=60.0, clock=time.monotonic, sleep=time.sleep):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self.clock = clock
+        self.sleep = sleep
+        self.events = deque()  # (time, requests, tokens)
+        self.requests = 0
+        self.tokens = 0
+        self.lock = threading.Lock()
+
+    def _expire(self, now):
+        while self.events and self.events[0][0] <= now - self.window:
+            _, requests, tokens = self.events.popleft()
+            self.requests -= requests
+            self.tokens -= tokens
+
+    def acquire(self, tokens):
+        """Block until one request of `tokens` fits both budgets; returns seconds waited"""
+        # A single prompt larger than the whole budget still goes, alone
+        tokens = min(tokens, self.tpm)
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = self.clock()
+                self._expire(now)
+                if self.requests < self.rpm and self.tokens + tokens <= self.tpm:
+                    self.events.append((now, 1, tokens))
+                    self.requests += 1
+                    self.tokens += tokens
+                    return waited
+                # Room opens when the oldest event leaves the window
+                wait = max(self.events[0][0] + self.window - now, 0.01)
+            self.sleep(wait)
+            waited += wait
+
+    def add_tokens(self, tokens):
+        """Count tokens known only after the call (the answer) against the budget"""
+        with self.lock:
+            self.events.append((self.clock(), 0, tokens))
+            self.tokens += tokens
+
+
+class GeminiClient:
+    """Thread-safe generate_content wrapper with quota-aware scheduling, retries and counters"""
+
+    def __init__(self, model, model_name=None, rpm=DEFAULT_RPM, tpm=DEFAULT_TPM, concurrency=DEFAULT_CONCURRENCY,
+                 max_retries=5, base_delay=2.0, max_delay=60.0, limiter=None, sleep=time.sleep):
+        self.model = model
+        self.model_name = model_name or getattr(model, '_model_name', '').split('/')[-1]
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.limiter = limiter or RateLimiter(rpm, tpm, sleep=sleep)
+        self.sleep = sleep
+        self.random = random.Random()
+        self.counters = Counter()
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.executor = None
+
+    def _count(self, **values):
+        with self.lock:
+            self.counters.update(values)
+
+    def _backoff(self, attempt):
+        # Full jitter: workers that hit the same 429 come back at different times
+        return self.random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def generate(self, prompt):
+        """Answer text for one prompt; raises the last error once retries run out"""
+        estimate = estimate_tokens(prompt)
+        for attempt in range(self.max_retries + 1):
+            waited = self.limiter.acquire(estimate)
+            self._count(requests=1, throttled_seconds=waited)
+            try:
+                response = self.model.generate_content(prompt)
+                text = response.text
+            except Exception as e:
+                if attempt < self.max_retries and is_retryable(e):
+                    self._count(retries=1)
+                    self.sleep(self._backoff(attempt))
+                    continue
+                self._count(failures=1)
+                raise
+            usage = getattr(response, 'usage_metadata', None)
+            input_tokens = getattr(usage, 'prompt_token_count', None) or estimate
+            output_tokens = getattr(usage, 'candidates_token_count', None) or estimate_tokens(text)
+            self.limiter.add_tokens(output_tokens)
+            self._count(succeeded=1, input_tokens=input_tokens, output_tokens=output_tokens)
+            return text
+
+    def map(self, fn, items):
+        """Run fn(item) on the worker pool; yields (item, result) in completion order"""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='gemini')
+        futures = {self.executor.submit(fn, item): item for item in items}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def stats(self):
+        with self.lock:
+            counters = dict(self.counters)
+        minutes = max(time.monotonic() - self.started, 1e-9) / 60
+        input_price, output_price = PRICING.get(self.model_name, (0.0, 0.0))
+        tokens = counters.get('input_tokens', 0) + counters.get('output_tokens', 0)
+        return {
+            'requests': counters.get('requests', 0),
+            'succeeded': counters.get('succeeded', 0),
+            'retries': counters.get('retries', 0),
+            'failures': counters.get('failures', 0),
+            'input_tokens': counters.get('input_tokens', 0),
+            'output_tokens': counters.get('output_tokens', 0),
+            'throttled_seconds': round(counters.get('throttled_seconds', 0.0), 1),
+            'requests_per_minute': round(counters.get('succeeded', 0) / minutes, 1),
+            'tokens_per_minute': round(tokens / minutes),
+            'cost_usd': (counters.get('input_tokens', 0) * input_price
+                         + counters.get('output_tokens', 0) * output_price) / 1_000_000,
+        }
+
+    def summary(self):
+        s = self.stats()
+        return (f"{s['succeeded']:,} answers, {s['retries']:,} retries, {s['failures']:,} failures | "
+                f"{s['requests_per_minute']:,} req/min, {s['tokens_per_minute']:,} tokens/min | "
+                f"{s['input_tokens']:,} in + {s['output_tokens']:,} out tokens, ~${s['cost_usd']:.4f}")
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class MockQuotaError(Exception):
+    pass
+
+
+class MockModel:
+    """Local stand-in for GenerativeModel: fixed latency, its own per-minute quota, optional random 503s"""
+
+    def __init__(self, reply='{}', latency=0.2, rpm=None, failure_rate=0.0, seed=0):
+        self.reply = reply
+        self.latency = latency
+        self.rpm = rpm
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.calls = deque()
+        self.lock = threading.Lock()
+        self._model_name = 'mock'
+
+    def generate_content(self, prompt):
+        with self.lock:
+            now = time.monotonic()
+            while self.calls and self.calls[0] <= now - 60:
+                self.calls.popleft()
+            if self.rpm is not None and len(self.calls) >= self.rpm:
+                raise MockQuotaError('429 Resource exhausted')
+            self.calls.append(now)
+            fail = self.random.random() < self.failure_rate
+        time.sleep(self.latency)
+        if fail:
+            raise MockQuotaError('503 Unavailable')
+        text = self.reply(prompt) if callable(self.reply) else self.reply
+        return SimpleNamespace(text=text, usage_metadata=SimpleNamespace(
+            prompt_token_count=estimate_tokens(prompt), candidates_token_count=estimate_tokens(text)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Throughput of a GeminiClient configuration against MockModel')
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.2, help='Seconds per mock answer')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--rpm', type=int, default=DEFAULT_RPM, help='Client budget')
+    parser.add_argument('--server-rpm', type=int, default=None, help='Mock quota (429s past it)')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='Share of mock 503s')
+    args = parser.parse_args()
+
+    prompts = [f"request {i} " + 'x' * 2000 for i in range(args.requests)]
+    for concurrency in sorted({1, args.concurrency}):
+        model = MockModel(latency=args.latency, rpm=args.server_rpm, failure_rate=args.failure_rate)
+        start = time.monotonic()
+        with GeminiClient(model, rpm=args.rpm, concurrency=concurrency, base_delay=0.1, max_delay=1.0) as client:
+            failed = sum(1 for _, ok in client.map(lambda p: _try(client, p), prompts) if not ok)
+        print(f"concurrency {concurrency:>3}: {time.monotonic() - start:6.1f}s, {failed} failed | {client.summary()}")
+
+
+def _try(client, prompt):
+    try:
+        client.generate(prompt)
+        return True
+    except Exception:
+        return False
+
+
+if __name__ == "__main__":
+    main()
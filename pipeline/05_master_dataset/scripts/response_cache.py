@@ -0,0 +1,186 @@
+"""
+Persistent LLM Response Cache for Validation and Audit Scripts
+Content-addressed store of parsed Gemini answers, with TTL and size-bounded eviction
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+10_send_to_gemini.py, 12_batch_validation.py (phase 05),
+validate_with_vertex.py (phase 09), extract_breeders.py and
+s3_to_vertex_auditor.py (phase 11) sent every prompt again on every run.
+Only validate_with_vertex kept a checkpoint, every 10 batches, so a crash
+or a re-run billed the same calls twice.
+
+  key = cache.key(model, version, payload)   SHA-256 of the model name, the
+                                             prompt version and the
+                                             normalized input (prompt text,
+                                             or a dict of what fills it)
+  cache.get(key) / cache.put(key, value)     parsed answer as JSON
+  cache.cached(model, version, payload, fn)  get, else fn() and put it
+                                             unless fn() returned None
+
+Answers are written as soon as each one is parsed, so a run that dies
+resumes at the next unanswered request. Failed or unparseable answers are
+never stored. Entries expire after LLM_CACHE_TTL_DAYS (default 30); past
+LLM_CACHE_MAX_MB (default 500) the least recently read entries go first.
+All scripts share pipeline/.llm_cache/responses.sqlite (LLM_CACHE_PATH).
+
+  python response_cache.py            entries, size and age of the oldest
+  python response_cache.py --clear    empty the cache
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+
+DEFAULT_PATH = Path(os.environ.get(
+    'LLM_CACHE_PATH', Path(__file__).resolve().parents[2] / '.llm_cache' / 'responses.sqlite'))
+DEFAULT_TTL_DAYS = float(os.environ.get('LLM_CACHE_TTL_DAYS', 30))
+DEFAULT_MAX_MB = float(os.environ.get('LLM_CACHE_MAX_MB', 500))
+# Eviction trims to this share of the size limit, so it does not run on every put
+EVICT_TO = 0.9
+
+
+def normalize(payload):
+    """Canonical text of a request input: NFC unicode, \\n line endings, no trailing spaces; dicts with sorted keys"""
+    if isinstance(payload, str):
+        text = unicodedata.normalize('NFC', payload).replace('\r\n', '\n').replace('\r', '\n')
+        return '\n'.join(line.rstrip() for line in text.strip().split('\n'))
+    if isinstance(payload, dict):
+        return json.dumps({str(k): normalize(v) for k, v in payload.items()}, sort_keys=True, ensure_ascii=False)
+    if isinstance(payload, (list, tuple)):
+        return json.dumps([normalize(v) for v in payload], ensure_ascii=False)
+    return json.dumps(payload, default=str)
+
+
+class ResponseCache:
+    """On-disk key -> parsed response store, safe to share between threads and processes"""
+
+    def __init__(self, path=DEFAULT_PATH, ttl_days=DEFAULT_TTL_DAYS, max_mb=DEFAULT_MAX_MB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl_days * 86400
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Worker threads of GeminiClient share one connection behind self.lock
+        self.db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)')
+        self.db.commit()
+        self.total_bytes = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    @staticmethod
+    def key(model, version, payload):
+        text = '\x1e'.join([model, version, normalize(payload)])
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Cached value, or None when missing or older than the TTL"""
+        now = time.time()
+        with self.lock:
+            row = self.db.execute('SELECT value, size, created_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is not None and now - row[2] > self.ttl:
+                self.db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self.db.commit()
+                self.total_bytes -= row[1]
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self.db.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        text = json.dumps(value, ensure_ascii=False)
+        size = len(text.encode('utf-8'))
+        now = time.time()
+        with self.lock:
+            old = self.db.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self.db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)', (key, text, size, now, now))
+            self.db.commit()
+            self.total_bytes += size - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self._evict(now)
+
+    def _evict(self, now):
+        # Expired entries first, then the least recently read until under EVICT_TO of the limit
+        self.db.execute('DELETE FROM responses WHERE created_at < ?', (now - self.ttl,))
+        target = int(self.max_bytes * EVICT_TO)
+        total = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        doomed = []
+        for key, size in self.db.execute('SELECT key, size FROM responses ORDER BY accessed_at'):
+            if total <= target:
+                break
+            doomed.append((key,))
+            total -= size
+        self.db.executemany('DELETE FROM responses WHERE key = ?', doomed)
+        self.db.commit()
+        self.total_bytes = total
+
+    def cached(self, model, version, payload, compute):
+        """Cached answer for this request, else compute() stored when it is not None"""
+        key = self.key(model, version, payload)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def summary(self):
+        return f"{self.hits:,} cache hits, {self.misses:,} misses ({self.path.name})"
+
+    def clear(self):
+        with self.lock:
+            self.db.execute('DELETE FROM responses')
+            self.db.commit()
+            self.total_bytes = 0
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Size and age of the shared LLM response cache')
+    parser.add_argument('--path', default=str(DEFAULT_PATH))
+    parser.add_argument('--clear', action='store_true', help='Delete every cached response')
+    args = parser.parse_args()
+
+    with ResponseCache(args.path) as cache:
+        if args.clear:
+            cache.clear()
+            print(f"[OK] Cleared {cache.path}")
+            return
+        count, oldest = cache.db.execute('SELECT COUNT(*), MIN(created_at) FROM responses').fetchone()
+        print(f"{cache.path}: {count:,} responses, {cache.total_bytes / (1024 * 1024):.1f} MB "
+              f"(limit {cache.max_bytes / (1024 * 1024):.0f} MB, TTL {cache.ttl / 86400:g} days)")
+        if oldest:
+            print(f"Oldest entry: {(time.time() - oldest) / 86400:.1f} days")
+
+
+if __name__ == "__main__":
+    main()
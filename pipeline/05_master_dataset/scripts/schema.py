@@ -3,7 +3,7 @@
 
 CORE_SCHEMA = {
     # Identity
-    'strain_id': 'UUID generated',
+    'strain_id': 'UUID5 of seed_bank + source_url (stable across re-runs)',
     'strain_name': 'Primary strain name',
     'seed_bank': 'Source attribution only',
     'source_url': 'Original URL for verification',
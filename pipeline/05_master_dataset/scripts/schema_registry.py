@@ -0,0 +1,115 @@
+"""
+Incremental Schema Registry for Column Mapping
+Resolves each source column once, with all schema.py keyword rules compiled into one matcher
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+02_column_mapping.py used to test every (seed_bank, column) pair against
+every EXCLUDED_COLUMNS and COLUMN_MAPPINGS keyword, and 03_merge_raw.py
+rebuilt its lookup from the resulting column_mapping.json. The answer only
+depends on the column name and the rules, so most of that work repeated
+itself: the same meta_*/spec_* keys appear in bank after bank, run after run.
+
+  ColumnMatcher()            one regex over every keyword, in rule priority order
+  SchemaRegistry(path)       output/schema_registry.json: column fingerprint ->
+                             status (mapped / excluded / unmapped) and maps_to
+
+registry.resolve(columns) answers known columns from the registry and runs
+the matcher only on columns it has never seen, so a new seed bank or meta
+tag costs a handful of matches. Editing the rules in schema.py changes
+RULES_VERSION, and the next run resolves every column again.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from schema import COLUMN_MAPPINGS, EXCLUDED_COLUMNS
+
+MAPPED, EXCLUDED, UNMAPPED = 'mapped', 'excluded', 'unmapped'
+
+# Fingerprint of the rules; resolved columns are only valid under the rules that resolved them
+RULES_VERSION = hashlib.sha256(
+    json.dumps([EXCLUDED_COLUMNS, COLUMN_MAPPINGS]).encode('utf-8')).hexdigest()[:12]
+
+
+def column_fingerprint(column):
+    """Registry key of a source column: the rules only see its lowercased name"""
+    return hashlib.sha256(column.lower().encode('utf-8')).hexdigest()[:16]
+
+
+class ColumnMatcher:
+    """First matching rule for a column name, same answer as testing the keyword lists in order"""
+
+    def __init__(self, excluded=EXCLUDED_COLUMNS, mappings=COLUMN_MAPPINGS):
+        # Priority order: every exclusion first, then COLUMN_MAPPINGS in dict order
+        self.targets = []
+        seen = set()
+        alternatives = []
+        rules = [(keyword, None) for keyword in excluded]
+        rules += [(keyword, unified) for unified, keywords in mappings.items() for keyword in keywords]
+        for keyword, target in rules:
+            if keyword in seen:
+                continue
+            seen.add(keyword)
+            alternatives.append(f"(?P<k{len(self.targets)}>{re.escape(keyword)})")
+            self.targets.append(target)
+        # A lookahead at every position reports the highest-priority keyword starting there,
+        # so the lowest index over all positions is the first rule that matches anywhere
+        self.pattern = re.compile(f"(?=(?:{'|'.join(alternatives)}))")
+
+    def match(self, column):
+        """(status, unified column or None)"""
+        found = [int(m.lastgroup[1:]) for m in self.pattern.finditer(column.lower())]
+        if not found:
+            return UNMAPPED, None
+        target = self.targets[min(found)]
+        return (EXCLUDED, None) if target is None else (MAPPED, target)
+
+
+class SchemaRegistry:
+    """Persistent column fingerprint -> resolved mapping, extended only with unseen columns"""
+
+    def __init__(self, path, matcher=None):
+        self.path = Path(path)
+        self.matcher = matcher
+        self.entries = {}
+        self.resolved = 0
+        self.changed = False
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('rules_version') == RULES_VERSION:
+                self.entries = data['columns']
+
+    def resolve(self, columns):
+        """{column: {'status', 'maps_to'}}, matching only columns not in the registry yet"""
+        resolved = {}
+        for column in columns:
+            key = column_fingerprint(column)
+            entry = self.entries.get(key)
+            if entry is None:
+                if self.matcher is None:
+                    self.matcher = ColumnMatcher()
+                status, maps_to = self.matcher.match(column)
+                entry = self.entries[key] = {'column': column, 'status': status, 'maps_to': maps_to}
+                self.resolved += 1
+                self.changed = True
+            resolved[column] = entry
+        return resolved
+
+    def mapping(self, columns):
+        """{original_col: unified_col} for the mapped columns among columns"""
+        return {column: entry['maps_to'] for column, entry in self.resolve(columns).items()
+                if entry['status'] == MAPPED}
+
+    def save(self):
+        if not self.changed:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'rules_version': RULES_VERSION, 'columns': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+        self.changed = False
@@ -0,0 +1,490 @@
+"""
+Typed Intermediate Tables for Pipelines 05-11
+Parquet hand-off between phases with an explicit Arrow schema, CSV kept as the human export
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Every phase used to hand its output to the next as CSV, written as UTF-8 in
+some scripts and Latin-1 in others, then re-read with low_memory=False and
+dtypes inferred from scratch. Accented names did not survive the round trip
+(UTF-8 read as Latin-1 gives 'CafÃ©'), and each read of a ~23k x 100+ column
+table cost seconds.
+
+write_table(df, 'output/x.csv') now writes output/x.parquet, typed by
+arrow_schema() from schema.py. By default it also writes output/x.csv as
+UTF-8 for people to open. read_table('output/x.csv') loads the Parquet
+file. It falls back to the CSV (UTF-8, then Latin-1) when no Parquet file
+exists, or when the CSV was edited after it was written (manual review in
+Excel), so existing CSV-only inputs keep working.
+
+Column types:
+  CORE_SCHEMA / COLUMN_MAPPINGS columns   string, except the numeric and flag
+                                          columns below
+  THC/CBD/CBN min/max/avg, *_percentage_raw, award counts, completeness
+  score, *_clean with percentage/days/_cm/_g_ float64 when every value parses
+                                               (a column holding '20-25%'
+                                               text stays string, with a warning)
+  is_*_raw                                bool when all values are flags
+  any other column                        numbers and flags as pandas read
+                                          them, all-empty columns null,
+                                          everything else string
+
+TableWriter writes the same files chunk by chunk for tables too large to
+build in memory (03_merge_raw.py).
+
+read_table(path, optimize=True) also applies the in-memory dtype plan:
+repeated labels (seed bank, breeder, seed type, dominant type, market
+tier) become categoricals, other text stays in Arrow string buffers
+instead of one Python object per cell, and the numeric columns above
+shrink to nullable Int16 (whole days / cm / percentages) or Float32 when
+that loses nothing. memory_report(df) shows where the bytes go:
+
+  python table_io.py ../../07_data_cleaning/input/master_strains_raw.csv
+"""
+
+import argparse
+import codecs
+import logging
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from schema import COLUMN_MAPPINGS, CORE_SCHEMA
+
+logger = logging.getLogger(__name__)
+
+KNOWN_COLUMNS = set(CORE_SCHEMA) | set(COLUMN_MAPPINGS)
+
+NUMERIC_COLUMN = re.compile(
+    r'^(thc|cbd|cbn)_(min|max|average|avg)_raw$'
+    r'|_percentage_raw$'
+    r'|^(award_count_raw|data_completeness_score)$'
+    r'|^.*(percentage|days|_cm|_g_).*_clean$'
+)
+FLAG_COLUMN = re.compile(r'^is_.*_raw$')
+# Flag-like columns scripts assign True/1 into; optimize_dtypes leaves them as read
+FLAG_NAME = re.compile(r'^(is|has)_|_is_')
+FLAG_VALUES = {'true': True, 'false': False, '1': True, '0': False, '1.0': True, '0.0': False}
+
+# Low-cardinality labels held as categoricals by optimize_dtypes
+CATEGORY_COLUMNS = {
+    'seed_bank', 'seed_bank_display_manual', 'breeder_name_raw', 'breeder_display',
+    'breeder_display_manual', 'seed_type_raw', 'dominant_type_raw', 'flowering_type_raw',
+    'difficulty_raw', 'market_tier', 'market_tier_raw',
+}
+INT16_RANGE = (np.iinfo(np.int16).min, np.iinfo(np.int16).max)
+# Float32 keeps ~7 significant digits; values must survive the round trip to this tolerance
+FLOAT32_TOLERANCE = 1e-4
+SMALL_NUMERIC_DTYPES = {'Int16', 'Float32'}
+
+COMPRESSION = 'zstd'
+# Set PIPELINE_CSV_EXPORT=false to skip the human-readable CSV next to each table
+CSV_EXPORT = os.environ.get('PIPELINE_CSV_EXPORT', 'true').lower() == 'true'
+CSV_ENCODINGS = ['utf-8-sig', 'latin-1']
+CHUNK_BYTES = 1024 * 1024
+
+
+def parquet_path(path):
+    """output/x.csv -> output/x.parquet"""
+    return Path(path).with_suffix('.parquet')
+
+
+def csv_path(path):
+    return Path(path).with_suffix('.csv')
+
+
+def declared_type(column):
+    """'float64', 'bool' or 'string' for pipeline schema columns, None for source-specific extras"""
+    if NUMERIC_COLUMN.search(column):
+        return 'float64'
+    if FLAG_COLUMN.match(column):
+        return 'bool'
+    if column in KNOWN_COLUMNS:
+        return 'string'
+    return None
+
+
+def _as_float(series):
+    """float64 series if every non-null value is numeric, else None"""
+    if pd.api.types.is_float_dtype(series) and series.dtype.itemsize == 4:
+        # Widen optimized Float32 columns via their shortest repr (20.1, not 20.100000381)
+        return pd.to_numeric(series.astype('string')).astype('float64')
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype('float64')
+    converted = pd.to_numeric(series, errors='coerce')
+    if converted.notna().sum() != series.notna().sum():
+        return None
+    return converted.astype('float64')
+
+
+def _as_flag(series):
+    """Nullable boolean series if every non-null value is a flag, else None"""
+    if pd.api.types.is_bool_dtype(series):
+        return series.astype('boolean')
+    mapped = series.astype('string').str.strip().str.lower().map(FLAG_VALUES)
+    if mapped.notna().sum() != series.notna().sum():
+        return None
+    return mapped.astype('boolean')
+
+
+def _as_string(series):
+    return series.astype('string')
+
+
+def conform(df):
+    """(typed copy of df, pyarrow schema) following the column rules above"""
+    columns, fields = {}, []
+    for column in df.columns:
+        series = df[column]
+        wanted = declared_type(str(column))
+        typed = None
+
+        if wanted == 'float64':
+            typed = _as_float(series)
+            if typed is None:
+                logger.warning(f"{column}: non-numeric values, stored as string")
+        elif wanted == 'bool':
+            typed = _as_flag(series)
+            if typed is None:
+                logger.warning(f"{column}: values other than true/false/1/0, stored as string")
+        elif wanted is None:
+            if pd.api.types.is_bool_dtype(series) or pd.api.types.infer_dtype(series, skipna=True) == 'boolean':
+                typed = series.astype('boolean')
+            elif pd.api.types.is_numeric_dtype(series):
+                typed = series
+            elif series.isna().all():
+                # Placeholder columns scripts fill later; Arrow null reads back as object, which takes any value
+                typed = series.astype(object)
+
+        if typed is None:
+            typed = _as_string(series)
+
+        columns[column] = typed
+        if pd.api.types.is_object_dtype(typed):
+            arrow_type = pa.null()
+        elif pd.api.types.is_bool_dtype(typed):
+            arrow_type = pa.bool_()
+        elif pd.api.types.is_integer_dtype(typed):
+            arrow_type = pa.int64()
+        elif pd.api.types.is_float_dtype(typed):
+            arrow_type = pa.float64()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(str(column), arrow_type))
+
+    return pd.DataFrame(columns, index=df.index), pa.schema(fields)
+
+
+def arrow_schema(df):
+    """Arrow schema write_table would use for df"""
+    return conform(df)[1]
+
+
+def _widened(df):
+    """df with optimize_dtypes' Int16/Float32 columns back to float64, so CSV exports read 20.0 / 20.1 as before"""
+    small = [column for column in df.columns if str(df[column].dtype) in SMALL_NUMERIC_DTYPES]
+    if not small:
+        return df
+    return df.assign(**{str(column): _as_float(df[column]) for column in small})
+
+
+def write_table(df, path, csv=None):
+    """Write df as typed Parquet (path with .parquet) plus, by default, a UTF-8 CSV export at path"""
+    export_csv = CSV_EXPORT if csv is None else csv
+    target = parquet_path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    # CSV first, so the Parquet file is the newer of the two and read_table picks it
+    if export_csv:
+        csv_file = csv_path(path)
+        tmp_csv = csv_file.with_suffix('.csv.tmp')
+        _widened(df).to_csv(tmp_csv, index=False, encoding='utf-8')
+        os.replace(tmp_csv, csv_file)
+
+    typed, schema = conform(df)
+    # No pandas metadata: readers get plain float64/object columns, as from read_csv, not nullable extension dtypes
+    table = pa.Table.from_pandas(typed, schema=schema, preserve_index=False).replace_schema_metadata(None)
+    tmp_parquet = target.with_suffix('.parquet.tmp')
+    pq.write_table(table, tmp_parquet, compression=COMPRESSION)
+    os.replace(tmp_parquet, target)
+    return target
+
+
+# Arrow types conform() gives undeclared columns
+UNDECLARED_TYPES = {'null': pa.null(), 'bool': pa.bool_(), 'int': pa.int64(), 'float': pa.float64(),
+                    'string': pa.string()}
+
+
+def _undeclared_kind(series):
+    """Key of UNDECLARED_TYPES conform() picks for an undeclared column"""
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.infer_dtype(series, skipna=True) == 'boolean':
+        return 'bool'
+    if pd.api.types.is_integer_dtype(series):
+        return 'int'
+    if pd.api.types.is_numeric_dtype(series):
+        return 'float'
+    if series.isna().all():
+        return 'null'
+    return 'string'
+
+
+def _combined_kind(kind, other):
+    """Kind of a column whose chunks have these two kinds"""
+    if kind is None or kind == other or kind == 'null':
+        # Missing ints become NaN, as in a float64 column read in one piece
+        return 'float' if kind == 'null' and other == 'int' else other
+    if other == 'null':
+        return 'float' if kind == 'int' else kind
+    if {kind, other} == {'int', 'float'}:
+        return 'float'
+    return 'string'
+
+
+class TableWriter:
+    """Write a table chunk by chunk, with a fixed column list, to the same files and types as write_table
+
+    Chunks are staged as text: the CSV export is appended as they arrive and the
+    Parquet rows go to a staging file. Whether each float64/bool column parses,
+    and which type conform() would give each undeclared column, is tracked
+    across chunks; close() re-types the staged file one row group at a time.
+    Memory is bounded by the chunk size, not the table.
+
+        with TableWriter('output/x.csv', columns) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+    """
+
+    def __init__(self, path, columns, csv=None):
+        self.columns = list(columns)
+        self.target = parquet_path(path)
+        self.target.parent.mkdir(parents=True, exist_ok=True)
+        self.csv_file = csv_path(path) if (CSV_EXPORT if csv is None else csv) else None
+        self.tmp_csv = self.csv_file.with_suffix('.csv.tmp') if self.csv_file else None
+        self.staging = self.target.with_suffix('.staging.parquet')
+        self.text_schema = pa.schema([pa.field(str(column), pa.string()) for column in self.columns])
+        self.parses = {column: declared_type(str(column)) in ('float64', 'bool') for column in self.columns}
+        self.kinds = {column: None for column in self.columns if declared_type(str(column)) is None}
+        self.rows = 0
+        self._staged = pq.ParquetWriter(self.staging, self.text_schema, compression=COMPRESSION)
+
+    def write(self, df):
+        chunk = df.reindex(columns=self.columns)
+        if self.tmp_csv:
+            chunk.to_csv(self.tmp_csv, mode='w' if self.rows == 0 else 'a', header=self.rows == 0,
+                         index=False, encoding='utf-8')
+        for column in self.columns:
+            if self.parses[column]:
+                convert = _as_float if declared_type(str(column)) == 'float64' else _as_flag
+                self.parses[column] = convert(chunk[column]) is not None
+        for column in self.kinds:
+            # Columns a chunk does not have are all-null in it, not float64 NaN
+            kind = _undeclared_kind(df[column]) if column in df.columns else 'null'
+            self.kinds[column] = _combined_kind(self.kinds[column], kind)
+        text = pa.Table.from_pandas(chunk.astype('string'), schema=self.text_schema, preserve_index=False)
+        self._staged.write_table(text.replace_schema_metadata(None))
+        self.rows += len(chunk)
+
+    def schema(self):
+        """Final Arrow schema: declared float64/bool columns that parsed in every chunk, string otherwise;
+        undeclared columns typed as write_table would type the whole column"""
+        types = {'float64': pa.float64(), 'bool': pa.bool_()}
+        fields = []
+        for column in self.columns:
+            if column in self.kinds:
+                fields.append(pa.field(str(column), UNDECLARED_TYPES[self.kinds[column] or 'null']))
+                continue
+            wanted = declared_type(str(column))
+            if wanted in types and not self.parses[column]:
+                logger.warning(f"{column}: non-{wanted} values, stored as string")
+            fields.append(pa.field(str(column), types[wanted] if self.parses[column] else pa.string()))
+        return pa.schema(fields)
+
+    def close(self):
+        self._staged.close()
+        if self.tmp_csv:
+            if self.rows == 0:
+                pd.DataFrame(columns=self.columns).to_csv(self.tmp_csv, index=False, encoding='utf-8')
+            os.replace(self.tmp_csv, self.csv_file)
+
+        schema = self.schema()
+        tmp_parquet = self.target.with_suffix('.parquet.tmp')
+        with pq.ParquetWriter(tmp_parquet, schema, compression=COMPRESSION) as final:
+            staged = pq.ParquetFile(self.staging)
+            for group in range(staged.num_row_groups):
+                chunk = staged.read_row_group(group).to_pandas()
+                for field in schema:
+                    if field.type == pa.float64():
+                        chunk[field.name] = _as_float(chunk[field.name])
+                    elif field.type == pa.bool_():
+                        chunk[field.name] = _as_flag(chunk[field.name])
+                    elif field.type == pa.int64():
+                        chunk[field.name] = pd.to_numeric(chunk[field.name]).astype('int64')
+                    elif field.type == pa.null():
+                        chunk[field.name] = pd.Series(None, index=chunk.index, dtype=object)
+                final.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                                  .replace_schema_metadata(None))
+            if staged.num_row_groups == 0:
+                final.write_table(schema.empty_table())
+        os.replace(tmp_parquet, self.target)
+        self.staging.unlink()
+        return self.target
+
+    def abort(self):
+        self._staged.close()
+        for file in (self.staging, self.tmp_csv):
+            if file and file.exists():
+                file.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def table_exists(path):
+    return parquet_path(path).exists() or csv_path(path).exists()
+
+
+def remove_table(path):
+    """Delete both the Parquet file and the CSV export"""
+    for file in (parquet_path(path), csv_path(path)):
+        if file.exists():
+            file.unlink()
+
+
+def csv_encoding(path):
+    """First of CSV_ENCODINGS that decodes the whole file, checked block by block"""
+    for encoding in CSV_ENCODINGS[:-1]:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(CHUNK_BYTES), b''):
+                    decoder.decode(block)
+            decoder.decode(b'', final=True)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return CSV_ENCODINGS[-1]
+
+
+def read_csv_text(path, **kwargs):
+    """CSV as UTF-8, falling back to Latin-1 for files written by older scripts
+
+    A chunked read decodes lazily, so its encoding is settled on the whole file first.
+    """
+    if kwargs.get('chunksize') or kwargs.get('iterator'):
+        return pd.read_csv(path, encoding=csv_encoding(path), low_memory=False, **kwargs)
+    for encoding in CSV_ENCODINGS[:-1]:
+        try:
+            return pd.read_csv(path, encoding=encoding, low_memory=False, **kwargs)
+        except UnicodeDecodeError:
+            continue
+    return pd.read_csv(path, encoding=CSV_ENCODINGS[-1], low_memory=False, **kwargs)
+
+
+def _arrow_string_dtype():
+    """Arrow-backed string dtype with NaN for missing values, as object columns have"""
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        # pandas < 2.3
+        return pd.StringDtype('pyarrow_numpy')
+
+
+def _small_numeric(series):
+    """Int16 / Float32 copy of a numeric series when no value changes, else None"""
+    values = pd.to_numeric(series, errors='coerce')
+    if values.notna().sum() != series.notna().sum():
+        return None
+    present = values.dropna().to_numpy(dtype='float64')
+    if len(present) == 0:
+        return values.astype('Float32')
+    if np.all(present == np.round(present)) and INT16_RANGE[0] <= present.min() and present.max() <= INT16_RANGE[1]:
+        return values.astype('Int16')
+    if np.allclose(present.astype('float32'), present, rtol=0, atol=FLOAT32_TOLERANCE):
+        return values.astype('Float32')
+    return None
+
+
+def optimize_dtypes(df):
+    """Apply the in-memory dtype plan (categoricals, Arrow strings, Int16/Float32) in place and return df"""
+    string_dtype = _arrow_string_dtype()
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if column in CATEGORY_COLUMNS:
+            df[column] = series.astype('category')
+        elif declared_type(str(column)) == 'float64':
+            small = _small_numeric(series)
+            if small is not None:
+                df[column] = small
+        elif FLAG_NAME.search(str(column)):
+            if pd.api.types.is_string_dtype(series):
+                df[column] = series.astype(object)
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            # Mixed and all-empty columns stay as read, so scripts can still fill them with any value
+            if pd.api.types.infer_dtype(series, skipna=True) == 'string':
+                df[column] = series.astype(string_dtype)
+    return df
+
+
+def memory_report(df, top=None):
+    """Per-column dtype and deep memory, largest first, with a TOTAL row"""
+    usage = df.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'mb': usage / 1024 ** 2,
+        'unique': df.nunique(dropna=True),
+    }).sort_values('mb', ascending=False)
+    if top:
+        report = report.head(top)
+    report.loc['TOTAL'] = ['', usage.sum() / 1024 ** 2, len(df)]
+    return report.round({'mb': 3})
+
+
+def read_table(path, columns=None, optimize=False):
+    """DataFrame for a table written by write_table (or a plain CSV at path); optimize=True applies the dtype plan"""
+    parquet_file, csv_file = parquet_path(path), csv_path(path)
+    if parquet_file.exists() and (not csv_file.exists()
+                                  or parquet_file.stat().st_mtime >= csv_file.stat().st_mtime):
+        if not optimize:
+            return pd.read_parquet(parquet_file, columns=columns)
+        # Strings go straight from Arrow buffers to Arrow-backed columns, never through Python objects
+        table = pq.read_table(parquet_file, columns=columns)
+        df = table.to_pandas(types_mapper={pa.string(): _arrow_string_dtype()}.get,
+                             split_blocks=True, self_destruct=True)
+        del table
+        return optimize_dtypes(df)
+    if csv_file.exists():
+        if parquet_file.exists():
+            logger.info(f"{csv_file.name} is newer than {parquet_file.name}, reading the CSV")
+        df = read_csv_text(csv_file, usecols=columns)
+        return optimize_dtypes(df) if optimize else df
+    raise FileNotFoundError(f"Neither {parquet_file} nor {csv_file} exists")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memory per column of a pipeline table, as read and with the dtype plan')
+    parser.add_argument('path', help='Table path (.csv or .parquet)')
+    parser.add_argument('--top', type=int, default=20, help='Columns to list')
+    args = parser.parse_args()
+
+    for label, optimize in [('As read', False), ('Dtype plan', True)]:
+        df = read_table(args.path, optimize=optimize)
+        report = memory_report(df, top=args.top)
+        print(f"\n{label}: {report.loc['TOTAL', 'mb']:,.1f} MB ({len(df):,} rows x {len(df.columns)} columns)")
+        print(report.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Local Validation Rules for the Master Dataset
+Exact anomaly counts, offending strain IDs and per-seed-bank quality in one vectorized pass
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+11_full_validation.py, 12_batch_validation.py and 13_vertex_batch_validation.py
+used to send the table to Gemini as CSV text and ask it to count THC > 40%,
+indica + sativa != 100 (±5), negative or impossible values, placeholders,
+case-insensitive duplicate names and fill rates. The answers were estimates,
+summed across 460/500-row batches (a duplicate split across two batches was
+never seen), and cost a request per batch.
+
+check_table(df) computes the same numbers exactly with pandas, in well under a
+second for 23k rows, and lists every offending row by strain_id. The scripts
+keep Gemini for the semantic checks only (fuzzy duplicates, data quality
+issues a rule cannot express).
+
+  python validation_rules.py                         ../output/master_strains_raw.csv
+  python validation_rules.py path/to/table.csv       any table with the same columns
+
+writes rule_validation_report.md and rule_violations.csv next to the input.
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from table_io import _arrow_string_dtype, read_table, write_table
+
+INPUT_CSV = Path("../output/master_strains_raw.csv")
+
+RULES = {
+    'thc_over_40': 'THC > 40%',
+    'percentage_mismatch': 'indica% + sativa% != 100% (tolerance ±5%)',
+    'impossible_values': 'Negative numbers, or percentages > 100',
+    'placeholders': 'Placeholder text ("N/A", "Unknown", "TBD", ...)',
+    'duplicate_name': 'Strain name repeated (case-insensitive)',
+}
+THC_COLUMN = re.compile(r'^thc_(content|min|max|average|avg|range)_raw$')
+PERCENT_COLUMN = re.compile(r'^(thc|cbd|cbn)_|_percentage_raw$')
+THC_LIMIT = 40
+PERCENT_TOTAL = 100
+PERCENT_TOLERANCE = 5
+# Same list 07_data_cleaning/scripts/03_placeholder_removal.py nulls out
+PLACEHOLDERS = [
+    'n/a', 'na', 'not available', 'not specified', 'unknown',
+    'tbd', 'tba', 'coming soon', 'contact us', 'varies',
+    'see description', 'variable', 'depends', 'multiple',
+    '-', '--', '---', 'none', 'null', 'nil'
+]
+# Range dashes ('18-22%', '16%-22%', '16% - 22%') become spaces first, so a remaining minus is a sign;
+# then up to two numbers per cell
+RANGE_DASH = r'(\d)\s*%?\s*[-–]\s*'
+NUMBERS = r'(-?\d+(?:\.\d+)?)(?:[^\d-]+(-?\d+(?:\.\d+)?))?'
+# Identity and provenance columns, left out of fill rates
+ID_COLUMNS = {'strain_id', 'seed_bank', 'source_url', 'source_url_raw', 's3_html_key', 's3_html_key_raw',
+              'scraped_at', 'scraped_at_raw', 'url_hash'}
+
+
+def _numbers(df, columns):
+    """Numbers in the given cells (up to two per text cell) as a float Series indexed by (row, column)"""
+    parts = []
+    for column in columns:
+        series = df[column].dropna()
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = series.astype('float64')
+        else:
+            text = series.astype(_arrow_string_dtype()).str.replace(RANGE_DASH, r'\1 ', regex=True)
+            found = text.str.extract(NUMBERS).astype('float64')
+            values = pd.concat([found[0], found[1]]).dropna()
+        values.index = pd.MultiIndex.from_arrays([values.index, np.full(len(values), column, dtype=object)])
+        parts.append(values)
+    if not parts:
+        return pd.Series(dtype='float64', index=pd.MultiIndex.from_arrays([[], []]))
+    return pd.concat(parts)
+
+
+def _first_number(series):
+    """First number in each cell (or the value itself for numeric columns), NaN otherwise"""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype('float64')
+    text = series.astype(_arrow_string_dtype()).str.replace(RANGE_DASH, r'\1 ', regex=True)
+    return text.str.extract(NUMBERS)[0].astype('float64')
+
+
+def _violations(df, cells, rule):
+    """Long rows (strain_id, seed_bank, rule, column, value) for a (row, column) MultiIndex"""
+    rows = np.asarray(cells.get_level_values(0), dtype='int64')
+    columns = np.asarray(cells.get_level_values(1), dtype=object)
+    values = np.empty(len(rows), dtype=object)
+    for column in pd.unique(columns):
+        here = columns == column
+        values[here] = df[column].to_numpy(dtype=object)[rows[here]]
+    return pd.DataFrame({
+        'strain_id': df['strain_id'].to_numpy(dtype=object)[rows],
+        'seed_bank': df['seed_bank'].astype(str).to_numpy()[rows],
+        'rule': rule,
+        'column': columns,
+        'value': pd.Series(values, dtype='string').to_numpy(),
+    })
+
+
+def _unique_pairs(index):
+    return index.unique() if len(index) else pd.MultiIndex.from_arrays([[], []])
+
+
+def check_table(df):
+    """Run every rule; returns the counts, offending rows and quality stats the Gemini prompts asked for"""
+    start = time.perf_counter()
+    df = df.reset_index(drop=True)
+    columns = [str(column) for column in df.columns]
+    found = []
+
+    # THC > 40%
+    thc_columns = [column for column in columns if THC_COLUMN.match(column)]
+    thc = _numbers(df, thc_columns)
+    found.append(_violations(df, _unique_pairs(thc[thc > THC_LIMIT].index), 'thc_over_40'))
+
+    # indica + sativa outside 100 ± 5
+    if {'indica_percentage_raw', 'sativa_percentage_raw'} <= set(columns):
+        total = _first_number(df['indica_percentage_raw']) + _first_number(df['sativa_percentage_raw'])
+        rows = df.index[(total - PERCENT_TOTAL).abs() > PERCENT_TOLERANCE]
+        cells = pd.MultiIndex.from_arrays([rows.repeat(2), np.tile(['indica_percentage_raw',
+                                                                    'sativa_percentage_raw'], len(rows))])
+        found.append(_violations(df, cells, 'percentage_mismatch'))
+
+    # Negative numbers anywhere numeric, percentages over 100
+    numeric_columns = [column for column in columns if PERCENT_COLUMN.search(column)
+                       or (pd.api.types.is_numeric_dtype(df[column]) and not pd.api.types.is_bool_dtype(df[column]))]
+    numbers = _numbers(df, numeric_columns)
+    is_percent = numbers.index.get_level_values(1).isin([column for column in numeric_columns
+                                                          if PERCENT_COLUMN.search(column)])
+    impossible = (numbers < 0) | (is_percent & (numbers > PERCENT_TOTAL))
+    found.append(_violations(df, _unique_pairs(numbers[impossible].index), 'impossible_values'))
+
+    # Placeholder text in any _raw / _clean text cell
+    text_columns = [column for column in columns if column.endswith(('_raw', '_clean'))
+                    and not pd.api.types.is_numeric_dtype(df[column])]
+    rows, hits = [], []
+    for column in text_columns:
+        text = df[column].astype(_arrow_string_dtype()).str.strip().str.lower()
+        matched = np.flatnonzero(text.isin(PLACEHOLDERS).to_numpy())
+        rows.append(matched)
+        hits.append(np.full(len(matched), column, dtype=object))
+    if text_columns:
+        cells = pd.MultiIndex.from_arrays([np.concatenate(rows), np.concatenate(hits)])
+        found.append(_violations(df, cells, 'placeholders'))
+
+    # Case-insensitive duplicate names
+    duplicates = []
+    if 'strain_name_raw' in columns:
+        names = df['strain_name_raw'].astype('string').str.strip().str.replace(r'\s+', ' ', regex=True)
+        key = names.str.casefold()
+        repeated = key.notna() & key.duplicated(keep=False)
+        rows = df.index[repeated]
+        found.append(_violations(df, pd.MultiIndex.from_arrays([rows, np.full(len(rows), 'strain_name_raw',
+                                                                               dtype=object)]), 'duplicate_name'))
+        groups = pd.DataFrame({'key': key[repeated], 'name': names[repeated],
+                               'seed_bank': df.loc[repeated, 'seed_bank'].astype(str)}).astype(object)
+        counts = groups.groupby('key', sort=True).agg(name=('name', 'first'), count=('name', 'size'))
+        # Seed banks per name: sort once, then split the array at each new key
+        pairs = groups.drop_duplicates(['key', 'seed_bank']).sort_values(['key', 'seed_bank'])
+        starts = np.flatnonzero(pairs['key'].ne(pairs['key'].shift()).to_numpy())[1:]
+        banks = np.split(pairs['seed_bank'].to_numpy(), starts)
+        duplicates = [{'name': name, 'count': int(count), 'seed_banks': seed_banks.tolist()}
+                      for name, count, seed_banks in zip(counts['name'], counts['count'], banks)]
+
+    violations = pd.concat(found, ignore_index=True)
+
+    # Fill rates
+    fields = [column for column in columns if column not in ID_COLUMNS]
+    filled = df[fields].notna().to_numpy()
+    row_fill = filled.mean(axis=1) if fields else np.zeros(len(df))
+    field_coverage = dict(zip(fields, filled.sum(axis=0).tolist()))
+    banks = pd.DataFrame({'seed_bank': df['seed_bank'].astype(str), 'fill': row_fill, 'over_50': row_fill > 0.5})
+    by_bank = banks.groupby('seed_bank').agg(strains=('fill', 'size'), avg_fill_rate=('fill', 'mean'),
+                                             strains_over_50=('over_50', 'sum'))
+    seed_bank_quality = {bank: {'strains': int(stats['strains']), 'avg_fill_rate': float(stats['avg_fill_rate']),
+                                'strains_over_50': int(stats['strains_over_50'])}
+                         for bank, stats in by_bank.iterrows()}
+
+    per_rule = violations.groupby('rule')['strain_id'].nunique()
+    return {
+        'strains': len(df),
+        'total_anomalies': {rule: int(per_rule.get(rule, 0)) for rule in RULES if rule != 'duplicate_name'},
+        'violations': violations,
+        'duplicates': duplicates,
+        'seed_bank_quality': seed_bank_quality,
+        'field_coverage': field_coverage,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def report_markdown(results):
+    """Rule sections for the validation reports: counts, duplicates, seed bank ranking, field coverage"""
+    strains = results['strains'] or 1
+    anomalies = results['total_anomalies']
+    duplicates = results['duplicates']
+    ranked = sorted(results['seed_bank_quality'].items(), key=lambda x: x[1]['avg_fill_rate'], reverse=True)
+    coverage = sorted(results['field_coverage'].items(), key=lambda x: x[1], reverse=True)
+
+    return f"""## Anomaly Detection (Exact Counts, Local Rules)
+
+{chr(10).join(f"- **{RULES[rule]}**: {count:,} strains" for rule, count in anomalies.items())}
+
+## Duplicate Detection (Case-Insensitive Exact Names)
+
+**Total Duplicates Found**: {len(duplicates):,} unique strain names, {sum(d['count'] for d in duplicates):,} strains
+
+Top 50 Duplicates:
+{chr(10).join(f"- {d['name']} ({d['count']}x: {', '.join(d['seed_banks'])})" for d in sorted(duplicates, key=lambda d: d['count'], reverse=True)[:50])}
+
+## Seed Bank Quality Rankings
+
+| Seed Bank | Strains | Avg Fill Rate | Strains >50% Fields |
+|-----------|---------|---------------|---------------------|
+{chr(10).join(f"| {bank} | {stats['strains']:,} | {stats['avg_fill_rate']:.1%} | {stats['strains_over_50']:,} |" for bank, stats in ranked)}
+
+## Field Coverage
+
+{chr(10).join(f"- **{field}**: {count:,} strains ({count/strains*100:.1f}%)" for field, count in coverage)}
+"""
+
+
+def rule_summary(results):
+    """Short plain-text version of the counts, for giving Gemini context it should not recount"""
+    lines = [f"{RULES[rule]}: {count}" for rule, count in results['total_anomalies'].items()]
+    lines.append(f"Case-insensitive duplicate names: {len(results['duplicates'])}")
+    lines.extend(f"{bank}: {stats['avg_fill_rate']:.1%} average fill rate, {stats['strains_over_50']} strains >50% filled"
+                 for bank, stats in results['seed_bank_quality'].items())
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exact anomaly, duplicate and fill-rate checks for the master dataset')
+    parser.add_argument('path', nargs='?', default=str(INPUT_CSV), help='Table path (.csv or .parquet)')
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    df = read_table(path)
+    results = check_table(df)
+
+    report_file = path.parent / "rule_validation_report.md"
+    violations_file = path.parent / "rule_violations.csv"
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write(f"# Rule Validation Report - {results['strains']:,} Strains\n\n")
+        f.write(report_markdown(results))
+    write_table(results['violations'], violations_file)
+
+    print(f"Checked {results['strains']:,} strains in {results['seconds']:.2f}s")
+    for rule, count in results['total_anomalies'].items():
+        print(f"  {RULES[rule]}: {count:,}")
+    print(f"  Duplicate names: {len(results['duplicates']):,}")
+    print(f"[OK] Report: {report_file}")
+    print(f"[OK] Offending rows: {violations_file} ({len(results['violations']):,} cells)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,35 @@
-import pandas as pd
 import boto3
 from bs4 import BeautifulSoup
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '03_s3_inventory' / 'scripts'))
+from inventory_index import InventoryIndex
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table
 
 s3 = boto3.client('s3')
 bucket = 'ci-strains-html'
 
 # Load master
-master = pd.read_csv('../input/master_strains_raw.csv', encoding='latin-1')
+master = read_table('../input/master_strains_raw.csv')
+
+# Indexed inventory (html + JS) - point lookups instead of scanning a CSV per URL
+inventory = InventoryIndex()
 
 # Sample 2 URLs from each failed bank
 banks = [
-    ('ilgm', 'html_js/', '../../03_s3_inventory/s3_js_html_inventory.csv'),
-    ('seeds_here_now', 'html/', '../../03_s3_inventory/s3_html_inventory.csv'),
-    ('great_lakes_genetics', 'html/', '../../03_s3_inventory/s3_html_inventory.csv')
+    ('ilgm', 'js'),
+    ('seeds_here_now', 'html'),
+    ('great_lakes_genetics', 'html')
 ]
 
-for bank_name, folder, inv_path in banks:
+for bank_name, source in banks:
     print(f"\n{'='*80}")
     print(f"SEED BANK: {bank_name}")
     print(f"{'='*80}")
     
-    inventory = pd.read_csv(inv_path, encoding='latin-1')
     bank_data = master[master['seed_bank'] == bank_name].head(2)
     
     for idx, row in bank_data.iterrows():
@@ -31,15 +40,14 @@ for bank_name, folder, inv_path in banks:
         print(f"URL: {url}")
         
         # Get S3 key
-        key_col = 'html_key' if 'js' in folder else 's3_html_key'
-        s3_key = inventory[inventory['url'] == url][key_col].values
+        match = inventory.lookup_url(url, source=source)
         
-        if len(s3_key) == 0:
+        if match is None:
             print("ERROR: No S3 key found")
             continue
         
         try:
-            obj = s3.get_object(Bucket=bucket, Key=s3_key[0])
+            obj = s3.get_object(Bucket=bucket, Key=match['s3_html_key'])
             html = obj['Body'].read().decode('utf-8')
             soup = BeautifulSoup(html, 'html.parser')
             
@@ -95,5 +103,7 @@ for bank_name, folder, inv_path in banks:
         except Exception as e:
             print(f"ERROR: {e}")
 
+inventory.close()
+
 print("\n" + "="*80)
 print("DIAGNOSTIC COMPLETE")
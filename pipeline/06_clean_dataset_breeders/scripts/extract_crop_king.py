@@ -3,11 +3,15 @@ Crop King - Breeder Extraction
 Self-branded: all strains are "Crop King"
 Logic designed by Amazon Q, verified by Shannon Goddard.
 """
-import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 # Load dataset
 print("Loading master dataset...")
-df = pd.read_csv('input/master_strains_raw.csv', encoding='latin-1', low_memory=False)
+df = read_table('input/master_strains_raw.csv')
 crop_king = df[df['seed_bank'] == 'crop_king'].copy()
 print(f"Crop King strains: {len(crop_king)}")
 
@@ -18,6 +22,6 @@ print(f"\nResults:")
 print(f"  Extracted: {len(crop_king)} (100.0%)")
 
 # Save
-crop_king.to_csv('output/crop_king_breeders.csv', index=False, encoding='utf-8')
+write_table(crop_king, 'output/crop_king_breeders.csv')
 crop_king.head(100).to_csv('output/crop_king_breeders_sample.csv', index=False, encoding='utf-8')
 print(f"\nOutput: output/crop_king_breeders.csv")
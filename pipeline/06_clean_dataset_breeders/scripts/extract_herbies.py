@@ -2,6 +2,10 @@ import pandas as pd
 import boto3
 from bs4 import BeautifulSoup
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 # Paths
 BASE_DIR = Path(__file__).parent.parent
@@ -10,7 +14,7 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 
 # Load datasets
 print("Loading master dataset...")
-master = pd.read_csv(BASE_DIR / "input" / "master_strains_raw.csv", encoding='utf-8')
+master = read_table(BASE_DIR / "input" / "master_strains_raw.csv")
 
 # Filter Herbies strains
 herbies = master[master['seed_bank'] == 'herbies'].copy()
@@ -65,7 +69,7 @@ for idx, row in herbies.iterrows():
 # Save results
 df = pd.DataFrame(results)
 output_path = OUTPUT_DIR / "herbies_breeders.csv"
-df.to_csv(output_path, index=False, encoding='utf-8')
+write_table(df, output_path)
 
 # Stats
 extracted = df['breeder_extracted'].notna().sum()
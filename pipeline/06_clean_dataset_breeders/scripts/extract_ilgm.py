@@ -3,6 +3,13 @@ import boto3
 from bs4 import BeautifulSoup
 import re
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '03_s3_inventory' / 'scripts'))
+from inventory_index import InventoryIndex
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 BASE_DIR = Path(__file__).parent.parent
 OUTPUT_DIR = BASE_DIR / "output"
@@ -11,15 +18,17 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 s3 = boto3.client('s3')
 BUCKET = 'ci-strains-html-archive'
 
-print("Loading S3 JS inventory...")
-inv = pd.read_csv(BASE_DIR.parent / '03_s3_inventory' / 's3_js_html_inventory.csv')
-url_to_key = dict(zip(inv['url'], inv['html_key']))
-
 print("Loading master dataset...")
-master = pd.read_csv(BASE_DIR / 'input' / 'master_strains_raw.csv', encoding='utf-8', low_memory=False)
+master = read_table(BASE_DIR / 'input' / 'master_strains_raw.csv')
 ilgm = master[master['seed_bank'] == 'ilgm_js'].copy()
 print(f"ILGM JS strains: {len(ilgm)}")
 
+# Indexed lookup for just this bank's URLs
+print("Looking up S3 JS keys...")
+with InventoryIndex() as inventory:
+    url_to_key = inventory.keys_for_urls(ilgm['source_url_raw'], source='js')
+print(f"S3 keys found: {len(url_to_key)}")
+
 results = []
 for idx, row in ilgm.iterrows():
     url = row['source_url_raw']
@@ -51,7 +60,7 @@ for idx, row in ilgm.iterrows():
 
 df = pd.DataFrame(results)
 output_path = OUTPUT_DIR / 'ilgm_breeders.csv'
-df.to_csv(output_path, index=False, encoding='utf-8')
+write_table(df, output_path)
 
 extracted = df['breeder_extracted'].notna().sum()
 failed = df['breeder_extracted'].isna().sum()
@@ -2,13 +2,17 @@ import pandas as pd
 import boto3
 from bs4 import BeautifulSoup
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 BASE_DIR = Path(__file__).parent.parent
 OUTPUT_DIR = BASE_DIR / "output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
 print("Loading master dataset...")
-master = pd.read_csv(BASE_DIR / "input" / "master_strains_raw.csv", encoding='utf-8', low_memory=False)
+master = read_table(BASE_DIR / "input" / "master_strains_raw.csv")
 
 multiverse = master[master['seed_bank'] == 'multiverse_beans'].copy()
 print(f"Multiverse Beans strains: {len(multiverse)}")
@@ -50,7 +54,7 @@ for idx, row in multiverse.iterrows():
 
 df = pd.DataFrame(results)
 output_path = OUTPUT_DIR / "multiverse_beans_breeders.csv"
-df.to_csv(output_path, index=False, encoding='utf-8')
+write_table(df, output_path)
 
 extracted = df['breeder_extracted'].notna().sum()
 failed = df['breeder_extracted'].isna().sum()
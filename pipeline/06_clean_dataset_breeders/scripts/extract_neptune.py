@@ -3,22 +3,31 @@ Neptune - Breeder Extraction
 Extracts breeder from breeder-link in product-breeder div.
 Logic designed by Amazon Q, verified by Shannon Goddard.
 """
-import pandas as pd
 import boto3
 from bs4 import BeautifulSoup
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '03_s3_inventory' / 'scripts'))
+from inventory_index import InventoryIndex
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 s3 = boto3.client('s3')
 BUCKET = 'ci-strains-html-archive'
 
-print("Loading S3 inventory...")
-inv = pd.read_csv('../../03_s3_inventory/s3_html_inventory.csv')
-url_to_key = dict(zip(inv['url'], inv['s3_html_key']))
-
 print("Loading master dataset...")
-df = pd.read_csv('../input/master_strains_raw.csv', encoding='latin-1', low_memory=False)
+df = read_table('../input/master_strains_raw.csv')
 neptune = df[df['seed_bank'] == 'neptune'].copy()
 print(f"Neptune strains: {len(neptune)}")
 
+# Indexed lookup for just this bank's URLs
+print("Looking up S3 keys...")
+with InventoryIndex() as inventory:
+    url_to_key = inventory.keys_for_urls(neptune['source_url_raw'], source='html')
+print(f"S3 keys found: {len(url_to_key)}")
+
 extracted = 0
 failed = 0
 
@@ -69,6 +78,6 @@ print(f"\nResults:")
 print(f"  Extracted: {extracted} ({extracted/len(neptune)*100:.1f}%)")
 print(f"  Failed: {failed} ({failed/len(neptune)*100:.1f}%)")
 
-neptune.to_csv('../output/neptune_breeders.csv', index=False, encoding='utf-8')
+write_table(neptune, '../output/neptune_breeders.csv')
 neptune.head(100).to_csv('../output/neptune_breeders_sample.csv', index=False, encoding='utf-8')
 print(f"\nOutput: output/neptune_breeders.csv")
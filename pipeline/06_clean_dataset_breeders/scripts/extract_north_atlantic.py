@@ -3,24 +3,32 @@ North Atlantic - Breeder Extraction
 Extracts breeder from breeder-link span.
 Logic designed by Amazon Q, verified by Shannon Goddard.
 """
-import pandas as pd
 import boto3
 from bs4 import BeautifulSoup
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '03_s3_inventory' / 'scripts'))
+from inventory_index import InventoryIndex
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 s3 = boto3.client('s3')
 BUCKET = 'ci-strains-html-archive'
 
-# Load inventory
-print("Loading S3 inventory...")
-inv = pd.read_csv('../../03_s3_inventory/s3_html_inventory.csv')
-url_to_key = dict(zip(inv['url'], inv['s3_html_key']))
-
 # Load dataset
 print("Loading master dataset...")
-df = pd.read_csv('../input/master_strains_raw.csv', encoding='latin-1', low_memory=False)
+df = read_table('../input/master_strains_raw.csv')
 north_atlantic = df[df['seed_bank'] == 'north_atlantic'].copy()
 print(f"North Atlantic strains: {len(north_atlantic)}")
 
+# Indexed lookup for just this bank's URLs
+print("Looking up S3 keys...")
+with InventoryIndex() as inventory:
+    url_to_key = inventory.keys_for_urls(north_atlantic['source_url_raw'], source='html')
+print(f"S3 keys found: {len(url_to_key)}")
+
 # Extract breeders
 extracted = 0
 failed = 0
@@ -76,6 +84,6 @@ print(f"  Extracted: {extracted} ({extracted/len(north_atlantic)*100:.1f}%)")
 print(f"  Failed: {failed} ({failed/len(north_atlantic)*100:.1f}%)")
 
 # Save
-north_atlantic.to_csv('../output/north_atlantic_breeders.csv', index=False, encoding='utf-8')
+write_table(north_atlantic, '../output/north_atlantic_breeders.csv')
 north_atlantic.head(100).to_csv('../output/north_atlantic_breeders_sample.csv', index=False, encoding='utf-8')
 print(f"\nOutput: output/north_atlantic_breeders.csv")
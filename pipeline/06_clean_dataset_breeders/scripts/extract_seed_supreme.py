@@ -2,13 +2,17 @@ import pandas as pd
 import boto3
 from bs4 import BeautifulSoup
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 BASE_DIR = Path(__file__).parent.parent
 OUTPUT_DIR = BASE_DIR / "output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
 print("Loading master dataset...")
-master = pd.read_csv(BASE_DIR / "input" / "master_strains_raw.csv", encoding='utf-8', low_memory=False)
+master = read_table(BASE_DIR / "input" / "master_strains_raw.csv")
 
 seed_supreme = master[master['seed_bank'] == 'seed_supreme'].copy()
 print(f"Seed Supreme strains: {len(seed_supreme)}")
@@ -53,7 +57,7 @@ for idx, row in seed_supreme.iterrows():
 
 df = pd.DataFrame(results)
 output_path = OUTPUT_DIR / "seed_supreme_breeders.csv"
-df.to_csv(output_path, index=False, encoding='utf-8')
+write_table(df, output_path)
 
 extracted = df['breeder_extracted'].notna().sum()
 failed = df['breeder_extracted'].isna().sum()
@@ -2,6 +2,13 @@ import pandas as pd
 import boto3
 from bs4 import BeautifulSoup
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '03_s3_inventory' / 'scripts'))
+from inventory_index import InventoryIndex
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 BASE_DIR = Path(__file__).parent.parent
 OUTPUT_DIR = BASE_DIR / "output"
@@ -10,15 +17,17 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 s3 = boto3.client('s3')
 BUCKET = 'ci-strains-html-archive'
 
-print("Loading S3 JS inventory...")
-inv = pd.read_csv(BASE_DIR.parent / '03_s3_inventory' / 's3_js_html_inventory.csv')
-url_to_key = dict(zip(inv['url'], inv['html_key']))
-
 print("Loading master dataset...")
-master = pd.read_csv(BASE_DIR / 'input' / 'master_strains_raw.csv', encoding='utf-8', low_memory=False)
+master = read_table(BASE_DIR / 'input' / 'master_strains_raw.csv')
 seedsman = master[master['seed_bank'] == 'seedsman_js'].copy()
 print(f"Seedsman JS strains: {len(seedsman)}")
 
+# Indexed lookup for just this bank's URLs
+print("Looking up S3 JS keys...")
+with InventoryIndex() as inventory:
+    url_to_key = inventory.keys_for_urls(seedsman['source_url_raw'], source='js')
+print(f"S3 keys found: {len(url_to_key)}")
+
 results = []
 for idx, row in seedsman.iterrows():
     url = row['source_url_raw']
@@ -57,7 +66,7 @@ for idx, row in seedsman.iterrows():
 
 df = pd.DataFrame(results)
 output_path = OUTPUT_DIR / 'seedsman_js_breeders.csv'
-df.to_csv(output_path, index=False, encoding='utf-8')
+write_table(df, output_path)
 
 extracted = df['breeder_extracted'].notna().sum()
 failed = df['breeder_extracted'].isna().sum()
@@ -1,12 +1,16 @@
 import pandas as pd
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 BASE_DIR = Path(__file__).parent.parent
 OUTPUT_DIR = BASE_DIR / "output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
 print("Loading master dataset...")
-master = pd.read_csv(BASE_DIR / "input" / "master_strains_raw.csv", encoding='utf-8', low_memory=False)
+master = read_table(BASE_DIR / "input" / "master_strains_raw.csv")
 
 # Self-branded seed banks (bank = breeder)
 self_branded = {
@@ -35,7 +39,7 @@ for bank_code, breeder_name in self_branded.items():
 
 df = pd.DataFrame(results)
 output_path = OUTPUT_DIR / "self_branded_breeders.csv"
-df.to_csv(output_path, index=False, encoding='utf-8')
+write_table(df, output_path)
 
 print(f"\nTotal: {len(df)} strains")
 print(f"Output: {output_path}")
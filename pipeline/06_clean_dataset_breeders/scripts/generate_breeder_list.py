@@ -1,10 +1,13 @@
-import pandas as pd
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table
 
 OUTPUT_DIR = Path(__file__).parent.parent / "output"
 
 print("Loading merged breeder data...")
-df = pd.read_csv(OUTPUT_DIR / "all_breeders_extracted.csv", encoding='utf-8')
+df = read_table(OUTPUT_DIR / "all_breeders_extracted.csv")
 
 print("Generating breeder list...")
 breeder_counts = df['breeder_extracted'].value_counts().sort_index()
@@ -1,10 +1,13 @@
-import pandas as pd
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table
 
 OUTPUT_DIR = Path(__file__).parent.parent / "output"
 
 print("Loading cleaned breeder data...")
-df = pd.read_csv(OUTPUT_DIR / "all_breeders_cleaned.csv", encoding='utf-8', low_memory=False)
+df = read_table(OUTPUT_DIR / "all_breeders_cleaned.csv")
 
 print("Generating cleaned breeder list...")
 breeder_counts = df['breeder_cleaned'].value_counts().sort_index()
@@ -1,5 +1,9 @@
 import pandas as pd
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 OUTPUT_DIR = Path(__file__).parent.parent / "output"
 
@@ -23,13 +27,13 @@ print("Merging breeder extraction results...")
 all_data = []
 
 for csv_file in csv_files:
-    df = pd.read_csv(OUTPUT_DIR / csv_file, encoding='utf-8')
+    df = read_table(OUTPUT_DIR / csv_file)
     all_data.append(df)
     print(f"  {csv_file}: {len(df)} strains")
 
 merged = pd.concat(all_data, ignore_index=True)
 output_path = OUTPUT_DIR / "all_breeders_extracted.csv"
-merged.to_csv(output_path, index=False, encoding='utf-8')
+write_table(merged, output_path)
 
 print(f"\nTotal: {len(merged)} strains")
 print(f"Output: {output_path}")
@@ -1,10 +1,13 @@
-import pandas as pd
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 OUTPUT_DIR = Path(__file__).parent.parent / "output"
 
 print("Loading merged breeder data...")
-df = pd.read_csv(OUTPUT_DIR / "all_breeders_extracted.csv", encoding='utf-8', low_memory=False)
+df = read_table(OUTPUT_DIR / "all_breeders_extracted.csv")
 
 print(f"Before standardization: {df['breeder_extracted'].nunique()} unique breeders")
 
@@ -279,6 +282,6 @@ print(f"Reduced by: {df['breeder_extracted'].nunique() - df['breeder_cleaned'].n
 
 # Save
 output_path = OUTPUT_DIR / "all_breeders_cleaned.csv"
-df.to_csv(output_path, index=False, encoding='utf-8')
+write_table(df, output_path)
 
 print(f"\nOutput: {output_path}")
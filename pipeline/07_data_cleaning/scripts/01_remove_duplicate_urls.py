@@ -1,5 +1,8 @@
-import pandas as pd
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 # Paths
 input_file = Path('../input/master_strains_raw.csv')
@@ -7,7 +10,7 @@ output_file = Path('../output/01_deduped_urls.csv')
 report_file = Path('../output/01_url_dedup_report.txt')
 
 # Read raw data
-df = pd.read_csv(input_file, encoding='latin-1', low_memory=False)
+df = read_table(input_file, optimize=True)
 
 print(f"Initial rows: {len(df)}")
 
@@ -28,7 +31,7 @@ print(f"Final rows: {len(df_clean)}")
 print(f"Removed: {len(df) - len(df_clean)} rows")
 
 # Save cleaned data
-df_clean.to_csv(output_file, index=False, encoding='utf-8')
+write_table(df_clean, output_file)
 
 # Generate report
 with open(report_file, 'w') as f:
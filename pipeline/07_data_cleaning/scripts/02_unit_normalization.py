@@ -1,6 +1,10 @@
 import pandas as pd
 import re
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 # Paths
 input_file = Path('../output/01_deduped_urls.csv')
@@ -8,7 +12,7 @@ output_file = Path('../output/02_unit_normalized.csv')
 report_file = Path('../output/02_unit_normalization_report.txt')
 
 # Read data
-df = pd.read_csv(input_file, encoding='utf-8')
+df = read_table(input_file, optimize=True)
 print(f"Initial rows: {len(df)}")
 
 conversions = {
@@ -119,7 +123,7 @@ if 'total_grow_time_raw' in df.columns:
     df['total_grow_time_days_clean'] = df['total_grow_time_raw'].apply(normalize_total_grow_time)
 
 # Save
-df.to_csv(output_file, index=False, encoding='utf-8')
+write_table(df, output_file)
 
 # Report
 with open(report_file, 'w') as f:
@@ -1,6 +1,10 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 # Paths
 input_file = Path('../output/02_unit_normalized.csv')
@@ -8,7 +12,7 @@ output_file = Path('../output/03_placeholders_removed.csv')
 report_file = Path('../output/03_placeholder_removal_report.txt')
 
 # Read data
-df = pd.read_csv(input_file, encoding='utf-8', low_memory=False)
+df = read_table(input_file, optimize=True)
 print(f"Initial rows: {len(df)}")
 
 # Placeholder patterns
@@ -38,7 +42,7 @@ for col in df.columns:
             affected_columns[col] = removed
 
 # Save
-df.to_csv(output_file, index=False, encoding='utf-8')
+write_table(df, output_file)
 
 # Report
 with open(report_file, 'w') as f:
@@ -2,6 +2,10 @@ import pandas as pd
 import numpy as np
 import re
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 # Paths
 input_file = Path('../output/04_data_types_standardized.csv')
@@ -9,7 +13,7 @@ output_file = Path('../output/05_genetics_normalized.csv')
 report_file = Path('../output/05_genetics_normalization_report.txt')
 
 # Read data
-df = pd.read_csv(input_file, encoding='utf-8', low_memory=False)
+df = read_table(input_file, optimize=True)
 print(f"Initial rows: {len(df)}")
 
 stats = {
@@ -83,7 +87,7 @@ def identify_breeding_status(row):
 df['breeding_status_clean'] = df.apply(identify_breeding_status, axis=1)
 
 # Save
-df.to_csv(output_file, index=False, encoding='utf-8')
+write_table(df, output_file)
 
 # Report
 with open(report_file, 'w') as f:
@@ -1,6 +1,10 @@
 import pandas as pd
 import re
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 # Paths
 input_file = Path('../output/05_genetics_normalized.csv')
@@ -8,7 +12,7 @@ output_file = Path('../output/06_strain_names_normalized.csv')
 report_file = Path('../output/06_strain_name_normalization_report.txt')
 
 # Read data
-df = pd.read_csv(input_file, encoding='utf-8', low_memory=False)
+df = read_table(input_file, optimize=True)
 print(f"Initial rows: {len(df)}")
 
 # Normalize strain name for matching
@@ -55,7 +59,7 @@ unique_normalized = df['strain_name_normalized'].nunique()
 duplicates_created = unique_raw - unique_normalized
 
 # Save
-df.to_csv(output_file, index=False, encoding='utf-8')
+write_table(df, output_file)
 
 # Report
 with open(report_file, 'w') as f:
@@ -1,6 +1,10 @@
 import pandas as pd
 import re
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 # Paths
 input_file = Path('../output/07_aka_extracted.csv')
@@ -8,7 +12,7 @@ output_file = Path('../output/08_similar_spelling_normalized.csv')
 report_file = Path('../output/08_similar_spelling_report.txt')
 
 # Read data
-df = pd.read_csv(input_file, encoding='utf-8', low_memory=False)
+df = read_table(input_file, optimize=True)
 print(f"Initial rows: {len(df)}")
 
 # Normalize for similar spelling matching
@@ -36,7 +40,7 @@ unique_similar = df['similar_spelling_clean'].nunique()
 additional_matches = unique_normalized - unique_similar
 
 # Save
-df.to_csv(output_file, index=False, encoding='utf-8')
+write_table(df, output_file)
 
 # Report
 with open(report_file, 'w') as f:
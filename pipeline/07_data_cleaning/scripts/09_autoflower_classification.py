@@ -1,6 +1,10 @@
 import pandas as pd
 import re
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 # Paths
 input_file = Path('../output/08_similar_spelling_normalized.csv')
@@ -8,7 +12,7 @@ output_file = Path('../output/09_autoflower_classified.csv')
 report_file = Path('../output/09_autoflower_classification_report.txt')
 
 # Read data
-df = pd.read_csv(input_file, encoding='utf-8', low_memory=False)
+df = read_table(input_file, optimize=True)
 print(f"Initial rows: {len(df)}")
 
 # Detect autoflower
@@ -54,7 +58,7 @@ for idx, row in df[df['is_autoflower_clean']].iterrows():
 moved_count = df[df['is_autoflower_clean']]['autoflower_seed_to_harvest_days_min_clean'].notna().sum()
 
 # Save
-df.to_csv(output_file, index=False, encoding='utf-8')
+write_table(df, output_file)
 
 # Report
 with open(report_file, 'w') as f:
@@ -4,6 +4,10 @@ import os
 import re
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_amsterdam_name(url):
     if pd.isna(url):
@@ -29,7 +33,7 @@ def main():
     output_file = '../output/amsterdam_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     amsterdam_df = df[df['seed_bank'] == 'amsterdam'].copy()
     print(f"Found {len(amsterdam_df)} Amsterdam strains")
@@ -37,7 +41,7 @@ def main():
     amsterdam_df['strain_name_extracted'] = amsterdam_df['source_url_raw'].apply(extract_amsterdam_name)
     
     os.makedirs('../output', exist_ok=True)
-    amsterdam_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(amsterdam_df, output_file)
     print(f"Saved {len(amsterdam_df)} strains to {output_file}")
     
     print("\nSample extractions:")
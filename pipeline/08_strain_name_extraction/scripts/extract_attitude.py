@@ -7,10 +7,13 @@ Example: auto-seeds-auto-1/prod_1705 → "Auto 1"
 Logic designed by Amazon Q, verified by Shannon Goddard.
 """
 
-import pandas as pd
 import re
 from pathlib import Path
 from extraction_helpers import *
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 # Paths
 INPUT_CSV = Path("../../07_data_cleaning/output/09_autoflower_classified.csv")
@@ -18,7 +21,7 @@ OUTPUT_CSV = Path("../output/attitude_strain_names_v2.csv")
 
 # Load data
 print("Loading data...")
-df = pd.read_csv(INPUT_CSV, low_memory=False)
+df = read_table(INPUT_CSV)
 df_bank = df[df['seed_bank'] == 'attitude'].copy()
 print(f"Found {len(df_bank)} Attitude strains")
 
@@ -116,5 +119,5 @@ for _, row in samples.iterrows():
 
 # Save
 OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
-df_bank.to_csv(OUTPUT_CSV, index=False, encoding='utf-8')
+write_table(df_bank, OUTPUT_CSV)
 print(f"Saved to: {OUTPUT_CSV}")
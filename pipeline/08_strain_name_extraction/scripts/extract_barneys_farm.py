@@ -4,6 +4,10 @@ import os
 import re
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_barneys_name(url):
     if pd.isna(url):
@@ -34,7 +38,7 @@ def main():
     output_file = '../output/barneys_farm_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     bf_df = df[df['seed_bank'] == 'barneys_farm'].copy()
     print(f"Found {len(bf_df)} Barney's Farm strains")
@@ -42,7 +46,7 @@ def main():
     bf_df['strain_name_extracted'] = bf_df['source_url_raw'].apply(extract_barneys_name)
     
     os.makedirs('../output', exist_ok=True)
-    bf_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(bf_df, output_file)
     print(f"Saved {len(bf_df)} strains to {output_file}")
     
     print("\nSample extractions:")
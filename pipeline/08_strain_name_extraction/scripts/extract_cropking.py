@@ -1,8 +1,12 @@
 """Crop King - Strain Name Extraction
 Logic designed by Amazon Q, verified by Shannon Goddard."""
-import pandas as pd
 import re
 from extraction_helpers import *
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_cropking_strain_name(url):
     slug = get_url_slug(url, 'last')
@@ -13,8 +17,8 @@ def extract_cropking_strain_name(url):
     return smart_title_case(name) if name else None
 
 if __name__ == "__main__":
-    df = pd.read_csv("../input/09_autoflower_classified.csv", encoding='latin-1', low_memory=False)
+    df = read_table("../input/09_autoflower_classified.csv")
     cropking = df[df['seed_bank'] == 'crop_king'].copy()
     cropking['strain_name_extracted'] = cropking['source_url_raw'].apply(extract_cropking_strain_name)
-    cropking.to_csv("../output/cropking_extracted.csv", index=False, encoding='utf-8')
+    write_table(cropking, "../output/cropking_extracted.csv")
     print(f"Crop King: {len(cropking)} strains extracted")
@@ -3,6 +3,10 @@ import sys
 import os
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_dutch_passion_name(url):
     if pd.isna(url):
@@ -27,7 +31,7 @@ def main():
     output_file = '../output/dutch_passion_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     dp_df = df[df['seed_bank'] == 'dutch_passion'].copy()
     print(f"Found {len(dp_df)} Dutch Passion strains")
@@ -35,7 +39,7 @@ def main():
     dp_df['strain_name_extracted'] = dp_df['source_url_raw'].apply(extract_dutch_passion_name)
     
     os.makedirs('../output', exist_ok=True)
-    dp_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(dp_df, output_file)
     print(f"Saved {len(dp_df)} strains to {output_file}")
     
     print("\nSample extractions:")
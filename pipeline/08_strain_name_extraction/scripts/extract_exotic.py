@@ -3,6 +3,10 @@ import sys
 import os
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_exotic_name(url):
     if pd.isna(url):
@@ -35,7 +39,7 @@ def main():
     output_file = '../output/exotic_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     exotic_df = df[df['seed_bank'] == 'exotic'].copy()
     print(f"Found {len(exotic_df)} Exotic Genetix strains")
@@ -49,7 +53,7 @@ def main():
     print(f"Filtered out {before_count - after_count} box-set entries")
     
     os.makedirs('../output', exist_ok=True)
-    exotic_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(exotic_df, output_file)
     print(f"Saved {len(exotic_df)} strains to {output_file}")
     
     print("\nSample extractions:")
@@ -1,8 +1,12 @@
 """Gorilla - Strain Name Extraction
 Logic designed by Amazon Q, verified by Shannon Goddard."""
-import pandas as pd
 import re
 from extraction_helpers import *
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_gorilla_strain_name(raw_name):
     if not raw_name or str(raw_name) == 'nan':
@@ -23,8 +27,8 @@ def extract_gorilla_strain_name(raw_name):
     return name if name else None
 
 if __name__ == "__main__":
-    df = pd.read_csv("../input/09_autoflower_classified.csv", encoding='latin-1', low_memory=False)
+    df = read_table("../input/09_autoflower_classified.csv")
     gorilla = df[df['seed_bank'] == 'gorilla'].copy()
     gorilla['strain_name_extracted'] = gorilla['strain_name_raw'].apply(extract_gorilla_strain_name)
-    gorilla.to_csv("../output/gorilla_extracted.csv", index=False, encoding='utf-8')
+    write_table(gorilla, "../output/gorilla_extracted.csv")
     print(f"Gorilla: {len(gorilla)} strains extracted")
@@ -4,6 +4,10 @@ import os
 import re
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_great_lakes_name(url):
     if pd.isna(url):
@@ -49,7 +53,7 @@ def main():
     output_file = '../output/great_lakes_genetics_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     gl_df = df[df['seed_bank'] == 'great_lakes_genetics'].copy()
     print(f"Found {len(gl_df)} Great Lakes Genetics strains")
@@ -57,7 +61,7 @@ def main():
     gl_df['strain_name_extracted'] = gl_df['source_url_raw'].apply(extract_great_lakes_name)
     
     os.makedirs('../output', exist_ok=True)
-    gl_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(gl_df, output_file)
     print(f"Saved {len(gl_df)} strains to {output_file}")
     
     print("\nSample extractions:")
@@ -5,6 +5,10 @@ import re
 from collections import Counter
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_herbies_name(url):
     if pd.isna(url):
@@ -46,7 +50,7 @@ def main():
     output_file = '../output/herbies_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     herbies_df = df[df['seed_bank'] == 'herbies'].copy()
     print(f"Found {len(herbies_df)} Herbies strains")
@@ -87,7 +91,7 @@ def main():
     
     # Save output
     os.makedirs('../output', exist_ok=True)
-    herbies_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(herbies_df, output_file)
     print(f"\nSaved {len(herbies_df)} strains to {output_file}")
     
     # Show samples
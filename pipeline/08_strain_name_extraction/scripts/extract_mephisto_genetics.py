@@ -3,6 +3,10 @@ import sys
 import os
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_mephisto_name(url):
     if pd.isna(url):
@@ -23,7 +27,7 @@ def main():
     output_file = '../output/mephisto_genetics_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     mephisto_df = df[df['seed_bank'] == 'mephisto_genetics'].copy()
     print(f"Found {len(mephisto_df)} Mephisto Genetics strains")
@@ -31,7 +35,7 @@ def main():
     mephisto_df['strain_name_extracted'] = mephisto_df['source_url_raw'].apply(extract_mephisto_name)
     
     os.makedirs('../output', exist_ok=True)
-    mephisto_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(mephisto_df, output_file)
     print(f"Saved {len(mephisto_df)} strains to {output_file}")
     
     print("\nSample extractions:")
@@ -5,6 +5,10 @@ import re
 from collections import Counter
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_multiverse_name(url):
     if pd.isna(url):
@@ -70,7 +74,7 @@ def main():
     output_file = '../output/multiverse_beans_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     mv_df = df[df['seed_bank'] == 'multiverse_beans'].copy()
     print(f"Found {len(mv_df)} Multiverse Beans strains")
@@ -121,7 +125,7 @@ def main():
     
     # Save output
     os.makedirs('../output', exist_ok=True)
-    mv_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(mv_df, output_file)
     print(f"\nSaved {len(mv_df)} strains to {output_file}")
     
     # Show samples
@@ -5,6 +5,10 @@ import re
 from collections import Counter
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_neptune_name(url):
     if pd.isna(url):
@@ -73,7 +77,7 @@ def main():
     output_file = '../output/neptune_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     neptune_df = df[df['seed_bank'] == 'neptune'].copy()
     print(f"Found {len(neptune_df)} Neptune strains")
@@ -96,7 +100,7 @@ def main():
     
     # Save output
     os.makedirs('../output', exist_ok=True)
-    neptune_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(neptune_df, output_file)
     print(f"\nSaved {len(neptune_df)} strains to {output_file}")
     
     # Show samples
@@ -3,6 +3,10 @@ import sys
 import os
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_north_atlantic_name(url):
     if pd.isna(url):
@@ -57,7 +61,7 @@ def main():
     output_file = '../output/north_atlantic_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     # Filter North Atlantic strains
     na_df = df[df['seed_bank'] == 'north_atlantic'].copy()
@@ -68,7 +72,7 @@ def main():
     
     # Save output
     os.makedirs('../output', exist_ok=True)
-    na_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(na_df, output_file)
     print(f"Saved {len(na_df)} strains to {output_file}")
     
     # Show samples
@@ -4,6 +4,10 @@ import os
 import re
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_royal_queen_name(url):
     if pd.isna(url):
@@ -33,7 +37,7 @@ def main():
     output_file = '../output/royal_queen_seeds_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     rqs_df = df[df['seed_bank'] == 'royal_queen_seeds'].copy()
     print(f"Found {len(rqs_df)} Royal Queen Seeds strains")
@@ -41,7 +45,7 @@ def main():
     rqs_df['strain_name_extracted'] = rqs_df['source_url_raw'].apply(extract_royal_queen_name)
     
     os.makedirs('../output', exist_ok=True)
-    rqs_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(rqs_df, output_file)
     print(f"Saved {len(rqs_df)} strains to {output_file}")
     
     print("\nSample extractions:")
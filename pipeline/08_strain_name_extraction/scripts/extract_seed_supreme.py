@@ -3,6 +3,10 @@ import sys
 import os
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_seed_supreme_name(url):
     if pd.isna(url):
@@ -34,7 +38,7 @@ def main():
     output_file = '../output/seed_supreme_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     ss_df = df[df['seed_bank'] == 'seed_supreme'].copy()
     print(f"Found {len(ss_df)} Seed Supreme strains")
@@ -42,7 +46,7 @@ def main():
     ss_df['strain_name_extracted'] = ss_df['source_url_raw'].apply(extract_seed_supreme_name)
     
     os.makedirs('../output', exist_ok=True)
-    ss_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(ss_df, output_file)
     print(f"Saved {len(ss_df)} strains to {output_file}")
     
     print("\nSample extractions:")
@@ -4,6 +4,10 @@ import os
 import re
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_seeds_here_now_name(url):
     if pd.isna(url):
@@ -56,7 +60,7 @@ def main():
     output_file = '../output/seeds_here_now_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     shn_df = df[df['seed_bank'] == 'seeds_here_now'].copy()
     print(f"Found {len(shn_df)} Seeds Here Now strains")
@@ -64,7 +68,7 @@ def main():
     shn_df['strain_name_extracted'] = shn_df['source_url_raw'].apply(extract_seeds_here_now_name)
     
     os.makedirs('../output', exist_ok=True)
-    shn_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(shn_df, output_file)
     print(f"Saved {len(shn_df)} strains to {output_file}")
     
     print("\nSample extractions:")
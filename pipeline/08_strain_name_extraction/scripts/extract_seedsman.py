@@ -4,6 +4,10 @@ import os
 import re
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_seedsman_name(url):
     if pd.isna(url):
@@ -31,7 +35,7 @@ def main():
     output_file = '../output/seedsman_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     seedsman_df = df[df['seed_bank'] == 'seedsman_js'].copy()
     print(f"Found {len(seedsman_df)} Seedsman strains")
@@ -39,7 +43,7 @@ def main():
     seedsman_df['strain_name_extracted'] = seedsman_df['source_url_raw'].apply(extract_seedsman_name)
     
     os.makedirs('../output', exist_ok=True)
-    seedsman_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(seedsman_df, output_file)
     print(f"Saved {len(seedsman_df)} strains to {output_file}")
     
     print("\nSample extractions:")
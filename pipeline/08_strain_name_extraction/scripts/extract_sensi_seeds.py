@@ -3,6 +3,10 @@ import sys
 import os
 sys.path.append(os.path.dirname(__file__))
 from extraction_helpers import get_url_slug, smart_title_case
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_sensi_name(url):
     if pd.isna(url):
@@ -23,7 +27,7 @@ def main():
     output_file = '../output/sensi_seeds_extracted.csv'
     
     print(f"Reading {input_file}...")
-    df = pd.read_csv(input_file, encoding='latin-1')
+    df = read_table(input_file)
     
     sensi_df = df[df['seed_bank'] == 'sensi_seeds'].copy()
     print(f"Found {len(sensi_df)} Sensi Seeds strains")
@@ -31,7 +35,7 @@ def main():
     sensi_df['strain_name_extracted'] = sensi_df['source_url_raw'].apply(extract_sensi_name)
     
     os.makedirs('../output', exist_ok=True)
-    sensi_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(sensi_df, output_file)
     print(f"Saved {len(sensi_df)} strains to {output_file}")
     
     print("\nSample extractions:")
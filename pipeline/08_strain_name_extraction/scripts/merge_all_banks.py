@@ -1,5 +1,10 @@
 import pandas as pd
 import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, table_exists, write_table
 
 def main():
     output_dir = '../output'
@@ -34,8 +39,8 @@ def main():
     
     for file in files:
         filepath = os.path.join(output_dir, file)
-        if os.path.exists(filepath):
-            df = pd.read_csv(filepath, encoding='latin-1')
+        if table_exists(filepath):
+            df = read_table(filepath)
             count = len(df)
             total_strains += count
             dfs.append(df)
@@ -48,7 +53,7 @@ def main():
     
     # Save merged file
     output_file = os.path.join(output_dir, 'all_strains_extracted.csv')
-    merged_df.to_csv(output_file, index=False, encoding='latin-1')
+    write_table(merged_df, output_file)
     
     print(f"\n{'='*60}")
     print(f"TOTAL STRAINS: {total_strains}")
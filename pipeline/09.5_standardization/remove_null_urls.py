@@ -1,6 +1,10 @@
-import pandas as pd
+import sys
+from pathlib import Path
 
-df = pd.read_csv('output/all_strains_standardized.csv', encoding='latin-1', low_memory=False)
+sys.path.append(str(Path(__file__).resolve().parents[1] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
+
+df = read_table('output/all_strains_standardized.csv')
 print(f"Before: {len(df)} rows")
 
 # Remove null URLs
@@ -8,5 +12,5 @@ df_clean = df[df['source_url_raw'].notna()].copy()
 print(f"After: {len(df_clean)} rows")
 print(f"Removed: {len(df) - len(df_clean)} null URLs")
 
-df_clean.to_csv('output/all_strains_standardized_clean.csv', index=False, encoding='latin-1')
+write_table(df_clean, 'output/all_strains_standardized_clean.csv')
 print("\nSaved: output/all_strains_standardized_clean.csv")
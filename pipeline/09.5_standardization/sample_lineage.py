@@ -1,6 +1,10 @@
-import pandas as pd
+import sys
+from pathlib import Path
 
-df = pd.read_csv('output/all_strains_standardized_clean.csv', encoding='latin-1', low_memory=False)
+sys.path.append(str(Path(__file__).resolve().parents[1] / '05_master_dataset' / 'scripts'))
+from table_io import read_table
+
+df = read_table('output/all_strains_standardized_clean.csv')
 
 # Find descriptions with parent crosses
 desc_with_x = df[df['description_raw'].str.contains(' x ', case=False, na=False)].head(20)
@@ -1,5 +1,10 @@
 import pandas as pd
 import re
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def create_display_name(name):
     """Proper capitalization for display"""
@@ -28,7 +33,7 @@ def create_slug(name):
 
 # Load merged dataset
 print("Loading dataset...")
-df = pd.read_csv('../09_vertex_validation/output/all_strains_validated_merged.csv', encoding='latin-1', low_memory=False)
+df = read_table('../09_vertex_validation/output/all_strains_validated_merged.csv')
 print(f"Total rows: {len(df)}")
 
 # Prioritize manual > validated > raw for source data
@@ -46,7 +51,7 @@ df['strain_name_slug'] = df['strain_source'].apply(create_slug)
 
 # Save
 output_path = 'output/all_strains_standardized.csv'
-df.to_csv(output_path, index=False, encoding='latin-1')
+write_table(df, output_path)
 
 print(f"\nStandardization complete: {output_path}")
 print(f"Breeder display: {df['breeder_display'].notna().sum()}")
@@ -1,9 +1,14 @@
 import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 # Load datasets
 print("Loading datasets...")
-main_df = pd.read_csv('output/all_strains_validated.csv', encoding='latin-1', low_memory=False)
-manual_df = pd.read_csv('output/all_strains_validated_flagged_manual_review.csv', encoding='latin-1')
+main_df = read_table('output/all_strains_validated.csv')
+manual_df = read_table('output/all_strains_validated_flagged_manual_review.csv')
 
 print(f"Main dataset: {len(main_df)} rows")
 print(f"Manual review: {len(manual_df)} rows")
@@ -25,7 +30,7 @@ for col in ['strain_name_aka_manual', 'strain_name_manual', 'breeder_manual', 'm
 
 # Save merged dataset
 output_path = 'output/all_strains_validated_merged.csv'
-main_df.to_csv(output_path, index=False, encoding='latin-1')
+write_table(main_df, output_path)
 print(f"\nMerged dataset saved: {output_path}")
 print(f"Total rows: {len(main_df)}")
 print(f"Manual reviews merged: {main_df['strain_name_manual'].notna().sum()}")
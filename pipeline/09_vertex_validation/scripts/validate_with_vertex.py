@@ -3,13 +3,25 @@ Vertex AI Validation Script - Strain Names & Breeders
 Validates and corrects extracted strain names and breeder names using Gemini 2.0 Flash
 """
 
-import pandas as pd
 import json
-import time
 from google.cloud import aiplatform
 from vertexai.generative_models import GenerativeModel
 from pathlib import Path
 from datetime import datetime
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from gemini_client import GeminiClient
+from response_cache import ResponseCache
+from table_io import read_table, remove_table, table_exists, write_table
+
+MODEL_NAME = 'gemini-2.0-flash-exp'
+# Bump to re-ask batches whose prompt is unchanged (the prompt text itself is part of the cache key)
+PROMPT_VERSION = 'name-breeder-v1'
+# Budgets for the shared client; batches run CONCURRENCY at a time within them
+REQUESTS_PER_MINUTE = 60
+TOKENS_PER_MINUTE = 1_000_000
+CONCURRENCY = 8
 
 class VertexValidator:
     """Validate strain names and breeders using Vertex AI"""
@@ -20,14 +32,22 @@ class VertexValidator:
         self.region = 'us-central1'
         aiplatform.init(project=self.project_id, location=self.region)
         
-        # Initialize Gemini model
-        self.model = GenerativeModel('gemini-2.0-flash-exp')
+        # Initialize Gemini model behind the rate-limited client
+        self.model = GenerativeModel(MODEL_NAME)
+        self.client = GeminiClient(self.model, model_name=MODEL_NAME, rpm=REQUESTS_PER_MINUTE,
+                                   tpm=TOKENS_PER_MINUTE, concurrency=CONCURRENCY)
+        # Answers from earlier runs, per batch prompt
+        self.cache = ResponseCache()
         
         # Stats tracking
         self.total_processed = 0
         self.total_corrections = 0
-        self.total_cost = 0.0
         self.flagged_count = 0
+    
+    @property
+    def total_cost(self):
+        """Cost of all answers so far, from the client's token counters"""
+        return self.client.stats()['cost_usd']
         
     def create_validation_prompt(self, batch_data):
         """Create prompt for batch validation"""
@@ -68,58 +88,101 @@ INPUT DATA:
 }"""
         return prompt
     
-    def validate_batch(self, batch_data, retry_count=0, max_retries=5):
-        """Validate a batch of strains with exponential backoff"""
+    def validate_batch(self, batch_data):
+        """Validate a batch of strains (the client waits for quota and retries 429s with jittered backoff)"""
         try:
             prompt = self.create_validation_prompt(batch_data)
             
+            # A batch answered by an earlier run is not sent again
+            cache_key = self.cache.key(MODEL_NAME, PROMPT_VERSION, prompt)
+            validations = self.cache.get(cache_key)
+            if validations is not None:
+                return validations
+            
             # Call Gemini API
-            response = self.model.generate_content(prompt)
+            response_text = self.client.generate(prompt).strip()
             
             # Parse JSON response
-            response_text = response.text.strip()
             if response_text.startswith('```json'):
                 response_text = response_text[7:-3].strip()
             elif response_text.startswith('```'):
                 response_text = response_text[3:-3].strip()
             
             result = json.loads(response_text)
-            
-            # Estimate cost (Gemini Flash: ~$0.00001 per 1K tokens)
-            # Rough estimate: 200 tokens per strain
-            estimated_tokens = len(batch_data) * 200
-            batch_cost = (estimated_tokens / 1000) * 0.00001
-            self.total_cost += batch_cost
-            
+            self.cache.put(cache_key, result['validations'])
             return result['validations']
             
         except Exception as e:
-            error_msg = str(e)
-            
-            # Handle rate limiting with exponential backoff
-            if '429' in error_msg or 'Resource exhausted' in error_msg:
-                if retry_count < max_retries:
-                    wait_time = (2 ** retry_count) * 5  # 5, 10, 20, 40, 80 seconds
-                    print(f"  Rate limit hit. Waiting {wait_time}s before retry {retry_count + 1}/{max_retries}...")
-                    time.sleep(wait_time)
-                    return self.validate_batch(batch_data, retry_count + 1, max_retries)
-                else:
-                    print(f"  Max retries reached. Skipping batch.")
-                    return None
-            
             print(f"Error validating batch: {e}")
             return None
     
+    def apply_validations(self, df, start_idx, validations, confidence_threshold):
+        """Write one batch's answers into df"""
+        for validation in validations:
+            idx = start_idx + validation['index']
+            
+            # Apply corrections
+            changes = []
+            if validation['corrected_strain_name'] != 'CORRECT':
+                df.at[idx, 'strain_name_validated'] = validation['corrected_strain_name']
+                changes.append(f"Strain: {df.at[idx, 'strain_name_extracted']} -> {validation['corrected_strain_name']}")
+                self.total_corrections += 1
+            
+            if validation['corrected_breeder'] != 'CORRECT':
+                df.at[idx, 'breeder_validated'] = validation['corrected_breeder']
+                changes.append(f"Breeder: {df.at[idx, 'breeder_validated']} -> {validation['corrected_breeder']}")
+                self.total_corrections += 1
+            
+            df.at[idx, 'validation_confidence'] = validation['confidence']
+            df.at[idx, 'validation_reasoning'] = validation['reasoning']
+            df.at[idx, 'validation_changes'] = '; '.join(changes) if changes else 'No changes'
+            df.at[idx, 'validation_attempted'] = True
+            
+            # Flag low confidence items
+            if validation['confidence'] < confidence_threshold:
+                df.at[idx, 'flagged_for_review'] = True
+                self.flagged_count += 1
+    
+    def run_batches(self, df, batches, total_batches, confidence_threshold, checkpoint_file):
+        """Validate batches concurrently through the client; answers are applied here, in one thread, as they arrive"""
+        # Workers only read their own copy of the rows; df is written by this thread alone
+        jobs = [(batch_num, start_idx, end_idx, df.iloc[start_idx:end_idx].copy())
+                for batch_num, start_idx, end_idx in batches]
+        failed_batches = []
+        
+        answers = self.client.map(lambda job: self.validate_batch(job[3]), jobs)
+        for done, ((batch_num, start_idx, end_idx, batch_data), validations) in enumerate(answers, 1):
+            print(f"\nBatch {batch_num + 1}/{total_batches} (rows {start_idx}-{end_idx}) [{done}/{len(jobs)} done]")
+            
+            if validations:
+                self.apply_validations(df, start_idx, validations, confidence_threshold)
+                self.total_processed += len(batch_data)
+                print(f"  Processed: {self.total_processed}/{len(df)}")
+                print(f"  Corrections: {self.total_corrections}")
+                print(f"  Flagged: {self.flagged_count}")
+                print(f"  Estimated cost: ${self.total_cost:.4f}")
+            else:
+                # Track failed batch
+                failed_batches.append((batch_num, start_idx, end_idx))
+                print(f"  Batch failed - will retry later")
+            
+            # Save checkpoint every 10 batches
+            if done % 10 == 0:
+                write_table(df, checkpoint_file)
+                print(f"  [Checkpoint saved] {self.client.summary()}")
+        
+        return failed_batches
+    
     def process_dataset(self, input_csv, output_csv, batch_size=50, confidence_threshold=90):
         """Process entire dataset in batches"""
         print(f"Loading dataset from {input_csv}...")
-        df = pd.read_csv(input_csv, encoding='latin-1')
+        df = read_table(input_csv)
         
         # Check for checkpoint file
         checkpoint_file = output_csv.replace('.csv', '_checkpoint.csv')
-        if Path(checkpoint_file).exists():
+        if table_exists(checkpoint_file):
             print(f"\n[CHECKPOINT FOUND] Resuming from {checkpoint_file}...")
-            df = pd.read_csv(checkpoint_file, encoding='utf-8')
+            df = read_table(checkpoint_file)
             # Count already processed
             already_processed = df['validation_attempted'].sum() if 'validation_attempted' in df.columns else 0
             print(f"Already processed: {already_processed} strains")
@@ -136,64 +199,20 @@ INPUT DATA:
         print(f"Total strains to validate: {len(df)}")
         print(f"Batch size: {batch_size}")
         print(f"Confidence threshold: {confidence_threshold}%")
+        print(f"Concurrency: {self.client.concurrency} (budget {self.client.limiter.rpm} req/min, "
+              f"{self.client.limiter.tpm:,} tokens/min)")
         print("-" * 60)
         
-        # Process in batches
+        # Batches whose rows all have an answer (from a checkpoint) are not sent again
         total_batches = (len(df) + batch_size - 1) // batch_size
-        failed_batches = []
-        
+        batches = []
         for batch_num in range(total_batches):
             start_idx = batch_num * batch_size
             end_idx = min(start_idx + batch_size, len(df))
-            batch_data = df.iloc[start_idx:end_idx]
-            
-            print(f"\nProcessing batch {batch_num + 1}/{total_batches} (rows {start_idx}-{end_idx})...")
-            
-            validations = self.validate_batch(batch_data)
-            
-            if validations:
-                for validation in validations:
-                    idx = start_idx + validation['index']
-                    
-                    # Apply corrections
-                    changes = []
-                    if validation['corrected_strain_name'] != 'CORRECT':
-                        df.at[idx, 'strain_name_validated'] = validation['corrected_strain_name']
-                        changes.append(f"Strain: {df.at[idx, 'strain_name_extracted']} -> {validation['corrected_strain_name']}")
-                        self.total_corrections += 1
-                    
-                    if validation['corrected_breeder'] != 'CORRECT':
-                        df.at[idx, 'breeder_validated'] = validation['corrected_breeder']
-                        changes.append(f"Breeder: {df.at[idx, 'breeder_validated']} -> {validation['corrected_breeder']}")
-                        self.total_corrections += 1
-                    
-                    df.at[idx, 'validation_confidence'] = validation['confidence']
-                    df.at[idx, 'validation_reasoning'] = validation['reasoning']
-                    df.at[idx, 'validation_changes'] = '; '.join(changes) if changes else 'No changes'
-                    df.at[idx, 'validation_attempted'] = True
-                    
-                    # Flag low confidence items
-                    if validation['confidence'] < confidence_threshold:
-                        df.at[idx, 'flagged_for_review'] = True
-                        self.flagged_count += 1
-                
-                self.total_processed += len(batch_data)
-                print(f"  Processed: {self.total_processed}/{len(df)}")
-                print(f"  Corrections: {self.total_corrections}")
-                print(f"  Flagged: {self.flagged_count}")
-                print(f"  Estimated cost: ${self.total_cost:.4f}")
-            else:
-                # Track failed batch
-                failed_batches.append((batch_num, start_idx, end_idx))
-                print(f"  Batch failed - will retry later")
-            
-            # Rate limiting (avoid API throttling)
-            time.sleep(3)  # Increased from 1 to 3 seconds
-            
-            # Save checkpoint every 10 batches
-            if (batch_num + 1) % 10 == 0:
-                df.to_csv(checkpoint_file, index=False, encoding='utf-8')
-                print(f"  [Checkpoint saved]")
+            if not df['validation_attempted'].iloc[start_idx:end_idx].astype(bool).all():
+                batches.append((batch_num, start_idx, end_idx))
+        
+        failed_batches = self.run_batches(df, batches, total_batches, confidence_threshold, checkpoint_file)
         
         # Retry failed batches
         if failed_batches:
@@ -201,50 +220,21 @@ INPUT DATA:
             print(f"RETRYING {len(failed_batches)} FAILED BATCHES")
             print(f"{'='*60}")
             
-            for batch_num, start_idx, end_idx in failed_batches:
-                batch_data = df.iloc[start_idx:end_idx]
-                print(f"\nRetrying batch {batch_num + 1}/{total_batches} (rows {start_idx}-{end_idx})...")
-                
-                validations = self.validate_batch(batch_data)
-                
-                if validations:
-                    for validation in validations:
-                        idx = start_idx + validation['index']
-                        
-                        changes = []
-                        if validation['corrected_strain_name'] != 'CORRECT':
-                            df.at[idx, 'strain_name_validated'] = validation['corrected_strain_name']
-                            changes.append(f"Strain: {df.at[idx, 'strain_name_extracted']} -> {validation['corrected_strain_name']}")
-                            self.total_corrections += 1
-                        
-                        if validation['corrected_breeder'] != 'CORRECT':
-                            df.at[idx, 'breeder_validated'] = validation['corrected_breeder']
-                            changes.append(f"Breeder: {df.at[idx, 'breeder_validated']} -> {validation['corrected_breeder']}")
-                            self.total_corrections += 1
-                        
-                        df.at[idx, 'validation_confidence'] = validation['confidence']
-                        df.at[idx, 'validation_reasoning'] = validation['reasoning']
-                        df.at[idx, 'validation_changes'] = '; '.join(changes) if changes else 'No changes'
-                        df.at[idx, 'validation_attempted'] = True
-                        
-                        if validation['confidence'] < confidence_threshold:
-                            df.at[idx, 'flagged_for_review'] = True
-                            self.flagged_count += 1
-                    
-                    self.total_processed += len(batch_data)
-                    print(f"  SUCCESS - Processed: {self.total_processed}/{len(df)}")
-                else:
-                    print(f"  Still failed - skipping")
-                
-                time.sleep(5)  # Longer delay for retries
+            still_failed = self.run_batches(df, failed_batches, total_batches, confidence_threshold, checkpoint_file)
+            for batch_num, start_idx, end_idx in still_failed:
+                print(f"  Batch {batch_num + 1} still failed - skipping")
+        
+        self.client.close()
+        print(f"\n{self.cache.summary()}")
+        self.cache.close()
         
         # Save results
         print(f"\nSaving validated dataset to {output_csv}...")
-        df.to_csv(output_csv, index=False, encoding='latin-1')
+        write_table(df, output_csv)
         
         # Delete checkpoint file on successful completion
-        if Path(checkpoint_file).exists():
-            Path(checkpoint_file).unlink()
+        if table_exists(checkpoint_file):
+            remove_table(checkpoint_file)
             print(f"[Checkpoint file deleted]")
         
         # Save flagged items
@@ -252,7 +242,7 @@ INPUT DATA:
         if len(flagged_df) > 0:
             flagged_csv = output_csv.replace('.csv', '_flagged.csv')
             print(f"Saving {len(flagged_df)} flagged items to {flagged_csv}...")
-            flagged_df.to_csv(flagged_csv, index=False, encoding='latin-1')
+            write_table(flagged_df, flagged_csv)
         
         # Generate report
         self.generate_report(df, output_csv.replace('.csv', '_report.txt'))
@@ -264,6 +254,7 @@ INPUT DATA:
         print(f"Total corrections made: {self.total_corrections}")
         print(f"Items flagged for review: {self.flagged_count}")
         print(f"Estimated total cost: ${self.total_cost:.4f}")
+        print(f"Gemini client: {self.client.summary()}")
         print("=" * 60)
     
     def generate_report(self, df, report_path):
@@ -276,7 +267,8 @@ INPUT DATA:
             f.write(f"Total Strains: {len(df)}\n")
             f.write(f"Corrections Made: {self.total_corrections}\n")
             f.write(f"Flagged for Review: {self.flagged_count}\n")
-            f.write(f"Estimated Cost: ${self.total_cost:.4f}\n\n")
+            f.write(f"Estimated Cost: ${self.total_cost:.4f}\n")
+            f.write(f"Gemini Client: {self.client.summary()}\n\n")
             
             f.write("CONFIDENCE DISTRIBUTION:\n")
             f.write(f"  95-100%: {len(df[df['validation_confidence'] >= 95])}\n")
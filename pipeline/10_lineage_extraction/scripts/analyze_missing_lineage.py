@@ -1,6 +1,10 @@
-import pandas as pd
+import sys
+from pathlib import Path
 
-df = pd.read_csv('output/all_strains_genetics_standardized.csv', encoding='latin-1', low_memory=False)
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table
+
+df = read_table('output/all_strains_genetics_standardized.csv', optimize=True)
 
 print("Missing Lineage Analysis by Seed Bank\n")
 print("="*70)
@@ -2,6 +2,11 @@ import pandas as pd
 import boto3
 from bs4 import BeautifulSoup
 import re
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_lineage_attitude(html):
     soup = BeautifulSoup(html, 'html.parser')
@@ -31,7 +36,7 @@ def create_slug(name):
     name = re.sub(r'[-\s]+', '-', name)
     return name.strip('-')
 
-df = pd.read_csv('output/all_strains_genetics_standardized.csv', encoding='latin-1', low_memory=False)
+df = read_table('output/all_strains_genetics_standardized.csv', optimize=True)
 attitude = df[df['seed_bank'] == 'attitude'].copy()
 missing = attitude[attitude['parent_1_display'].isna()]
 
@@ -70,6 +75,7 @@ for idx, row in missing.iterrows():
     except:
         continue
 
-df.to_csv('output/all_strains_lineage_attitude.csv', index=False, encoding='utf-8')
+# Only this seed bank's rows; merge_lineage.py combines the per-bank files
+write_table(df[df['seed_bank'] == 'attitude'], 'output/lineage_attitude.csv')
 print(f"\nAttitude extraction complete: {extracted} lineage extracted")
 print(f"Total with lineage: {df['parent_1_display'].notna().sum()} ({df['parent_1_display'].notna().sum()/len(df)*100:.1f}%)")
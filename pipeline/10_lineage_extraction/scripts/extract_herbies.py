@@ -2,6 +2,11 @@ import pandas as pd
 import boto3
 from bs4 import BeautifulSoup
 import re
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def extract_lineage_herbies(html):
     soup = BeautifulSoup(html, 'html.parser')
@@ -28,7 +33,7 @@ def create_slug(name):
     name = re.sub(r'[-\s]+', '-', name)
     return name.strip('-')
 
-df = pd.read_csv('output/all_strains_lineage_gorilla.csv', encoding='utf-8', low_memory=False)
+df = read_table('output/all_strains_genetics_standardized.csv', optimize=True)
 herbies = df[df['seed_bank'] == 'herbies'].copy()
 missing = herbies[herbies['parent_1_display'].isna()]
 
@@ -67,6 +72,7 @@ for idx, row in missing.iterrows():
     except:
         continue
 
-df.to_csv('output/all_strains_lineage_herbies.csv', index=False, encoding='utf-8')
+# Only this seed bank's rows; merge_lineage.py combines the per-bank files
+write_table(df[df['seed_bank'] == 'herbies'], 'output/lineage_herbies.csv')
 print(f"\nHerbies extraction complete: {extracted} lineage extracted")
 print(f"Total with lineage: {df['parent_1_display'].notna().sum()} ({df['parent_1_display'].notna().sum()/len(df)*100:.1f}%)")
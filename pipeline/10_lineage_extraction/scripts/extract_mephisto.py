@@ -1,12 +1,16 @@
-import pandas as pd
 import boto3
 from bs4 import BeautifulSoup
 import re
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 s3 = boto3.client('s3')
 bucket = 'ci-strains-html-archive'
 
-df = pd.read_csv('output/all_strains_lineage_herbies.csv', encoding='utf-8')
+df = read_table('output/all_strains_genetics_standardized.csv', optimize=True)
 mephisto = df[(df['seed_bank'] == 'mephisto_genetics') & (df['parent_1_display'].isna())].copy()
 
 print(f"Processing {len(mephisto)} Mephisto strains...")
@@ -49,5 +53,6 @@ for idx, row in mephisto.iterrows():
         continue
 
 print(f"Extracted: {extracted}/{len(mephisto)} ({extracted/len(mephisto)*100:.1f}%)")
-df.to_csv('output/all_strains_lineage_mephisto.csv', index=False, encoding='utf-8')
+# Only this seed bank's rows; merge_lineage.py combines the per-bank files
+write_table(df[df['seed_bank'] == 'mephisto_genetics'], 'output/lineage_mephisto.csv')
 print(f"Total coverage: {df['parent_1_display'].notna().sum()}/{len(df)} ({df['parent_1_display'].notna().sum()/len(df)*100:.1f}%)")
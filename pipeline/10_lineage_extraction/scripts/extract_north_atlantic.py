@@ -1,12 +1,16 @@
-import pandas as pd
 import boto3
 from bs4 import BeautifulSoup
 import re
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 s3 = boto3.client('s3')
 bucket = 'ci-strains-html-archive'
 
-df = pd.read_csv('output/all_strains_lineage_neptune.csv', encoding='utf-8', low_memory=False)
+df = read_table('output/all_strains_genetics_standardized.csv', optimize=True)
 north_atlantic = df[(df['seed_bank'] == 'north_atlantic') & (df['parent_1_display'].isna())].copy()
 
 print(f"Processing {len(north_atlantic)} North Atlantic strains...")
@@ -39,5 +43,6 @@ for idx, row in north_atlantic.iterrows():
         continue
 
 print(f"Extracted: {extracted}/{len(north_atlantic)} ({extracted/len(north_atlantic)*100:.1f}%)")
-df.to_csv('output/all_strains_lineage_north_atlantic.csv', index=False, encoding='utf-8')
+# Only this seed bank's rows; merge_lineage.py combines the per-bank files
+write_table(df[df['seed_bank'] == 'north_atlantic'], 'output/lineage_north_atlantic.csv')
 print(f"Total coverage: {df['parent_1_display'].notna().sum()}/{len(df)} ({df['parent_1_display'].notna().sum()/len(df)*100:.1f}%)")
@@ -0,0 +1,44 @@
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, table_exists, write_table
+
+# Each extractor only touches its own seed bank's rows, so the extractors run
+# independently and their per-bank files are applied onto the standardized input here
+LINEAGE_FILES = [
+    'output/lineage_attitude.csv',
+    'output/lineage_barneys.csv',
+    'output/lineage_cropking.csv',
+    'output/lineage_exotic.csv',
+    'output/lineage_gorilla.csv',
+    'output/lineage_herbies.csv',
+    'output/lineage_mephisto.csv',
+    'output/lineage_neptune.csv',
+    'output/lineage_north_atlantic.csv',
+    'output/lineage_royal_queen.csv',
+    'output/lineage_seeds_here_now.csv',
+    'output/lineage_seedsman.csv',
+    'output/lineage_ilgm.csv'
+]
+
+df = read_table('output/all_strains_genetics_standardized.csv')
+order, columns = df['source_url_raw'], list(df.columns)
+df = df.set_index('source_url_raw')
+print(f"Input: {len(df)} strains, {df['parent_1_display'].notna().sum()} with lineage")
+
+for lineage_file in LINEAGE_FILES:
+    if not table_exists(lineage_file):
+        print(f"- {lineage_file}: NOT FOUND")
+        continue
+    bank_rows = read_table(lineage_file).set_index('source_url_raw')
+    before = df.loc[df.index.isin(bank_rows.index), 'parent_1_display'].notna().sum()
+    df = pd.concat([df.drop(bank_rows.index), bank_rows])
+    print(f"+ {lineage_file}: {len(bank_rows)} strains, +{bank_rows['parent_1_display'].notna().sum() - before} lineage")
+
+df = df.loc[order].reset_index()
+df = df[columns + [column for column in df.columns if column not in columns]]
+write_table(df, 'output/all_strains_lineage_final.csv')
+print(f"\nTotal with lineage: {df['parent_1_display'].notna().sum()}/{len(df)} ({df['parent_1_display'].notna().sum()/len(df)*100:.1f}%)")
+print("Saved: output/all_strains_lineage_final.csv")
@@ -10,11 +10,17 @@ Logic designed by Amazon Q, verified by Shannon Goddard.
 import pandas as pd
 import boto3
 import json
-import time
 from pathlib import Path
 from google.cloud import aiplatform
 from vertexai.generative_models import GenerativeModel, Part
 import vertexai
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from batch_requests import prompt_version
+from gemini_client import GeminiClient
+from response_cache import ResponseCache
+from table_io import read_table, write_table
 
 # Configuration
 PROJECT_ID = "ci-strains-pro"
@@ -23,35 +29,16 @@ MODEL_NAME = "gemini-1.5-pro"
 S3_BUCKET = "ci-strains-html-archive"
 BATCH_SIZE = 50  # Process in batches to manage rate limits
 CONFIDENCE_THRESHOLD = 0.90  # Flag items below this score
+# Rows of a batch run concurrently within these budgets (replaces the fixed 1s sleep)
+REQUESTS_PER_MINUTE = 60
+TOKENS_PER_MINUTE = 1_000_000
+CONCURRENCY = 8
 
-# Paths
-INPUT_CSV = "pipeline/11_manual_review_and_validation/output/pipeline_11_manual_review.csv"
-OUTPUT_CSV = "pipeline/11_manual_review_and_validation/audit/audit_results.csv"
-FLAGGED_CSV = "pipeline/11_manual_review_and_validation/audit/audit_flagged.csv"
-
-# Initialize clients
-s3_client = boto3.client('s3')
-vertexai.init(project=PROJECT_ID, location=LOCATION)
-model = GenerativeModel(MODEL_NAME)
-
-def get_html_from_s3(s3_key):
-    """Fetch HTML content from S3 bucket"""
-    try:
-        response = s3_client.get_object(Bucket=S3_BUCKET, Key=s3_key)
-        html_content = response['Body'].read().decode('latin-1')
-        return html_content
-    except Exception as e:
-        print(f"Error fetching {s3_key}: {e}")
-        return None
-
-def audit_row_with_gemini(row, html_content):
-    """Send HTML and manual corrections to Gemini for audit"""
-    
-    prompt = f"""You are a botanical data auditor. Review the provided HTML and verify if the following CSV data is correct:
+PROMPT_TEMPLATE = """You are a botanical data auditor. Review the provided HTML and verify if the following CSV data is correct:
 
-Seed Bank: {row['seed_bank_display_manual']}
-Breeder: {row['breeder_display_manual']}
-Strain Name: {row['strain_name_display_manual']}
+Seed Bank: {seed_bank}
+Breeder: {breeder}
+Strain Name: {strain_name}
 
 CRITICAL RULES:
 1. If the HTML mentions a specific breeder (e.g., "Barney's Farm", "Royal Queen Seeds", "00 Seeds"), but the CSV says "Unbranded" or "Bulk" or the seed bank name, you MUST flag this as an error and provide the correct breeder name.
@@ -74,12 +61,46 @@ Respond ONLY with valid JSON in this exact format:
 }}
 
 HTML Content:
-{html_content[:50000]}
+{html_content}
 """
+# Cached audits are keyed by S3 key + the manual values under this version; any edit to the template changes it
+PROMPT_VERSION = prompt_version("manual-audit-v1", PROMPT_TEMPLATE)
+
+# Paths
+INPUT_CSV = "pipeline/11_manual_review_and_validation/output/pipeline_11_manual_review.csv"
+OUTPUT_CSV = "pipeline/11_manual_review_and_validation/audit/audit_results.csv"
+FLAGGED_CSV = "pipeline/11_manual_review_and_validation/audit/audit_flagged.csv"
+
+# Initialize clients
+s3_client = boto3.client('s3')
+vertexai.init(project=PROJECT_ID, location=LOCATION)
+model = GenerativeModel(MODEL_NAME)
+client = GeminiClient(model, model_name=MODEL_NAME, rpm=REQUESTS_PER_MINUTE, tpm=TOKENS_PER_MINUTE,
+                      concurrency=CONCURRENCY)
+response_cache = ResponseCache()
+
+def get_html_from_s3(s3_key):
+    """Fetch HTML content from S3 bucket"""
+    try:
+        response = s3_client.get_object(Bucket=S3_BUCKET, Key=s3_key)
+        html_content = response['Body'].read().decode('latin-1')
+        return html_content
+    except Exception as e:
+        print(f"Error fetching {s3_key}: {e}")
+        return None
+
+def audit_row_with_gemini(row, html_content, cache_key=None):
+    """Send HTML and manual corrections to Gemini for audit; a parsed answer is stored under cache_key"""
+    
+    prompt = PROMPT_TEMPLATE.format(
+        seed_bank=row['seed_bank_display_manual'],
+        breeder=row['breeder_display_manual'],
+        strain_name=row['strain_name_display_manual'],
+        html_content=html_content[:50000]
+    )
     
     try:
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
+        result_text = client.generate(prompt).strip()
         
         # Remove markdown code blocks if present
         if result_text.startswith("```json"):
@@ -90,6 +111,8 @@ HTML Content:
             result_text = result_text[:-3]
         
         result = json.loads(result_text.strip())
+        if cache_key:
+            response_cache.put(cache_key, result)
         return result
     except Exception as e:
         print(f"Error auditing row {row['strain_id']}: {e}")
@@ -102,31 +125,35 @@ HTML Content:
             "reasoning": f"Error: {str(e)}"
         }
 
-def process_batch(df_batch, start_idx):
-    """Process a batch of rows"""
-    results = []
+def audit_row(row):
+    """Audit result for one row with manual corrections"""
+    # Skip if no S3 key
+    if pd.isna(row['s3_html_key_raw']):
+        return {
+            'strain_id': row['strain_id'],
+            'audit_seed_bank_correct': None,
+            'audit_breeder_correct': None,
+            'audit_strain_name_correct': None,
+            'audit_confidence': 0.0,
+            'audit_suggested_corrections': json.dumps({}),
+            'audit_reasoning': 'No S3 HTML key available',
+            'audit_flagged': True
+        }
     
-    for idx, row in df_batch.iterrows():
-        print(f"Processing {idx + 1}/{len(df_batch)} (Overall: {start_idx + idx + 1})")
-        
-        # Skip if no S3 key
-        if pd.isna(row['s3_html_key_raw']):
-            results.append({
-                'strain_id': row['strain_id'],
-                'audit_seed_bank_correct': None,
-                'audit_breeder_correct': None,
-                'audit_strain_name_correct': None,
-                'audit_confidence': 0.0,
-                'audit_suggested_corrections': json.dumps({}),
-                'audit_reasoning': 'No S3 HTML key available',
-                'audit_flagged': True
-            })
-            continue
-        
+    # The same page and manual values audited by an earlier run need neither S3 nor Gemini
+    cache_key = response_cache.key(MODEL_NAME, PROMPT_VERSION, {
+        's3_html_key': row['s3_html_key_raw'],
+        'seed_bank': row['seed_bank_display_manual'],
+        'breeder': row['breeder_display_manual'],
+        'strain_name': row['strain_name_display_manual'],
+    })
+    audit_result = response_cache.get(cache_key)
+    
+    if audit_result is None:
         # Fetch HTML from S3
         html_content = get_html_from_s3(row['s3_html_key_raw'])
         if not html_content:
-            results.append({
+            return {
                 'strain_id': row['strain_id'],
                 'audit_seed_bank_correct': None,
                 'audit_breeder_correct': None,
@@ -135,26 +162,31 @@ def process_batch(df_batch, start_idx):
                 'audit_suggested_corrections': json.dumps({}),
                 'audit_reasoning': 'Failed to fetch HTML from S3',
                 'audit_flagged': True
-            })
-            continue
+            }
         
         # Audit with Gemini
-        audit_result = audit_row_with_gemini(row, html_content)
-        
-        # Format result
-        results.append({
-            'strain_id': row['strain_id'],
-            'audit_seed_bank_correct': audit_result.get('seed_bank_correct'),
-            'audit_breeder_correct': audit_result.get('breeder_correct'),
-            'audit_strain_name_correct': audit_result.get('strain_name_correct'),
-            'audit_confidence': audit_result.get('confidence', 0.0),
-            'audit_suggested_corrections': json.dumps(audit_result.get('suggested_corrections', {})),
-            'audit_reasoning': audit_result.get('reasoning', ''),
-            'audit_flagged': audit_result.get('confidence', 0.0) < CONFIDENCE_THRESHOLD
-        })
-        
-        # Rate limiting
-        time.sleep(1)
+        audit_result = audit_row_with_gemini(row, html_content, cache_key)
+    
+    # Format result
+    return {
+        'strain_id': row['strain_id'],
+        'audit_seed_bank_correct': audit_result.get('seed_bank_correct'),
+        'audit_breeder_correct': audit_result.get('breeder_correct'),
+        'audit_strain_name_correct': audit_result.get('strain_name_correct'),
+        'audit_confidence': audit_result.get('confidence', 0.0),
+        'audit_suggested_corrections': json.dumps(audit_result.get('suggested_corrections', {})),
+        'audit_reasoning': audit_result.get('reasoning', ''),
+        'audit_flagged': audit_result.get('confidence', 0.0) < CONFIDENCE_THRESHOLD
+    }
+
+def process_batch(df_batch, start_idx):
+    """Process a batch of rows in parallel within the client's rate limits"""
+    results = []
+    
+    rows = (row for _, row in df_batch.iterrows())
+    for done, (row, result) in enumerate(client.map(audit_row, rows), 1):
+        print(f"Processed {done}/{len(df_batch)} (Overall: {start_idx + done})")
+        results.append(result)
     
     return results
 
@@ -165,7 +197,7 @@ def main():
     
     # Load CSV
     print(f"\nLoading CSV: {INPUT_CSV}")
-    df = pd.read_csv(INPUT_CSV, encoding='latin-1')
+    df = read_table(INPUT_CSV)
     print(f"Total strains: {len(df)}")
     
     # Filter rows with manual corrections
@@ -199,13 +231,18 @@ def main():
         # Save progress after each batch
         results_df = pd.DataFrame(all_results)
         merged_df = df.merge(results_df, on='strain_id', how='left')
-        merged_df.to_csv(OUTPUT_CSV, index=False, encoding='latin-1')
+        write_table(merged_df, OUTPUT_CSV)
         print(f"\nProgress saved to {OUTPUT_CSV}")
+        print(f"Gemini: {client.summary()}")
+    
+    client.close()
     
     # Final results
     print(f"\n{'=' * 80}")
     print("Audit Complete!")
     print(f"{'=' * 80}")
+    print(f"Gemini: {client.summary()}")
+    print(f"Cache: {response_cache.summary()}")
     
     results_df = pd.DataFrame(all_results)
     
@@ -220,12 +257,12 @@ def main():
     
     # Merge with original data
     merged_df = df.merge(results_df, on='strain_id', how='left')
-    merged_df.to_csv(OUTPUT_CSV, index=False, encoding='latin-1')
+    write_table(merged_df, OUTPUT_CSV)
     print(f"\nFull results saved to: {OUTPUT_CSV}")
     
     # Save flagged items
     flagged_df = merged_df[merged_df['audit_flagged'] == True]
-    flagged_df.to_csv(FLAGGED_CSV, index=False, encoding='latin-1')
+    write_table(flagged_df, FLAGGED_CSV)
     print(f"Flagged items saved to: {FLAGGED_CSV}")
     
     print("\n" + "=" * 80)
@@ -1,22 +1,29 @@
-import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 clean_file = "output/pipeline_11_clean.csv"
 source_file = "input/pipeline_11_breeder_extracted.csv"
 
 print("Reading files...")
-df_clean = pd.read_csv(clean_file, encoding='latin-1', low_memory=False)
-df_source = pd.read_csv(source_file, encoding='latin-1', low_memory=False)
+df_clean = read_table(clean_file)
+df_source = read_table(source_file)
 
 print(f"Clean: {len(df_clean):,} strains")
 print(f"Source: {len(df_source):,} strains")
 
-# Check current state
-empty_count = df_clean['strain_name_raw'].isna().sum()
-print(f"\nEmpty strain_name_raw: {empty_count:,}")
+# Check current state (create_clean_dataset.py does not keep the column)
+if 'strain_name_raw' in df_clean.columns:
+    empty_count = df_clean['strain_name_raw'].isna().sum()
+    print(f"\nEmpty strain_name_raw: {empty_count:,}")
+else:
+    print("\nNo strain_name_raw column yet")
 
 # Update from source
 print("\nUpdating strain_name_raw from source...")
-df_clean = df_clean.drop(columns=['strain_name_raw'])
+df_clean = df_clean.drop(columns=['strain_name_raw'], errors='ignore')
 df_clean = df_clean.merge(
     df_source[['strain_id', 'strain_name_raw']], 
     on='strain_id', 
@@ -33,7 +40,7 @@ df_clean = df_clean[cols]
 missing = df_clean['strain_name_raw'].isna().sum()
 print(f"Coverage: {len(df_clean) - missing:,} / {len(df_clean):,} ({((len(df_clean) - missing) / len(df_clean) * 100):.1f}%)")
 
-df_clean.to_csv(clean_file, index=False, encoding='utf-8')
+write_table(df_clean, clean_file)
 print(f"\nSaved to: {clean_file}")
 
 print("\nSample:")
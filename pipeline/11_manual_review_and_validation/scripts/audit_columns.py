@@ -1,11 +1,16 @@
 import pandas as pd
 import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table
 
 input_file = "output/pipeline_11_breeder_extracted.csv"
 output_file = "output/column_audit_report.md"
 
 print(f"Reading {input_file}...")
-df = pd.read_csv(input_file, encoding='latin-1', low_memory=False)
+df = read_table(input_file)
 
 print(f"Total rows: {len(df):,}")
 print(f"Total columns: {len(df.columns)}")
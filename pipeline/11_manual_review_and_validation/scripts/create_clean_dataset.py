@@ -1,10 +1,14 @@
-import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 input_file = "output/pipeline_11_breeder_extracted.csv"
 output_file = "output/pipeline_11_clean.csv"
 
 print(f"Reading {input_file}...")
-df = pd.read_csv(input_file, encoding='latin-1', low_memory=False)
+df = read_table(input_file)
 print(f"Original: {len(df):,} rows, {len(df.columns)} columns")
 
 # KEEP columns
@@ -75,7 +79,7 @@ print(f"Clean: {len(df_clean):,} rows, {len(df_clean.columns)} columns")
 print(f"Removed: {len(df.columns) - len(df_clean.columns)} columns")
 
 # Save
-df_clean.to_csv(output_file, index=False, encoding='utf-8')
+write_table(df_clean, output_file)
 print(f"\nSaved to: {output_file}")
 
 # Show what we kept
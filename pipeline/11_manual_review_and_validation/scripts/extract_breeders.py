@@ -10,11 +10,18 @@ Logic designed by Amazon Q, verified by Shannon Goddard.
 import pandas as pd
 import boto3
 import json
-import time
 import re
 from bs4 import BeautifulSoup
 from vertexai.generative_models import GenerativeModel
 import vertexai
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from batch_requests import prompt_version
+from gemini_client import GeminiClient
+from response_cache import ResponseCache
+from table_io import read_table, write_table
 
 # Configuration
 PROJECT_ID = "gen-lang-client-0100184589"  # Same as Phase 9
@@ -23,6 +30,33 @@ MODEL_NAME = "gemini-2.0-flash-exp"  # Same as Phase 9
 S3_BUCKET = "ci-strains-html-archive"
 BATCH_SIZE = 50
 CONFIDENCE_THRESHOLD = 0.85
+# Rows of a batch run concurrently within these budgets (replaces the fixed 3s sleep)
+REQUESTS_PER_MINUTE = 60
+TOKENS_PER_MINUTE = 1_000_000
+CONCURRENCY = 8
+
+PROMPT_TEMPLATE = """You are a cannabis breeder extraction specialist. Read this text and identify the BREEDER (not the seed bank).
+
+CRITICAL RULES:
+1. The BREEDER is who created the genetics (e.g., "Barney's Farm", "Royal Queen Seeds", "00 Seeds")
+2. The SEED BANK is who sells the seeds (e.g., "The Attitude Seedbank", "Neptune Seed Bank")
+3. Seed Bank for this strain: {seed_bank}
+4. If the text mentions a specific breeder name, extract it
+5. Look in: product title, breeder field, manufacturer, brand, genetics info
+6. If you cannot find a breeder, return "Unknown"
+
+Respond ONLY with valid JSON:
+{{
+  "breeder": "breeder name or Unknown",
+  "confidence": 0.0-1.0,
+  "reasoning": "where you found it"
+}}
+
+Text Content:
+{html_content}
+"""
+# Cached answers are keyed by S3 key + seed bank under this version; any edit to the template changes it
+PROMPT_VERSION = prompt_version("breeder-extraction-v1", PROMPT_TEMPLATE)
 
 # Paths
 INPUT_CSV = "output/pipeline_11_manual_review.csv"
@@ -32,6 +66,9 @@ OUTPUT_CSV = "output/pipeline_11_breeder_extracted.csv"
 s3_client = boto3.client('s3')
 vertexai.init(project=PROJECT_ID, location=LOCATION)
 model = GenerativeModel(MODEL_NAME)
+client = GeminiClient(model, model_name=MODEL_NAME, rpm=REQUESTS_PER_MINUTE, tpm=TOKENS_PER_MINUTE,
+                      concurrency=CONCURRENCY)
+response_cache = ResponseCache()
 
 def get_html_from_s3(s3_key):
     """Fetch HTML from S3 and extract text only"""
@@ -58,90 +95,74 @@ def extract_json(text):
     except:
         return None
 
-def extract_breeder_with_gemini(html_content, seed_bank, retry_count=0):
-    """Extract breeder name from HTML using Gemini with retry logic"""
+def extract_breeder_with_gemini(html_content, seed_bank, cache_key=None):
+    """Extract breeder name from HTML using Gemini (the client retries rate limits with jittered backoff)
     
-    prompt = f"""You are a cannabis breeder extraction specialist. Read this text and identify the BREEDER (not the seed bank).
-
-CRITICAL RULES:
-1. The BREEDER is who created the genetics (e.g., "Barney's Farm", "Royal Queen Seeds", "00 Seeds")
-2. The SEED BANK is who sells the seeds (e.g., "The Attitude Seedbank", "Neptune Seed Bank")
-3. Seed Bank for this strain: {seed_bank}
-4. If the text mentions a specific breeder name, extract it
-5. Look in: product title, breeder field, manufacturer, brand, genetics info
-6. If you cannot find a breeder, return "Unknown"
-
-Respond ONLY with valid JSON:
-{{
-  "breeder": "breeder name or Unknown",
-  "confidence": 0.0-1.0,
-  "reasoning": "where you found it"
-}}
-
-Text Content:
-{html_content}
-"""
+    A parsed answer is stored under cache_key; fallbacks for errors are not.
+    """
+    
+    prompt = PROMPT_TEMPLATE.format(seed_bank=seed_bank, html_content=html_content)
     
     try:
-        response = model.generate_content(prompt)
-        result_text = response.text.strip()
+        result_text = client.generate(prompt).strip()
         
         # Robust JSON extraction
         result = extract_json(result_text)
         if result:
+            if cache_key:
+                response_cache.put(cache_key, result)
             return result
         else:
             return {"breeder": "Unknown", "confidence": 0.0, "reasoning": "Failed to parse JSON"}
             
     except Exception as e:
-        # Retry logic for rate limits (429, 503)
-        if retry_count < 3 and ('429' in str(e) or '503' in str(e)):
-            print(f"Rate limit hit, retrying in 10 seconds... (attempt {retry_count + 1}/3)")
-            time.sleep(10)
-            return extract_breeder_with_gemini(html_content, seed_bank, retry_count + 1)
-        
         print(f"Error: {e}")
         return {"breeder": "Unknown", "confidence": 0.0, "reasoning": f"Error: {str(e)}"}
 
-def process_batch(df_batch, start_idx):
-    """Process batch of Unknown breeders"""
-    results = []
+def extract_row(row):
+    """Breeder extraction result for one Unknown-breeder row"""
+    if pd.isna(row['s3_html_key_raw']):
+        return {
+            'strain_id': row['strain_id'],
+            'breeder_extracted': 'Unknown',
+            'breeder_confidence': 0.0,
+            'breeder_reasoning': 'No S3 HTML key'
+        }
     
-    for idx, row in df_batch.iterrows():
-        print(f"Processing {idx - start_idx + 1}/{len(df_batch)} (Overall: {idx + 1})")
-        
-        if pd.isna(row['s3_html_key_raw']):
-            results.append({
-                'strain_id': row['strain_id'],
-                'breeder_extracted': 'Unknown',
-                'breeder_confidence': 0.0,
-                'breeder_reasoning': 'No S3 HTML key'
-            })
-            continue
-        
+    # An archived page answered by an earlier run needs neither S3 nor Gemini
+    cache_key = response_cache.key(MODEL_NAME, PROMPT_VERSION, {
+        's3_html_key': row['s3_html_key_raw'], 'seed_bank': row['seed_bank_display_manual']})
+    extraction = response_cache.get(cache_key)
+    
+    if extraction is None:
         # Fetch HTML
         html_content = get_html_from_s3(row['s3_html_key_raw'])
         if not html_content:
-            results.append({
+            return {
                 'strain_id': row['strain_id'],
                 'breeder_extracted': 'Unknown',
                 'breeder_confidence': 0.0,
                 'breeder_reasoning': 'Failed to fetch HTML'
-            })
-            continue
+            }
         
-        # Extract breeder with retry logic
-        extraction = extract_breeder_with_gemini(html_content, row['seed_bank_display_manual'])
-        
-        results.append({
-            'strain_id': row['strain_id'],
-            'breeder_extracted': extraction.get('breeder', 'Unknown'),
-            'breeder_confidence': extraction.get('confidence', 0.0),
-            'breeder_reasoning': extraction.get('reasoning', '')
-        })
-        
-        # Rate limiting (increased to avoid 429 errors)
-        time.sleep(3)  # Increased from 1 to 3 seconds
+        # Extract breeder
+        extraction = extract_breeder_with_gemini(html_content, row['seed_bank_display_manual'], cache_key)
+    
+    return {
+        'strain_id': row['strain_id'],
+        'breeder_extracted': extraction.get('breeder', 'Unknown'),
+        'breeder_confidence': extraction.get('confidence', 0.0),
+        'breeder_reasoning': extraction.get('reasoning', '')
+    }
+
+def process_batch(df_batch, start_idx):
+    """Process batch of Unknown breeders, rows in parallel within the client's rate limits"""
+    results = []
+    
+    rows = (row for _, row in df_batch.iterrows())
+    for done, (row, result) in enumerate(client.map(extract_row, rows), 1):
+        print(f"Processed {done}/{len(df_batch)} (Overall: {start_idx + done})")
+        results.append(result)
     
     return results
 
@@ -152,7 +173,7 @@ def main():
     
     # Load CSV
     print(f"\nLoading: {INPUT_CSV}")
-    df = pd.read_csv(INPUT_CSV, encoding='latin-1')
+    df = read_table(INPUT_CSV)
     print(f"Total strains: {len(df):,}")
     
     # Filter Unknown breeders
@@ -182,13 +203,18 @@ def main():
         # Save progress
         results_df = pd.DataFrame(all_results)
         merged_df = df.merge(results_df, on='strain_id', how='left')
-        merged_df.to_csv(OUTPUT_CSV, index=False, encoding='utf-8')
+        write_table(merged_df, OUTPUT_CSV)
         print(f"\nProgress saved to {OUTPUT_CSV}")
+        print(f"Gemini: {client.summary()}")
+    
+    client.close()
     
     # Final stats
     print(f"\n{'=' * 80}")
     print("Extraction Complete!")
     print(f"{'=' * 80}")
+    print(f"Gemini: {client.summary()}")
+    print(f"Cache: {response_cache.summary()}")
     
     results_df = pd.DataFrame(all_results)
     
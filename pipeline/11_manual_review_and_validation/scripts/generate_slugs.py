@@ -1,5 +1,10 @@
 import pandas as pd
 import re
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 def create_slug(name):
     """Convert strain name to URL-safe slug"""
@@ -30,7 +35,7 @@ input_file = "output/pipeline_11_clean.csv"
 output_file = "output/pipeline_11_clean.csv"
 
 print(f"Reading {input_file}...")
-df = pd.read_csv(input_file, encoding='latin-1', low_memory=False)
+df = read_table(input_file)
 
 print(f"Total strains: {len(df):,}")
 
@@ -50,6 +55,6 @@ if empty_slugs.any():
     print(df[empty_slugs][['strain_id', 'strain_name_display_manual']].head())
 
 # Save
-df.to_csv(output_file, index=False, encoding='utf-8')
+write_table(df, output_file)
 print(f"\nSaved to: {output_file}")
 print(f"Added column: strain_name_slug")
@@ -1,10 +1,14 @@
-import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / '05_master_dataset' / 'scripts'))
+from table_io import read_table, write_table
 
 input_file = "output/pipeline_11_clean.csv"
 output_file = "output/pipeline_11_clean.csv"
 
 print(f"Reading {input_file}...")
-df = pd.read_csv(input_file, encoding='latin-1', low_memory=False)
+df = read_table(input_file)
 
 print(f"Original: {len(df):,} strains")
 
@@ -23,7 +27,7 @@ if delete_count > 0:
     print(f"Removed: {delete_count} strains")
     
     # Save
-    df_clean.to_csv(output_file, index=False, encoding='utf-8')
+    write_table(df_clean, output_file)
     print(f"\nSaved to: {output_file}")
 else:
     print("\nNo rows marked for deletion found.")
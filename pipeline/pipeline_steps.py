@@ -0,0 +1,212 @@
+"""
+Pipeline Step Declarations (Phases 05-11)
+Every script the runner knows about, with the files it reads and writes
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Paths are relative to pipeline/. A table path (x.csv) covers both the
+Parquet file and the CSV export written by table_io. Dependencies are not
+declared: a step depends on the last step declared before it that writes
+one of its inputs, so scripts that rewrite a file in place (05 scripts
+05-08, phase 11 cleanup) run in declaration order.
+
+Scripts that call Gemini/Vertex (05 scripts 09-14, 09 validate_with_vertex,
+11 extract_breeders) or depend on hand-edited review files are left out;
+their outputs are treated as source files, like the scraped CSVs.
+"""
+
+SEED_BANK_INVENTORIES = ['03_s3_inventory/s3_html_inventory.csv', '03_s3_inventory/s3_js_html_inventory.csv']
+
+
+class Step:
+    def __init__(self, name, script=None, inputs=(), outputs=(), cwd=None, copy=None):
+        """script runs with cwd (default: its own folder); copy=(source, target) copies a table instead"""
+        self.name = name
+        self.script = script
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.cwd = cwd
+        self.copy = copy
+
+    def __repr__(self):
+        return f"Step({self.name})"
+
+
+def handoff(name, source, target):
+    """Copy a table from one phase's output to the next phase's input folder"""
+    return Step(name, inputs=[source], outputs=[target], copy=(source, target))
+
+
+def _phase_05():
+    base = '05_master_dataset'
+    master = f'{base}/output/master_strains_raw.csv'
+    return [
+        Step('05/01_column_analysis', f'{base}/scripts/01_column_analysis.py',
+             inputs=[f'{base}/csv/*.csv'],
+             outputs=[f'{base}/output/column_analysis.json', f'{base}/output/column_frequency.txt']),
+        Step('05/02_column_mapping', f'{base}/scripts/02_column_mapping.py',
+             inputs=[f'{base}/output/column_analysis.json'],
+             outputs=[f'{base}/output/column_mapping.json', f'{base}/output/excluded_columns.json',
+                      f'{base}/output/unmapped_columns.json', f'{base}/output/schema_registry.json']),
+        Step('05/03_merge_raw', f'{base}/scripts/03_merge_raw.py',
+             inputs=[f'{base}/csv/*.csv', f'{base}/output/schema_registry.json'], outputs=[master]),
+        Step('05/05_add_s3_keys', f'{base}/scripts/05_add_s3_keys.py',
+             inputs=[master] + SEED_BANK_INVENTORIES, outputs=[master]),
+        Step('05/06_backfill_metadata', f'{base}/scripts/06_backfill_metadata.py',
+             inputs=[master] + SEED_BANK_INVENTORIES, outputs=[master]),
+        Step('05/07_match_seedsman', f'{base}/scripts/07_match_seedsman.py', inputs=[master], outputs=[master]),
+        Step('05/08_fix_strain_names', f'{base}/scripts/08_fix_strain_names.py', inputs=[master], outputs=[master]),
+    ]
+
+
+# Phase 06 breeder extractors: all read the master dataset, each writes its own file.
+# (script, runs from the phase folder instead of scripts/)
+PHASE_06_EXTRACTORS = {
+    'attitude': False, 'crop_king': True, 'gorilla': False, 'great_lakes': False, 'herbies': False,
+    'ilgm': False, 'multiverse_beans': False, 'neptune': False, 'north_atlantic': False,
+    'seed_supreme': False, 'seeds_here_now': False, 'seedsman_js': False, 'self_branded': False,
+}
+PHASE_06_MERGED = [
+    'attitude', 'gorilla', 'north_atlantic', 'neptune', 'herbies', 'multiverse_beans', 'seed_supreme',
+    'seeds_here_now', 'great_lakes', 'ilgm', 'seedsman_js', 'self_branded',
+]
+
+
+def _phase_06():
+    base = '06_clean_dataset_breeders'
+    master = f'{base}/input/master_strains_raw.csv'
+    steps = [handoff('06/input', '05_master_dataset/output/master_strains_raw.csv', master)]
+    for bank, from_phase_folder in PHASE_06_EXTRACTORS.items():
+        steps.append(Step(f'06/extract_{bank}', f'{base}/scripts/extract_{bank}.py',
+                          inputs=[master], outputs=[f'{base}/output/{bank}_breeders.csv'],
+                          cwd=base if from_phase_folder else None))
+    steps += [
+        Step('06/merge_all_breeders', f'{base}/scripts/merge_all_breeders.py',
+             inputs=[f'{base}/output/{bank}_breeders.csv' for bank in PHASE_06_MERGED],
+             outputs=[f'{base}/output/all_breeders_extracted.csv']),
+        Step('06/generate_breeder_list', f'{base}/scripts/generate_breeder_list.py',
+             inputs=[f'{base}/output/all_breeders_extracted.csv'], outputs=[f'{base}/BREEDER_LIST.md']),
+        Step('06/standardize_breeders', f'{base}/scripts/standardize_breeders.py',
+             inputs=[f'{base}/output/all_breeders_extracted.csv'], outputs=[f'{base}/output/all_breeders_cleaned.csv']),
+        Step('06/generate_cleaned_breeder_list', f'{base}/scripts/generate_cleaned_breeder_list.py',
+             inputs=[f'{base}/output/all_breeders_cleaned.csv'], outputs=[f'{base}/BREEDER_LIST_CLEANED.md']),
+    ]
+    return steps
+
+
+PHASE_07_STEPS = [
+    ('01_remove_duplicate_urls', '01_deduped_urls', '01_url_dedup_report'),
+    ('02_unit_normalization', '02_unit_normalized', '02_unit_normalization_report'),
+    ('03_placeholder_removal', '03_placeholders_removed', '03_placeholder_removal_report'),
+    ('04_data_type_standardization', '04_data_types_standardized', '04_data_type_report'),
+    ('05_genetics_normalization', '05_genetics_normalized', '05_genetics_normalization_report'),
+    ('06_strain_name_normalization', '06_strain_names_normalized', '06_strain_name_normalization_report'),
+    ('07_aka_extraction', '07_aka_extracted', '07_aka_extraction_report'),
+    ('08_similar_spelling_normalization', '08_similar_spelling_normalized', '08_similar_spelling_report'),
+    ('09_autoflower_classification', '09_autoflower_classified', '09_autoflower_classification_report'),
+]
+
+
+def _phase_07():
+    base = '07_data_cleaning'
+    previous = f'{base}/input/master_strains_raw.csv'
+    steps = [handoff('07/input', '05_master_dataset/output/master_strains_raw.csv', previous)]
+    for script, table, report in PHASE_07_STEPS:
+        output = f'{base}/output/{table}.csv'
+        steps.append(Step(f'07/{script}', f'{base}/scripts/{script}.py', inputs=[previous],
+                          outputs=[output, f'{base}/output/{report}.txt']))
+        previous = output
+    return steps
+
+
+# Phase 08 per-bank strain name extractors: script stem -> output table
+PHASE_08_EXTRACTORS = {
+    'amsterdam': 'amsterdam_extracted', 'barneys_farm': 'barneys_farm_extracted',
+    'cropking': 'cropking_extracted', 'dutch_passion': 'dutch_passion_extracted', 'exotic': 'exotic_extracted',
+    'gorilla': 'gorilla_extracted', 'great_lakes_genetics': 'great_lakes_genetics_extracted',
+    'herbies': 'herbies_extracted', 'ilgm': 'ilgm_extracted', 'mephisto_genetics': 'mephisto_genetics_extracted',
+    'multiverse_beans': 'multiverse_beans_extracted', 'neptune': 'neptune_extracted',
+    'north_atlantic': 'north_atlantic_extracted', 'royal_queen_seeds': 'royal_queen_seeds_extracted',
+    'seed_supreme': 'seed_supreme_extracted', 'seeds_here_now': 'seeds_here_now_extracted',
+    'seedsman': 'seedsman_extracted', 'sensi_seeds': 'sensi_seeds_extracted',
+}
+
+
+def _phase_08():
+    base = '08_strain_name_extraction'
+    autoflower = f'{base}/input/09_autoflower_classified.csv'
+    breeder_variations = f'{base}/docs/ALL_BREEDER_VARIATIONS.txt'
+    steps = [handoff('08/input', '07_data_cleaning/output/09_autoflower_classified.csv', autoflower)]
+    for bank, table in PHASE_08_EXTRACTORS.items():
+        steps.append(Step(f'08/extract_{bank}', f'{base}/scripts/extract_{bank}.py',
+                          inputs=[autoflower, breeder_variations], outputs=[f'{base}/output/{table}.csv']))
+    # Attitude reads phase 07's output directly
+    steps.append(Step('08/extract_attitude', f'{base}/scripts/extract_attitude.py',
+                      inputs=['07_data_cleaning/output/09_autoflower_classified.csv', breeder_variations],
+                      outputs=[f'{base}/output/attitude_strain_names_v2.csv']))
+    merged = [f'{base}/output/attitude_strain_names_v2.csv'] + [f'{base}/output/{table}.csv'
+                                                               for table in PHASE_08_EXTRACTORS.values()]
+    steps.append(Step('08/merge_all_banks', f'{base}/scripts/merge_all_banks.py', inputs=merged,
+                      outputs=[f'{base}/output/all_strains_extracted.csv']))
+    return steps
+
+
+def _phase_09():
+    vertex, standardization = '09_vertex_validation', '09.5_standardization'
+    return [
+        handoff('09/input', '08_strain_name_extraction/output/all_strains_extracted.csv',
+                f'{vertex}/input/all_strains_extracted.csv'),
+        # validate_with_vertex.py (paid Vertex calls) writes output/all_strains_validated.csv
+        Step('09/merge_manual_review', f'{vertex}/merge_manual_review.py', cwd=vertex,
+             inputs=[f'{vertex}/output/all_strains_validated.csv',
+                     f'{vertex}/output/all_strains_validated_flagged_manual_review.csv'],
+             outputs=[f'{vertex}/output/all_strains_validated_merged.csv']),
+        Step('09.5/standardize_names', f'{standardization}/standardize_names.py', cwd=standardization,
+             inputs=[f'{vertex}/output/all_strains_validated_merged.csv'],
+             outputs=[f'{standardization}/output/all_strains_standardized.csv']),
+        Step('09.5/remove_null_urls', f'{standardization}/remove_null_urls.py', cwd=standardization,
+             inputs=[f'{standardization}/output/all_strains_standardized.csv'],
+             outputs=[f'{standardization}/output/all_strains_standardized_clean.csv']),
+    ]
+
+
+# Phase 10 lineage extractors: each writes only its own seed bank's rows
+PHASE_10_EXTRACTORS = [
+    'attitude', 'barneys', 'cropking', 'exotic', 'gorilla', 'herbies', 'mephisto', 'neptune',
+    'north_atlantic', 'royal_queen', 'seeds_here_now', 'seedsman', 'ilgm',
+]
+
+
+def _phase_10():
+    base = '10_lineage_extraction'
+    # Genetics standardization of the 09.5 output is done by hand
+    standardized = f'{base}/output/all_strains_genetics_standardized.csv'
+    steps = [Step(f'10/extract_{bank}', f'{base}/scripts/extract_{bank}.py', cwd=base, inputs=[standardized],
+                  outputs=[f'{base}/output/lineage_{bank}.csv']) for bank in PHASE_10_EXTRACTORS]
+    steps.append(Step('10/merge_lineage', f'{base}/scripts/merge_lineage.py', cwd=base,
+                      inputs=[standardized] + [f'{base}/output/lineage_{bank}.csv' for bank in PHASE_10_EXTRACTORS],
+                      outputs=[f'{base}/output/all_strains_lineage_final.csv']))
+    return steps
+
+
+def _phase_11():
+    base = '11_manual_review_and_validation'
+    clean = f'{base}/output/pipeline_11_clean.csv'
+    # extract_breeders.py (Vertex) turns the hand-reviewed pipeline_11_manual_review.csv into
+    # pipeline_11_breeder_extracted.csv
+    extracted = f'{base}/output/pipeline_11_breeder_extracted.csv'
+    return [
+        handoff('11/input', '10_lineage_extraction/output/all_strains_lineage_final.csv',
+                f'{base}/input/all_strains_lineage_final.csv'),
+        Step('11/audit_columns', f'{base}/scripts/audit_columns.py', cwd=base, inputs=[extracted],
+             outputs=[f'{base}/output/column_audit_report.md']),
+        Step('11/create_clean_dataset', f'{base}/scripts/create_clean_dataset.py', cwd=base, inputs=[extracted],
+             outputs=[clean]),
+        Step('11/remove_deleted_rows', f'{base}/scripts/remove_deleted_rows.py', cwd=base, inputs=[clean],
+             outputs=[clean]),
+        Step('11/generate_slugs', f'{base}/scripts/generate_slugs.py', cwd=base, inputs=[clean], outputs=[clean]),
+        Step('11/add_raw_strain_names', f'{base}/scripts/add_raw_strain_names.py', cwd=base,
+             inputs=[clean, f'{base}/input/pipeline_11_breeder_extracted.csv'], outputs=[clean]),
+    ]
+
+
+STEPS = _phase_05() + _phase_06() + _phase_07() + _phase_08() + _phase_09() + _phase_10() + _phase_11()
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Pipeline Runner for Phases 05-11
+Runs the scripts declared in pipeline_steps.py as a DAG, skipping steps whose code and inputs are unchanged
+Logic designed by Amazon Q, verified by Shannon Goddard.
+
+Each phase used to be run by hand, script by script, from the folder its
+relative paths expect, and nothing recorded which outputs were stale. The
+runner starts every script from the right folder, in dependency order. Steps
+whose dependencies are done run in parallel (--jobs), e.g. the phase 06
+breeder extractors, the phase 08 per-bank extractors and the phase 10
+lineage extractors.
+
+A step is skipped when its cache key matches the last successful run and
+its outputs still exist. The key is a SHA-256 over:
+  - the script and the local modules it imports (table_io, schema,
+    extraction_helpers, ...)
+  - the content of every input file (Parquet and CSV export for tables), as
+    its producing step last wrote it, so in-place rewrites of the 05 master
+    do not invalidate the steps before them
+When a step re-runs, every later step that rewrites one of its outputs in
+place is marked stale, since its changes were made to the file just
+replaced. A stale in-place step whose file on disk is no longer the version
+its producer wrote (a later rewrite already applied) re-runs the chain from
+the step that first wrote the file, so it never edits its own output again.
+Downstream steps are checked only once their inputs are rebuilt. If a
+re-run writes identical output, nothing below it re-runs. Keys are kept in
+.pipeline_state.json and step logs in .pipeline_logs/.
+
+  python run_pipeline.py --list                 every step and whether it is stale
+  python run_pipeline.py 07                     phase 07 (plus anything stale upstream)
+  python run_pipeline.py 08/extract_gorilla     one step
+  python run_pipeline.py 10 --jobs 8 --force    re-run phase 10 regardless of the cache
+  python run_pipeline.py --dry-run              show what would run
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from pipeline_steps import STEPS
+
+PIPELINE_DIR = Path(__file__).resolve().parent
+STATE_FILE = PIPELINE_DIR / '.pipeline_state.json'
+LOG_DIR = PIPELINE_DIR / '.pipeline_logs'
+
+# Folders scripts add to sys.path for shared modules
+SHARED_MODULE_DIRS = [
+    PIPELINE_DIR / '05_master_dataset' / 'scripts',
+    PIPELINE_DIR / '03_s3_inventory' / 'scripts',
+    PIPELINE_DIR / '02_s3_scraping',
+]
+IMPORT_PATTERN = re.compile(r'^\s*(?:from|import)\s+([A-Za-z_]\w*)', re.MULTILINE)
+# Table files written by table_io for a .csv path
+TABLE_SUFFIXES = ('.parquet', '.csv')
+CHUNK_SIZE = 1024 * 1024
+
+
+class FileHasher:
+    """SHA-256 of files, reusing the digest while size and mtime are unchanged"""
+
+    def __init__(self, known=None):
+        self.known = known or {}
+        self.lock = threading.Lock()
+
+    def digest(self, path):
+        path = Path(path)
+        stat = path.stat()
+        signature = [stat.st_size, stat.st_mtime_ns]
+        key = str(path)
+        with self.lock:
+            entry = self.known.get(key)
+            if entry and entry['stat'] == signature:
+                return entry['sha256']
+
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                sha.update(chunk)
+        with self.lock:
+            self.known[key] = {'stat': signature, 'sha256': sha.hexdigest()}
+        return sha.hexdigest()
+
+
+def table_files(path):
+    """Files on disk behind a declared path: both table_io files for x.csv, glob matches for patterns"""
+    path = PIPELINE_DIR / path
+    if any(ch in path.name for ch in '*?['):
+        return sorted(p for p in path.parent.glob(path.name) if p.is_file())
+    if path.suffix == '.csv':
+        return [p for p in (path.with_suffix(suffix) for suffix in TABLE_SUFFIXES) if p.exists()]
+    return [path] if path.exists() else []
+
+
+def local_modules(script, seen=None):
+    """The script plus local .py modules it imports, recursively"""
+    seen = seen if seen is not None else set()
+    script = Path(script).resolve()
+    if script in seen:
+        return seen
+    seen.add(script)
+    for name in IMPORT_PATTERN.findall(script.read_text(encoding='utf-8', errors='ignore')):
+        for folder in [script.parent] + SHARED_MODULE_DIRS:
+            module = folder / f'{name}.py'
+            if module.exists():
+                local_modules(module, seen)
+                break
+    return seen
+
+
+class PipelineRunner:
+    def __init__(self, steps, jobs=None, force=(), dry_run=False):
+        """force: names of steps to run even when up to date"""
+        self.steps = {step.name: step for step in steps}
+        self.order = [step.name for step in steps]
+        self.jobs = jobs or os.cpu_count() or 4
+        self.force = set(force)
+        self.dry_run = dry_run
+        self.state = self._load_state()
+        self.hasher = FileHasher(self.state.get('files'))
+        self.state_lock = threading.Lock()
+        self.print_lock = threading.Lock()
+        self.dependencies, self.producers, self.later_writers = self._build_graph(steps)
+
+    def _load_state(self):
+        if STATE_FILE.exists():
+            with open(STATE_FILE) as f:
+                return json.load(f)
+        return {'steps': {}, 'files': {}}
+
+    def _save_state(self):
+        with self.state_lock:
+            self.state['files'] = self.hasher.known
+            tmp_file = STATE_FILE.with_suffix('.json.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(self.state, f, indent=1, sort_keys=True)
+            os.replace(tmp_file, STATE_FILE)
+
+    @staticmethod
+    def _build_graph(steps):
+        """({step: dependencies}, {step: {input: producing step}}, {step: later writers of its outputs})
+
+        Covers read-after-write, write-after-write and write-after-read, so in-place rewrites keep their order.
+        """
+        dependencies = {step.name: set() for step in steps}
+        producers = {}
+        later_writers = {step.name: set() for step in steps}
+        last_writer, readers, writers = {}, {}, {}
+        for step in steps:
+            for path in step.inputs:
+                for written, writer in last_writer.items():
+                    if written == path or fnmatch.fnmatch(written, path):
+                        dependencies[step.name].add(writer)
+                        producers.setdefault(step.name, {})[path] = writer
+            for path in step.outputs:
+                if path in last_writer:
+                    dependencies[step.name].add(last_writer[path])
+                dependencies[step.name].update(r for r in readers.get(path, ()) if r != step.name)
+                for writer in writers.get(path, ()):
+                    later_writers[writer].add(step.name)
+            for path in step.inputs:
+                readers.setdefault(path, set()).add(step.name)
+            for path in step.outputs:
+                last_writer[path] = step.name
+                readers[path] = set()
+                writers.setdefault(path, []).append(step.name)
+        return dependencies, producers, later_writers
+
+    def select(self, targets, with_upstream=True):
+        """Step names matching targets (phase '07', name '08/extract_gorilla' or pattern '08/*') plus upstream"""
+        if not targets:
+            return list(self.order)
+        selected = set()
+        for target in targets:
+            matches = [name for name in self.order
+                       if name == target or name.split('/')[0] == target or fnmatch.fnmatch(name, target)]
+            if not matches:
+                raise SystemExit(f"No step matches '{target}' (see --list)")
+            selected.update(matches)
+        if with_upstream:
+            pending = list(selected)
+            while pending:
+                for dependency in self.dependencies[pending.pop()]:
+                    if dependency not in selected:
+                        selected.add(dependency)
+                        pending.append(dependency)
+        return [name for name in self.order if name in selected]
+
+    def cache_key(self, step):
+        """Key over code and input content; None when an input is missing"""
+        parts = {'command': [step.script, step.cwd, step.copy]}
+        if step.script:
+            for module in sorted(local_modules(PIPELINE_DIR / step.script)):
+                parts[str(module.relative_to(PIPELINE_DIR))] = self.hasher.digest(module)
+        for path in step.inputs:
+            files = table_files(path)
+            if not files:
+                return None
+            # A table later rewritten in place (the 05 master) is keyed as its producer left it
+            writer = self.producers.get(step.name, {}).get(path)
+            recorded = self.state['steps'].get(writer, {}).get('outputs', {})
+            for file in files:
+                relative = str(file.relative_to(PIPELINE_DIR))
+                parts[relative] = recorded.get(relative) or self.hasher.digest(file)
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+    def _in_place_chain(self, name, path):
+        """Steps that rewrote path in place up to name, back to the step that first wrote it (last)"""
+        chain = [name]
+        while path in self.steps[chain[-1]].inputs and path in self.steps[chain[-1]].outputs:
+            writer = self.producers.get(chain[-1], {}).get(path)
+            if writer is None:
+                break
+            chain.append(writer)
+        return chain
+
+    def rewind(self, names):
+        """Selected names plus forced re-runs of in-place chains whose input was already rewritten on disk
+
+        An in-place step can only be re-run on the file its producer wrote. Once later steps have
+        rewritten that file, the chain is rebuilt from its first writer instead.
+        """
+        selected = set(names)
+        for name in names:
+            step = self.steps[name]
+            for path in step.inputs:
+                writer = self.producers.get(name, {}).get(path)
+                if path not in step.outputs or writer is None:
+                    continue
+                key = self.cache_key(step)
+                if key is None or self.is_fresh(step, key):
+                    break
+                recorded = self.state['steps'].get(writer, {}).get('outputs', {})
+                if all(recorded.get(str(file.relative_to(PIPELINE_DIR)), self.hasher.digest(file))
+                       == self.hasher.digest(file) for file in table_files(path)):
+                    continue
+                chain = self._in_place_chain(name, path)
+                self._report(f"⏪ {name}: {path} was rewritten after {writer} wrote it, re-running from {chain[-1]}")
+                self.force.add(chain[-1])
+                selected.update(chain)
+        return [name for name in self.order if name in selected]
+
+    def _report(self, message):
+        # One write per line; worker threads report concurrently
+        with self.print_lock:
+            print(message, flush=True)
+
+    def _output_digests(self, step):
+        return {str(file.relative_to(PIPELINE_DIR)): self.hasher.digest(file)
+                for path in step.outputs for file in table_files(path)}
+
+    def missing_inputs(self, step):
+        return [path for path in step.inputs if not table_files(path)]
+
+    def is_fresh(self, step, key):
+        record = self.state['steps'].get(step.name)
+        return (step.name not in self.force and record is not None and record['key'] == key
+                and all(table_files(path) for path in step.outputs))
+
+    def _execute(self, step):
+        """Run one step; returns (ok, seconds, log file)"""
+        LOG_DIR.mkdir(exist_ok=True)
+        log_file = LOG_DIR / f"{step.name.replace('/', '__')}.log"
+        start = time.perf_counter()
+        if step.copy:
+            source, target = (PIPELINE_DIR / p for p in step.copy)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # CSV export first, so the Parquet copy stays the newer file (copy2 keeps mtimes)
+            for suffix in reversed(TABLE_SUFFIXES):
+                if source.with_suffix(suffix).exists():
+                    tmp_file = target.with_suffix(suffix + '.tmp')
+                    shutil.copy2(source.with_suffix(suffix), tmp_file)
+                    os.replace(tmp_file, target.with_suffix(suffix))
+            log_file.write_text(f"Copied {source} -> {target}\n", encoding='utf-8')
+            return True, time.perf_counter() - start, log_file
+
+        cwd = PIPELINE_DIR / step.cwd if step.cwd else (PIPELINE_DIR / step.script).parent
+        env = dict(os.environ, PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
+        with open(log_file, 'w', encoding='utf-8') as log:
+            result = subprocess.run([sys.executable, str(PIPELINE_DIR / step.script)], cwd=cwd, env=env,
+                                    stdout=log, stderr=subprocess.STDOUT)
+        return result.returncode == 0, time.perf_counter() - start, log_file
+
+    def _run_step(self, step):
+        """Check the cache, run if stale; returns 'skipped', 'ran', 'failed' or 'blocked'"""
+        key = self.cache_key(step)
+        if key is None:
+            missing = ', '.join(self.missing_inputs(step))
+            # Raw sources are often not kept locally; outputs already on disk are still usable downstream
+            if step.outputs and all(table_files(path) for path in step.outputs) and step.name not in self.force:
+                if step.name not in self.state['steps'] and not self.dry_run:
+                    with self.state_lock:
+                        self.state['steps'][step.name] = {'key': None, 'outputs': self._output_digests(step)}
+                    self._save_state()
+                self._report(f"⏭️  {step.name}: keeping existing outputs, missing input {missing}")
+                return 'skipped'
+            self._report(f"⛔ {step.name}: missing input {missing}")
+            return 'blocked'
+        if self.is_fresh(step, key):
+            self._report(f"⏭️  {step.name}: up to date")
+            return 'skipped'
+        if self.dry_run:
+            self._report(f"▶️  {step.name}: would run")
+            return 'ran'
+
+        self._report(f"▶️  {step.name}: running")
+        ok, seconds, log_file = self._execute(step)
+        if not ok:
+            self._report(f"❌ {step.name}: failed after {seconds:.1f}s, see {log_file.relative_to(PIPELINE_DIR)}")
+            return 'failed'
+        missing = [path for path in step.outputs if not table_files(path)]
+        if missing:
+            self._report(f"❌ {step.name}: finished but did not write {', '.join(missing)}")
+            return 'failed'
+        outputs = self._output_digests(step)
+        with self.state_lock:
+            self.state['steps'][step.name] = {'key': key, 'outputs': outputs, 'seconds': round(seconds, 2),
+                                              'finished': time.strftime('%Y-%m-%dT%H:%M:%S')}
+            # Later in-place rewrites of these outputs were applied to the file just replaced
+            for name in self.later_writers[step.name]:
+                self.state['steps'].pop(name, None)
+        self._save_state()
+        self._report(f"✅ {step.name}: done in {seconds:.1f}s")
+        return 'ran'
+
+    def run(self, names):
+        """Run the selected steps in dependency order, independent ones in parallel"""
+        names = self.rewind(names)
+        selected = set(names)
+        status = {}
+        pending = list(names)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while pending or running:
+                for name in list(pending):
+                    dependencies = self.dependencies[name] & selected
+                    if any(status.get(d) in ('failed', 'blocked', 'upstream') for d in dependencies):
+                        status[name] = 'upstream'
+                        pending.remove(name)
+                        self._report(f"⛔ {name}: skipped, an upstream step did not complete")
+                    elif all(d in status for d in dependencies):
+                        # In a dry run, nothing is rebuilt, so anything below a stale step would run
+                        if self.dry_run and any(status[d] == 'ran' for d in dependencies):
+                            status[name] = 'ran'
+                            self._report(f"▶️  {name}: would run (upstream changes)")
+                        else:
+                            running[pool.submit(self._run_step, self.steps[name])] = name
+                        pending.remove(name)
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    status[running.pop(future)] = future.result()
+        return status
+
+    def list_steps(self, names):
+        """Print each step with its dependencies and cache status"""
+        for name in names:
+            step = self.steps[name]
+            key = self.cache_key(step)
+            if key is None:
+                missing = self.missing_inputs(step)
+                state = 'waits upstream' if all(path in self.producers.get(name, {}) for path in missing) else 'missing input'
+            elif self.is_fresh(step, key):
+                state = 'up to date'
+            else:
+                state = 'stale'
+            dependencies = ', '.join(sorted(self.dependencies[name])) or '-'
+            print(f"{name:45} {state:14} after: {dependencies}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run pipeline phases 05-11 as a cached, parallel DAG')
+    parser.add_argument('targets', nargs='*', help="Phases ('07'), steps ('08/extract_gorilla') or patterns ('10/*')")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='Steps to run at once (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Run the named steps even if up to date')
+    parser.add_argument('--only', action='store_true', help='Do not pull in upstream steps')
+    parser.add_argument('--dry-run', action='store_true', help='Show what would run')
+    parser.add_argument('--list', action='store_true', help='List steps, dependencies and cache status')
+    args = parser.parse_args()
+
+    runner = PipelineRunner(STEPS, jobs=args.jobs, dry_run=args.dry_run)
+    names = runner.select(args.targets, with_upstream=not args.only)
+    if args.force:
+        # Only the named steps; stale upstream steps still run, fresh ones are still skipped
+        runner.force = set(runner.select(args.targets, with_upstream=False))
+    if args.list:
+        runner.list_steps(names)
+        return
+
+    start = time.perf_counter()
+    status = runner.run(names)
+    counts = {outcome: list(status.values()).count(outcome) for outcome in ('ran', 'skipped', 'failed', 'blocked', 'upstream')}
+    print(f"\n{len(status)} steps in {time.perf_counter() - start:.1f}s: {counts['ran']} ran, {counts['skipped']} up to date, "
+          f"{counts['failed']} failed, {counts['blocked'] + counts['upstream']} not run")
+    if counts['failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()